@@ -23,6 +23,7 @@ from scipy.signal import butter, filtfilt, iirnotch, welch
 from scipy.integrate import simpson as simps
 import numpy as np
 import platform, ssl
+from utils.metrics_uploader import MetricsUploader
 
 
 # Try to import custom PyQtGraph configuration if it exists
@@ -376,6 +377,8 @@ class MainWindow(QMainWindow):
         self.jwt_token = None
         self.brainlink_thread = None
         self.serial_obj = None
+        self.uploader = None  # Background metrics upload, created after login
+        self._last_upload_error = None
         self.setMinimumSize(900, 600)
         
         # Create log area early to avoid AttributeError
@@ -424,8 +427,12 @@ class MainWindow(QMainWindow):
         self.battery_label = QLabel("Battery: --%")
         self.battery_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.battery_label.setStyleSheet("font-size: 14px; color: #00FF00; padding-right: 10px;")
+        # Upload counters (sent / queued / dropped) at the top left
+        self.upload_label = QLabel("Upload: idle")
+        self.upload_label.setStyleSheet("font-size: 12px; color: #FFFFFF; padding-left: 10px;")
         # Place battery label in a horizontal layout with a stretch
         battery_layout = QHBoxLayout()
+        battery_layout.addWidget(self.upload_label)
         battery_layout.addStretch()
         battery_layout.addWidget(self.battery_label)
         main_layout.addLayout(battery_layout)
@@ -682,28 +689,14 @@ class MainWindow(QMainWindow):
             'Beta power':  beta_power,
             'Gamma power': gamma_power,
         }
-        headers = {"X-Authorization": f"Bearer {self.jwt_token}"} if self.jwt_token else {}
-        try:
-            response = requests.post(BACKEND_URL, json=payload, headers=headers, timeout=2)
-            if response.status_code == 200:
-                self.log_message(f"✓ Data sent | Theta contribution: {theta_contribution:.1f}%")
-            else:
-                self.log_message(f"Error sending data: {response.status_code}")
-        except requests.exceptions.ProxyError as e:
-            self.log_message(f"Proxy error: {str(e)}")
-            try:
-                # Try once more without proxy
-                direct_session = requests.Session()
-                direct_session.proxies = {}
-                response = direct_session.post(BACKEND_URL, json=payload, headers=headers, timeout=2)
-                if response.status_code == 200:
-                    self.log_message(f"✓ Data sent (direct) | Theta contribution: {theta_contribution:.1f}%")
-                else:
-                    self.log_message(f"Error sending data (direct connection): {response.status_code}")
-            except Exception as e2:
-                self.log_message(f"Error sending data without proxy: {str(e2)}")
-        except Exception as e:
-            self.log_message(f"Error sending data: {str(e)}")
+        # Queue for the uploader thread; a slow backend no longer stalls the plot
+        if self.uploader is not None:
+            self.uploader.submit(payload)
+            self.upload_label.setText(self.uploader.status_text())
+            error = self.uploader.last_error
+            if error and error != self._last_upload_error:
+                self.log_message(f"Error sending data: {error}")
+            self._last_upload_error = error
     
     def on_start_clicked(self):
         global BACKEND_URL, SERIAL_PORT
@@ -812,6 +805,9 @@ class MainWindow(QMainWindow):
             self.log_message("Login canceled.")
             return
         
+        headers = {"X-Authorization": f"Bearer {self.jwt_token}"} if self.jwt_token else {}
+        self.uploader = MetricsUploader(BACKEND_URL, headers=headers).start()
+        
         self.serial_obj = CushySerial(SERIAL_PORT, SERIAL_BAUD)
         self.log_message("Starting BrainLink thread...")
         self.brainlink_thread = threading.Thread(target=run_brainlink, args=(self.serial_obj,))
@@ -822,6 +818,8 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         global stop_thread_flag
         stop_thread_flag = True
+        if self.uploader is not None:
+            self.uploader.stop(flush_timeout=2.0)
         if self.serial_obj and self.serial_obj.is_open:
             self.serial_obj.close()
         if self.brainlink_thread and self.brainlink_thread.is_alive():
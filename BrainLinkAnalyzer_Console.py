@@ -2,6 +2,11 @@
 """
 BrainLink Feature Analysis Console
 Simple console-only version that shows processed EEG values in real-time.
+
+Filters, PSD and band powers come from the headless core (brainlink_core.dsp),
+so the numbers match the GUI. For full enhanced analysis of a recorded session
+without the GUI use ``python -m brainlink_core.analyze <recording>``
+(brainlink-analyze); this console only monitors a live headset.
 """
 
 import sys, os, time, threading, random
@@ -10,9 +15,10 @@ from cushy_serial import CushySerial
 import numpy as np
 import platform
 from collections import deque
-from scipy.signal import butter, filtfilt, iirnotch, welch
 from scipy.integrate import simpson as simps
 
+from brainlink_core.dsp import FS, EEG_BANDS, bandpass_filter, notch_filter, compute_psd, bandpower
+
 try:
     from BrainLinkParser.BrainLinkParser import BrainLinkParser
 except ImportError:
@@ -40,7 +46,7 @@ except ImportError:
                 # Generate realistic EEG-like data
                 dummy_raw = random.randint(-100, 100) + 50 * np.sin(time.time() * 2 * np.pi * 10)
                 self.onRaw(dummy_raw)
-                time.sleep(1/256)  # 256 Hz sampling rate
+                time.sleep(1/FS)
 
 # Global variables
 SERIAL_PORT = None
@@ -48,42 +54,6 @@ SERIAL_BAUD = 115200
 stop_thread_flag = False
 live_data_buffer = deque(maxlen=1000)
 
-# Signal processing constants
-FS = 256
-WINDOW_SIZE = 256 
-OVERLAP_SIZE = 128
-EEG_BANDS = {
-    'delta': (0.5, 4),
-    'theta': (4, 8),
-    'alpha': (8, 12),
-    'beta': (12, 30),
-    'gamma': (30, 45)
-}
-
-def bandpass_filter(data, lowcut=1.0, highcut=45.0, fs=256, order=2):
-    nyq = 0.5 * fs
-    low = lowcut / nyq
-    high = highcut / nyq
-    b, a = butter(order, [low, high], btype='band')
-    return filtfilt(b, a, data)
-
-def notch_filter(data, fs, notch_freq=60.0, quality_factor=30.0):
-    freq_ratio = notch_freq / (fs / 2.0)
-    b, a = iirnotch(freq_ratio, quality_factor)
-    return filtfilt(b, a, data)
-
-def compute_psd(data, fs):
-    freqs, psd = welch(data, fs=fs, nperseg=WINDOW_SIZE, noverlap=OVERLAP_SIZE)
-    return freqs, psd
-
-def bandpower(psd, freqs, band):
-    low, high = EEG_BANDS[band]
-    idx = np.logical_and(freqs >= low, freqs <= high)
-    if np.sum(idx) == 0:
-        return 0
-    bp = simps(psd[idx], dx=freqs[1] - freqs[0])
-    return bp
-
 def detect_brainlink():
     """Device detection with enhanced logging"""
     ports = serial.tools.list_ports.comports()
@@ -125,21 +95,21 @@ def onRaw(raw):
         print(f"Latest raw value: {raw:.1f} µV")
         
         # Process the data if we have enough samples
-        if len(live_data_buffer) >= 256:
+        if len(live_data_buffer) >= FS:
             try:
                 # Get recent data for analysis
-                data = np.array(list(live_data_buffer)[-256:])
+                data = np.array(list(live_data_buffer)[-FS:])
                 
                 # Apply filters
-                data_notched = notch_filter(data, 256, notch_freq=50.0, quality_factor=30.0)
-                filtered = bandpass_filter(data_notched, lowcut=1.0, highcut=45.0, fs=256, order=2)
+                data_notched = notch_filter(data, FS, notch_freq=50.0, quality_factor=30.0)
+                filtered = bandpass_filter(data_notched, lowcut=1.0, highcut=45.0, fs=FS, order=2)
                 
                 # Compute basic statistics
                 print(f"Filtered data range: {np.min(filtered):.1f} to {np.max(filtered):.1f} µV")
                 print(f"Mean: {np.mean(filtered):.1f} µV, Std: {np.std(filtered):.1f} µV")
                 
                 # Compute power spectral density
-                freqs, psd = compute_psd(filtered, 256)
+                freqs, psd = compute_psd(filtered, FS)
                 total_power = simps(psd, dx=freqs[1] - freqs[0])
                 
                 # Calculate band powers
@@ -182,7 +152,7 @@ def onRaw(raw):
             except Exception as e:
                 print(f"Analysis error: {e}")
         else:
-            print(f"Need {256 - len(live_data_buffer)} more samples for analysis")
+            print(f"Need {FS - len(live_data_buffer)} more samples for analysis")
             print(f"===================================\n")
 
 def onEEG(data):
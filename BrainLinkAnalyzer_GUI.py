@@ -9,18 +9,32 @@ import sys, os, time, threading, requests, random
 import serial.tools.list_ports
 from cushy_serial import CushySerial
 import numpy as np
-import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 import json
 from datetime import datetime
 import platform
 import ssl
 import getpass
-from collections import deque
+from collections import OrderedDict, deque
 import weakref
 from typing import Any, Dict, List, Optional
 
 # REAL MINDLINK PARSER - NO DUMMY DATA ALLOWED
 from BrainLinkParser.BrainLinkParser import BrainLinkParser
+from utils.bl_log import get_logger
+from utils.lazy_import import lazy_attr, lazy_module
+from utils.pipeline_latency import PIPELINE_LATENCY
+# Constants, DSP helpers and the feature engine live in the Qt-free core package
+from brainlink_core.dsp import (
+    EXTRA_TASKS, FS, WINDOW_SIZE, OVERLAP_SIZE, EEG_BANDS, FEATURE_NAMES, AVAILABLE_TASKS,
+    butter_lowpass_filter, bandpass_filter, notch_filter, compute_psd, bandpower,
+    remove_eye_blink_artifacts, check_signal_legitimacy, is_signal_noisy,
+)
+from brainlink_core.engine import FeatureAnalysisEngine
+
+# Per-packet console output goes through the queued, rate-limited logger
+serial_log = get_logger("serial")
+signal_log = get_logger("signal")
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
@@ -39,27 +53,21 @@ try:
 except Exception:
     pass
 import pyqtgraph as pg
-from scipy.signal import butter, filtfilt, iirnotch, welch, decimate, hilbert
-from scipy.integrate import simpson as simps
-from scipy.stats import zscore
+# SciPy and pandas load on first use, not before the first dialog (BL_LAZY_IMPORTS=0 disables)
+pd = lazy_module('pandas')
+butter = lazy_attr('scipy.signal', 'butter')
+filtfilt = lazy_attr('scipy.signal', 'filtfilt')
+iirnotch = lazy_attr('scipy.signal', 'iirnotch')
+welch = lazy_attr('scipy.signal', 'welch')
+decimate = lazy_attr('scipy.signal', 'decimate')
+hilbert = lazy_attr('scipy.signal', 'hilbert')
+simps = lazy_attr('scipy.integrate', 'simpson')
+zscore = lazy_attr('scipy.stats', 'zscore')
 
 # Windowed task analysis pipeline modules
 # from task_analyzer import TaskAnalyzer
 # from event_parser import parse_events
 # from task_reporting import render_task_report, render_two_session_agreement
-# Optional extra tasks plugin - import dynamically to avoid static resolution errors
-try:
-    import importlib
-    import importlib.util
-    if importlib.util.find_spec("extra_tasks") is not None:
-        mod = importlib.import_module("extra_tasks")
-        EXTRA_TASKS = getattr(mod, "EXTRA_TASKS", {})
-    else:
-        EXTRA_TASKS = {}
-except Exception as e:
-    # Non-fatal: continue with empty extra tasks and log a warning
-    print(f"Warning: optional module 'extra_tasks' not imported: {e}")
-    EXTRA_TASKS = {}
 
 # Import winreg only on Windows
 if platform.system() == 'Windows':
@@ -177,396 +185,154 @@ SERIAL_BAUD = 115200
 ALLOWED_HWIDS = []
 stop_thread_flag = False
 live_data_buffer = []
+# Monotonic count of samples delivered to onRaw. live_data_buffer is trimmed in place,
+# so its length cannot tell consumers whether new data has arrived.
+raw_samples_received = 0
 
-# Signal processing constants from mother code (corrected to match BrainCompanion_updated.py)
-FS = 512
-WINDOW_SIZE = 512 
-OVERLAP_SIZE = 128
-EEG_BANDS = {
-    'delta': (0.5, 4),
-    'theta': (4, 8),
-    'alpha': (8, 12),
-    'beta': (12, 30),
-    'gamma': (30, 45)
-}
 
-# Feature analysis constants
-FEATURE_NAMES = [
-    'delta_power', 'theta_power', 'alpha_power', 'beta_power', 'gamma_power',
-    'delta_relative', 'theta_relative', 'alpha_relative', 'beta_relative', 'gamma_relative',
-    'delta_peak_freq', 'theta_peak_freq', 'alpha_peak_freq', 'beta_peak_freq', 'gamma_peak_freq',
-    'delta_peak_amp', 'theta_peak_amp', 'alpha_peak_amp', 'beta_peak_amp', 'gamma_peak_amp',
-    'alpha_theta_ratio', 'beta_alpha_ratio', 'total_power'
-]
-
-# Available cognitive tasks
-AVAILABLE_TASKS = {
-    'visual_imagery': {
-        'name': 'Visual Imagery',
-        'description': 'Visualize a familiar place or object in detail',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Visualize walking through your home in rich sensory detail.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start visualizing\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Visualize walking through your home in rich sensory detail continuously. (Start on beep sound).'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'IMAGERY: Visualize walking through your home in rich sensory detail continuously.'}
-        ]
-    },
-    'attention_focus': {
-        'name': 'Focused Attention',
-        'description': 'Focus intensely on breathing or a single point',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Focus all attention on your breathing. Count breaths 1–10 and repeat.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start focusing\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'}
-        ]
-    },
-    'mental_math': {
-        'name': 'Mental Math',
-        'description': 'Perform mental arithmetic (e.g., count backwards from 200 by 7s)',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Count backwards from 200 by 7s: 200, 193, 186, 179...\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start counting\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to count backwards from 200 by 7s with your EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'COUNT: 200, 193, 186, 179... Keep counting backwards by 7s.'}
-        ]
-    },
-    'working_memory': {
-        'name': 'Working Memory',
-        'description': 'Remember and manipulate a sequence of numbers or letters',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Remember this sequence: 3-8-2-9-5-1. Now add 2 to each number mentally.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start calculating\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to remember and manipulate this sequence: 3-8-2-9-5-1. Add 2 to each number with EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'REMEMBER: 3-8-2-9-5-1. Add 2 to each number: 5-10-4-11-7-3. Keep manipulating the sequence.'}
-        ]
-    },
-    'attention_focus': {
-        'name': 'Focused Attention',
-        'description': 'Focus intensely on breathing or a single point',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Focus all attention on your breathing. Count breaths 1–10 and repeat.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start focusing\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'}
-        ]
-    },
-    'language_processing': {
-        'name': 'Language Processing',
-        'description': 'Generate words or sentences following specific rules',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Think of as many words as possible that start with the letter "S".\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start generating words\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare – Silently list distinct "S" words, avoid repeats, keep steady pace with EYES CLOSED.).'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'GENERATE: Silently list distinct "S" words, avoid repeats, keep steady pace.'}
-        ]
-    },
-    'motor_imagery': {
-        'name': 'Motor Imagery',
-        'description': 'Imagine performing physical movements without moving',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Imagine throwing a ball with your right hand, then left hand, alternating.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start imagining\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to imagine throwing a ball with your right hand, then left hand, alternating with EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'IMAGINE: Throw a ball with your right hand, then left hand, alternating. Feel the motion vividly.'}
-        ]
-    },
-    'cognitive_load': {
-        'name': 'Cognitive Load',
-        'description': 'Perform multiple cognitive tasks simultaneously',
-        'duration': 60,
-        'instructions': '🔊 EYES CLOSED TASK - Count backwards from 50 by 3s while visualizing the numbers in blue.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start task\n• 2 beeps = Task complete, you can stop',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to count backwards from 50 by 3s while visualizing each number in blue with EYES CLOSED.'},
-            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'COUNT & VISUALIZE: 50, 47, 44, 41... Count backwards by 3s while seeing each number in blue.'}
-        ]
-    },
-    # --- Added protocol tasks with phase-based timing ---
-    'emotion_face': {
-    'name': 'Emotion Recognition',
-        'description': 'View static emotional face images with timed phases.',
-        'duration': 114,  # 6 images × 19s each (8s cue + 11s look+resonate)
-        'instructions': '👁️ EYES OPEN TASK - For each face: LOOK & RESONATE with the emotion shown.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start task | 2 beeps = End task',
-        'phases': ['analyze', 'rest'],
-        'continuous_recording': True,  # Record throughout entire task
-        'phase_structure': [
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to LOOK & RESONATE with the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 0, 'instruction': 'LOOK & RESONATE'},
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to LOOK & RESONATE with the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 1, 'instruction': 'LOOK & RESONATE'},
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 2, 'instruction': 'LOOK & RESONATE'},
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 3, 'instruction': 'LOOK & RESONATE'},
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 4, 'instruction': 'LOOK & RESONATE'},
-            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
-            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 5, 'instruction': 'LOOK & RESONATE'}
-        ],
-        'media': {
-            'images': [
-                'emo_face_01.png', 'emo_face_02.png', 'emo_face_03.png',
-                'emo_face_04.png', 'emo_face_05.png', 'emo_face_06.png'
-            ],
-            'videos': []
-        }
-    },
-    'diverse_thinking': {
-    'name': 'Creative Fluency',
-        'description': 'Divergent thinking task with timed phases.',
-        'duration': 96,  # 2 prompts × 48s each (8s get ready + 10s cue + 30s thinking)
-        'instructions': '👁️ EYES OPEN TASK - Read the prompt, then think of creative and unusual uses.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start thinking | 2 beeps = End task',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for creative thinking...'},
-            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 0},
-            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 0},
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for next prompt...'},
-            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 1},
-            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 1}
-        ],
-        'media': {
-            'type': 'text_prompts',
-            'prompts': [
-                {
-                    'title': 'CREATIVE USES - PAPERCLIP',
-                    'text': 'Think of as many creative and unusual uses for a PAPERCLIP as you can.\n\nGo beyond the obvious uses - be creative and imaginative!',
-                    'duration': 30
-                },
-                {
-                    'title': 'CREATIVE USES - ARTIFICIAL INTELLIGENCE',
-                    'text': 'Think of as many creative and innovative uses for ARTIFICIAL INTELLIGENCE as you can.\n\nConsider both current and future possibilities!',
-                    'duration': 30
-                }
-            ]
-        }
-    },
-    'reappraisal': {
-    'name': 'Perspective Shift',
-        'description': 'Cognitive reappraisal task with timed phases.',
-        'duration': 96,  # 2 scenarios × 48s each (8s get ready + 10s cue + 30s thinking)
-        'instructions': '👁️ EYES OPEN TASK - Read the scenario and follow the specific thinking instructions.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start task | 2 beeps = End task',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for thinking task...'},
-            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 0},
-            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 0},
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for next scenario...'},
-            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 1},
-            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 1}
-        ],
-        'media': {
-            'type': 'text_prompts',
-            'prompts': [
-                {
-                    'title': 'THINK POSITIVE',
-                    'scenario': 'Feedback from a close friend',
-                    'instruction': 'Try to see this situation in a positive light. What good could come from this? What are the silver linings?',
-                    'duration': 30
-                },
-                {
-                    'title': 'FOCUS ON NEGATIVES',
-                    'scenario': 'Going to miss a flight',
-                    'instruction': 'Think about what went wrong with this situation. Focus on the problems and negative consequences.',
-                    'duration': 30
-                }
-            ]
-        }
-    },
-    'curiosity': {
-    'name': 'Curiosity Reveal',
-        'description': 'Curiosity task with reveal timing.',
-        'duration': 45,  # 8s get ready + 2s cue + 2s wait + 33s video
-        'instructions': '👁️ EYES OPEN TASK - Watch the video reveal with full attention.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & video starts | 2 beeps = End task',
-        'phases': ['analyze', 'rest'],
-        'phase_structure': [
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for video reveal...'},
-            {'type': 'cue', 'duration': 2, 'record': False, 'instruction': 'Video starting soon...'},
-            {'type': 'wait', 'duration': 2, 'record': True, 'instruction': 'Video starting...'},
-            {'type': 'video', 'duration': 33, 'record': True, 'media_file': 'curiosity_clip_01.mp4'}
-        ],
-        'media': {
-            # Placeholders; ensure files exist in assets/ or replace with available ones
-            'images': ['curiosity_card_back.png'],
-            'videos': ['curiosity_clip_01.mp4']
-        }
-    },
-    # --- Lifestyle pathway tasks ---
-    'num_form': {
-        'name': 'Numerical Preference',
-        'description': 'Evaluate aesthetic preference for numbers vs forms with balanced look phases.',
-        'duration': 60,
-        'instructions': (
-            '👁️ EYES OPEN TASK\n\n'
-            'NUMBERS: Wait for the countdown, then LOOK for the numbers. Keep your gaze steady and minimize movement.\n'
-            'FORMS: Wait for the countdown, then LOOK for the shapes. Keep your gaze steady and minimize movement.\n\n'
-            'Audio cues: 1 beep = Start task | 1 smooth beep = Phase change | 2 beeps = End task'
-        ),
-        'phases': ['analyze', 'rest'],
-        'continuous_recording': True,
-        'phase_structure': [
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready...'},
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'NUMBERS'},
-            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'NUM_FORM.png'},
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FORMS'},
-            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'NUM_FORM.png'},
-            {'type': 'rest', 'duration': 2, 'record': False, 'instruction': 'Rest.'}
-        ],
-        'media': {
-            'images': ['NUM_FORM.png'],
-            'videos': []
-        }
-    },
-    'order_surprise': {
-        'name': 'Order & Surprise',
-        'description': 'Evaluate aesthetic response to ORDER vs SURPRISE with balanced look phases.',
-        'duration': 60,
-        'instructions': (
-            '👁️ EYES OPEN TASK\n\n'
-            'ORDER: Wait for the countdown, then COUNT symmetrical/normal shapes. Keep your gaze steady and minimize movement.\n'
-            'SURPRISE: Wait for the countdown, then COUNT non-symmetrical/abnormal shapes. Keep your gaze steady and minimize movement.\n\n'
-            'Audio cues: 1 beep = Start task | 1 smooth beep = Phase change | 2 beeps = End task'
-        ),
-        'phases': ['analyze', 'rest'],
-        'continuous_recording': True,
-        'phase_structure': [
-            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready...'},
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'ORDER'},
-            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'ORDER_SURPRISE.png'},
-            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'SURPRISE'},
-            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'ORDER_SURPRISE.png'},
-            {'type': 'rest', 'duration': 2, 'record': False, 'instruction': 'Rest.'}
-        ],
-        'media': {
-            'images': ['ORDER_SURPRISE.png'],
-            'videos': []
-        }
-    }
-}
 
-# Merge in any extra protocol tasks
-if EXTRA_TASKS:
-    try:
-        AVAILABLE_TASKS.update(EXTRA_TASKS)
-    except Exception:
-        pass
-
-# Signal processing functions from mother code
-def butter_lowpass_filter(data, cutoff, fs, order=2):
-    nyq = 0.5 * fs
-    normal_cutoff = cutoff / nyq
-    b, a = butter(order, normal_cutoff, btype='low', analog=False)
-    return filtfilt(b, a, data)
-
-def bandpass_filter(data, lowcut=1.0, highcut=45.0, fs=512, order=2):
-    nyq = 0.5 * fs
-    b, a = butter(order, [lowcut/nyq, highcut/nyq], btype='band')
-    return filtfilt(b, a, data)
-
-def notch_filter(data, fs, notch_freq=60.0, quality_factor=30.0):
-    freq = notch_freq/(fs/2)
-    b, a = iirnotch(freq, quality_factor)
-    return filtfilt(b, a, data)
-
-def compute_psd(data, fs):
-    freqs, psd = welch(data, fs=fs, nperseg=WINDOW_SIZE, noverlap=OVERLAP_SIZE)
-    return freqs, psd
-
-def bandpower(psd, freqs, band):
-    low, high = EEG_BANDS[band]
-    idx = (freqs >= low) & (freqs <= high)
-    return simps(psd[idx], dx=freqs[1] - freqs[0]) if np.any(idx) else 0
-
-def remove_eye_blink_artifacts(data, window=10):
-    """Remove eye blink artifacts from EEG data"""
-    clean = data.copy()
-    adaptive_threshold = np.mean(data) + 3 * np.std(data)
-    idx = np.where(np.abs(data) > adaptive_threshold)[0]
-    for i in idx:
-        start = max(0, i - window)
-        end = min(len(data), i + window)
-        local_window = np.delete(data[start:end], np.where(np.abs(data[start:end]) > adaptive_threshold))
-        if len(local_window) > 0:
-            clean[i] = np.median(local_window)
-        else:
-            clean[i] = np.median(data)
-    return clean
+class SpectralCache:
+    """Share spectra (and results derived from them) between live consumers.
 
+    The plot tick, calibration timers, status bar and onRaw all look at the
+    most recent second of the same buffer. Entries are keyed by
+    ``(buffer id, end sample index, window length, fs, method)`` so each
+    window is analysed once per data hop, however many consumers ask.
+    """
 
-def check_signal_legitimacy(data_window, min_variance=0.05, max_diff_std=0.1, max_identical_fraction=0.02):
-    """Perform quick heuristic checks to determine if the incoming EEG window looks legitimate.
-
-    Returns a dict with flags and short messages. Heuristics used:
-      - low_variance: variance below min_variance (flatline / disconnected)
-      - regular_steps: very low std of successive differences (possible synthetic/demo)
-      - too_many_identical: many repeated identical values (clipping or synthetic)
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def psd(self, data, fs, buffer_id=None, end_index=None, method='welch'):
+        """Welch PSD of ``data``; memoized when the caller identifies the window."""
+        if buffer_id is None or end_index is None:
+            return compute_psd(data, fs)
+        key = (buffer_id, int(end_index), len(data), fs, method)
+        return self.get_or_compute(key, lambda: compute_psd(np.asarray(data), fs))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+spectral_cache = SpectralCache()
+
+
+class RawBatcher:
+    """Collect parser raw values and deliver them to subscribers as arrays.
+
+    BrainLinkParser calls back once per 512 Hz sample. ``push`` only stores
+    the value in a preallocated array; subscribers receive a float array
+    every ``batch_size`` samples, or once the oldest pending sample is
+    ``max_latency_ms`` old (``flush_if_stale`` enforces the bound when the
+    stream pauses). ``batch_size=1`` gives per-sample delivery.
     """
-    metrics = {}
-    arr = np.array(data_window)
-    metrics['variance'] = float(np.var(arr)) if arr.size > 0 else 0.0
-    metrics['std_of_diffs'] = float(np.std(np.diff(arr))) if arr.size > 1 else 0.0
-    # Fraction of identical samples (exact equality)
-    if arr.size > 0:
-        unique_count = len(np.unique(arr))
-        metrics['identical_fraction'] = 1.0 - (unique_count / float(arr.size))
-    else:
-        metrics['identical_fraction'] = 1.0
 
-    flags = {
-        'low_variance': metrics['variance'] < min_variance,
-        'regular_steps': metrics['std_of_diffs'] < max_diff_std,
-        'too_many_identical': metrics['identical_fraction'] > max_identical_fraction
-    }
+    def __init__(self, batch_size=16, max_latency_ms=50.0):
+        self.batch_size = max(1, int(batch_size))
+        self.max_latency_s = max(0.0, float(max_latency_ms)) / 1000.0
+        self._buf = np.empty(self.batch_size, dtype=float)
+        self._count = 0
+        self._first_time = 0.0
+        self._first_ns = 0
+        self._subscribers = []
+        # Held while dispatching so batches reach subscribers in order
+        self._lock = threading.RLock()
+        self.batches = 0
+        self.samples = 0
+
+    def subscribe(self, callback):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def push(self, value):
+        with self._lock:
+            if self._count == 0:
+                self._first_time = time.monotonic()
+                self._first_ns = PIPELINE_LATENCY.stamp()
+            self._buf[self._count] = value
+            self._count += 1
+            if self._count >= self.batch_size or (time.monotonic() - self._first_time) >= self.max_latency_s:
+                self._flush_locked()
+
+    def flush_if_stale(self):
+        with self._lock:
+            if self._count and (time.monotonic() - self._first_time) >= self.max_latency_s:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            if self._count:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        batch = self._buf[:self._count].copy()
+        self._count = 0
+        self.batches += 1
+        self.samples += batch.size
+        # Oldest sample in the batch -> dispatch, then -> all subscribers done
+        PIPELINE_LATENCY.record('acquire', self._first_ns)
+        for callback in list(self._subscribers):
+            try:
+                callback(batch)
+            except Exception as e:
+                print(f"Raw batch subscriber error: {e}")
+        PIPELINE_LATENCY.record('end_to_end', self._first_ns)
 
-    messages = []
-    if flags['low_variance']:
-        messages.append('Low variance - possible disconnected/flatline signal')
-    if flags['regular_steps']:
-        messages.append('Highly regular sample-to-sample steps - possible synthetic/demo data')
-    if flags['too_many_identical']:
-        messages.append('Many identical values - possible clipping or artificial data')
 
-    return {'flags': flags, 'metrics': metrics, 'messages': messages}
+def _env_number(name, default, cast=float):
+    try:
+        return cast(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
 
 
-def is_signal_noisy(data_window, fs=512, high_freq_threshold=30.0, high_freq_ratio_thresh=0.7):
-    """Estimate whether the window is dominated by high-frequency noise.
+# BL_RAW_BATCH=1 restores per-sample delivery
+RAW_BATCH_SIZE = _env_number('BL_RAW_BATCH', 16, int)
+RAW_BATCH_LATENCY_MS = _env_number('BL_RAW_BATCH_MS', 50.0, float)
+raw_batcher = RawBatcher(RAW_BATCH_SIZE, RAW_BATCH_LATENCY_MS)
 
-    Simple heuristic: compute PSD and compare power above `high_freq_threshold` to total power.
-    Returns (is_noisy: bool, details: dict)
-    
-    Note: Threshold increased to 0.7 (70%) to reduce false positives from normal EEG artifacts.
-    """
-    arr = np.array(data_window)
-    details = {}
-    if arr.size < 4:
-        details['reason'] = 'too_short'
-        details['high_freq_ratio'] = 0.0
-        return False, details
 
-    try:
-        freqs, psd = compute_psd(arr, fs)
-        total = np.trapz(psd, freqs) if psd.size > 0 else 0.0
-        mask = freqs >= high_freq_threshold
-        high_power = np.trapz(psd[mask], freqs[mask]) if np.any(mask) else 0.0
-        ratio = float(high_power / (total + 1e-12))
-        details['total_power'] = float(total)
-        details['high_power'] = float(high_power)
-        details['high_freq_ratio'] = ratio
-        details['freq_max'] = float(freqs[np.argmax(psd)]) if psd.size > 0 else 0.0
-        is_noisy = ratio > high_freq_ratio_thresh
-        return is_noisy, details
-    except Exception as e:
-        details['error'] = str(e)
-        return False, details
+def live_window(buffer, n_samples, end_index, hop=64):
+    """Return ``(window, aligned_end)`` for the last ``n_samples`` up to a hop boundary.
+
+    Consumers polling at different rates get the same window (and cache key)
+    until ``hop`` new samples have arrived, so per-window analysis runs at a
+    fixed data rate instead of once per UI timer. Returns ``(None, None)``
+    when the buffer does not hold a full window.
+    """
+    hop = max(1, int(hop))
+    aligned_end = int(end_index) - (int(end_index) % hop)
+    lag = int(end_index) - aligned_end
+    snapshot = list(buffer[-(n_samples + lag):]) if lag else list(buffer[-n_samples:])
+    if len(snapshot) < n_samples + lag:
+        return None, None
+    window = snapshot[:n_samples]
+    return np.asarray(window, dtype=float), aligned_end
 
 def detect_brainlink():
     """Device detection from mother code with enhanced logging"""
@@ -617,27 +383,41 @@ def detect_brainlink():
 
 # Data collection callbacks from mother code
 def onRaw(raw):
-    global live_data_buffer
+    """Parser callback: queue one sample. Processing happens per batch in onRawBatch.
+
+    Consumers are configured through attributes on this function
+    (``onRaw.feature_engine``, ``onRaw._suppress_console``).
+    """
+    raw_batcher.push(raw)
+
+
+def _dummy_pattern_count(values):
+    """Number of new samples that end a suspiciously regular 10-sample run"""
+    tail = getattr(onRaw, '_last_values', None)
+    run = np.concatenate([tail, values]) if tail is not None and len(tail) else values
+    onRaw._last_values = run[-9:].copy()
+    if len(run) < 10:
+        return 0
+    # Each window holds the 9 diffs of a 10-value run ending at one new sample
+    windows = sliding_window_view(np.diff(run), 9)
+    flagged = (windows.std(axis=1) < 0.1) | np.all(np.abs(windows) < 0.01, axis=1)
+    return int(np.count_nonzero(flagged))
+
+
+def onRawBatch(values):
+    """Process a batch of raw samples (float array) from raw_batcher"""
+    global live_data_buffer, raw_samples_received
     
     # CRITICAL VALIDATION: Detect if we're getting dummy data patterns
     # Check for suspicious patterns that indicate dummy data generation
-    if hasattr(onRaw, '_last_values'):
-        onRaw._last_values.append(raw)
-        if len(onRaw._last_values) > 10:
-            onRaw._last_values = onRaw._last_values[-10:]
-            
-        # Check for unrealistic patterns (like perfect sine waves from dummy generator)
-        if len(onRaw._last_values) >= 10:
-            values = np.array(onRaw._last_values)
-            # Check for suspiciously regular patterns
-            diffs = np.diff(values)
-            if np.std(diffs) < 0.1 or np.all(np.abs(diffs) < 0.01):
-                print("WARNING: Detected potentially artificial/dummy data patterns!")
-                print("Please ensure you're connected to a REAL MindLink device!")
-    else:
-        onRaw._last_values = [raw]
+    # (perfect sine waves from a dummy generator have near-constant diffs)
+    if _dummy_pattern_count(values):
+        signal_log.warning("WARNING: Detected potentially artificial/dummy data patterns! "
+                           "Please ensure you're connected to a REAL MindLink device!")
     
-    live_data_buffer.append(raw)
+    previous_len = len(live_data_buffer)
+    live_data_buffer.extend(values.tolist())
+    raw_samples_received += len(values)
     # CRITICAL FIX: Trim buffer IN-PLACE to prevent unbounded growth
     # Using slice assignment del[:] to modify the SAME list object
     # This ensures all modules referencing live_data_buffer see the trimmed version
@@ -646,10 +426,11 @@ def onRaw(raw):
     
     # Also feed data to feature engine if GUI is running
     if hasattr(onRaw, 'feature_engine') and onRaw.feature_engine:
-        onRaw.feature_engine.add_data(raw)
+        onRaw.feature_engine.add_data(values)
     
     # Show processed values in console every 50 samples (unless suppressed by enhanced GUI)
-    if len(live_data_buffer) % 50 == 0 and not getattr(onRaw, '_suppress_console', False):
+    # (same trigger as per-sample delivery: buffer length reaching a multiple of 50)
+    if len(live_data_buffer) // 50 > previous_len // 50 and not getattr(onRaw, '_suppress_console', False):
         # print(f"\n=== EEG ANALYZER CONSOLE OUTPUT ===")
         # print(f"Buffer size: {len(live_data_buffer)} samples")
         # print(f"Latest raw value: {raw:.1f} µV")
@@ -671,8 +452,9 @@ def onRaw(raw):
                 # print(f"Filtered data range: {np.min(filtered):.1f} to {np.max(filtered):.1f} µV")
                 # print(f"Mean: {np.mean(filtered):.1f} µV, Std: {np.std(filtered):.1f} µV")
                 
-                # Compute power spectral density
-                freqs, psd = compute_psd(filtered, 512)
+                # Compute power spectral density (shared with the noise check below)
+                freqs, psd = spectral_cache.psd(filtered, 512, buffer_id=id(live_data_buffer),
+                                                end_index=raw_samples_received, method='welch_bp1-45')
                 
                 # Total EEG power via variance of the signal (matching BrainCompanion_updated.py)
                 total_power = np.var(filtered)
@@ -705,15 +487,16 @@ def onRaw(raw):
                 try:
                     recent_window = filtered[-512:] if len(filtered) >= 512 else filtered
                     legitimacy = check_signal_legitimacy(recent_window)
-                    noisy, noise_details = is_signal_noisy(recent_window, fs=512)
+                    # recent_window is the whole filtered window, so its PSD is the one above
+                    noisy, noise_details = is_signal_noisy(recent_window, fs=512, spectrum=(freqs, psd))
                     onRaw._last_check = {'legitimacy': legitimacy, 'is_noisy': noisy, 'noise_details': noise_details}
                     # Print concise warnings so users see issues in console
                     if legitimacy['messages']:
-                        print("SIGNAL WARNING:", "; ".join(legitimacy['messages']))
+                        signal_log.warning("SIGNAL WARNING: %s", "; ".join(legitimacy['messages']))
                     if noisy:
-                        print(f"SIGNAL WARNING: High-frequency noise detected (ratio={noise_details.get('high_freq_ratio',0):.2f})")
+                        signal_log.warning("SIGNAL WARNING: High-frequency noise detected (ratio=%.2f)", noise_details.get('high_freq_ratio', 0))
                 except Exception as e:
-                    print(f"Signal checks failed: {e}")
+                    signal_log.warning("Signal checks failed: %s", e)
 
                 # print(f"MENTAL STATE INTERPRETATION:")
                 # if alpha_rel > 0.3:
@@ -728,21 +511,22 @@ def onRaw(raw):
                 # print(f"===================================\n")
                 
             except Exception as e:
-                print(f"Analysis error: {e}")
+                signal_log.warning("Analysis error: %s", e)
         else:
-            print(f"Need {512 - len(live_data_buffer)} more samples for analysis")
-            print(f"===================================\n")
+            signal_log.debug("Need %d more samples for analysis", 512 - len(live_data_buffer))
+
+raw_batcher.subscribe(onRawBatch)
 
 def onEEG(data):
-    print("EEG -> attention:", data.attention, "meditation:", data.meditation)
+    serial_log.debug("EEG -> attention: %s meditation: %s", data.attention, data.meditation)
 
 def onExtendEEG(data):
     try:
         battery_val = getattr(data, 'battery', None)
         firmware = getattr(data, 'version', None)
-        print("Extended EEG -> battery:", battery_val, "version:", firmware)
+        serial_log.debug("Extended EEG -> battery: %s version: %s", battery_val, firmware)
     except Exception:
-        print("Extended EEG packet received")
+        serial_log.debug("Extended EEG packet received")
 
     window_ref = None
     if 'BrainLinkAnalyzerWindow' in globals():
@@ -762,10 +546,10 @@ def onExtendEEG(data):
                 pass
 
 def onGyro(x, y, z):
-    print(f"Gyro -> x={x}, y={y}, z={z}")
+    serial_log.debug("Gyro -> x=%s, y=%s, z=%s", x, y, z)
 
 def onRR(rr1, rr2, rr3):
-    print(f"RR -> rr1={rr1}, rr2={rr2}, rr3={rr3}")
+    serial_log.debug("RR -> rr1=%s, rr2=%s, rr3=%s", rr1, rr2, rr3)
 
 def run_brainlink(serial_obj):
     """MindLink thread function from mother code"""
@@ -776,7 +560,7 @@ def run_brainlink(serial_obj):
 
     @serial_obj.on_message()
     def handle_serial_message(msg: bytes):
-        print(f"Received message: {len(msg)} bytes")
+        serial_log.debug("Received message: %d bytes", len(msg))
         parser.parse(msg)
 
     try:
@@ -787,11 +571,15 @@ def run_brainlink(serial_obj):
         return
         
     try:
+        # Wake often enough to enforce the raw batch latency bound if the stream pauses
+        poll_s = min(1.0, max(0.01, raw_batcher.max_latency_s))
         while not stop_thread_flag:
-            time.sleep(1)
+            time.sleep(poll_s)
+            raw_batcher.flush_if_stale()
     except KeyboardInterrupt:
         print("Exiting MindLink thread (KeyboardInterrupt).")
     finally:
+        raw_batcher.flush()
         if serial_obj.is_open:
             serial_obj.close()
         print("Serial closed. Thread exiting.")
@@ -987,236 +775,6 @@ class LoginDialog(QDialog):
             self.settings.remove("password")
         return self.username_edit.text(), self.password_edit.text()
 
-# --- Feature Analysis Engine ---
-class FeatureAnalysisEngine:
-    def __init__(self):
-        self.fs = 512  # Corrected sampling rate
-        self.window_size = 1.0
-        self.overlap = 0.5
-        self.window_samples = int(self.window_size * self.fs)
-        
-        # Data buffers
-        self.raw_buffer = deque(maxlen=self.fs * 10)
-        self.filtered_buffers = {band: deque(maxlen=self.fs * 10) for band in EEG_BANDS}
-        self.power_buffers = {band: deque(maxlen=self.fs * 10) for band in EEG_BANDS}
-        
-        # Calibration data storage
-        self.calibration_data = {
-            'eyes_closed': {'features': [], 'timestamps': []},
-            'eyes_open': {'features': [], 'timestamps': []},
-            'task': {'features': [], 'timestamps': []}
-        }
-        
-        # Current state
-        self.current_state = 'idle'
-        self.current_task = None
-        self.state_start_time = None
-        
-        # Analysis results
-        self.baseline_stats = {}
-        self.analysis_results = {}
-        
-        # Real-time features
-        self.latest_features = {}
-    
-    def reset_session(self):
-        """Clear all accumulated data for new session"""
-        # Clear data buffers
-        self.raw_buffer.clear()
-        for band in self.filtered_buffers:
-            self.filtered_buffers[band].clear()
-        for band in self.power_buffers:
-            self.power_buffers[band].clear()
-        
-        # Clear calibration data
-        self.calibration_data = {
-            'eyes_closed': {'features': [], 'timestamps': []},
-            'eyes_open': {'features': [], 'timestamps': []},
-            'task': {'features': [], 'timestamps': []}
-        }
-        
-        # Reset state
-        self.current_state = 'idle'
-        self.current_task = None
-        self.state_start_time = None
-        
-        # Clear analysis results
-        self.baseline_stats = {}
-        self.analysis_results = {}
-        self.latest_features = {}
-        
-        print("✓ Feature engine session reset complete")
-        
-    def add_data(self, new_data):
-        """Add new EEG data and process it"""
-        if np.isscalar(new_data):
-            new_data = np.array([new_data])
-        else:
-            new_data = np.array(new_data)
-        
-        self.raw_buffer.extend(new_data)
-        
-        # Process if we have enough data
-        if len(self.raw_buffer) >= self.window_samples:
-            window_data = np.array(list(self.raw_buffer)[-self.window_samples:])
-            features = self.extract_features(window_data)
-            
-            # Store latest features
-            self.latest_features = features
-            
-            # Store based on current state
-            if self.current_state in ['eyes_closed', 'eyes_open', 'task']:
-                self.calibration_data[self.current_state]['features'].append(features)
-                self.calibration_data[self.current_state]['timestamps'].append(time.time())
-            
-            return features
-        return None
-    
-    def extract_features(self, window_data):
-        """Extract comprehensive features from EEG data"""
-        features = {}
-        
-        # Remove DC component
-        window_data = window_data - np.mean(window_data)
-        
-        # Apply notch filter for line noise
-        try:
-            window_data = notch_filter(window_data, self.fs, notch_freq=50.0)
-        except:
-            pass
-        
-        # Compute PSD
-        freqs, psd = compute_psd(window_data, self.fs)
-        
-        # Total EEG power via variance of the signal (matching BrainCompanion_updated.py)
-        total_power = np.var(window_data)
-        
-        # Calculate band powers
-        band_powers = {}
-        for band_name in EEG_BANDS:
-            power = bandpower(psd, freqs, band_name)
-            band_powers[band_name] = power
-            features[f'{band_name}_power'] = power
-            
-            # Relative power
-            rel_power = power / total_power if total_power > 0 else 0
-            features[f'{band_name}_relative'] = rel_power
-            
-            # Peak frequency and amplitude
-            low, high = EEG_BANDS[band_name]
-            band_mask = (freqs >= low) & (freqs <= high)
-            if np.any(band_mask):
-                band_freqs = freqs[band_mask]
-                band_psd = psd[band_mask]
-                
-                if len(band_psd) > 0:
-                    peak_idx = np.argmax(band_psd)
-                    features[f'{band_name}_peak_freq'] = band_freqs[peak_idx]
-                    features[f'{band_name}_peak_amp'] = band_psd[peak_idx]
-                else:
-                    features[f'{band_name}_peak_freq'] = (low + high) / 2
-                    features[f'{band_name}_peak_amp'] = 0
-            else:
-                features[f'{band_name}_peak_freq'] = (low + high) / 2
-                features[f'{band_name}_peak_amp'] = 0
-        
-        # Compute ratios
-        features['alpha_theta_ratio'] = band_powers.get('alpha', 0) / (band_powers.get('theta', 0) + 1e-10)
-        features['beta_alpha_ratio'] = band_powers.get('beta', 0) / (band_powers.get('alpha', 0) + 1e-10)
-        features['total_power'] = total_power
-        
-        return features
-    
-    def start_calibration_phase(self, phase_name, task_type=None):
-        """Start calibration phase"""
-        self.current_state = phase_name
-        self.current_task = task_type
-        self.state_start_time = time.time()
-        
-        # Clear existing data
-        self.calibration_data[phase_name]['features'] = []
-        self.calibration_data[phase_name]['timestamps'] = []
-        
-        print(f"Started calibration phase: {phase_name}")
-        if task_type:
-            print(f"Task: {AVAILABLE_TASKS[task_type]['name']}")
-            print(f"Instructions: {AVAILABLE_TASKS[task_type]['instructions']}")
-    
-    def stop_calibration_phase(self):
-        """Stop calibration phase"""
-        if self.current_state != 'idle':
-            duration = time.time() - self.state_start_time
-            num_features = len(self.calibration_data[self.current_state]['features'])
-            
-            print(f"Stopped calibration phase: {self.current_state}")
-            print(f"Duration: {duration:.1f}s, Features collected: {num_features}")
-            
-            self.current_state = 'idle'
-            self.current_task = None
-            self.state_start_time = None
-    
-    def compute_baseline_statistics(self):
-        """Compute baseline statistics"""
-        baseline_features = []
-        baseline_features.extend(self.calibration_data['eyes_closed']['features'])
-        baseline_features.extend(self.calibration_data['eyes_open']['features'])
-        
-        if len(baseline_features) == 0:
-            return
-        
-        df = pd.DataFrame(baseline_features)
-        self.baseline_stats = {}
-        
-        for feature in FEATURE_NAMES:
-            if feature in df.columns:
-                values = df[feature].values
-                self.baseline_stats[feature] = {
-                    'mean': np.mean(values),
-                    'std': np.std(values),
-                    'min': np.min(values),
-                    'max': np.max(values),
-                    'median': np.median(values),
-                    'q25': np.percentile(values, 25),
-                    'q75': np.percentile(values, 75)
-                }
-        
-        print(f"Baseline statistics computed for {len(self.baseline_stats)} features")
-    
-    def analyze_task_data(self):
-        """Analyze task data against baseline"""
-        if not self.baseline_stats:
-            return
-        
-        task_features = self.calibration_data['task']['features']
-        if len(task_features) == 0:
-            return
-        
-        task_df = pd.DataFrame(task_features)
-        self.analysis_results = {}
-        
-        for feature in FEATURE_NAMES:
-            if feature in task_df.columns and feature in self.baseline_stats:
-                task_values = task_df[feature].values
-                baseline_mean = self.baseline_stats[feature]['mean']
-                baseline_std = self.baseline_stats[feature]['std']
-                
-                z_scores = (task_values - baseline_mean) / (baseline_std + 1e-10)
-                outliers = np.abs(z_scores) > 2
-                
-                self.analysis_results[feature] = {
-                    'task_mean': np.mean(task_values),
-                    'task_std': np.std(task_values),
-                    'baseline_mean': baseline_mean,
-                    'baseline_std': baseline_std,
-                    'z_scores': z_scores,
-                    'outliers': outliers,
-                    'outlier_percentage': np.sum(outliers) / len(outliers) * 100,
-                    'significant_change': abs(np.mean(task_values) - baseline_mean) > 2 * baseline_std
-                }
-        
-        print(f"Task analysis completed for {len(self.analysis_results)} features")
-        return self.analysis_results
-
 # --- Main Window ---
 class BrainLinkAnalyzerWindow(QMainWindow):
     battery_update = Signal(object, object)
@@ -3801,6 +3359,10 @@ class BrainLinkAnalyzerWindow(QMainWindow):
             self.close_task_interface()
         except Exception:
             pass
+        try:
+            PIPELINE_LATENCY.end_session()
+        except Exception:
+            pass
         super().closeEvent(event)
 
     def show_task_interface(self, task_type):
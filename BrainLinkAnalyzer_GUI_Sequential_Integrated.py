@@ -14,6 +14,12 @@ import sys
 import platform
 import time
 import atexit
+
+# BL_IMPORT_PROFILE=1 records every import from here on; the tree is printed
+# when the first dialog appears (see utils/import_profile.py)
+from utils import import_profile
+
+import logging
 import numpy as np
 
 # Global reference for cleanup
@@ -67,25 +73,31 @@ def play_beep(frequency=800, duration_ms=200):
         return
     
     try:
-        # Generate sine wave for beep
-        sample_rate = 22050
-        duration_s = duration_ms / 1000.0
-        num_samples = int(sample_rate * duration_s)
-        
-        # Create sine wave array
-        samples = np.sin(2 * np.pi * frequency * np.linspace(0, duration_s, num_samples))
-        # Normalize to 16-bit range
-        samples = (samples * 32767).astype(np.int16)
-        
-        # Create stereo sound (duplicate mono to both channels)
-        stereo_samples = np.column_stack((samples, samples))
-        
-        # Play the beep
-        sound = pygame.mixer.Sound(buffer=stereo_samples)
-        sound.play()
+        # Rendered once per frequency/duration by the cue bank, then reused
+        from utils.audio_cues import CUE_BANK
+        CUE_BANK.load()
+        CUE_BANK.play_tone(frequency, duration_ms)
     except Exception as e:
         print(f"Warning: Could not play beep: {e}")
 
+def play_cue(name, engine=None):
+    """Play a pre-rendered cue pattern (utils.audio_cues) without blocking.
+    
+    The playback timestamp is logged by the cue bank and, if ``engine`` keeps
+    phase markers (offline engine), stored next to them. Only cues announcing
+    a phase start are timed against the engine's current phase start.
+    """
+    try:
+        from utils.audio_cues import CUE_BANK, PHASE_START_CUES
+        if AUDIO_AVAILABLE:
+            CUE_BANK.load()
+        marker_time = getattr(engine, 'phase_start_time', None) if name in PHASE_START_CUES else None
+        event = CUE_BANK.play(name, marker_time=marker_time)
+        if hasattr(engine, 'record_cue'):
+            engine.record_cue(event)
+    except Exception as e:
+        print(f"Warning: Could not play cue '{name}': {e}")
+
 def cleanup_and_quit():
     """Properly cleanup device connections and trigger main window close"""
     from PySide6.QtCore import QTimer
@@ -129,49 +141,79 @@ from BrainLinkAnalyzer_GUI_Enhanced import (
 
 # Import signal quality check functions from base GUI
 import BrainLinkAnalyzer_GUI as BaseGUI
+from utils.multichannel_quality import (
+    as_samples_by_channels,
+    multichannel_quality_metrics,
+    score_bins,
+)
+from utils.plot_decimation import MinMaxDecimator, plot_columns
+from utils.bl_log import get_logger
+from utils.lazy_import import LAZY_IMPORTS, module_available
+from utils.pipeline_latency import PIPELINE_LATENCY
+from brainlink_core.warmup import WarmupService, synthetic_eeg
+from utils.api_client import ApiError, get_client as get_api_client
+from utils.report_outbox import ReportOutbox, owner_id
+from utils.media_cache import MEDIA_CACHE
 
-# Try to import enhanced 64-channel analysis engine for ANT Neuro
+plot_log = get_logger("plot")
+
+# Enhanced (live) and OFFLINE 64-channel analysis engines for ANT Neuro. They are
+# only needed once ANT Neuro is selected, so in lazy startup mode (default,
+# BL_LAZY_IMPORTS=0 disables) they are imported by _load_64ch_engines() on first use.
 ENHANCED_64CH_AVAILABLE = False
 Enhanced64ChannelEngine = None
 create_enhanced_engine = None
-
-try:
-    from antNeuro.enhanced_multichannel_analysis import Enhanced64ChannelEngine, create_enhanced_engine  # type: ignore
-    ENHANCED_64CH_AVAILABLE = True
-    print("✓ Enhanced 64-channel analysis engine loaded for ANT Neuro")
-except ImportError as e:
-    ENHANCED_64CH_AVAILABLE = False
-    Enhanced64ChannelEngine = None
-    create_enhanced_engine = None
-    print(f"⚠ Enhanced 64-channel engine not available: {e}")
-except Exception as e:
-    ENHANCED_64CH_AVAILABLE = False
-    Enhanced64ChannelEngine = None
-    create_enhanced_engine = None
-    print(f"⚠ Error loading enhanced 64-channel engine: {e}")
-
-# Try to import OFFLINE 64-channel analysis engine (no live processing)
 OFFLINE_64CH_AVAILABLE = False
 OfflineMultichannelEngine = None
 create_offline_engine = None
+_64CH_ENGINES_LOADED = False
 
-try:
-    from antNeuro.offline_multichannel_analysis import OfflineMultichannelEngine, create_offline_engine  # type: ignore
-    OFFLINE_64CH_AVAILABLE = True
-    print("✓ Offline 64-channel analysis engine loaded for ANT Neuro")
-except ImportError as e:
-    OFFLINE_64CH_AVAILABLE = False
-    OfflineMultichannelEngine = None
-    create_offline_engine = None
-    print(f"⚠ Offline 64-channel engine not available: {e}")
-except Exception as e:
-    OFFLINE_64CH_AVAILABLE = False
-    OfflineMultichannelEngine = None
-    create_offline_engine = None
-    print(f"⚠ Error loading offline 64-channel engine: {e}")
-
-
-def assess_eeg_signal_quality(data_window, fs=512):
+
+def _load_64ch_engines():
+    """Import the 64-channel engines (once) and set the *_64CH_AVAILABLE flags."""
+    global ENHANCED_64CH_AVAILABLE, Enhanced64ChannelEngine, create_enhanced_engine
+    global OFFLINE_64CH_AVAILABLE, OfflineMultichannelEngine, create_offline_engine, _64CH_ENGINES_LOADED
+    if _64CH_ENGINES_LOADED:
+        return
+    _64CH_ENGINES_LOADED = True
+
+    try:
+        from antNeuro.enhanced_multichannel_analysis import Enhanced64ChannelEngine, create_enhanced_engine  # type: ignore
+        ENHANCED_64CH_AVAILABLE = True
+        print("✓ Enhanced 64-channel analysis engine loaded for ANT Neuro")
+    except ImportError as e:
+        ENHANCED_64CH_AVAILABLE = False
+        Enhanced64ChannelEngine = None
+        create_enhanced_engine = None
+        print(f"⚠ Enhanced 64-channel engine not available: {e}")
+    except Exception as e:
+        ENHANCED_64CH_AVAILABLE = False
+        Enhanced64ChannelEngine = None
+        create_enhanced_engine = None
+        print(f"⚠ Error loading enhanced 64-channel engine: {e}")
+
+    # OFFLINE 64-channel analysis engine (no live processing)
+    try:
+        from antNeuro.offline_multichannel_analysis import OfflineMultichannelEngine, create_offline_engine  # type: ignore
+        OFFLINE_64CH_AVAILABLE = True
+        print("✓ Offline 64-channel analysis engine loaded for ANT Neuro")
+    except ImportError as e:
+        OFFLINE_64CH_AVAILABLE = False
+        OfflineMultichannelEngine = None
+        create_offline_engine = None
+        print(f"⚠ Offline 64-channel engine not available: {e}")
+    except Exception as e:
+        OFFLINE_64CH_AVAILABLE = False
+        OfflineMultichannelEngine = None
+        create_offline_engine = None
+        print(f"⚠ Error loading offline 64-channel engine: {e}")
+
+
+if not LAZY_IMPORTS:
+    _load_64ch_engines()
+
+
+def assess_eeg_signal_quality(data_window, fs=512, spectrum=None):
     """
     Professional multi-metric EEG signal quality assessment.
     
@@ -186,6 +228,8 @@ def assess_eeg_signal_quality(data_window, fs=512):
     3. Spectral slope (1/f characteristic) - real EEG has negative slope
     4. Amplitude checks and artifact detection
     
+    Pass ``spectrum=(freqs, psd)`` to reuse a PSD already computed for this window.
+    
     Returns: (quality_score: 0-100, status: str, details: dict)
     """
     arr = np.array(data_window)
@@ -213,7 +257,7 @@ def assess_eeg_signal_quality(data_window, fs=512):
     # environmental noise when not worn can have high amplitude
     # ===================================================================
     try:
-        freqs, psd = BaseGUI.compute_psd(arr, fs)
+        freqs, psd = spectrum if spectrum is not None else BaseGUI.compute_psd(arr, fs)
         total_power = np.sum(psd) + 1e-12
         
         # Band power calculations
@@ -379,10 +423,52 @@ def assess_eeg_signal_quality(data_window, fs=512):
     return quality_score, status, details
 
 
+# Live quality is re-evaluated once per hop of new samples (1/8 s at 512 Hz)
+QUALITY_HOP_SAMPLES = 64
+
+
+def assess_live_signal_quality(data_buffer, sample_rate):
+    """Signal quality of the latest second of ``data_buffer``, shared across consumers.
+
+    The live plot, calibration timers and status bar all poll the same
+    MindLink buffer. Results come from ``BaseGUI.spectral_cache`` keyed by
+    the hop-aligned end sample, so the Welch PSD and the quality heuristics
+    run once per hop regardless of how many timers ask. Other buffers (and
+    buffers still filling up) are assessed directly.
+
+    Returns ``(quality_score, status, details)`` like assess_eeg_signal_quality.
+    """
+    window, end_index = None, None
+    if data_buffer is BaseGUI.live_data_buffer:
+        window, end_index = BaseGUI.live_window(data_buffer, sample_rate, BaseGUI.raw_samples_received,
+                                                hop=QUALITY_HOP_SAMPLES)
+    if window is None:
+        return assess_eeg_signal_quality(np.array(list(data_buffer)[-sample_rate:]), fs=sample_rate)
+    cache = BaseGUI.spectral_cache
+
+    def _assess():
+        spectrum = cache.psd(window, sample_rate, buffer_id=id(data_buffer), end_index=end_index)
+        return assess_eeg_signal_quality(window, fs=sample_rate, spectrum=spectrum)
+
+    return cache.get_or_compute((id(data_buffer), end_index, sample_rate, sample_rate, 'quality'), _assess)
+
+
 # ============================================================================
 # MULTI-CHANNEL SIGNAL QUALITY ASSESSMENT (for 64-channel ANT Neuro)
 # ============================================================================
 
+def _warm_signal_quality(profile):
+    """Warm-up step: one single-channel quality check on synthetic EEG."""
+    fs = profile['sample_rate']
+    assess_eeg_signal_quality(synthetic_eeg(2 * fs, 1, fs)[:, 0], fs=fs)
+
+
+def _warm_multichannel_signal_quality(profile):
+    """Warm-up step: one 64-channel quality check on synthetic EEG."""
+    fs = profile['sample_rate']
+    assess_multichannel_signal_quality(synthetic_eeg(2 * fs, profile['channels'], fs), fs=fs)
+
+
 def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=None):
     """
     Comprehensive multi-channel EEG signal quality assessment for 64-channel systems.
@@ -418,9 +504,6 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
         - regional_scores: dict of region -> score
         - issues: list of detected issues
     """
-    from scipy import signal as scipy_signal
-    from scipy.stats import kurtosis, zscore
-    
     # Default 64-channel names for ANT Neuro eego SDK
     # SDK provides channels 0-63 as EEG reference channels
     # Channels 64-87 are bipolar auxiliary channels (not used in quality assessment)
@@ -438,13 +521,8 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
     }
     
     # Ensure data is in (samples, channels) format
-    data = np.array(multichannel_data)
-    if data.ndim == 1:
-        data = data.reshape(-1, 1)
-    
     # Auto-detect orientation: if first dim is small (like 64), transpose
-    if data.shape[0] < data.shape[1] and data.shape[0] <= 128:
-        data = data.T
+    data = as_samples_by_channels(multichannel_data)
     
     n_samples, n_channels = data.shape
     
@@ -474,71 +552,39 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
     
     # ===================================================================
     # FAST PER-CHANNEL QUALITY ASSESSMENT
-    # Uses simple time-domain metrics for speed (no PSD computation)
+    # Uses simple time-domain metrics for speed (no PSD computation),
+    # computed for all channels at once
     # ===================================================================
-    channel_scores = []
-    
-    for ch_idx in range(n_channels):
-        ch_name = channel_names[ch_idx]
-        ch_data = data[:, ch_idx]
-        
-        ch_score = 100
-        ch_status = "good"
-        
-        # 1. Check for flat signal (disconnected electrode)
-        ch_std = np.std(ch_data)
-        if ch_std < 1.0:
-            ch_score = 5
-            ch_status = "flat"
-            details['flat_channels'].append(ch_name)
-            details['bad_channels'].append(ch_name)
-            details['per_channel_scores'][ch_name] = ch_score
-            details['per_channel_status'][ch_name] = ch_status
-            channel_scores.append(ch_score)
-            continue  # Skip further analysis for flat channels
-        
-        # 2. Check for excessive amplitude (saturation or major artifact)
-        ch_max = np.max(np.abs(ch_data))
-        if ch_max > 1000:  # Saturated
-            ch_score = 10
-            ch_status = "saturated"
-            details['artifact_channels'].append(ch_name)
-        elif ch_max > 500:  # High amplitude artifact
-            ch_score = 30
-            ch_status = "artifact"
-            details['artifact_channels'].append(ch_name)
-        elif ch_max > 200:  # Minor artifact
-            ch_score -= 20
-        
-        # 3. Fast noise check using standard deviation
-        # Good EEG signal typically has std between 10-100 µV
-        if ch_std > 200:  # Very noisy
-            ch_score -= 30
-            details['noisy_channels'].append(ch_name)
-        elif ch_std > 100:  # Noisy
-            ch_score -= 15
-            details['noisy_channels'].append(ch_name)
-        elif ch_std < 5:  # Very low variance (poor contact)
-            ch_score -= 25
-        
-        # Clamp score
-        ch_score = max(0, min(100, ch_score))
-        
-        # Update status based on final score
-        if ch_score < 30:
-            ch_status = "bad"
-            if ch_name not in details['bad_channels']:
-                details['bad_channels'].append(ch_name)
-        elif ch_score < 50:
-            ch_status = "poor"
-        elif ch_score < 70:
-            ch_status = "acceptable"
-        else:
-            ch_status = "good"
-        
-        details['per_channel_scores'][ch_name] = ch_score
-        details['per_channel_status'][ch_name] = ch_status
-        channel_scores.append(ch_score)
+    metrics = multichannel_quality_metrics(data, fs, spectral=False, spike_window_s=None)
+    ch_std = metrics['std']
+    ch_max = metrics['max_abs']
+    
+    # 1. Flat signal (disconnected electrode): fixed score, no further checks
+    flat = ch_std < 1.0
+    
+    # 2. Excessive amplitude (saturation or major artifact)
+    saturated = ~flat & (ch_max > 1000)
+    artifact = ~flat & ~saturated & (ch_max > 500)
+    scores = np.select([saturated, artifact], [10, 30], default=100)
+    scores = scores - np.where(~saturated & ~artifact & (ch_max > 200), 20, 0)  # Minor artifact
+    
+    # 3. Fast noise check using standard deviation
+    # Good EEG signal typically has std between 10-100 µV
+    very_noisy = ch_std > 200
+    noisy = ~very_noisy & (ch_std > 100)
+    scores = scores - np.select([very_noisy, noisy, ch_std < 5], [30, 15, 25], default=0)
+    
+    # Clamp score, then derive status from the final score
+    scores = np.where(flat, 5, np.clip(scores, 0, 100))
+    statuses = np.where(flat, 'flat', score_bins(scores))
+    
+    channel_scores = [int(s) for s in scores]
+    details['per_channel_scores'] = dict(zip(channel_names, channel_scores))
+    details['per_channel_status'] = dict(zip(channel_names, statuses.tolist()))
+    details['flat_channels'] = [channel_names[i] for i in np.flatnonzero(flat)]
+    details['bad_channels'] = [channel_names[i] for i in np.flatnonzero(flat | (scores < 30))]
+    details['noisy_channels'] = [channel_names[i] for i in np.flatnonzero(~flat & (very_noisy | noisy))]
+    details['artifact_channels'] = [channel_names[i] for i in np.flatnonzero(saturated | artifact)]
     
     # ===================================================================
     # REGIONAL QUALITY ASSESSMENT
@@ -817,6 +863,16 @@ class MindLinkStatusBar(QFrame):
         self.signal_quality = QLabel("Signal: Checking...")
         layout.addWidget(self.signal_quality)
         
+        # Pipeline latency (end-to-end p50/p95 and slowest stage; full table in tooltip)
+        self.latency_label = QLabel("⏱ --")
+        self.latency_label.setVisible(PIPELINE_LATENCY.enabled)
+        layout.addWidget(self.latency_label)
+        
+        # Report outbox (pending / sent seeding uploads); hidden while empty
+        self.outbox_label = QLabel("")
+        self.outbox_label.setVisible(False)
+        layout.addWidget(self.outbox_label)
+        
         # Channel quality viewer button (for multi-channel devices)
         device_type = getattr(main_window, 'device_type', 'mindlink')
         if device_type == 'antneuro':
@@ -894,8 +950,6 @@ class MindLinkStatusBar(QFrame):
             
             # Professional multi-metric signal quality assessment (same as LiveEEGDialog)
             if len(data_buffer) >= sample_rate:
-                recent_data = np.array(list(data_buffer)[-sample_rate:])
-                
                 # Use multi-channel assessment for ANT Neuro device
                 device_type = getattr(self.main_window, 'device_type', 'mindlink')
                 
@@ -905,7 +959,7 @@ class MindLinkStatusBar(QFrame):
                     self.signal_quality.setStyleSheet("")
                 else:
                     # Single-channel MindLink assessment
-                    quality_score, status, details = assess_eeg_signal_quality(recent_data, fs=sample_rate)
+                    quality_score, status, details = assess_live_signal_quality(data_buffer, sample_rate)
                 
                     # Debug output - print every 5 seconds (timer is 500ms)
                     if not hasattr(self, '_debug_counter'):
@@ -929,6 +983,15 @@ class MindLinkStatusBar(QFrame):
             else:
                 self.signal_quality.setText("Signal: Waiting...")
                 self.signal_quality.setStyleSheet("color: #94a3b8; font-weight: 700;")
+            
+            if PIPELINE_LATENCY.enabled:
+                self.latency_label.setText(PIPELINE_LATENCY.panel_text())
+                self.latency_label.setToolTip("\n".join(PIPELINE_LATENCY.report_lines()) or "No samples yet")
+            
+            outbox = getattr(self.main_window, 'report_outbox', None)
+            outbox_text = outbox.status_text() if outbox is not None else ""
+            self.outbox_label.setText(outbox_text)
+            self.outbox_label.setVisible(bool(outbox_text))
         except Exception as e:
             print(f"Warning: Error updating status: {e}")
             import traceback
@@ -964,6 +1027,12 @@ class MindLinkStatusBar(QFrame):
             self.channel_quality_dialog.close()
 
 
+def _latency_footer():
+    """Pipeline latency table for the end of text reports (empty if nothing was recorded)."""
+    lines = PIPELINE_LATENCY.report_lines()
+    return ([""] + lines) if lines else []
+
+
 def add_status_bar_to_dialog(dialog: QDialog, main_window) -> MindLinkStatusBar:
     """Helper to add MindLink status bar to any dialog"""
     # Get the dialog's main layout
@@ -1296,10 +1365,9 @@ class HelpDialog(QDialog):
                 try:
                     img_full_path = BL.resource_path(f"assets/{image_path}")
                     if os.path.isfile(img_full_path):
-                        pixmap = QtGui.QPixmap(img_full_path)
-                        if not pixmap.isNull():
-                            # Scale image to fit the right column (1/3 of previous size)
-                            scaled_pixmap = pixmap.scaledToWidth(167, Qt.SmoothTransformation)
+                        # Scale image to fit the right column (1/3 of previous size); decoded once per run
+                        scaled_pixmap = MEDIA_CACHE.pixmap(image_path, 167, mode='width')
+                        if not scaled_pixmap.isNull():
                             img_label = QLabel()
                             img_label.setPixmap(scaled_pixmap)
                             img_label.setAlignment(Qt.AlignTop | Qt.AlignCenter)
@@ -1973,15 +2041,33 @@ except ImportError as e:
     print(f"⚠ ANT Neuro eego SDK not available: {e}")
     print("  Will try EDI2 gRPC API instead.")
 
-# EDI2 gRPC API - Modern alternative that solves power state issues
+# EDI2 gRPC API - Modern alternative that solves power state issues.
+# The gRPC stubs are imported by _load_edi2_client() on first scan/connect in lazy
+# startup mode; until then availability is whether the client module is installed.
 EDI2_AVAILABLE = False
 EDI2Client = None
-try:
-    from antNeuro.edi2_client import EDI2Client
-    EDI2_AVAILABLE = True
-    print("✓ ANT Neuro EDI2 gRPC client loaded successfully")
-except ImportError as e:
-    print(f"⚠ EDI2 client not available: {e}")
+_EDI2_LOADED = False
+
+
+def _load_edi2_client() -> bool:
+    """Import the EDI2 gRPC client (once); returns EDI2_AVAILABLE."""
+    global EDI2_AVAILABLE, EDI2Client, _EDI2_LOADED
+    if not _EDI2_LOADED:
+        _EDI2_LOADED = True
+        try:
+            from antNeuro.edi2_client import EDI2Client
+            EDI2_AVAILABLE = True
+            print("✓ ANT Neuro EDI2 gRPC client loaded successfully")
+        except ImportError as e:
+            EDI2_AVAILABLE = False
+            print(f"⚠ EDI2 client not available: {e}")
+    return EDI2_AVAILABLE
+
+
+if LAZY_IMPORTS:
+    EDI2_AVAILABLE = module_available('antNeuro.edi2_client')
+else:
+    _load_edi2_client()
 
 
 class AntNeuroDeviceManager:
@@ -2011,6 +2097,7 @@ class AntNeuroDeviceManager:
         import threading
         self.live_data_buffer = deque(maxlen=5120)
         self.multichannel_buffer = deque(maxlen=5120)
+        self.samples_received = 0  # Absolute sample count (aligns plot decimation columns)
         
         # Threading
         self.stream_thread = None
@@ -2034,7 +2121,7 @@ class AntNeuroDeviceManager:
         Returns real devices if found. Only returns demo device if NO real devices detected.
         """
         # Try EDI2 first (modern API, no power blocking)
-        if self.use_edi2 and EDI2_AVAILABLE:
+        if self.use_edi2 and _load_edi2_client():
             try:
                 print("[ANT NEURO] Scanning with EDI2 gRPC API...")
                 if self.edi2_client is None:
@@ -2090,7 +2177,7 @@ class AntNeuroDeviceManager:
             return True
         
         # Try EDI2 first (modern API, no power blocking)
-        if self.use_edi2 and EDI2_AVAILABLE:
+        if self.use_edi2 and _load_edi2_client():
             try:
                 print(f"[ANT NEURO CONNECT] Using EDI2 gRPC API...")
                 if self.edi2_client is None:
@@ -2207,8 +2294,8 @@ class AntNeuroDeviceManager:
                     
                     # Batch append to buffers (much faster than per-sample)
                     self.live_data_buffer.extend(primary_values)
-                    for sample in data_uv:
-                        self.multichannel_buffer.append(sample)
+                    self.multichannel_buffer.extend(data_uv)
+                    self.samples_received += len(data_uv)
                     
                     # Only feed to feature engine during calibration/task phases
                     # Pass FULL multi-channel data for 64-channel feature extraction
@@ -2423,8 +2510,8 @@ class AntNeuroDeviceManager:
                     # Batch processing for efficiency
                     primary_values = samples[:, primary_ch_idx]
                     self.live_data_buffer.extend(primary_values)
-                    for sample in samples:
-                        self.multichannel_buffer.append(sample)
+                    self.multichannel_buffer.extend(samples)
+                    self.samples_received += len(samples)
                     
                     # Batch feed FULL multi-channel data to feature engine during calibration/task
                     if self.feature_engine is not None:
@@ -2464,8 +2551,8 @@ class AntNeuroDeviceManager:
             # Batch append
             primary_values = samples[:, primary_ch_idx]
             self.live_data_buffer.extend(primary_values)
-            for sample in samples:
-                self.multichannel_buffer.append(sample)
+            self.multichannel_buffer.extend(samples)
+            self.samples_received += len(samples)
             
             # Batch feed FULL multi-channel data to feature engine during calibration/task
             if self.feature_engine is not None:
@@ -2626,6 +2713,8 @@ class WorkflowManager:
         dialog.show()  # Use show() instead of exec() to keep event loop running
         dialog.raise_()
         dialog.activateWindow()
+        # Time-to-first-dialog mark (import tree / startup probe); no-op after the first call
+        QTimer.singleShot(0, import_profile.first_dialog_shown)
     
     def _show_device_type_selection(self):
         dialog = DeviceTypeSelectionDialog(self)
@@ -2978,6 +3067,11 @@ class DeviceTypeSelectionDialog(QDialog):
         self.workflow.main_window.device_type = device_type
         print(f"✓ Selected device type: {device_type}")
         
+        # Warm the kernels for this device's sample rate while the next steps are open
+        warmup = getattr(self.workflow.main_window, 'warmup', None)
+        if warmup is not None:
+            warmup.request(device_type)
+        
         # Switch to enhanced 64-channel engine if ANT Neuro selected
         if device_type == "antneuro":
             self.workflow.main_window.switch_to_enhanced_64ch_engine()
@@ -4639,6 +4733,17 @@ class PartnerIDDialog(QDialog):
 # STEP 3: LOGIN (Using REAL authentication)
 # ============================================================================
 
+class LoginSignals(QObject):
+    """Thread-safe signals for the login worker"""
+    login_succeeded = Signal(object)  # utils.api_client.LoginResult
+    login_failed = Signal(object)  # Exception (ApiError or requests exception)
+
+
+class OutboxSignals(QObject):
+    """Thread-safe signal for report outbox events"""
+    outbox_event = Signal(object)  # dict from utils.report_outbox (kind, id, response, last_error)
+
+
 class LoginDialog(QDialog):
     """Step 3: Real user authentication"""
     
@@ -4782,6 +4887,12 @@ class LoginDialog(QDialog):
         # Add MindLink status bar (includes Help button in header)
         self.status_bar = add_status_bar_to_dialog(self, self.workflow.main_window)
         self._programmatic_close = False
+        
+        # Login runs on a worker thread; results come back through these signals
+        self._login_signals = LoginSignals()
+        self._login_signals.login_succeeded.connect(self._on_login_succeeded)
+        self._login_signals.login_failed.connect(self._on_login_failed)
+        self._login_thread = None
     
     def closeEvent(self, event):
         """Handle dialog close - only trigger confirmation if user clicked X"""
@@ -4974,273 +5085,152 @@ class LoginDialog(QDialog):
         self.back_button.setEnabled(True)
     
     def _perform_login(self, username, password, login_url):
-        """Perform actual login"""
-        import requests
-        
-        login_payload = {
-            "username": username,
-            "password": password
-        }
-        
+        """Log in and fetch user data, partners and HWIDs on a worker thread"""
         print("\n" + "="*60)
         print(">>> LOGIN ATTEMPT <<<")
         print(f"URL: {login_url}")
         print(f"Username: {username}")
-        print(f"Password: {'*' * len(password)}")
-        print(f"Payload: {login_payload}")
         print("="*60 + "\n")
         
+        self.workflow.main_window.log_message(f"Connecting to {login_url}")
+        self._login_username = username
+        client = get_api_client(login_url)
+        self._login_thread = threading.Thread(
+            target=self._login_worker, args=(client, username, password), name="bl-login", daemon=True
+        )
+        self._login_thread.start()
+    
+    def _login_worker(self, client, username, password):
+        """Worker thread: pooled login plus parallel fetches; results go back via signals"""
         try:
-            self.workflow.main_window.log_message(f"Connecting to {login_url}")
-            
-            # For local development, skip SSL verification
-            is_local = "127.0.0.1" in login_url or "localhost" in login_url
-            
-            # Try with certificate verification first (skip for local)
-            try:
-                login_response = requests.post(
-                    login_url, 
-                    json=login_payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10,
-                    verify=not is_local  # Skip SSL verification for local
-                )
-                
-                print(f"Login Response Status: {login_response.status_code}")
-                print(f"Login Response Headers: {dict(login_response.headers)}")
-                print(f"Login Response Body: {login_response.text[:500]}")  # First 500 chars
-                
-            except requests.exceptions.ProxyError as e:
-                self.workflow.main_window.log_message(f"Proxy error, retrying without proxy...")
-                direct_session = requests.Session()
-                direct_session.proxies = {}
-                login_response = direct_session.post(
-                    login_url, 
-                    json=login_payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10,
-                    verify=True
-                )
-            
-            if login_response.status_code == 200:
-                data = login_response.json()
-                jwt_token = data.get("x-jwt-access-token")
-                hwid = data.get("hwid")
-                
-                if jwt_token:
-                    self.workflow.main_window.jwt_token = jwt_token
-                    self.workflow.main_window.log_message("✓ Login successful. JWT token obtained.")
-                    
-                    if hwid:
-                        self.workflow.main_window.log_message(f"✓ Hardware ID received: {hwid}")
-                        BL.ALLOWED_HWIDS = [hwid]
-                    
-                    # Fetch userData from dedicated endpoint
-                    self._fetch_user_data(jwt_token)
-                    
-                    # Fetch partners list for validation
-                    self._fetch_partners_list(jwt_token)
-                    
-                    # Fetch user HWIDs
-                    self._fetch_user_hwids(jwt_token)
-                    
-                    # Start device connection
-                    self._connect_device()
-                    
-                    self.status_label.setText("✓ Login successful. Please enter Partner ID...")
-                    self.status_label.setStyleSheet("color: #10b981; font-size: 12px; font-weight: 600;")
-                    # Hide error message on success
-                    self.error_info_label.setVisible(False)
-                    
-                    # Auto-proceed to Partner ID after 1 second
-                    QTimer.singleShot(1000, self.on_auto_next)
-                else:
-                    self.error_info_label.setText(
-                        "WARNING: AUTHENTICATION FAILED\n\n"
-                        "The login response didn't contain an authentication token.\n\n"
-                        "TO RESOLVE:\n"
-                        "1. Verify your credentials are correct\n"
-                        "2. If the problem persists, close this application\n"
-                        "3. Restart the application and try again"
-                    )
-                    self.error_info_label.setVisible(True)
-                    self.status_label.setText("Login failed. Please follow the instructions above.")
-                    self.status_label.setStyleSheet("color: #dc2626; font-size: 12px;")
-                    self.login_button.setEnabled(True)
-                    self.back_button.setEnabled(True)
-            else:
-                self.error_info_label.setText(
-                    "⚠️ AUTHENTICATION FAILED\n\n"
-                    f"Login failed with status code: {login_response.status_code}\n\n"
-                    "TO RESOLVE:\n"
-                    "1. Verify your email and password are correct\n"
-                    "2. Check your internet connection\n"
-                    "3. If the problem persists, close this application\n"
-                    "4. Restart the application and try again"
-                )
-                self.error_info_label.setVisible(True)
-                self.status_label.setText("Login failed. Please follow the instructions above.")
-                self.status_label.setStyleSheet("color: #dc2626; font-size: 12px;")
-                self.login_button.setEnabled(True)
-                self.back_button.setEnabled(True)
-                
+            result = client.login_and_fetch(username, password)
         except Exception as e:
+            self._login_signals.login_failed.emit(e)
+        else:
+            self._login_signals.login_succeeded.emit(result)
+    
+    def _on_login_succeeded(self, result):
+        """Apply the login result on the Qt thread and continue the workflow"""
+        main_window = self.workflow.main_window
+        main_window.jwt_token = result.jwt_token
+        # Spooled reports are only sent with the token of the login that queued them
+        main_window.login_owner = owner_id(getattr(self, '_login_username', '') or '')
+        main_window.log_message("✓ Login successful. JWT token obtained.")
+        if hasattr(main_window, 'report_outbox'):
+            # This login's reports spooled before a restart or a 401 go out with the new token
+            main_window.report_outbox.wake()
+        if result.hwid:
+            main_window.log_message(f"✓ Hardware ID received: {result.hwid}")
+            BL.ALLOWED_HWIDS = [result.hwid]
+        
+        self._apply_user_data(result)
+        self._apply_partners_list(result)
+        self._apply_user_hwids(result)
+        print(f"Login to ready: {result.timings.get('ready', 0.0):.0f} ms "
+              f"(login {result.timings.get('login', 0.0):.0f} ms)")
+        
+        # Start device connection
+        self._connect_device()
+        
+        self.status_label.setText("✓ Login successful. Please enter Partner ID...")
+        self.status_label.setStyleSheet("color: #10b981; font-size: 12px; font-weight: 600;")
+        # Hide error message on success
+        self.error_info_label.setVisible(False)
+        
+        # Auto-proceed to Partner ID after 1 second
+        QTimer.singleShot(1000, self.on_auto_next)
+    
+    def _on_login_failed(self, error):
+        """Show the login error on the Qt thread"""
+        if isinstance(error, ApiError) and error.kind == 'no_token':
+            self.error_info_label.setText(
+                "WARNING: AUTHENTICATION FAILED\n\n"
+                "The login response didn't contain an authentication token.\n\n"
+                "TO RESOLVE:\n"
+                "1. Verify your credentials are correct\n"
+                "2. If the problem persists, close this application\n"
+                "3. Restart the application and try again"
+            )
+            self.status_label.setText("Login failed. Please follow the instructions above.")
+        elif isinstance(error, ApiError) and error.kind == 'status':
+            self.error_info_label.setText(
+                "⚠️ AUTHENTICATION FAILED\n\n"
+                f"Login failed with status code: {error.status_code}\n\n"
+                "TO RESOLVE:\n"
+                "1. Verify your email and password are correct\n"
+                "2. Check your internet connection\n"
+                "3. If the problem persists, close this application\n"
+                "4. Restart the application and try again"
+            )
+            self.status_label.setText("Login failed. Please follow the instructions above.")
+        else:
             self.error_info_label.setText(
                 "WARNING: AUTHENTICATION ERROR\n\n"
-                f"Error: {str(e)}\n\n"
+                f"Error: {str(error)}\n\n"
                 "TO RESOLVE:\n"
                 "1. Check your internet connection\n"
                 "2. Verify your credentials are correct\n"
                 "3. If the problem persists, close this application\n"
                 "4. Restart the application and try again"
             )
-            self.error_info_label.setVisible(True)
             self.status_label.setText("Authentication error. Please follow the instructions above.")
-            self.status_label.setStyleSheet("color: #dc2626; font-size: 12px;")
-            self.login_button.setEnabled(True)
-            self.back_button.setEnabled(True)
-    
-    def _fetch_user_data(self, jwt_token):
-        """Fetch user data from /api/cas/users/current_user endpoint"""
-        import requests
-        
-        print("\n" + "="*60)
-        print(">>> _fetch_user_data CALLED <<<")
-        print("="*60)
-        
-        # Use login URL base instead of backend URL
-        # Remove /token/login from the end to get the base /api/cas
-        api_base = self.login_url.replace("/token/login", "")
-        user_data_url = f"{api_base}/users/current_user"
-        
-        print(f"API Base: {api_base}")
-        print(f"Full URL: {user_data_url}")
-        print(f"JWT Token (first 20 chars): {jwt_token[:20]}...")
-        
-        try:
-            self.workflow.main_window.log_message(f"Fetching user data from {user_data_url}")
-            
-            user_response = requests.get(
-                user_data_url,
-                headers={"X-Authorization": f"Bearer {jwt_token}"},
-                timeout=10
-            )
-            
-            print(f"Response Status Code: {user_response.status_code}")
-            print(f"Response Headers: {dict(user_response.headers)}")
-            
-            if user_response.status_code == 200:
-                response_json = user_response.json()
-                print(f"Full Response JSON: {response_json}")
-                
-                user_data = response_json.get("data", {})
-                print(f"\n>>> USER DATA EXTRACTED <<<")
-                print(user_data)
-                print("="*60 + "\n")
-                
-                self.workflow.main_window.user_data = user_data
-                self.workflow.main_window.log_message(f"✓ User data fetched successfully")
-                
-                # Log initial_protocol status for debugging
-                initial_protocol = user_data.get('initial_protocol', '')
-                if initial_protocol:
-                    self.workflow.main_window.log_message(f"✓ User has completed initial protocol: {initial_protocol}")
-                    print(f"Initial protocol found: {initial_protocol}")
-                else:
-                    self.workflow.main_window.log_message("ℹ User has not completed initial protocol yet")
-                    print("No initial_protocol found (user is new)")
-            else:
-                print(f"ERROR: Status code {user_response.status_code}")
-                print(f"Response Text: {user_response.text}")
-                self.workflow.main_window.log_message(f"Warning: Could not fetch user data (status {user_response.status_code})")
-                self.workflow.main_window.user_data = {}
-        except Exception as e:
-            print(f"EXCEPTION in _fetch_user_data: {e}")
-            import traceback
-            traceback.print_exc()
-            self.workflow.main_window.log_message(f"Error fetching user data: {e}")
-            self.workflow.main_window.user_data = {}
+        self.error_info_label.setVisible(True)
+        self.status_label.setStyleSheet("color: #dc2626; font-size: 12px;")
+        self.login_button.setEnabled(True)
+        self.back_button.setEnabled(True)
     
-    def _fetch_partners_list(self, jwt_token):
-        """Fetch the list of available partners from API"""
-        import requests
+    def _apply_user_data(self, result):
+        """Store userData from /api/cas/users/current_user"""
+        main_window = self.workflow.main_window
+        if 'user_data' in result.errors:
+            print(f"ERROR fetching user data: {result.errors['user_data']}")
+            main_window.log_message(f"Warning: Could not fetch user data ({result.errors['user_data']})")
+            main_window.user_data = {}
+            return
         
-        print("\n" + "="*60)
-        print(">>> _fetch_partners_list CALLED <<<")
-        print("="*60)
+        user_data = result.user_data
+        print(f"\n>>> USER DATA EXTRACTED <<<")
+        print(user_data)
+        print("="*60 + "\n")
         
-        # Use login URL base instead of backend URL
-        api_base = self.login_url.replace("/token/login", "")
+        main_window.user_data = user_data
+        main_window.log_message(f"✓ User data fetched successfully")
         
-        # Use 'all' to get all partner IDs regardless of region
-        region = 'all'
-        partners_url = f"{api_base}/partners/list?region={region}"
+        # Log initial_protocol status for debugging
+        initial_protocol = user_data.get('initial_protocol', '')
+        if initial_protocol:
+            main_window.log_message(f"✓ User has completed initial protocol: {initial_protocol}")
+            print(f"Initial protocol found: {initial_protocol}")
+        else:
+            main_window.log_message("ℹ User has not completed initial protocol yet")
+            print("No initial_protocol found (user is new)")
+    
+    def _apply_partners_list(self, result):
+        """Store the list of available partners for Partner ID validation"""
+        main_window = self.workflow.main_window
+        if 'partners' in result.errors:
+            print(f"ERROR fetching partners list: {result.errors['partners']}")
+            main_window.log_message(f"Warning: Could not fetch partners list ({result.errors['partners']})")
+            main_window.partners_list = []
+            return
         
-        print(f"Partners List URL: {partners_url}")
-        print(f"Region Parameter: {region}")
+        partners_list = result.partners
+        print(f"\n>>> PARTNERS LIST EXTRACTED <<<")
+        print(f"Number of partners: {len(partners_list)}")
+        for partner in partners_list[:5]:  # Show first 5 for debugging
+            print(f"  - Partner: {partner}")
+        print("="*60 + "\n")
         
-        try:
-            self.workflow.main_window.log_message(f"Fetching partners list from {partners_url}")
-            
-            partners_response = requests.get(
-                partners_url,
-                headers={"X-Authorization": f"Bearer {jwt_token}"},
-                timeout=10,
-                verify=False if "127.0.0.1" in self.login_url else True
-            )
-            
-            print(f"Response Status Code: {partners_response.status_code}")
-            
-            if partners_response.status_code == 200:
-                response_json = partners_response.json()
-                print(f"Full Response JSON: {response_json}")
-                
-                partners_list = response_json.get("partners", [])
-                print(f"\n>>> PARTNERS LIST EXTRACTED <<<")
-                print(f"Number of partners: {len(partners_list)}")
-                for partner in partners_list[:5]:  # Show first 5 for debugging
-                    print(f"  - Partner: {partner}")
-                print("="*60 + "\n")
-                
-                self.workflow.main_window.partners_list = partners_list
-                self.workflow.main_window.log_message(f"✓ Fetched {len(partners_list)} partners")
-            else:
-                print(f"ERROR: Status code {partners_response.status_code}")
-                print(f"Response Text: {partners_response.text}")
-                self.workflow.main_window.log_message(f"Warning: Could not fetch partners list (status {partners_response.status_code})")
-                self.workflow.main_window.partners_list = []
-        except Exception as e:
-            print(f"EXCEPTION in _fetch_partners_list: {e}")
-            import traceback
-            traceback.print_exc()
-            self.workflow.main_window.log_message(f"Error fetching partners list: {e}")
-            self.workflow.main_window.partners_list = []
+        main_window.partners_list = partners_list
+        main_window.log_message(f"✓ Fetched {len(partners_list)} partners")
     
-    def _fetch_user_hwids(self, jwt_token):
-        """Fetch authorized HWIDs for user"""
-        import requests
-        
-        # Use login URL base instead of backend URL
-        api_base = self.login_url.replace("/token/login", "")
-        try:
-            hwids_url = f"{api_base}/users/hwids"
-            self.workflow.main_window.log_message(f"Fetching authorized device IDs from {hwids_url}")
-            hwid_response = requests.get(
-                hwids_url,
-                headers={"X-Authorization": f"Bearer {jwt_token}"},
-                timeout=5
-            )
-            if hwid_response.status_code == 200:
-                raw_hwids = hwid_response.json().get("brainlink_hwid", [])
-                if isinstance(raw_hwids, str):
-                    BL.ALLOWED_HWIDS = [raw_hwids]
-                elif isinstance(raw_hwids, list):
-                    BL.ALLOWED_HWIDS = raw_hwids
-                else:
-                    BL.ALLOWED_HWIDS = []
-                self.workflow.main_window.log_message(f"✓ Fetched {len(BL.ALLOWED_HWIDS)} authorized device IDs")
-        except Exception as e:
-            self.workflow.main_window.log_message(f"Error fetching HWIDs: {e}")
+    def _apply_user_hwids(self, result):
+        """Store the authorized HWIDs (keeps the login HWID if the request failed)"""
+        if result.hwids is None:
+            self.workflow.main_window.log_message(f"Error fetching HWIDs: {result.errors.get('hwids')}")
+            return
+        BL.ALLOWED_HWIDS = result.hwids
+        self.workflow.main_window.log_message(f"✓ Fetched {len(BL.ALLOWED_HWIDS)} authorized device IDs")
     
     def _connect_device(self):
         """Connect to the EEG device (MindLink or ANT Neuro based on device type)"""
@@ -5504,13 +5494,14 @@ class PathwaySelectionDialog(QDialog):
 # ============================================================================
 
 class MultiChannelViewDialog(QDialog):
-    """Popup dialog showing all 64 EEG channels in an 8x8 grid layout.
+    """Popup dialog showing all 64 EEG channels stacked in one plot.
     
     Optimized for performance using:
-    - Downsampled data (100 points per channel)
-    - Batch updates (100ms interval)
-    - Minimal plot decorations
-    - Fixed Y-range (no auto-scaling)
+    - A single curve item for all channels (connect array splits the rows)
+    - Min/max envelope per pixel column (peak-preserving, incremental)
+    - Only channel rows visible in the scroll area are drawn
+    - No redraws while hidden or minimized; frame time shown in the title
+    - Fixed ranges and minimal plot decorations
     """
     
     # NA-265 waveguard net 64-channel cap electrode layout (from UDO-SM-1002rev04 datasheet)
@@ -5532,7 +5523,8 @@ class MultiChannelViewDialog(QDialog):
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self.main_window = main_window
-        self.setWindowTitle("All 64 EEG Channels - Real-Time View")
+        self._base_title = "All 64 EEG Channels - Real-Time View"
+        self.setWindowTitle(self._base_title)
         self.setModal(False)
         self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
         
@@ -5542,33 +5534,37 @@ class MultiChannelViewDialog(QDialog):
         # Set window icon
         set_window_icon(self)
         
-        # Number of channels and grid layout
+        # Number of channels and stacked layout
         self.n_channels = 64
-        self.grid_cols = 8
-        self.grid_rows = 8
+        self.channel_spacing = 200.0  # µV between trace baselines (each trace clipped to ±100 µV)
+        self.row_height = 28  # Pixels per channel row
         
         # Sample rate and display settings
         self.sample_rate = get_device_sample_rate(main_window)
-        self.display_points = 100  # Downsampled points per channel
+        self.display_points = 100  # Fallback column count before the plot is laid out
         self.window_seconds = 2.0  # Show 2 seconds of data
+        self._decimator = MinMaxDecimator()
+        self._decimated_rows = None  # (first, last) channel rows the decimator holds
         
-        # Store plot curves
-        self.curves = []
-        self.plot_widgets = []
+        # Frame timing (shown in the window title)
+        self._frame_ms = None
+        self._tick_ms = None
+        self._last_tick = None
+        self._last_title_update = 0.0
         
         # Build UI
         self._build_ui()
         
-        # Update timer - 100ms for 64 channels (10 FPS is smooth enough)
+        # Update timer - 50ms (20 FPS) with a single stacked curve item
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self._update_all_plots)
-        self.update_timer.start(100)
+        self.update_timer.start(50)
         
         # Track if closed programmatically
         self._programmatic_close = False
     
     def _build_ui(self):
-        """Build the 8x8 grid of plot widgets"""
+        """Build one stacked plot holding all channels, inside a scroll area"""
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(8, 8, 8, 8)
         main_layout.setSpacing(4)
@@ -5580,70 +5576,49 @@ class MultiChannelViewDialog(QDialog):
         main_layout.addWidget(header)
         
         # Info label
-        info = QLabel("Each plot shows 2 seconds of EEG data. Updated 10x per second. Y-axis: ±100 µV")
+        info = QLabel("Channels are stacked, 2 seconds each. Y-range per channel: ±100 µV. Scroll to see all channels.")
         info.setStyleSheet("font-size: 11px; color: #64748b; padding: 2px;")
         info.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(info)
         
-        # Scroll area for the grid (in case window is small)
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; }")
-        
-        # Grid container
-        grid_widget = QWidget()
-        grid_layout = QGridLayout(grid_widget)
-        grid_layout.setSpacing(2)
-        grid_layout.setContentsMargins(4, 4, 4, 4)
+        # Scroll area for the stacked plot; only rows in view are drawn
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setStyleSheet("QScrollArea { border: none; }")
         
-        # Create 64 mini plot widgets
+        # Single plot - minimal decorations for performance
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setBackground('#1e293b')  # Dark slate background
+        self.plot_widget.setFixedHeight(self.n_channels * self.row_height + 20)
+        self.plot_widget.hideAxis('bottom')
+        self.plot_widget.setMouseEnabled(x=False, y=False)  # Disable mouse interaction
+        self.plot_widget.setMenuEnabled(False)  # Disable right-click menu
+        self.plot_widget.hideButtons()
+        
+        # Channel names as left-axis ticks at each trace baseline
+        ticks = []
         for i in range(self.n_channels):
-            row = i // self.grid_cols
-            col = i % self.grid_cols
-            
-            # Container for each channel
-            ch_widget = QWidget()
-            ch_layout = QVBoxLayout(ch_widget)
-            ch_layout.setContentsMargins(0, 0, 0, 0)
-            ch_layout.setSpacing(0)
-            
-            # Channel label
             ch_name = self.CHANNEL_NAMES[i] if i < len(self.CHANNEL_NAMES) else f"Ch{i+1}"
-            label = QLabel(f"{i+1}. {ch_name}")
-            label.setStyleSheet("font-size: 9px; font-weight: bold; color: #374151; padding: 1px;")
-            label.setAlignment(Qt.AlignCenter)
-            label.setFixedHeight(14)
-            
-            # Mini plot widget - minimal decorations for performance
-            plot = pg.PlotWidget()
-            plot.setBackground('#1e293b')  # Dark slate background
-            plot.setFixedHeight(80)
-            plot.setMinimumWidth(150)
-            
-            # Disable all axes labels and ticks for performance
-            plot.getPlotItem().hideAxis('left')
-            plot.getPlotItem().hideAxis('bottom')
-            plot.setMouseEnabled(x=False, y=False)  # Disable mouse interaction
-            plot.setMenuEnabled(False)  # Disable right-click menu
-            
-            # Fixed Y range
-            plot.setYRange(-100, 100, padding=0)
-            plot.enableAutoRange(enable=False)
-            
-            # Create curve with thin pen
-            curve = plot.plot(pen=pg.mkPen(color='#22d3ee', width=1))  # Cyan color
-            curve.setClipToView(True)
-            
-            self.curves.append(curve)
-            self.plot_widgets.append(plot)
-            
-            ch_layout.addWidget(label)
-            ch_layout.addWidget(plot)
-            
-            grid_layout.addWidget(ch_widget, row, col)
-        
-        scroll.setWidget(grid_widget)
-        main_layout.addWidget(scroll, 1)
+            ticks.append((-i * self.channel_spacing, f"{i+1}. {ch_name}"))
+        left_axis = self.plot_widget.getAxis('left')
+        left_axis.setTicks([ticks, []])
+        left_axis.setTextPen(pg.mkPen('#e2e8f0'))
+        left_axis.setWidth(70)
+        
+        # Fixed ranges (no auto-scaling)
+        self.plot_widget.setXRange(0, self.window_seconds, padding=0)
+        self.plot_widget.setYRange(-(self.n_channels - 0.5) * self.channel_spacing,
+                                   0.5 * self.channel_spacing, padding=0)
+        self.plot_widget.enableAutoRange(enable=False)
+        
+        # All channels are drawn by this one item (segments split via a connect array)
+        self.curve = pg.PlotCurveItem(pen=pg.mkPen(color='#22d3ee', width=1))  # Cyan color
+        self.plot_widget.addItem(self.curve)
+        
+        self.scroll.setWidget(self.plot_widget)
+        # Redraw on scroll, but keep scroll events out of the frame-time meter
+        self.scroll.verticalScrollBar().valueChanged.connect(lambda _value: self._update_all_plots(timed=False))
+        main_layout.addWidget(self.scroll, 1)
         
         # Close button
         btn_layout = QHBoxLayout()
@@ -5681,8 +5656,35 @@ class MultiChannelViewDialog(QDialog):
             }
         """)
     
-    def _update_all_plots(self):
-        """Update all 64 channel plots from multichannel_buffer"""
+    def _visible_channels(self, n_available):
+        """Indices of channel rows currently inside the scroll viewport (plus one row margin)"""
+        try:
+            top = -self.plot_widget.y()  # Plot offset inside the scrolled viewport
+            bottom = top + self.scroll.viewport().height()
+            view_box = self.plot_widget.getPlotItem().getViewBox()
+            y_top = view_box.mapSceneToView(QtCore.QPointF(0, top)).y()
+            y_bottom = view_box.mapSceneToView(QtCore.QPointF(0, bottom)).y()
+            first = max(0, int(np.floor(-y_top / self.channel_spacing)) - 1)
+            last = min(n_available, int(np.ceil(-y_bottom / self.channel_spacing)) + 2)
+            if first < last:
+                return np.arange(first, last)
+        except Exception:
+            pass
+        return np.arange(n_available)
+    
+    def _update_all_plots(self, timed=True):
+        """Redraw the visible channel rows from multichannel_buffer
+        
+        ``timed`` ticks (the update timer) feed the frame-time/FPS meter
+        when they draw; scroll-triggered redraws do not.
+        """
+        # Skip frames nobody can see
+        if not self.isVisible() or self.isMinimized():
+            self._last_tick = None
+            return
+        
+        start_time = time.perf_counter()
+        drawn = False
         try:
             # Get multichannel buffer
             multichannel_buffer = ANT_NEURO.multichannel_buffer
@@ -5692,6 +5694,7 @@ class MultiChannelViewDialog(QDialog):
             
             # Get last N samples (window_seconds worth)
             n_samples = int(self.window_seconds * self.sample_rate)
+            end_index = getattr(ANT_NEURO, 'samples_received', 0)
             recent_data = list(multichannel_buffer)[-n_samples:]
             
             # Convert to numpy array (samples x channels)
@@ -5701,29 +5704,58 @@ class MultiChannelViewDialog(QDialog):
                 return
             
             n_samples_actual, n_channels_actual = data_array.shape
-            
-            # Downsample for display (take every Nth point)
-            downsample_factor = max(1, n_samples_actual // self.display_points)
-            
-            # Create time axis
-            time_axis = np.linspace(0, self.window_seconds, min(self.display_points, n_samples_actual))
-            
-            # Update each channel
-            for ch_idx in range(min(self.n_channels, n_channels_actual)):
-                ch_data = data_array[::downsample_factor, ch_idx]
-                
-                # Center around zero (remove DC offset)
-                ch_data = ch_data - np.mean(ch_data)
-                
-                # Clip to ±100 µV for display
-                ch_data = np.clip(ch_data, -100, 100)
-                
-                # Update curve
-                if ch_idx < len(self.curves):
-                    self.curves[ch_idx].setData(time_axis[:len(ch_data)], ch_data)
+            n_shown = min(self.n_channels, n_channels_actual)
+            end_index = max(end_index, n_samples_actual)
+            
+            # Only rows inside the scroll viewport are decimated and drawn;
+            # the decimator's cached columns are per row set, so start over on scroll
+            visible = self._visible_channels(n_shown)
+            rows = (int(visible[0]), int(visible[-1]))
+            if rows != self._decimated_rows:
+                self._decimator.reset()
+                self._decimated_rows = rows
+            data_array = data_array[:, visible]
+            
+            # Reduce to a min/max pair per pixel column so spikes and blinks
+            # stay visible (only newly completed columns are recomputed)
+            n_columns = plot_columns(self.plot_widget, default=self.display_points)
+            x, envelope = self._decimator.update(data_array, end_index, n_columns)
+            
+            # Time axis relative to the start of the window
+            time_axis = (x - (end_index - n_samples_actual)) / self.sample_rate
+            
+            # Center around zero (remove DC offset), clip to ±100 µV, then offset each row
+            traces = np.clip(envelope - data_array.mean(axis=0), -100, 100)
+            traces = traces - visible * self.channel_spacing
+            
+            # One path: break the line between the last point of a row and the next row
+            connect = np.ones((len(visible), len(time_axis)), dtype=bool)
+            connect[:, -1] = False
+            self.curve.setData(np.tile(time_axis, len(visible)), traces.T.ravel(), connect=connect.ravel())
+            drawn = True
                     
         except Exception as e:
             print(f"[MultiChannel] Update error: {e}")
+        finally:
+            if timed and drawn:
+                self._record_frame_time(time.perf_counter() - start_time)
+            elif timed:
+                self._last_tick = None  # Next drawn tick starts a fresh interval
+    
+    def _record_frame_time(self, elapsed):
+        """Smooth update time and tick rate; show them in the title about once a second"""
+        now = time.perf_counter()
+        frame_ms = elapsed * 1000.0
+        self._frame_ms = frame_ms if self._frame_ms is None else 0.9 * self._frame_ms + 0.1 * frame_ms
+        if self._last_tick is not None:
+            tick_ms = (now - self._last_tick) * 1000.0
+            self._tick_ms = tick_ms if self._tick_ms is None else 0.9 * self._tick_ms + 0.1 * tick_ms
+        self._last_tick = now
+        
+        if self._tick_ms and now - self._last_title_update >= 1.0:
+            self._last_title_update = now
+            fps = 1000.0 / self._tick_ms
+            self.setWindowTitle(f"{self._base_title} - {self._frame_ms:.1f} ms/frame, {fps:.0f} FPS")
     
     def closeEvent(self, event):
         """Clean up timer on close"""
@@ -5783,6 +5815,7 @@ class LiveEEGDialog(QDialog):
         # Time tracking for X-axis
         self._plot_time_offset = 0  # Running time offset in seconds
         self._plot_window_seconds = 5.0  # Show 5 seconds of data
+        self._decimator = MinMaxDecimator()  # Per-pixel min/max envelope for the 5 s window
         
         plot_layout.addWidget(self.plot_widget)
         
@@ -5922,6 +5955,7 @@ class LiveEEGDialog(QDialog):
         in real-time through the feature_engine which processes data immediately
         as it arrives via the onRaw callback. This plot is purely for visualization.
         """
+        t_plot = PIPELINE_LATENCY.stamp()
         # Get the correct data buffer based on device type
         data_buffer = get_live_data_buffer(self.workflow.main_window)
         sample_rate = get_device_sample_rate(self.workflow.main_window)
@@ -5933,6 +5967,7 @@ class LiveEEGDialog(QDialog):
         debug_print = (self._plot_debug_counter >= 40)  # Every 2 seconds at 50ms
         if debug_print:
             self._plot_debug_counter = 0
+            debug_print = plot_log.isEnabledFor(logging.DEBUG)
         
         # Use the REAL data buffer from the selected device
         if len(data_buffer) >= 500:  # Need at least 500 samples to plot
@@ -5942,16 +5977,22 @@ class LiveEEGDialog(QDialog):
                 # For multi-channel: Plot with DC offset removed for better visualization
                 # Calculate how many samples to display (5 seconds window)
                 window_samples = int(self._plot_window_seconds * sample_rate)
+                end_index = getattr(ANT_NEURO, 'samples_received', 0)
                 raw_data = np.array(list(data_buffer)[-window_samples:])
                 n_samples = len(raw_data)
+                end_index = max(end_index, n_samples)
+                
+                # Min/max per pixel column: ~2 points per pixel instead of the
+                # whole window, without hiding spikes between kept samples
+                x, envelope = self._decimator.update(raw_data, end_index, plot_columns(self.plot_widget))
                 
                 # Remove DC offset (mean) for visualization - centers signal around zero
-                display_data = raw_data - np.mean(raw_data)
+                display_data = envelope - np.mean(raw_data)
                 
                 # Create time axis that scrolls continuously
                 # Calculate current time offset based on buffer position
                 current_time = len(data_buffer) / sample_rate
-                time_axis = np.linspace(current_time - n_samples/sample_rate, current_time, n_samples)
+                time_axis = current_time - (end_index - 1 - x) / sample_rate
                 
                 # Update plot with time-based X coordinates
                 self.curve.setData(time_axis, display_data)
@@ -5970,7 +6011,8 @@ class LiveEEGDialog(QDialog):
                 
                 # Debug: Print data range every 2 seconds
                 if debug_print:
-                    print(f"[Plot] raw: {raw_data.min():.1f} to {raw_data.max():.1f}, centered: {display_data.min():.1f} to {display_data.max():.1f} µV, t={current_time:.1f}s, y_range=±{y_range:.0f}µV")
+                    plot_log.debug("[Plot] raw: %.1f to %.1f, centered: %.1f to %.1f µV, t=%.1fs, y_range=±%.0fµV",
+                                   raw_data.min(), raw_data.max(), display_data.min(), display_data.max(), current_time, y_range)
             else:
                 data = np.array(list(data_buffer)[-sample_rate:])
                 n_samples = len(data)
@@ -5996,7 +6038,7 @@ class LiveEEGDialog(QDialog):
                 self.info_label.setStyleSheet("")
             else:
                 # Single-channel MindLink quality assessment
-                quality_score, status, details = assess_eeg_signal_quality(data, fs=sample_rate)
+                quality_score, status, details = assess_live_signal_quality(data_buffer, sample_rate)
                 
                 # Simplified logic: Only show "Noisy" if headset is not worn
                 if status == "not_worn":
@@ -6006,6 +6048,7 @@ class LiveEEGDialog(QDialog):
                     # If user is wearing it, show Good regardless of other quality metrics
                     self.info_label.setText(f"✓ Signal quality: Good | Data flowing normally")
                     self.info_label.setStyleSheet("color: #10b981; font-size: 13px; padding: 8px; font-weight: 600;")
+            PIPELINE_LATENCY.record('plot', t_plot)
         else:
             # No data detected - increment counter
             self.no_data_count += 1
@@ -6281,11 +6324,8 @@ class CalibrationDialog(QDialog):
             
             if len(data_buffer) >= sample_rate:
                 import time
-                # Use proper window size for signal analysis
-                data = np.array(list(data_buffer)[-sample_rate:])
-                
-                # Professional signal quality assessment
-                quality_score, status, details = assess_eeg_signal_quality(data, fs=sample_rate)
+                # Professional signal quality assessment (latest second, shared per data hop)
+                quality_score, status, details = assess_live_signal_quality(data_buffer, sample_rate)
                 
                 # Track quality history (timestamp, score)
                 current_time = time.time()
@@ -6393,8 +6433,7 @@ class CalibrationDialog(QDialog):
             sample_rate = get_device_sample_rate(self.workflow.main_window)
             
             if len(data_buffer) >= sample_rate:
-                data = np.array(list(data_buffer)[-sample_rate:])
-                quality_score, status, details = assess_eeg_signal_quality(data, fs=sample_rate)
+                quality_score, status, details = assess_live_signal_quality(data_buffer, sample_rate)
                 
                 # Track quality locally
                 current_time = time.time()
@@ -6487,8 +6526,8 @@ class CalibrationDialog(QDialog):
         if self.countdown_value > 0:
             self.status_label.setText(f"Countdown: {self.countdown_value}")
             self.phase_label.setText(f"Listening to audio: {self.countdown_value}...")
-            # Play countdown beep (cross-platform)
-            play_beep(800, 200)  # 800Hz, 200ms
+            # Play countdown beep (cross-platform, pre-rendered 800Hz / 200ms)
+            play_cue('countdown', self.feature_engine)
             self.countdown_value -= 1
         else:
             # Countdown finished, start actual recording
@@ -6570,8 +6609,7 @@ class CalibrationDialog(QDialog):
             sample_rate = get_device_sample_rate(self.workflow.main_window)
             
             if len(data_buffer) >= sample_rate:
-                data = np.array(list(data_buffer)[-sample_rate:])
-                quality_score, status, details = assess_eeg_signal_quality(data, fs=sample_rate)
+                quality_score, status, details = assess_live_signal_quality(data_buffer, sample_rate)
                 
                 # Track quality locally
                 current_time = time.time()
@@ -6660,9 +6698,8 @@ class CalibrationDialog(QDialog):
             print("Dialog not visible, skipping auto_stop_phase")
             return
         
-        # Play completion sound (4 beeps - cross-platform)
-        for i in range(4):
-            QTimer.singleShot(i * 200, lambda: play_beep(1000, 150))
+        # Play completion sound (4 beeps in one pre-rendered buffer - cross-platform)
+        play_cue('phase_complete', self.feature_engine)
             
         try:
             # Stop the calibration phase
@@ -6835,6 +6872,11 @@ class TaskSelectionDialog(QDialog):
         if not self.available_task_ids:
             self.available_task_ids = list(BL.AVAILABLE_TASKS.keys())
         
+        # Size the "auto" permutation plan for every task offered in this session
+        engine = getattr(self.workflow.main_window, 'feature_engine', None)
+        if engine is not None and hasattr(engine, 'expected_tasks'):
+            engine.expected_tasks = len(self.available_task_ids)
+        
         # Main layout
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(24, 24, 24, 24)
@@ -6951,6 +6993,17 @@ class TaskSelectionDialog(QDialog):
         self.update_completed_tasks_display()
         main_layout.addWidget(self.completed_label)
         
+        # Background analysis queue (pipelined per-task analysis)
+        self.analysis_queue_label = QLabel()
+        self.analysis_queue_label.setWordWrap(True)
+        self.analysis_queue_label.setStyleSheet("font-size: 11px; color: #64748b; padding: 0px 8px;")
+        self.analysis_queue_label.setVisible(False)
+        main_layout.addWidget(self.analysis_queue_label)
+        self.analysis_queue_timer = QTimer(self)
+        self.analysis_queue_timer.timeout.connect(self.update_analysis_queue_display)
+        self.analysis_queue_timer.start(1000)
+        self.update_analysis_queue_display()
+        
         # Navigation buttons
         nav_layout = QHBoxLayout()
         nav_layout.setSpacing(12)
@@ -7063,6 +7116,11 @@ class TaskSelectionDialog(QDialog):
         
         # Get task info from BL.AVAILABLE_TASKS using task_id
         if task_id and task_id in BL.AVAILABLE_TASKS:
+            # Decode the task's images in the background while the operator reads the preview
+            try:
+                self.workflow.main_window.prefetch_task_media(task_id)
+            except Exception as e:
+                print(f"[MEDIA] Prefetch failed for {task_id}: {e}")
             task_info = BL.AVAILABLE_TASKS[task_id]
             task_name = task_info.get('name', task_id)
             desc = task_info.get('description', 'No description available')
@@ -7262,10 +7320,29 @@ class TaskSelectionDialog(QDialog):
         else:
             self.completed_label.setText(f"✓ {count} tasks completed: {', '.join(completed_tasks)}")
     
+    def update_analysis_queue_display(self):
+        """Show the state of background per-task analyses"""
+        scheduler = getattr(self.workflow.main_window.feature_engine, 'task_scheduler', None)
+        entries = scheduler.status() if scheduler is not None else []
+        if not entries:
+            self.analysis_queue_label.setVisible(False)
+            return
+        icons = {'queued': '⏳', 'running': '⚙️', 'done': '✓', 'failed': '⚠'}
+        parts = []
+        for task_name, state, seconds in entries:
+            label = BL.AVAILABLE_TASKS.get(task_name, {}).get('name', task_name)
+            text = f"{icons.get(state, '')} {label}: {state}"
+            if state == 'done' and seconds is not None:
+                text += f" ({seconds:.0f}s)"
+            parts.append(text)
+        self.analysis_queue_label.setText("Background analysis: " + " | ".join(parts))
+        self.analysis_queue_label.setVisible(True)
+    
     def on_back(self):
         """Navigate back"""
         if self.status_bar:
             self.status_bar.cleanup()
+        self.analysis_queue_timer.stop()
         self._programmatic_close = True
         self.close()
         QTimer.singleShot(100, lambda: self.workflow.go_back())
@@ -7274,6 +7351,7 @@ class TaskSelectionDialog(QDialog):
         """Proceed to multi-task analysis"""
         if self.status_bar:
             self.status_bar.cleanup()
+        self.analysis_queue_timer.stop()
         self._programmatic_close = True
         self.close()
         QTimer.singleShot(100, lambda: self.workflow.go_to_step(WorkflowStep.MULTI_TASK_ANALYSIS))
@@ -7288,6 +7366,7 @@ class MultiTaskAnalysisDialog(QDialog):
     
     # Define signal for thread-safe communication
     analysis_complete_signal = QtCore.Signal()
+    offline_extraction_done_signal = QtCore.Signal(bool)
     
     def __init__(self, workflow: WorkflowManager, parent=None):
         super().__init__(parent)
@@ -7305,6 +7384,8 @@ class MultiTaskAnalysisDialog(QDialog):
         
         # Connect signal to slot for thread-safe GUI updates
         self.analysis_complete_signal.connect(self._display_results)
+        self.offline_extraction_done_signal.connect(self._on_offline_extraction_done)
+        self._offline_extraction_running = False
         
         # UI Elements
         title_label = QLabel("Multi-Task Analysis")
@@ -7593,9 +7674,8 @@ class MultiTaskAnalysisDialog(QDialog):
                 "Computing 1,400+ features per window...\n\n"
                 "This may take 1-2 minutes depending on recording length."
             )
-            QtWidgets.QApplication.processEvents()
             
-            # Run offline analysis (extracts features from raw data)
+            # Run offline analysis (extracts features from raw data) off the GUI thread
             def progress_callback(pct):
                 msg = f"OFFLINE ANALYSIS: {pct}% complete..."
                 QtCore.QMetaObject.invokeMethod(
@@ -7606,21 +7686,50 @@ class MultiTaskAnalysisDialog(QDialog):
                                       f"Processing 64 channels × 1,400+ features per window...")
                 )
             
-            engine.analyze_offline(progress_callback=progress_callback)
-            
-            # Stop recording if still active
-            if hasattr(engine, 'stop_recording'):
-                engine.stop_recording()
-            
-            # Save phase markers
-            if hasattr(engine, 'save_phase_markers'):
-                engine.save_phase_markers()
-            
-            print(f"[OFFLINE ANALYSIS] Feature extraction complete!")
-            print(f"[OFFLINE ANALYSIS] Eyes-closed: {len(engine.calibration_data['eyes_closed']['features'])} windows")
-            print(f"[OFFLINE ANALYSIS] Eyes-open: {len(engine.calibration_data['eyes_open']['features'])} windows")
-            print(f"[OFFLINE ANALYSIS] Task: {len(engine.calibration_data['task']['features'])} windows")
+            def _extract():
+                extracted = False
+                try:
+                    extracted = engine.analyze_offline(progress_callback=progress_callback) is not None
+                    
+                    # Stop recording if still active
+                    if hasattr(engine, 'stop_recording'):
+                        engine.stop_recording()
+                    
+                    # Save phase markers
+                    if hasattr(engine, 'save_phase_markers'):
+                        engine.save_phase_markers()
+                    
+                    print(f"[OFFLINE ANALYSIS] Feature extraction complete!")
+                    print(f"[OFFLINE ANALYSIS] Eyes-closed: {len(engine.calibration_data['eyes_closed']['features'])} windows")
+                    print(f"[OFFLINE ANALYSIS] Eyes-open: {len(engine.calibration_data['eyes_open']['features'])} windows")
+                    print(f"[OFFLINE ANALYSIS] Task: {len(engine.calibration_data['task']['features'])} windows")
+                except Exception as e:
+                    print(f"[OFFLINE ANALYSIS] Feature extraction failed: {e}")
+                    import traceback
+                    traceback.print_exc()
+                self.offline_extraction_done_signal.emit(extracted)
+            
+            self._offline_extraction_running = True
+            import threading
+            threading.Thread(target=_extract, name="OfflineExtraction", daemon=True).start()
+            return
         
+        self._analyze_extracted_tasks()
+    
+    def _on_offline_extraction_done(self, extracted: bool):
+        """Continue with statistics once background feature extraction has finished."""
+        was_running = self._offline_extraction_running
+        self._offline_extraction_running = False
+        if not was_running:
+            # Dialog was left (cancelled) while extraction was running
+            return
+        if not extracted:
+            print("[OFFLINE ANALYSIS] No features extracted; continuing with whatever tasks are available")
+        self._analyze_extracted_tasks()
+    
+    def _analyze_extracted_tasks(self):
+        """Run multi-task statistics on the engine's recorded/extracted task features."""
+        engine = self.workflow.main_window.feature_engine
         tasks = engine.calibration_data.get('tasks', {})
         
         print(f"\n=== PRE-ANALYSIS DEBUG ===")
@@ -7659,9 +7768,18 @@ class MultiTaskAnalysisDialog(QDialog):
         
         import threading
         
+        # Tasks already analyzed in the background only need the combined/across-task steps
+        scheduler = getattr(engine, 'task_scheduler', None)
+        pipelined_done = [name for name, state, _ in (scheduler.status() if scheduler else []) if state == 'done']
+        pipelined_note = (
+            f"{len(pipelined_done)} of {len(tasks)} task(s) already analyzed in the background.\n"
+            if pipelined_done else ""
+        )
+        
         # Show initial progress message
         self.results_text.setPlainText(
             "Analysis in progress...\n\n"
+            f"{pipelined_note}"
             "Initializing analysis engine...\n"
             "Computing baseline statistics...\n"
             "Preparing task comparisons...\n\n"
@@ -7848,6 +7966,8 @@ class MultiTaskAnalysisDialog(QDialog):
                 config = getattr(engine, 'config', None)
                 fast_mode = getattr(config, 'fast_mode', True) if config else True
                 n_perm = getattr(config, 'n_perm', 100) if config else 100
+                if hasattr(engine, '_effective_n_perm'):
+                    n_perm = engine._effective_n_perm()
                 
                 # Generate enhanced report
                 report_lines = Enhanced64ChannelReportGenerator.generate_text_report(
@@ -7856,6 +7976,8 @@ class MultiTaskAnalysisDialog(QDialog):
                     n_permutations=n_perm
                 )
                 
+                report_lines.extend(_latency_footer())
+                
                 # Display in results area
                 results_text = "\n".join(report_lines)
                 self.results_text.setPlainText(results_text)
@@ -8049,6 +8171,8 @@ class MultiTaskAnalysisDialog(QDialog):
                 config = getattr(engine, 'config', None)
                 fast_mode = getattr(config, 'fast_mode', True) if config else True
                 n_perm = getattr(config, 'n_perm', 100) if config else 100
+                if hasattr(engine, '_effective_n_perm'):
+                    n_perm = engine._effective_n_perm()
                 
                 # Generate enhanced report
                 report_lines = Enhanced64ChannelReportGenerator.generate_text_report(
@@ -8056,6 +8180,7 @@ class MultiTaskAnalysisDialog(QDialog):
                     fast_mode=fast_mode,
                     n_permutations=n_perm
                 )
+                report_lines.extend(_latency_footer())
                 
                 self.generated_report_text = "\n".join(report_lines)
                 return self.generated_report_text
@@ -8079,6 +8204,9 @@ class MultiTaskAnalysisDialog(QDialog):
             report_lines.append(f"Sampling Rate: {engine.fs} Hz")
             report_lines.append(f"Session ID: {getattr(engine, 'session_id', 'N/A')}")
             report_lines.append(f"User: {getattr(engine, 'user_email', 'N/A')}")
+            plan_line = engine.permutation_plan_summary() if hasattr(engine, 'permutation_plan_summary') else None
+            if plan_line:
+                report_lines.append(plan_line)
             report_lines.append("")
         
         # Add artifact detection summary
@@ -8183,6 +8311,7 @@ class MultiTaskAnalysisDialog(QDialog):
             else:
                 report_lines.append(str(results))
         
+        report_lines.extend(_latency_footer())
         self.generated_report_text = "\n".join(report_lines)
         return self.generated_report_text
     
@@ -8326,8 +8455,7 @@ class MultiTaskAnalysisDialog(QDialog):
             self._send_report_to_api(email)
     
     def _send_report_to_api(self, email):
-        """Send the report to the seeding API endpoint with protocol_type"""
-        import requests
+        """Queue the report for the seeding API endpoint (sent by the main window's report outbox)"""
         import uuid
         
         # Get protocol type (default to "initial" if not set)
@@ -8383,168 +8511,76 @@ class MultiTaskAnalysisDialog(QDialog):
             }
         }
         
-        # Show progress
-        progress = QMessageBox(self)
-        progress.setWindowTitle("Seeding Report")
-        progress.setText("Sending report to database...")
-        progress.setStandardButtons(QMessageBox.NoButton)
-        progress.setModal(True)
-        progress.show()
-        QtWidgets.QApplication.processEvents()
+        # Spool the report; the outbox sends it in the background (retries survive restarts)
+        import json
+        payload_size_kb = len(json.dumps(payload).encode('utf-8')) / 1024
+        main_window = self.workflow.main_window
+        main_window.log_message(f"Seeding report to: {seed_url}")
+        main_window.log_message(f"Protocol type: {protocol_type}, Partner ID: {partner_id}")
+        main_window.log_message(f"Payload size: {payload_size_kb:.2f} KB")
         
         try:
-            headers = {
-                "X-Authorization": f"Bearer {jwt_token}",
-                "Content-Type": "application/json"
-            }
-            
-            # Determine if SSL verification should be disabled (for localhost)
-            verify_ssl = "127.0.0.1" not in seed_url and "localhost" not in seed_url
-            
-            # Log payload details for debugging
-            import json
-            payload_json = json.dumps(payload)
-            payload_size_kb = len(payload_json.encode('utf-8')) / 1024
-            
-            self.workflow.main_window.log_message(f"Seeding report to: {seed_url}")
-            self.workflow.main_window.log_message(f"Protocol type: {protocol_type}, Partner ID: {partner_id}")
-            self.workflow.main_window.log_message(f"Payload size: {payload_size_kb:.2f} KB")
-            
-            print(f"\n>>> SEEDING REPORT <<<")
-            print(f"URL: {seed_url}")
-            print(f"Protocol Type: {protocol_type}")
-            print(f"Partner ID: {partner_id}")
-            print(f"Payload Size: {payload_size_kb:.2f} KB")
-            print(f"Headers: {headers}")
-            print(f"Verify SSL: {verify_ssl}")
-            
-            response = requests.post(
-                seed_url, 
-                json=payload, 
-                headers=headers, 
-                timeout=60,  # Increased timeout for large reports
-                verify=verify_ssl
-            )
-            
-            # Close progress dialog - use hide + deleteLater for complete removal
-            progress.hide()
-            progress.close()
-            progress.deleteLater()
-            QtWidgets.QApplication.processEvents()
-            
-            if response.status_code == 200 or response.status_code == 201:
-                result = response.json()
-                
-                # Create a success dialog with enhanced styling
-                success_dialog = QMessageBox(self)
-                success_dialog.setWindowTitle("✓ Report Seeded Successfully")
-                success_dialog.setIcon(QMessageBox.Information)
-                
-                success_message = (
-                    "🎉 Your EEG report has been successfully sent to the Mindspeller database!\n\n"
-                    "Report Details:\n"
-                    f"• User ID: {result.get('user_id', 'N/A')}\n"
-                    f"• Session ID: {result.get('session_id', 'N/A')}\n"
-                    f"• Report ID: {result.get('report_id', 'N/A')}\n\n"
-                    "✓ Your neuroprofiling report is now available in your Mindspeller account.\n"
-                    "✓ You can access it immediately at mindspeller.com\n"
-                    "✓ You can safely close this application now.\n\n"
-                    "Thank you for using MindLink Analyzer!"
-                )
-                
-                success_dialog.setText(success_message)
-                success_dialog.setStandardButtons(QMessageBox.Ok)
-                
-                # Style the dialog
-                success_dialog.setStyleSheet("""
-                    QMessageBox {
-                        background-color: #f0fdf4;
-                    }
-                    QLabel {
-                        color: #166534;
-                        font-size: 13px;
-                    }
-                    QPushButton {
-                        background-color: #10b981;
-                        color: white;
-                        padding: 8px 24px;
-                        border-radius: 6px;
-                        font-weight: 600;
-                    }
-                    QPushButton:hover {
-                        background-color: #059669;
-                    }
-                """)
-                
-                success_dialog.exec()
-                
-                # Show a toast notification as well
-                try:
-                    self.workflow.main_window.log_message(
-                        f"✓ Report seeded successfully! User ID: {result.get('user_id')}, "
-                        f"Session ID: {result.get('session_id')}, Report ID: {result.get('report_id')}"
-                    )
-                except:
-                    pass
-                
-            else:
-                error_msg = response.json().get('error', 'Unknown error') if response.content else 'Unknown error'
-                QMessageBox.warning(
-                    self,
-                    "Seeding Failed",
-                    f"Failed to seed report.\n\n"
-                    f"Status: {response.status_code}\n"
-                    f"Error: {error_msg}"
-                )
-                
-        except requests.exceptions.RequestException as e:
-            # Ensure progress dialog is closed on error - use hide + deleteLater
-            progress.hide()
-            progress.close()
-            progress.deleteLater()
-            QtWidgets.QApplication.processEvents()
-            error_details = str(e)
-            
-            # Provide more helpful error message for common issues
-            if "Connection aborted" in error_details or "10053" in error_details:
-                error_msg = (
-                    "Connection to server was lost.\n\n"
-                    "Possible causes:\n"
-                    "• Server closed the connection (check if Flask server is running)\n"
-                    "• Request timeout (report may be too large)\n"
-                    "• Network issue\n\n"
-                    f"Technical details: {error_details}"
-                )
-            elif "Connection refused" in error_details or "10061" in error_details:
-                error_msg = (
-                    "Cannot connect to server.\n\n"
-                    f"Is the server running at {seed_url}?\n\n"
-                    f"Technical details: {error_details}"
-                )
-            else:
-                error_msg = f"Failed to connect to API:\n{error_details}"
-            
-            self.workflow.main_window.log_message(f"Error seeding report: {error_details}")
-            
-            QMessageBox.critical(
-                self,
-                "Network Error",
-                error_msg
-            )
+            entry = main_window.report_outbox.enqueue(seed_url, payload)
         except Exception as e:
-            # Ensure progress dialog is closed on error - use hide + deleteLater
-            progress.hide()
-            progress.close()
-            progress.deleteLater()
-            QtWidgets.QApplication.processEvents()
             QMessageBox.critical(
                 self,
                 "Error",
-                f"Unexpected error while seeding report:\n{str(e)}"
+                f"Could not queue the report for seeding:\n{str(e)}"
+            )
+            return
+        
+        if entry.duplicate and entry.status == 'sent':
+            main_window.log_message(f"Report {entry.id[:12]} was already seeded; not sending it again")
+            text = "This report has already been sent to the Mindspeller database."
+        elif entry.duplicate and entry.status == 'failed':
+            main_window.log_message(f"Report {entry.id[:12]} was rejected earlier: {entry.last_error}")
+            reply = QMessageBox.question(
+                self,
+                "Report Rejected Earlier",
+                "This report was sent before and the server rejected it.\n\n"
+                f"Error: {entry.last_error or 'unknown'}\n\n"
+                "Queue it again?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
             )
+            if reply != QMessageBox.Yes:
+                return
+            try:
+                entry = main_window.report_outbox.requeue(entry.id)
+            except Exception as e:
+                entry = None
+                main_window.log_message(f"Could not re-queue report: {e}")
+            if entry is None:
+                QMessageBox.critical(self, "Error", "Could not queue the report again.")
+                return
+            main_window.log_message(f"Report {entry.id[:12]} re-queued for seeding")
+            text = "The report has been queued again and is being sent in the background."
+        elif entry.duplicate:
+            main_window.log_message(f"Report {entry.id[:12]} is already queued for seeding")
+            text = "This report is already queued and will be sent in the background."
+        else:
+            main_window.log_message(f"Report {entry.id[:12]} queued for seeding")
+            text = (
+                "The report has been queued and is being sent in the background.\n\n"
+                "You can keep working; the status bar shows the upload status. "
+                "If the connection fails it is retried automatically, also after a restart."
+            )
+        notice = QMessageBox(self)
+        notice.setWindowTitle("Seeding Report")
+        notice.setIcon(QMessageBox.Information)
+        notice.setText(text)
+        notice.setStandardButtons(QMessageBox.Ok)
+        notice.setModal(False)
+        notice.setAttribute(Qt.WA_DeleteOnClose)
+        notice.show()
     
     def on_back(self):
         """Navigate back"""
+        if self._offline_extraction_running:
+            self._offline_extraction_running = False
+            engine = self.workflow.main_window.feature_engine
+            if hasattr(engine, 'cancel_offline_analysis'):
+                engine.cancel_offline_analysis()
         if self.status_bar:
             self.status_bar.cleanup()
         self._programmatic_close = True
@@ -8596,6 +8632,9 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
         # Track if using enhanced 64-channel engine
         self.using_enhanced_engine = False
         
+        # Analyze each task in the background while the next one is recorded
+        self._enable_pipelined_analysis()
+        
         # Ensure protocol groups use the correct Lifestyle tasks (now implemented)
         self._protocol_groups = {
             'Personal Pathway': ['emotion_face', 'diverse_thinking'],
@@ -8609,8 +8648,103 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
         # Initialize workflow manager
         self.workflow = WorkflowManager(self)
         
-        # Start the workflow
+        # Warm the analysis kernels in the background while the setup dialogs are open
+        self.warmup = WarmupService(config=self.config)
+        self.warmup.add_step('signal_quality', _warm_signal_quality, device='mindlink')
+        self.warmup.add_step('multichannel_quality', _warm_multichannel_signal_quality, device='antneuro')
+        
+        # Durable outbox for report seeding; sends whatever a previous run left behind once logged in
+        self._outbox_signals = OutboxSignals()
+        self._outbox_signals.outbox_event.connect(self._on_outbox_event)
+        self.report_outbox = ReportOutbox(
+            token_fn=lambda: getattr(self, 'jwt_token', None),
+            owner_fn=lambda: getattr(self, 'login_owner', None),
+            on_event=self._outbox_signals.outbox_event.emit,
+        ).start()
+        
+        # Start the workflow; the warm-up starts once the first dialog is up
         QTimer.singleShot(100, self.start_workflow)
+        QTimer.singleShot(400, lambda: self.warmup.start('mindlink'))
+    
+    def _on_outbox_event(self, event):
+        """Report seeding progress from the outbox worker (delivered on the Qt thread)"""
+        report = event['id'][:12]
+        kind = event['kind']
+        if kind == 'retry':
+            self.log_message(f"Report {report} not sent yet ({event['last_error']}); retrying in the background")
+        elif kind == 'failed':
+            self.log_message(f"Error seeding report {report}: {event['last_error']}")
+            QMessageBox.warning(
+                self,
+                "Seeding Failed",
+                f"The server rejected the report.\n\n"
+                f"Error: {event['last_error']}\n\n"
+                f"The report is kept in {os.path.join(self.report_outbox.spool_dir, 'failed')}; "
+                f"seeding it again offers to re-queue it."
+            )
+        elif kind == 'sent':
+            result = event.get('response') or {}
+            self.log_message(
+                f"✓ Report seeded successfully! User ID: {result.get('user_id')}, "
+                f"Session ID: {result.get('session_id')}, Report ID: {result.get('report_id')}"
+            )
+            self._show_seed_success(result)
+    
+    def _show_seed_success(self, result):
+        """Non-modal confirmation once the outbox has delivered a report"""
+        # Create a success dialog with enhanced styling
+        success_dialog = QMessageBox(self)
+        success_dialog.setWindowTitle("✓ Report Seeded Successfully")
+        success_dialog.setIcon(QMessageBox.Information)
+        
+        success_message = (
+            "🎉 Your EEG report has been successfully sent to the Mindspeller database!\n\n"
+            "Report Details:\n"
+            f"• User ID: {result.get('user_id', 'N/A')}\n"
+            f"• Session ID: {result.get('session_id', 'N/A')}\n"
+            f"• Report ID: {result.get('report_id', 'N/A')}\n\n"
+            "✓ Your neuroprofiling report is now available in your Mindspeller account.\n"
+            "✓ You can access it immediately at mindspeller.com\n"
+            "✓ You can safely close this application now.\n\n"
+            "Thank you for using MindLink Analyzer!"
+        )
+        
+        success_dialog.setText(success_message)
+        success_dialog.setStandardButtons(QMessageBox.Ok)
+        
+        # Style the dialog
+        success_dialog.setStyleSheet("""
+            QMessageBox {
+                background-color: #f0fdf4;
+            }
+            QLabel {
+                color: #166534;
+                font-size: 13px;
+            }
+            QPushButton {
+                background-color: #10b981;
+                color: white;
+                padding: 8px 24px;
+                border-radius: 6px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background-color: #059669;
+            }
+        """)
+        
+        success_dialog.setModal(False)
+        success_dialog.setAttribute(Qt.WA_DeleteOnClose)
+        success_dialog.show()
+    
+    def _enable_pipelined_analysis(self):
+        """Start background per-task analysis on the current feature engine (live engines only)."""
+        engine = getattr(self, 'feature_engine', None)
+        if engine is None or hasattr(engine, 'analyze_offline'):
+            # Offline engine only has features after analyze_offline(); nothing to pipeline
+            return
+        if hasattr(engine, 'enable_pipelined_analysis'):
+            engine.enable_pipelined_analysis()
     
     def switch_to_enhanced_64ch_engine(self):
         """Switch to OFFLINE 64-channel engine for ANT Neuro device.
@@ -8619,6 +8753,7 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
         Uses OFFLINE analysis: records raw data during streaming,
         extracts all features when "Analyze" is clicked.
         """
+        _load_64ch_engines()
         # Prefer OFFLINE engine (records raw data, processes later)
         if OFFLINE_64CH_AVAILABLE:
             print(f"\n{'='*70}")
@@ -8667,6 +8802,7 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
             self.feature_engine.set_log_function(self.log_message)
             self.using_enhanced_engine = True
             self.using_offline_engine = False
+            self._enable_pipelined_analysis()
             
             ANT_NEURO.feature_engine = self.feature_engine
             print(f"[MAIN WINDOW] ANT_NEURO.feature_engine set to {type(self.feature_engine).__name__}")
@@ -8752,6 +8888,14 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
             except Exception:
                 pass
             
+            # Skip any warm-up steps that have not run yet
+            if hasattr(self, 'warmup'):
+                self.warmup.stop()
+            
+            # Unsent reports stay in the outbox spool for the next start
+            if hasattr(self, 'report_outbox'):
+                self.report_outbox.stop()
+            
             # Accept the close event
             event.accept()
             
@@ -8769,8 +8913,15 @@ class SequentialBrainLinkAnalyzerWindow(EnhancedBrainLinkAnalyzerWindow):
 # MAIN ENTRY POINT
 # ============================================================================
 
+import_profile.mark('imports')
+
+
 if __name__ == "__main__":
     import sys
+    import multiprocessing
+    
+    # Offline 64-channel extraction uses a process pool; required for frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     
     # Create QApplication first
     app = QtWidgets.QApplication(sys.argv)
@@ -8782,6 +8933,7 @@ if __name__ == "__main__":
     
     # Start with OS selection workflow
     window = SequentialBrainLinkAnalyzerWindow("Windows")
+    import_profile.mark('window')
     
      # Close PyInstaller splash screen after app is initialized
     try:
@@ -124,6 +124,10 @@ from BrainLinkAnalyzer_GUI import (
     WINDOW_SIZE,
     OVERLAP_SIZE,
 )
+from utils.multichannel_quality import (
+    as_samples_by_channels,
+    multichannel_quality_metrics,
+)
 
 # Import Qt components
 from PySide6 import QtCore, QtWidgets, QtGui
@@ -1027,9 +1031,6 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
     overall_status : str ('good', 'acceptable', 'poor', 'cap_issue')
     details : dict with per-channel and regional quality metrics
     """
-    from scipy import signal as scipy_signal
-    from scipy.stats import kurtosis
-    
     # Default 64-channel names
     if channel_names is None:
         channel_names = [
@@ -1059,12 +1060,7 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
         'temporal': ['T7', 'T8', 'FT7', 'FT8', 'TP7', 'TP8']
     }
     
-    data = np.array(multichannel_data)
-    if data.ndim == 1:
-        data = data.reshape(-1, 1)
-    
-    if data.shape[0] < data.shape[1] and data.shape[0] <= 128:
-        data = data.T
+    data = as_samples_by_channels(multichannel_data)
     
     n_samples, n_channels = data.shape
     
@@ -1088,51 +1084,33 @@ def assess_multichannel_signal_quality(multichannel_data, fs=500, channel_names=
     if n_samples < 256:
         return 0, "insufficient_data", details
     
-    # Per-channel assessment
-    channel_scores = []
-    for ch_idx in range(n_channels):
-        ch_name = channel_names[ch_idx]
-        ch_data = data[:, ch_idx]
-        ch_score = 100
-        
-        ch_std = np.std(ch_data)
-        if ch_std < 1.0:
-            ch_score = 5
-            details['flat_channels'].append(ch_name)
-        
-        ch_max = np.max(np.abs(ch_data))
-        if ch_max > 500:
-            ch_score = min(ch_score, 20)
-            details['bad_channels'].append(ch_name)
-        
-        if ch_std >= 1.0:
-            try:
-                freqs, psd = scipy_signal.welch(ch_data, fs=fs, nperseg=min(256, n_samples))
-                total_power = np.sum(psd) + 1e-12
-                
-                idx_low = (freqs >= 0.5) & (freqs <= 8)
-                idx_high = freqs >= 30
-                
-                low_freq_ratio = np.sum(psd[idx_low]) / total_power
-                high_freq_ratio = np.sum(psd[idx_high]) / total_power
-                
-                if low_freq_ratio < 0.25:
-                    ch_score -= 20
-                if high_freq_ratio > 0.40:
-                    ch_score -= 15
-                    if ch_name not in details['noisy_channels']:
-                        details['noisy_channels'].append(ch_name)
-            except Exception:
-                ch_score -= 10
-        
-        ch_score = max(0, min(100, ch_score))
-        
-        if ch_score < 30 and ch_name not in details['bad_channels']:
-            details['bad_channels'].append(ch_name)
-        
-        details['per_channel_scores'][ch_name] = ch_score
-        details['per_channel_status'][ch_name] = "good" if ch_score >= 70 else "acceptable" if ch_score >= 50 else "poor"
-        channel_scores.append(ch_score)
+    # Per-channel assessment (all channels at once, one batched PSD)
+    metrics = multichannel_quality_metrics(data, fs, spectral=True, nperseg=256, spike_window_s=None)
+    ch_std = metrics['std']
+    flat = ch_std < 1.0
+    high_amp = metrics['max_abs'] > 500
+    
+    scores = np.where(flat, 5, 100)
+    scores = np.where(high_amp, np.minimum(scores, 20), scores)
+    if metrics['spectral_ok']:
+        noisy = ~flat & (metrics['high_ratio'] > 0.40)
+        scores = scores - np.where(~flat & (metrics['low_ratio'] < 0.25), 20, 0)
+        scores = scores - np.where(noisy, 15, 0)
+        details['spectral_slopes'] = dict(zip(channel_names, metrics['spectral_slope'].tolist()))
+    else:
+        noisy = np.zeros(n_channels, dtype=bool)
+        scores = scores - np.where(~flat, 10, 0)
+    scores = np.clip(scores, 0, 100)
+    
+    channel_scores = [int(s) for s in scores]
+    details['per_channel_scores'] = dict(zip(channel_names, channel_scores))
+    details['per_channel_status'] = {
+        name: "good" if s >= 70 else "acceptable" if s >= 50 else "poor"
+        for name, s in details['per_channel_scores'].items()
+    }
+    details['flat_channels'] = [channel_names[i] for i in np.flatnonzero(flat)]
+    details['bad_channels'] = [channel_names[i] for i in np.flatnonzero(high_amp | (scores < 30))]
+    details['noisy_channels'] = [channel_names[i] for i in np.flatnonzero(noisy)]
     
     # Regional assessment
     for region_name, region_channels in REGIONS.items():
@@ -23,6 +23,14 @@ except ImportError as e:
     SDK_AVAILABLE = False
     print(f"Warning: eego_sdk not available: {e}")
 
+try:
+    from utils.bl_log import get_logger
+    acquisition_log = get_logger("acquisition")
+except ImportError:
+    # Standalone run from antNeuro/ without the project root on sys.path
+    import logging
+    acquisition_log = logging.getLogger("bl.acquisition")
+
 
 @dataclass
 class ChannelInfo:
@@ -73,6 +81,11 @@ class AntNeuroDevice:
         self.sampling_rate = 0
         self.is_streaming = False
         
+        # Samples read from the SDK but not yet returned by read_samples()
+        self._carry: Optional[np.ndarray] = None
+        self.max_carry_seconds = 10.0
+        self.dropped_samples = 0
+        
         # Initialize factory
         try:
             self.factory = eego_sdk.factory()
@@ -264,6 +277,8 @@ class AntNeuroDevice:
                 )
                 self.channels.append(ch_info)
             
+            self._carry = None
+            self.dropped_samples = 0
             self.is_streaming = True
             print(f"Streaming started at {sample_rate} Hz")
             print(f"Channels available: {len(self.channels)}")
@@ -275,6 +290,10 @@ class AntNeuroDevice:
         """
         Read EEG samples from the stream
         
+        Samples beyond ``num_samples`` are kept in a carry-over buffer and
+        returned first by the next call, so nothing the amplifier delivered
+        is dropped.
+        
         Args:
             num_samples: Number of samples to read per channel
             
@@ -292,66 +311,88 @@ class AntNeuroDevice:
         try:
             # Get data from stream - returns a buffer object
             buffer = self.stream.getData()
-            
-            if buffer is None:
-                return None
-            
-            # Get the data as a flat list/array
-            # The SDK returns data in channel-major format:
-            # [ch0_sample0, ch0_sample1, ..., ch1_sample0, ch1_sample1, ...]
-            num_channels = len(self.channels)
-            
-            # Try to get the size and samples
-            try:
-                size = buffer.size()
-                if size == 0:
-                    return None
-                
-                # Extract samples from buffer
-                # buffer.getSample(channel_idx) returns all samples for that channel
-                channel_data = []
-                for ch_idx in range(num_channels):
-                    ch_samples = buffer.getSample(ch_idx)
-                    # Convert to list if it's not already
-                    if hasattr(ch_samples, '__iter__'):
-                        channel_data.append(list(ch_samples))
-                    else:
-                        channel_data.append([ch_samples])
-                
-                # Transpose to get (samples, channels) format
-                max_samples = max(len(ch) for ch in channel_data)
-                data_array = np.zeros((max_samples, num_channels))
-                
-                for ch_idx, ch_samples in enumerate(channel_data):
-                    data_array[:len(ch_samples), ch_idx] = ch_samples
-                
-                # Return requested number of samples
-                if data_array.shape[0] >= num_samples:
-                    return data_array[:num_samples, :]
-                else:
-                    return data_array
-                    
-            except AttributeError:
-                # Alternative: buffer might be a simple array
-                # Try to reshape directly
-                data_flat = np.array(buffer)
-                if len(data_flat) == 0:
-                    return None
-                
-                # Assume channel-major format
-                samples_per_channel = len(data_flat) // num_channels
-                data_array = data_flat.reshape(num_channels, samples_per_channel).T
-                
-                if data_array.shape[0] >= num_samples:
-                    return data_array[:num_samples, :]
-                else:
-                    return data_array
-            
+            data_array = self._buffer_to_array(buffer) if buffer is not None else None
         except Exception as e:
-            print(f"Error reading samples: {e}")
-            import traceback
-            traceback.print_exc()
+            # Called in the acquisition loop, so a persistent fault is rate-limited
+            acquisition_log.warning("Error reading samples: %s", e, exc_info=True)
+            data_array = None
+        
+        return self._take_samples(data_array, num_samples)
+    
+    def _buffer_to_array(self, buffer) -> Optional[np.ndarray]:
+        """Convert an SDK buffer to a (samples, channels) array in one step"""
+        num_channels = len(self.channels)
+        try:
+            num_channels = int(buffer.getChannelCount()) or num_channels
+        except Exception:
+            pass
+        if num_channels <= 0:
             return None
+        
+        # 1. Buffer protocol: zero-copy view of the SDK's sample-major storage
+        # 2. Single flat getter (same layout as AntNeuroDeviceManager's stream loop)
+        flat = None
+        try:
+            flat = np.asarray(memoryview(buffer), dtype=float).reshape(-1)
+        except TypeError:
+            getter = getattr(buffer, 'getData', None)
+            if getter is not None:
+                flat = np.asarray(getter(), dtype=float).reshape(-1)
+        if flat is not None:
+            if flat.size == 0:
+                return None
+            usable = flat.size - flat.size % num_channels
+            return flat[:usable].reshape(-1, num_channels)
+        
+        # 3. Older bindings: per-channel getter
+        return self._buffer_to_array_per_channel(buffer, num_channels)
+    
+    @staticmethod
+    def _buffer_to_array_per_channel(buffer, num_channels: int) -> Optional[np.ndarray]:
+        """Fallback for bindings without a flat getter: one getSample() call per channel"""
+        try:
+            if buffer.size() == 0:
+                return None
+        except AttributeError:
+            # Buffer might be a simple channel-major array
+            data_flat = np.array(buffer)
+            if len(data_flat) == 0:
+                return None
+            samples_per_channel = len(data_flat) // num_channels
+            return data_flat[:samples_per_channel * num_channels].reshape(num_channels, samples_per_channel).T
+        
+        channel_data = [np.atleast_1d(np.asarray(buffer.getSample(ch_idx), dtype=float))
+                        for ch_idx in range(num_channels)]
+        max_samples = max(len(ch) for ch in channel_data)
+        data_array = np.zeros((max_samples, num_channels))
+        for ch_idx, ch_samples in enumerate(channel_data):
+            data_array[:len(ch_samples), ch_idx] = ch_samples
+        return data_array
+    
+    def _take_samples(self, data_array: Optional[np.ndarray], num_samples: int) -> Optional[np.ndarray]:
+        """Prepend carried-over samples, return up to ``num_samples`` and keep the rest"""
+        carry = self._carry
+        if carry is not None and data_array is not None and carry.shape[1] != data_array.shape[1]:
+            carry = None  # Channel layout changed; stale samples can't be merged
+        if carry is not None:
+            data_array = carry if data_array is None else np.concatenate([carry, data_array])
+        if data_array is None or data_array.shape[0] == 0:
+            self._carry = None
+            return None
+        
+        num_samples = max(1, int(num_samples))
+        if data_array.shape[0] <= num_samples:
+            self._carry = None
+            return data_array
+        
+        rest = data_array[num_samples:]
+        # Bound the backlog if the consumer falls behind (keep the newest samples)
+        limit = max(num_samples, int(self.max_carry_seconds * (self.sampling_rate or 500)))
+        if rest.shape[0] > limit:
+            self.dropped_samples += rest.shape[0] - limit
+            rest = rest[-limit:]
+        self._carry = rest.copy()
+        return data_array[:num_samples]
     
     def get_channel_info(self) -> List[ChannelInfo]:
         """
@@ -380,6 +421,7 @@ class AntNeuroDevice:
         
         self.sampling_rate = 0
         self.channels = []
+        self._carry = None
     
     def disconnect(self) -> None:
         """Disconnect from amplifier"""
@@ -55,6 +55,16 @@ except ImportError as e:
     GRPC_AVAILABLE = False
     print(f"Warning: gRPC modules not available: {e}")
 
+try:
+    from utils.bl_log import get_logger
+    from utils.pipeline_latency import PIPELINE_LATENCY
+    stream_log = get_logger("edi2")
+except ImportError:
+    # Standalone run from antNeuro/ without the project root on sys.path
+    import logging
+    stream_log = logging.getLogger("bl.edi2")
+    PIPELINE_LATENCY = None
+
 
 @dataclass
 class DeviceInfo:
@@ -609,7 +619,7 @@ class EDI2Client:
     
     def _stream_loop(self):
         """Background thread for continuous data acquisition"""
-        print("[EDI2] Stream loop started")
+        stream_log.info("[EDI2] Stream loop started")
         
         frame_count = 0
         zero_frame_count = 0
@@ -631,6 +641,7 @@ class EDI2Client:
                     time.sleep(0.001)
                     continue
                 
+                t_arrival = PIPELINE_LATENCY.stamp() if PIPELINE_LATENCY is not None else 0
                 for frame in frame_resp.FrameList:
                     # Extract data matrix (cumulative/integrated values)
                     cols = frame.Matrix.Cols  # channels
@@ -641,11 +652,11 @@ class EDI2Client:
                     if np.all(raw_data == 0):
                         zero_frame_count += 1
                         if zero_frame_count == 1:
-                            print(f"[EDI2] WARNING: Received all-zero frame (device may have stopped)")
+                            stream_log.warning("[EDI2] WARNING: Received all-zero frame (device may have stopped)")
                         continue
                     else:
                         if zero_frame_count > 0:
-                            print(f"[EDI2] Data resumed after {zero_frame_count} zero frames")
+                            stream_log.warning("[EDI2] Data resumed after %d zero frames", zero_frame_count)
                             zero_frame_count = 0
                     
                     # Differentiate to get instantaneous EEG values
@@ -674,9 +685,14 @@ class EDI2Client:
                         for sample in data:
                             self.data_buffer.append(sample)
                     
+                    if t_arrival:
+                        PIPELINE_LATENCY.record('acquire', t_arrival)
+                    
                     # Call callback if set
                     if self.on_data_callback:
                         self.on_data_callback(data)
+                    if t_arrival:
+                        PIPELINE_LATENCY.record('end_to_end', t_arrival)
                 
                 # Minimal sleep - just yield to other threads
                 # At 500 Hz we get ~500 samples/sec, need to read fast
@@ -684,16 +700,16 @@ class EDI2Client:
                 
             except grpc.RpcError as e:
                 if not self.stop_thread_flag.is_set():
-                    print(f"[EDI2] Stream error: {e}")
+                    stream_log.error("[EDI2] Stream error: %s", e)
                     if self.on_error_callback:
                         self.on_error_callback(e)
                 break
             except Exception as e:
                 if not self.stop_thread_flag.is_set():
-                    print(f"[EDI2] Unexpected error: {e}")
+                    stream_log.error("[EDI2] Unexpected error: %s", e)
                 break
         
-        print("[EDI2] Stream loop ended")
+        stream_log.info("[EDI2] Stream loop ended")
     
     def get_data(self, num_samples: int = None) -> Optional[np.ndarray]:
         """
@@ -25,13 +25,22 @@ import warnings
 # Suppress numpy warnings for cleaner output
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
-# Import base engine components
 try:
-    from BrainLinkAnalyzer_GUI_Enhanced import (
+    from utils.bl_log import get_logger
+    from utils.pipeline_latency import PIPELINE_LATENCY
+    engine_log = get_logger("engine")
+except ImportError:
+    import logging
+    engine_log = logging.getLogger("bl.engine")
+    PIPELINE_LATENCY = None
+
+# Import base engine components from the Qt-free core (no PySide6 in worker processes)
+try:
+    from brainlink_core.enhanced import (
         EnhancedFeatureAnalysisEngine,
         EnhancedAnalyzerConfig
     )
-    from BrainLinkAnalyzer_GUI import (
+    from brainlink_core.dsp import (
         EEG_BANDS,
         compute_psd,
         bandpower,
@@ -183,6 +192,7 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         self.window_size = 2.0  # 2 second windows
         self.window_samples = int(self.window_size * self.fs)
         self.step_samples = int(self.window_samples * 0.5)  # 50% overlap
+        self.feature_interval_s = 0.5  # Max 2 Hz feature extraction (wall clock)
         
         # Multi-channel buffer: stores full multi-channel samples
         self.multichannel_buffer = deque(maxlen=self.fs * 10)
@@ -245,6 +255,7 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         - 1D array (n_samples,): Multiple single-channel samples
         - 2D array (n_samples, n_channels): Batch of multi-channel samples
         """
+        t_buffer = PIPELINE_LATENCY.stamp() if PIPELINE_LATENCY is not None else 0
         if np.isscalar(new_data):
             # Single value - treat as primary channel only
             self.raw_buffer.append(new_data)
@@ -280,16 +291,19 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         if len(self.multichannel_buffer) >= self.window_samples:
             # Throttle feature extraction to avoid overwhelming the system
             current_time = time.time()
-            if current_time - self._last_feature_time >= 0.5:  # Max 2 Hz feature extraction
+            if current_time - self._last_feature_time >= self.feature_interval_s:
                 self._last_feature_time = current_time
                 
                 # Get multi-channel window
                 mc_window = np.array(list(self.multichannel_buffer)[-self.window_samples:])
+                if t_buffer:
+                    PIPELINE_LATENCY.record('buffer', t_buffer)
                 
                 # Extract full multi-channel features
                 features = self.extract_multichannel_features(mc_window)
                 
                 if features is not None:
+                    t_store = PIPELINE_LATENCY.stamp() if t_buffer else 0
                     self.latest_features = features
                     
                     # Store based on current state
@@ -307,6 +321,8 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
                             bucket = tasks.setdefault(self.current_task, {'features': [], 'timestamps': []})
                             bucket['features'].append(features)
                             bucket['timestamps'].append(time.time())
+                    if t_store:
+                        PIPELINE_LATENCY.record('store', t_store)
                     
                     return features
         
@@ -329,6 +345,8 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         if n_samples < 256 or n_channels < 1:
             return None
         
+        t_stage = PIPELINE_LATENCY.stamp() if PIPELINE_LATENCY is not None else 0
+        
         # Remove DC offset per channel
         mc_data = mc_data - np.mean(mc_data, axis=0, keepdims=True)
         
@@ -338,6 +356,8 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
             mc_data = signal.filtfilt(b_notch, a_notch, mc_data, axis=0)
         except:
             pass
+        if t_stage:
+            t_stage = PIPELINE_LATENCY.lap('filter', t_stage)
         
         # Compute PSD for all channels at once using Welch method
         nperseg = min(n_samples, 256)
@@ -345,6 +365,8 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
             freqs, psd_all = signal.welch(mc_data, self.fs, nperseg=nperseg, axis=0)
         except:
             return None
+        if t_stage:
+            t_stage = PIPELINE_LATENCY.lap('psd', t_stage)
         
         # psd_all shape: (n_freqs, n_channels)
         
@@ -499,6 +521,9 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         features['n_good_channels'] = int(np.sum(channel_powers > np.percentile(channel_powers, 10)))
         features['n_features_extracted'] = len(features)
         
+        if t_stage:
+            PIPELINE_LATENCY.record('features', t_stage)
+        
         return features
     
     def extract_features(self, window_data):
@@ -540,8 +565,8 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         self.state_start_time = time.time()
         
         feature_count = len(self.calibration_data.get(phase, {}).get('features', []))
-        print(f"[64CH ENGINE] Started {phase} phase (task: {task_type})")
-        print(f"[64CH ENGINE] Existing features in {phase}: {feature_count}")
+        engine_log.info("[64CH ENGINE] Started %s phase (task: %s)", phase, task_type)
+        engine_log.info("[64CH ENGINE] Existing features in %s: %d", phase, feature_count)
     
     def stop_calibration_phase(self):
         """Stop the current calibration phase"""
@@ -552,24 +577,28 @@ class Enhanced64ChannelEngine(EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAIL
         phase = self.current_state
         feature_count = len(self.calibration_data.get(phase, {}).get('features', []))
         
-        print(f"Stopped calibration phase: {phase}")
-        print(f"Duration: {duration:.1f}s, Features collected: {feature_count}")
+        engine_log.info("Stopped calibration phase: %s", phase)
+        engine_log.info("Duration: %.1fs, Features collected: %d", duration, feature_count)
         
         if feature_count > 0:
             # Report feature count
             sample_features = self.calibration_data[phase]['features'][0]
-            print(f"Features per window: {len(sample_features)}")
+            engine_log.info("Features per window: %d", len(sample_features))
         
         if phase == 'task' and self.current_task:
             tasks = self.calibration_data.get('tasks', {})
             task_bucket = tasks.get(self.current_task, {})
             task_features = len(task_bucket.get('features', []))
             if task_features > 0:
-                print(f"Task '{self.current_task}' saved with {task_features} feature windows")
+                engine_log.info("Task '%s' saved with %d feature windows", self.current_task, task_features)
         
+        closing_task = self.current_task if phase == 'task' else None
         self.current_state = 'idle'
         self.current_task = None
         self.state_start_time = None
+        
+        if closing_task and hasattr(self, '_on_task_phase_closed'):
+            self._on_task_phase_closed(closing_task)
     
     def set_log_function(self, log_func):
         """Set logging function for compatibility"""
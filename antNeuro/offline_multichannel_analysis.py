@@ -27,6 +27,16 @@ from typing import Optional, Dict, List, Any, Tuple
 from scipy import signal
 import warnings
 import threading
+import multiprocessing as mp
+import queue as _queue
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait as _wait_futures
+from multiprocessing import shared_memory
+
+from utils.multichannel_quality import multichannel_quality_metrics
+from utils.bl_log import get_logger
+from utils.audio_cues import attach_cues
+
+engine_log = get_logger("engine")
 
 # Try to import base engine for analyze_all_tasks_data
 BASE_ENGINE_AVAILABLE = False
@@ -34,7 +44,7 @@ EnhancedFeatureAnalysisEngine = None
 EnhancedAnalyzerConfig = None
 
 try:
-    from BrainLinkAnalyzer_GUI_Enhanced import (
+    from brainlink_core.enhanced import (
         EnhancedFeatureAnalysisEngine,
         EnhancedAnalyzerConfig
     )
@@ -86,6 +96,53 @@ except ImportError:
 _BaseClass = EnhancedFeatureAnalysisEngine if BASE_ENGINE_AVAILABLE else object
 
 
+class OfflineAnalysisCancelled(Exception):
+    """Raised inside feature extraction when cancel_offline_analysis() was requested."""
+
+
+# Engine attributes a phase worker needs for _extract_windowed_features (no full __init__)
+_PHASE_WORKER_ATTRS = (
+    'fs', 'channel_count', 'channel_names', 'window_size', 'window_overlap',
+    'channel_index', 'primary_channel_idx', 'region_indices', 'asymmetry_indices', 'bands',
+)
+# Below this many windows the worker start-up cost (spawn + imports) outweighs the gain
+_PARALLEL_MIN_WINDOWS = 300
+_worker_cancel_event = None
+_worker_progress_queue = None
+
+
+def _init_phase_worker(cancel_event, progress_queue):
+    global _worker_cancel_event, _worker_progress_queue
+    _worker_cancel_event = cancel_event
+    _worker_progress_queue = progress_queue
+
+
+def _extract_phase_worker(shm_name: str, shape: Tuple[int, int], dtype: str,
+                          start: int, stop: int, engine_state: Dict[str, Any], phase_idx: int):
+    """Process-pool entry point: extract features for one phase from shared memory."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        engine = OfflineMultichannelEngine.__new__(OfflineMultichannelEngine)
+        engine.__dict__.update(engine_state)
+
+        def _report(done, total):
+            if _worker_progress_queue is not None:
+                _worker_progress_queue.put((phase_idx, done, total))
+
+        def _cancelled():
+            return _worker_cancel_event is not None and _worker_cancel_event.is_set()
+
+        samples = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        try:
+            features_list = engine._extract_windowed_features(
+                samples[start:stop], should_cancel=_cancelled, window_progress=_report)
+        finally:
+            del samples  # Release the buffer view before closing the segment
+        return phase_idx, features_list, getattr(engine, 'artifact_summary', {})
+    finally:
+        shm.close()
+
+
 class OfflineMultichannelEngine(_BaseClass):
     """
     Offline 64-channel EEG recording and analysis engine.
@@ -161,6 +218,7 @@ class OfflineMultichannelEngine(_BaseClass):
         
         # Phase markers
         self.phase_markers = []  # List of {'phase': str, 'task': str, 'start': float, 'end': float}
+        self.cue_events = []  # Audio cues: {'cue': str, 'time': float, 'requested': float, ...} (same time base)
         self.current_phase = None
         self.current_task = None
         self.phase_start_time = None
@@ -264,47 +322,35 @@ class OfflineMultichannelEngine(_BaseClass):
             'channel_quality': {}  # Quality score per channel (0-1)
         }
         
-        # 1. Detect flat channels (likely disconnected)
-        for ch_idx in range(n_channels):
-            ch_data = data[:, ch_idx]
-            std = np.std(ch_data)
-            
-            # Flat signal detection (<0.1 µV std)
-            if std < 0.1:
-                artifact_info['flat_channels'].append(ch_idx)
-                artifact_info['bad_channels'].append(ch_idx)
-                artifact_info['channel_quality'][ch_idx] = 0.0
-                continue
-            
-            # Check for excessive amplitude (>200 µV)
-            max_amp = np.max(np.abs(ch_data))
-            if max_amp > 200:
-                artifact_info['noisy_channels'].append(ch_idx)
-                artifact_info['bad_channels'].append(ch_idx)
-                artifact_info['channel_quality'][ch_idx] = 0.3
-                continue
-            
-            # Compute quality score based on std and amplitude
-            # Good EEG typically has 5-50 µV std
-            if 5 <= std <= 50 and max_amp <= 150:
-                quality = 1.0
-            elif 2 <= std <= 80 and max_amp <= 200:
-                quality = 0.7
-            else:
-                quality = 0.5
-            
-            artifact_info['channel_quality'][ch_idx] = quality
-        
-        # 2. Detect high-amplitude artifact windows
-        window_size = int(0.5 * self.fs)  # 0.5 second windows
-        for start_idx in range(0, n_samples - window_size, window_size // 2):
-            end_idx = start_idx + window_size
-            window = data[start_idx:end_idx, :]
-            
-            # Check for sudden amplitude spikes across channels
-            max_per_channel = np.max(np.abs(window), axis=0)
-            if np.mean(max_per_channel) > 150:  # Average across channels exceeds threshold
-                artifact_info['artifact_windows'].append((start_idx, end_idx))
+        metrics = multichannel_quality_metrics(
+            data, self.fs, spectral=False, spike_window_s=0.5, spike_threshold=150.0
+        )
+        std = metrics['std']
+        max_amp = metrics['max_abs']
+        
+        # 1. Flat signal (<0.1 µV std, likely disconnected) and excessive amplitude (>200 µV)
+        flat = std < 0.1
+        noisy = ~flat & (max_amp > 200)
+        
+        # Quality score from std and amplitude; good EEG typically has 5-50 µV std
+        quality = np.select(
+            [flat, noisy,
+             (std >= 5) & (std <= 50) & (max_amp <= 150),
+             (std >= 2) & (std <= 80) & (max_amp <= 200)],
+            [0.0, 0.3, 1.0, 0.7],
+            default=0.5,
+        )
+        artifact_info['flat_channels'] = np.flatnonzero(flat).tolist()
+        artifact_info['noisy_channels'] = np.flatnonzero(noisy).tolist()
+        artifact_info['bad_channels'] = np.flatnonzero(flat | noisy).tolist()
+        artifact_info['channel_quality'] = dict(enumerate(quality.tolist()))
+        
+        # 2. High-amplitude artifact windows (0.5 s, half overlap): mean of
+        # per-channel peak amplitude above threshold
+        window_size = metrics['spike_window']
+        artifact_info['artifact_windows'] = [
+            (int(start), int(start) + window_size) for start in metrics['spike_windows']
+        ]
         
         return artifact_info
     
@@ -328,7 +374,7 @@ class OfflineMultichannelEngine(_BaseClass):
         # 1. Remove bad channels by interpolating from neighbors
         bad_channels = artifact_info.get('bad_channels', [])
         if bad_channels:
-            print(f"[ARTIFACT REMOVAL] Interpolating {len(bad_channels)} bad channels")
+            engine_log.info("[ARTIFACT REMOVAL] Interpolating %d bad channels", len(bad_channels))
             for bad_ch in bad_channels:
                 if 0 < bad_ch < n_channels - 1:
                     # Simple average of neighbors
@@ -341,7 +387,7 @@ class OfflineMultichannelEngine(_BaseClass):
         # 2. Remove high-amplitude artifact windows by linear interpolation
         artifact_windows = artifact_info.get('artifact_windows', [])
         if artifact_windows:
-            print(f"[ARTIFACT REMOVAL] Interpolating {len(artifact_windows)} artifact windows")
+            engine_log.info("[ARTIFACT REMOVAL] Interpolating %d artifact windows", len(artifact_windows))
             for start_idx, end_idx in artifact_windows:
                 if start_idx > 0 and end_idx < n_samples - 1:
                     # Linear interpolation across all channels
@@ -464,6 +510,19 @@ class OfflineMultichannelEngine(_BaseClass):
         if hasattr(self, 'current_should_record'):
             self.current_should_record = True
     
+    def record_cue(self, event: Dict[str, Any]):
+        """Store an audio cue (utils.audio_cues event) in the phase marker time base."""
+        if not self.recording_start_time:
+            return
+        self.cue_events.append({
+            'cue': event.get('cue'),
+            'time': event['played'] - self.recording_start_time,
+            'requested': event['requested'] - self.recording_start_time,
+            'audio': event.get('audio', False),
+            'phase': self.current_phase,
+            'task': self.current_task,
+        })
+    
     # Compatibility methods
     def start_calibration_phase(self, phase: str, task_type: str = None):
         """Compatibility wrapper for start_phase."""
@@ -477,18 +536,23 @@ class OfflineMultichannelEngine(_BaseClass):
         """Set logging function for compatibility."""
         self._log_func = log_func
     
-    def analyze_offline(self, progress_callback=None) -> Dict[str, Any]:
+    def analyze_offline(self, progress_callback=None, workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Perform offline analysis on recorded data.
         
         This is called when the user clicks "Analyze" after recording.
         Extracts features from all phases and runs statistical analysis.
+        Independent phases are extracted in a process pool (one phase per
+        task, shared-memory input); results are merged in marker order so
+        calibration_data matches a serial run exactly.
         
         Args:
             progress_callback: Function to call with progress (0-100)
+            workers: Worker processes (default: BL_OFFLINE_WORKERS or CPU count - 1;
+                     1 runs serially in this process)
         
         Returns:
-            Dictionary with analysis results
+            Dictionary with analysis results (None if cancelled or no data)
         """
         print(f"\n{'='*70}")
         print(f"[OFFLINE ENGINE] STARTING OFFLINE ANALYSIS")
@@ -504,58 +568,61 @@ class OfflineMultichannelEngine(_BaseClass):
             print("[OFFLINE ENGINE] No phase markers found!")
             return None
         
+        self._offline_cancel = threading.Event()
+        
         # Convert raw data to numpy array
         timestamps = np.array([t for t, _ in self.raw_data])
         samples = np.array([s for _, s in self.raw_data])
         
         total_phases = len(self.phase_markers)
         
-        # Process each phase
+        # Slice each phase once; phases too short to window are skipped
+        jobs = []  # (phase_idx, marker, phase_data)
         for phase_idx, marker in enumerate(self.phase_markers):
-            phase = marker['phase']
-            task = marker['task']
-            start_time = marker['start']
-            end_time = marker['end']
-            
-            if progress_callback:
-                progress_callback(int(phase_idx / total_phases * 50))
-            
-            print(f"[OFFLINE ENGINE] Processing phase: {phase} (t={start_time:.1f}s to {end_time:.1f}s)")
-            
-            # Extract samples for this phase
-            mask = (timestamps >= start_time) & (timestamps <= end_time)
+            mask = (timestamps >= marker['start']) & (timestamps <= marker['end'])
             phase_data = samples[mask]
-            
             if len(phase_data) < self.fs * self.window_size:
-                print(f"  Warning: Not enough data for phase {phase} ({len(phase_data)} samples)")
+                engine_log.warning("  Warning: Not enough data for phase %s (%d samples)", marker['phase'], len(phase_data))
                 continue
-            
-            # Extract features using windowing
-            features_list = self._extract_windowed_features(phase_data, progress_callback, 
-                                                            base_progress=int(phase_idx / total_phases * 50))
-            
+            jobs.append((phase_idx, marker, phase_data))
+        
+        if workers is None:
+            try:
+                workers = int(os.environ.get("BL_OFFLINE_WORKERS", "0")) or None
+            except ValueError:
+                workers = None
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) - 1)
+            if sum(self._phase_window_count(len(d)) for _, _, d in jobs) < _PARALLEL_MIN_WINDOWS:
+                workers = 1
+        workers = max(1, min(int(workers), len(jobs) or 1))
+        
+        try:
+            results = None
+            if workers > 1:
+                try:
+                    results = self._extract_phases_parallel(jobs, total_phases, workers, progress_callback)
+                except OfflineAnalysisCancelled:
+                    raise
+                except Exception as e:
+                    print(f"[OFFLINE ENGINE] Parallel extraction unavailable ({e}); falling back to serial")
+                    results = None
+            if results is None:
+                results = self._extract_phases_serial(jobs, total_phases, progress_callback)
+        except OfflineAnalysisCancelled:
+            print("[OFFLINE ENGINE] Offline analysis cancelled")
+            return None
+        
+        # Merge in marker order (same overwrite semantics as processing phases one by one)
+        for phase_idx, marker, _ in jobs:
+            features_list, artifact_info = results.get(phase_idx, ([], None))
+            engine_log.info("[OFFLINE ENGINE] Processing phase: %s (t=%.1fs to %.1fs)", marker['phase'], marker['start'], marker['end'])
+            if artifact_info is not None:
+                self.artifact_summary = artifact_info
             if not features_list:
                 continue
-            
-            # Store features
-            if phase == 'eyes_closed':
-                self.calibration_data['eyes_closed']['features'] = features_list
-                self.calibration_data['eyes_closed']['timestamps'] = list(range(len(features_list)))
-            elif phase == 'eyes_open':
-                self.calibration_data['eyes_open']['features'] = features_list
-                self.calibration_data['eyes_open']['timestamps'] = list(range(len(features_list)))
-            elif phase == 'task':
-                self.calibration_data['task']['features'] = features_list
-                self.calibration_data['task']['timestamps'] = list(range(len(features_list)))
-                
-                if task:
-                    tasks = self.calibration_data.setdefault('tasks', {})
-                    tasks[task] = {
-                        'features': features_list,
-                        'timestamps': list(range(len(features_list)))
-                    }
-            
-            print(f"  Extracted {len(features_list)} feature windows ({len(features_list[0])} features each)")
+            self._store_phase_features(marker, features_list)
+            engine_log.info("  Extracted %d feature windows (%d features each)", len(features_list), len(features_list[0]))
         
         if progress_callback:
             progress_callback(60)
@@ -573,7 +640,115 @@ class OfflineMultichannelEngine(_BaseClass):
         
         return self.calibration_data
     
-    def _extract_windowed_features(self, data: np.ndarray, progress_callback=None, base_progress=0) -> List[Dict]:
+    def cancel_offline_analysis(self):
+        """Request cancellation of a running analyze_offline() (safe from any thread)."""
+        cancel = getattr(self, '_offline_cancel', None)
+        if cancel is not None:
+            cancel.set()
+    
+    def _store_phase_features(self, marker: Dict[str, Any], features_list: List[Dict]) -> None:
+        phase = marker['phase']
+        task = marker['task']
+        if phase == 'eyes_closed':
+            self.calibration_data['eyes_closed']['features'] = features_list
+            self.calibration_data['eyes_closed']['timestamps'] = list(range(len(features_list)))
+        elif phase == 'eyes_open':
+            self.calibration_data['eyes_open']['features'] = features_list
+            self.calibration_data['eyes_open']['timestamps'] = list(range(len(features_list)))
+        elif phase == 'task':
+            self.calibration_data['task']['features'] = features_list
+            self.calibration_data['task']['timestamps'] = list(range(len(features_list)))
+            
+            if task:
+                tasks = self.calibration_data.setdefault('tasks', {})
+                tasks[task] = {
+                    'features': features_list,
+                    'timestamps': list(range(len(features_list)))
+                }
+    
+    def _phase_window_count(self, n_samples: int) -> int:
+        window_samples = int(self.window_size * self.fs)
+        step_samples = max(1, int(window_samples * (1 - self.window_overlap)))
+        return max(1, (n_samples - window_samples) // step_samples + 1)
+    
+    def _extract_phases_serial(self, jobs, total_phases, progress_callback=None):
+        """Extract each phase in this process; returns {phase_idx: (features, artifact_info)}."""
+        results = {}
+        cancel = self._offline_cancel
+        for phase_idx, marker, phase_data in jobs:
+            if progress_callback:
+                progress_callback(int(phase_idx / total_phases * 50))
+            features_list = self._extract_windowed_features(
+                phase_data, progress_callback,
+                base_progress=int(phase_idx / total_phases * 50),
+                should_cancel=cancel.is_set)
+            results[phase_idx] = (features_list, self.artifact_summary)
+        return results
+    
+    def _extract_phases_parallel(self, jobs, total_phases, workers, progress_callback=None):
+        """Fan phases out to a process pool reading one shared-memory block."""
+        if not jobs:
+            return {}
+        n_channels = jobs[0][2].shape[1]
+        offsets = []
+        total = 0
+        for _, _, phase_data in jobs:
+            offsets.append((total, total + len(phase_data)))
+            total += len(phase_data)
+        dtype = jobs[0][2].dtype
+        shm = shared_memory.SharedMemory(create=True, size=max(1, total * n_channels * np.dtype(dtype).itemsize))
+        ctx = mp.get_context('spawn')  # fork is unsafe with Qt/streaming threads alive
+        cancel_event = ctx.Event()
+        progress_queue = ctx.Queue()
+        engine_state = {name: getattr(self, name) for name in _PHASE_WORKER_ATTRS if hasattr(self, name)}
+        window_totals = {phase_idx: self._phase_window_count(len(phase_data)) for phase_idx, _, phase_data in jobs}
+        window_done = {phase_idx: 0 for phase_idx, _, _ in jobs}
+        last_pct = -1
+        results = {}
+        print(f"[OFFLINE ENGINE] Extracting {len(jobs)} phases with {workers} worker processes")
+        try:
+            shared = np.ndarray((total, n_channels), dtype=dtype, buffer=shm.buf)
+            for (start, stop), (_, _, phase_data) in zip(offsets, jobs):
+                shared[start:stop] = phase_data
+            del shared
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=_init_phase_worker,
+                                     initargs=(cancel_event, progress_queue)) as pool:
+                pending = {
+                    pool.submit(_extract_phase_worker, shm.name, (total, n_channels), np.dtype(dtype).str,
+                                start, stop, engine_state, phase_idx)
+                    for (start, stop), (phase_idx, _, _) in zip(offsets, jobs)
+                }
+                while pending:
+                    done, pending = _wait_futures(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    if self._offline_cancel.is_set():
+                        cancel_event.set()
+                        for fut in pending:
+                            fut.cancel()
+                        raise OfflineAnalysisCancelled()
+                    for fut in done:
+                        phase_idx, features_list, artifact_info = fut.result()
+                        results[phase_idx] = (features_list, artifact_info)
+                        window_done[phase_idx] = window_totals[phase_idx]
+                    while True:
+                        try:
+                            phase_idx, n_done, _ = progress_queue.get_nowait()
+                        except _queue.Empty:
+                            break
+                        window_done[phase_idx] = max(window_done[phase_idx], n_done)
+                    if progress_callback:
+                        frac = sum(window_done.values()) / float(sum(window_totals.values()))
+                        pct = int(frac * 50)
+                        if pct != last_pct:
+                            last_pct = pct
+                            progress_callback(pct)
+        finally:
+            shm.close()
+            shm.unlink()
+        return results
+    
+    def _extract_windowed_features(self, data: np.ndarray, progress_callback=None, base_progress=0,
+                                   should_cancel=None, window_progress=None) -> List[Dict]:
         """
         Extract features from data using sliding windows.
         
@@ -581,6 +756,8 @@ class OfflineMultichannelEngine(_BaseClass):
             data: Shape (n_samples, n_channels)
             progress_callback: Progress callback
             base_progress: Base progress value
+            should_cancel: Optional callable; raises OfflineAnalysisCancelled when it returns True
+            window_progress: Optional callable(windows_done, windows_total)
         
         Returns:
             List of feature dictionaries
@@ -591,8 +768,8 @@ class OfflineMultichannelEngine(_BaseClass):
         
         # Perform artifact detection on full data
         artifact_info = self.detect_artifacts(data)
-        print(f"[ARTIFACT DETECTION] Bad channels: {len(artifact_info['bad_channels'])}")
-        print(f"[ARTIFACT DETECTION] Artifact windows: {len(artifact_info['artifact_windows'])}")
+        engine_log.info("[ARTIFACT DETECTION] Bad channels: %d, artifact windows: %d",
+                        len(artifact_info['bad_channels']), len(artifact_info['artifact_windows']))
         
         # Apply artifact removal
         cleaned_data = self.remove_artifacts(data, artifact_info)
@@ -606,12 +783,16 @@ class OfflineMultichannelEngine(_BaseClass):
         n_windows = (n_samples - window_samples) // step_samples + 1
         
         for i, start_idx in enumerate(range(0, n_samples - window_samples + 1, step_samples)):
+            if should_cancel is not None and should_cancel():
+                raise OfflineAnalysisCancelled()
             end_idx = start_idx + window_samples
             window_data = cleaned_data[start_idx:end_idx]
             
             features = self._extract_multichannel_features(window_data)
             if features:
                 features_list.append(features)
+            if window_progress is not None and (i + 1) % 10 == 0:
+                window_progress(i + 1, n_windows)
         
         return features_list
     
@@ -817,6 +998,8 @@ class OfflineMultichannelEngine(_BaseClass):
         # Include user email in markers filename
         email_safe = self.user_email.replace('@', '_').replace('.', '_')
         markers_file = os.path.join(self.save_dir, f"markers_{self.session_id}_{email_safe}.json")
+        # start_cue_ms / end_cue_ms: cue playback relative to each marker boundary
+        attach_cues(self.phase_markers, self.cue_events)
         
         with open(markers_file, 'w') as f:
             json.dump({
@@ -826,7 +1009,8 @@ class OfflineMultichannelEngine(_BaseClass):
                 'channel_count': self.channel_count,
                 'channel_names': self.channel_names,
                 'recording_file': self.session_file,
-                'phase_markers': self.phase_markers
+                'phase_markers': self.phase_markers,
+                'cue_events': self.cue_events
             }, f, indent=2)
         
         print(f"[OFFLINE ENGINE] Phase markers saved: {markers_file}")
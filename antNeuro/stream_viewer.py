@@ -4,6 +4,10 @@ ANT Neuro Real-Time EEG Stream Viewer
 ======================================
 Simple GUI to visualize live EEG data from ANT Neuro amplifier.
 
+The info bar shows display FPS and acquisition-to-paint latency (time from
+reading a block off the amplifier to the next repaint), so the viewer also
+works as an acquisition diagnostic.
+
 IMPORTANT: Must connect to amplifier BEFORE importing Qt to avoid USB conflicts!
 
 Usage:
@@ -95,13 +99,89 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QComboBox, QSpinBox, QGroupBox
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QEvent, QObject
 import pyqtgraph as pg
 
 # Already connected to device before Qt import!
 # global_device and global_amp_info are available
 
 
+class ChannelRingBuffer:
+    """Fixed-size (samples x channels) ring buffer with contiguous read views.
+    
+    Storage is mirrored (2 x capacity rows), so each block is written with
+    slice assignments and the most recent samples are always one contiguous
+    slice: views handed to the curves never need a copy or a reorder.
+    """
+    
+    def __init__(self, capacity, n_channels):
+        self.capacity = int(capacity)
+        self.n_channels = int(n_channels)
+        self._data = np.zeros((2 * self.capacity, self.n_channels))
+        self.head = 0  # Next write position (mod capacity)
+        self.count = 0  # Valid samples (<= capacity)
+    
+    def clear(self):
+        self.head = 0
+        self.count = 0
+    
+    def extend(self, block):
+        """Append a (n_samples, channels) block; channels beyond the block's columns read 0"""
+        block = block[-self.capacity:]
+        n = block.shape[0]
+        if n == 0:
+            return
+        n_cols = min(self.n_channels, block.shape[1])
+        if n_cols < self.n_channels:
+            padded = np.zeros((n, self.n_channels))
+            padded[:, :n_cols] = block[:, :n_cols]
+            block = padded
+        else:
+            block = block[:, :self.n_channels]
+        first = min(n, self.capacity - self.head)
+        # Write each row at head and at head + capacity (the mirror)
+        self._data[self.head:self.head + first] = block[:first]
+        self._data[self.head + self.capacity:self.head + self.capacity + first] = block[:first]
+        if first < n:
+            rest = n - first
+            self._data[:rest] = block[first:]
+            self._data[self.capacity:self.capacity + rest] = block[first:]
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.capacity, self.count + n)
+    
+    def latest(self):
+        """View of the valid samples, oldest first: (count, n_channels)"""
+        end = self.head + self.capacity
+        return self._data[end - self.count:end]
+
+
+class PaintLatencyProbe(QObject):
+    """Records the delay from a data block's arrival to the next paint of a widget"""
+    
+    def __init__(self, widget, history=200):
+        super().__init__(widget)
+        self.pending = None  # Arrival time of the newest block not yet painted
+        self.samples = deque(maxlen=history)
+        widget.installEventFilter(self)
+    
+    def mark(self, arrival_time):
+        if self.pending is None:
+            self.pending = arrival_time
+    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.pending is not None:
+            self.samples.append((time.perf_counter() - self.pending) * 1000.0)
+            self.pending = None
+        return False
+    
+    def summary(self):
+        """(median_ms, p95_ms) or None"""
+        if not self.samples:
+            return None
+        values = np.fromiter(self.samples, dtype=float)
+        return float(np.median(values)), float(np.percentile(values, 95))
+
+
 class EEGStreamViewer(QMainWindow):
     """Real-time EEG stream viewer with multi-channel display"""
     
@@ -112,7 +192,8 @@ class EEGStreamViewer(QMainWindow):
         self.is_streaming = False
         self.channels_to_display = 8  # Number of channels to show
         self.buffer_size = 500  # Number of samples to display (1 second at 500Hz)
-        self.channel_buffers = []
+        self.ring = None  # ChannelRingBuffer of displayed channels
+        self.x_axis = np.arange(self.buffer_size)  # Cached sample-index x-axis
         self.sample_rate = 500
         
         self.init_ui()
@@ -181,10 +262,13 @@ class EEGStreamViewer(QMainWindow):
         info_layout = QHBoxLayout()
         self.info_label = QLabel("Amplifier: Not connected")
         self.fps_label = QLabel("FPS: 0")
+        self.latency_label = QLabel("Latency: -")
+        self.latency_label.setToolTip("Time from reading a block off the amplifier to the next repaint (median / 95th percentile)")
         self.data_label = QLabel("Samples: 0")
         info_layout.addWidget(self.info_label)
         info_layout.addStretch()
         info_layout.addWidget(self.fps_label)
+        info_layout.addWidget(self.latency_label)
         info_layout.addWidget(self.data_label)
         main_layout.addLayout(info_layout)
         
@@ -192,6 +276,7 @@ class EEGStreamViewer(QMainWindow):
         self.plot_widget = pg.GraphicsLayoutWidget()
         self.plot_widget.setBackground('w')
         main_layout.addWidget(self.plot_widget)
+        self.latency_probe = PaintLatencyProbe(self.plot_widget.viewport())
         
         # Create plots for each channel
         self.plots = []
@@ -211,7 +296,7 @@ class EEGStreamViewer(QMainWindow):
         self.plot_widget.clear()
         self.plots = []
         self.curves = []
-        self.channel_buffers = []
+        self.ring = ChannelRingBuffer(self.buffer_size, self.channels_to_display)
         
         colors = [
             (255, 0, 0),      # Red
@@ -242,9 +327,6 @@ class EEGStreamViewer(QMainWindow):
             
             self.plots.append(plot)
             self.curves.append(curve)
-            
-            # Create data buffer
-            self.channel_buffers.append(deque(maxlen=self.buffer_size))
     
     def update_device_info(self):
         """Update UI with connected device information"""
@@ -320,8 +402,8 @@ class EEGStreamViewer(QMainWindow):
             self.channel_spin.setEnabled(False)
             
             # Clear buffers
-            for buffer in self.channel_buffers:
-                buffer.clear()
+            self.ring.clear()
+            self.latency_probe.samples.clear()
             
             # Start update timer (30 FPS)
             self.update_timer.start(33)
@@ -376,21 +458,20 @@ class EEGStreamViewer(QMainWindow):
             # Read samples (50ms worth of data)
             num_samples = max(10, int(self.sample_rate * 0.05))
             data = self.device.read_samples(num_samples)
+            arrival_time = time.perf_counter()
             
             if data is None or data.shape[0] == 0:
                 return
             
-            # Update buffers with new data
-            for sample_idx in range(data.shape[0]):
-                for ch_idx in range(min(self.channels_to_display, data.shape[1])):
-                    self.channel_buffers[ch_idx].append(data[sample_idx, ch_idx])
+            # Update buffers with new data (one block write)
+            self.ring.extend(data)
             
-            # Update plots
-            for ch_idx in range(self.channels_to_display):
-                if len(self.channel_buffers[ch_idx]) > 0:
-                    y_data = np.array(self.channel_buffers[ch_idx])
-                    x_data = np.arange(len(y_data))
-                    self.curves[ch_idx].setData(x_data, y_data)
+            # Update plots from views of the ring buffer
+            window = self.ring.latest()
+            x_data = self.x_axis[:window.shape[0]]
+            for ch_idx in range(min(self.channels_to_display, data.shape[1])):
+                self.curves[ch_idx].setData(x_data, window[:, ch_idx])
+            self.latency_probe.mark(arrival_time)
             
             # Update data counter
             self.data_label.setText(f"Samples: {data.shape[0]} x {data.shape[1]} ch")
@@ -403,6 +484,9 @@ class EEGStreamViewer(QMainWindow):
             if elapsed >= 1.0:
                 fps = self.frame_count / elapsed
                 self.fps_label.setText(f"FPS: {fps:.1f}")
+                latency = self.latency_probe.summary()
+                if latency is not None:
+                    self.latency_label.setText(f"Latency: {latency[0]:.1f} ms (p95 {latency[1]:.1f} ms)")
                 self.frame_count = 0
                 self.last_update_time = current_time
             
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark kernels for the analysis hot paths.
+
+Every kernel is built from seeded synthetic EEG so runs are repeatable.
+A kernel is registered as ``(name, setup)``; ``setup()`` prepares inputs
+and returns the callable that is timed, so engine construction and data
+generation are never part of the measurement. Stateful kernels (caches,
+calibration buffers) get a fresh setup per repetition.
+
+Channel-dependent kernels are registered once per channel count, e.g.
+``quality.assess_multichannel[ch=32]``. The ``startup.first_dialog``
+kernels launch the Sequential GUI in a subprocess and time it until the
+OS-selection dialog is shown (``BL_STARTUP_PROBE``), with lazy and with
+eager analysis imports.
+
+Author: BrainLink Companion Team
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANTNEURO_DIR = os.path.join(ROOT_DIR, 'antNeuro')
+for _path in (ROOT_DIR, ANTNEURO_DIR):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+DEFAULT_CHANNELS = (1, 8, 32, 64)
+SEED = 1234
+STARTUP_TIMEOUT_S = 120
+
+Kernel = Tuple[str, Callable[[], Callable[[], object]]]
+
+
+# ----------------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------------
+
+def synthetic_eeg(n_samples: int, n_channels: int = 1, fs: float = 512.0, seed: int = SEED) -> np.ndarray:
+    """(n_samples, n_channels) µV: 1/f background, 10 Hz alpha, 50 Hz mains and sparse blinks."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / fs
+    white = rng.standard_normal((n_samples, n_channels))
+    # Pink-ish background via cumulative smoothing of white noise
+    pink = np.cumsum(white, axis=0)
+    pink -= np.linspace(0, 1, n_samples)[:, None] * pink[-1]
+    pink *= 8.0 / (pink.std(axis=0, keepdims=True) + 1e-12)
+    alpha = 12.0 * np.sin(2 * np.pi * 10.0 * t)[:, None] * rng.uniform(0.5, 1.5, n_channels)
+    mains = 3.0 * np.sin(2 * np.pi * 50.0 * t)[:, None]
+    data = pink + alpha + mains + 4.0 * white
+    for start in rng.integers(0, max(1, n_samples - int(0.3 * fs)), size=max(1, n_samples // int(8 * fs))):
+        width = int(0.3 * fs)
+        data[start:start + width, :min(4, n_channels)] += 120.0 * np.hanning(width)[:, None]
+    return data
+
+
+def synthetic_feature_windows(n_windows: int, n_features: int, shift: float = 0.0, seed: int = SEED,
+                              step_s: float = 1.0) -> Dict[str, List]:
+    """Feature-window bucket ({'features', 'timestamps'}) like calibration_data entries."""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=1.0, sigma=0.4, size=(n_windows, n_features)) + shift
+    names = [f"feat_{i:03d}_power" for i in range(n_features)]
+    features = [dict(zip(names, row.tolist())) for row in values]
+    timestamps = (1_700_000_000.0 + np.arange(n_windows) * step_s).tolist()
+    return {'features': features, 'timestamps': timestamps}
+
+
+def _per_feature_arrays(n_features: int, n_task: int, n_base: int, seed: int = SEED) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    return {
+        f"feat_{i:03d}": (rng.normal(0.3, 1.0, n_task), rng.normal(0.0, 1.0, n_base))
+        for i in range(n_features)
+    }
+
+
+# ----------------------------------------------------------------------------
+# Engines
+# ----------------------------------------------------------------------------
+
+def _enhanced_config(**overrides):
+    from brainlink_core.enhanced import EnhancedAnalyzerConfig
+    settings = dict(fast_mode=False, n_perm=200, seed=SEED, result_cache=False)
+    settings.update(overrides)
+    return EnhancedAnalyzerConfig(**settings)
+
+
+def _base_extract_features() -> Callable[[], object]:
+    from brainlink_core.engine import FeatureAnalysisEngine
+    engine = FeatureAnalysisEngine()
+    window = synthetic_eeg(engine.window_samples, 1, fs=engine.fs)[:, 0]
+    return lambda: engine.extract_features(window)
+
+
+def _enhanced_extract_features() -> Callable[[], object]:
+    from brainlink_core.enhanced import EnhancedFeatureAnalysisEngine
+    engine = EnhancedFeatureAnalysisEngine(config=_enhanced_config())
+    window = synthetic_eeg(engine.window_samples, 1, fs=engine.fs)[:, 0]
+    return lambda: engine.extract_features(window)
+
+
+def _permutation_sum_p() -> Callable[[], object]:
+    from brainlink_core.enhanced import EnhancedFeatureAnalysisEngine
+    engine = EnhancedFeatureAnalysisEngine(config=_enhanced_config())
+    data = _per_feature_arrays(n_features=40, n_task=60, n_base=120)
+    engine.cache_manager.clear()
+    return lambda: engine._permutation_sum_p(data, observed_sum=25.0)
+
+
+def _permutation_sum_p_blocks() -> Callable[[], object]:
+    from brainlink_core.enhanced import EnhancedFeatureAnalysisEngine
+    engine = EnhancedFeatureAnalysisEngine(config=_enhanced_config())
+    blocks = _per_feature_arrays(n_features=20, n_task=12, n_base=12)
+    engine.cache_manager.clear()
+    # Python-level loop over permutations x features; 100 keeps a run around a few seconds
+    return lambda: engine._permutation_sum_p_blocks(blocks, n_perm=100)
+
+
+def _analyze_across_tasks() -> Callable[[], object]:
+    from brainlink_core.enhanced import EnhancedFeatureAnalysisEngine
+    engine = EnhancedFeatureAnalysisEngine(config=_enhanced_config())
+    baseline = synthetic_feature_windows(120, 60, seed=SEED)
+    for name in baseline['features'][0]:
+        column = np.array([w[name] for w in baseline['features']])
+        engine.baseline_stats[name] = {'mean': float(column.mean()), 'std': float(column.std())}
+    tasks = {
+        f"task_{k}": synthetic_feature_windows(96, 60, shift=0.1 * k, seed=SEED + k)
+        for k in range(4)
+    }
+    engine.cache_manager.clear()
+    return lambda: engine._analyze_across_tasks(tasks)
+
+
+def _multichannel_features(n_channels: int) -> Callable[[], Callable[[], object]]:
+    def setup():
+        from enhanced_multichannel_analysis import Enhanced64ChannelEngine
+        engine = Enhanced64ChannelEngine(sample_rate=500, channel_count=n_channels, config=_enhanced_config())
+        window = synthetic_eeg(int(2.0 * 500), n_channels, fs=500.0)
+        return lambda: engine.extract_multichannel_features(window)
+    return setup
+
+
+def _offline_analysis(n_channels: int) -> Callable[[], Callable[[], object]]:
+    def setup():
+        from offline_multichannel_analysis import OfflineMultichannelEngine
+        fs = 500
+        engine = OfflineMultichannelEngine(sample_rate=fs, channel_count=n_channels,
+                                           save_dir=tempfile.mkdtemp(prefix="bl_bench_"))
+        seconds = 40
+        data = synthetic_eeg(seconds * fs, n_channels, fs=float(fs))
+        engine.raw_data = [(i / fs, data[i]) for i in range(len(data))]
+        engine.phase_markers = [
+            {'phase': 'eyes_closed', 'task': None, 'start': 0.0, 'end': 16.0},
+            {'phase': 'eyes_open', 'task': None, 'start': 16.0, 'end': 24.0},
+            {'phase': 'task', 'task': 'mental_math', 'start': 24.0, 'end': 32.0},
+            {'phase': 'task', 'task': 'visual_imagery', 'start': 32.0, 'end': 40.0},
+        ]
+        return lambda: engine.analyze_offline(workers=1)
+    return setup
+
+
+def _signal_quality(n_channels: int) -> Callable[[], Callable[[], object]]:
+    def setup():
+        from BrainLinkAnalyzer_GUI_Sequential_Integrated import assess_multichannel_signal_quality
+        data = synthetic_eeg(4 * 500, n_channels, fs=500.0)
+        return lambda: assess_multichannel_signal_quality(data, fs=500)
+    return setup
+
+
+def _startup_first_dialog(lazy: bool) -> Callable[[], Callable[[], object]]:
+    def setup():
+        script = os.path.join(ROOT_DIR, 'BrainLinkAnalyzer_GUI_Sequential_Integrated.py')
+        env = dict(os.environ, BL_STARTUP_PROBE='1', BL_LAZY_IMPORTS='1' if lazy else '0')
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        env.pop('BL_IMPORT_PROFILE', None)
+
+        def launch():
+            # The GUI prints one BL_STARTUP line and exits once the first dialog is up
+            proc = subprocess.run([sys.executable, script], cwd=ROOT_DIR, env=env, capture_output=True,
+                                  text=True, encoding='utf-8', errors='replace', timeout=STARTUP_TIMEOUT_S)
+            for line in proc.stdout.splitlines():
+                if line.startswith('BL_STARTUP '):
+                    return json.loads(line[len('BL_STARTUP '):])
+            tail = (proc.stderr.strip().splitlines() or ['no output'])[-1]
+            raise RuntimeError(f"GUI exited ({proc.returncode}) before the first dialog: {tail}")
+        return launch
+    return setup
+
+
+def all_kernels(channels: Sequence[int] = DEFAULT_CHANNELS) -> List[Kernel]:
+    """Every registered kernel, channel sweeps expanded for ``channels``."""
+    kernels: List[Kernel] = [
+        ('engine.extract_features', _base_extract_features),
+        ('enhanced.extract_features', _enhanced_extract_features),
+        ('enhanced.permutation_sum_p', _permutation_sum_p),
+        ('enhanced.permutation_sum_p_blocks', _permutation_sum_p_blocks),
+        ('enhanced.analyze_across_tasks', _analyze_across_tasks),
+    ]
+    for ch in channels:
+        kernels.append((f'multichannel.extract_features[ch={ch}]', _multichannel_features(ch)))
+    for ch in channels:
+        kernels.append((f'offline.analyze_offline[ch={ch}]', _offline_analysis(ch)))
+    for ch in channels:
+        kernels.append((f'quality.assess_multichannel[ch={ch}]', _signal_quality(ch)))
+    kernels.append(('startup.first_dialog[lazy]', _startup_first_dialog(lazy=True)))
+    kernels.append(('startup.first_dialog[eager]', _startup_first_dialog(lazy=False)))
+    return kernels
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmarks and store or compare per-machine baselines.
+
+    python benchmarks/run_benchmarks.py                  # run and print
+    python benchmarks/run_benchmarks.py --save           # write baselines/<machine>.json
+    python benchmarks/run_benchmarks.py --compare        # exit 1 on regressions
+    python benchmarks/run_benchmarks.py --compare --threshold 0.15 --filter permutation
+
+Each kernel is set up fresh, warmed up once, then timed ``--repeat`` times.
+The median is recorded. A kernel counts as a regression when its median
+exceeds the baseline median by more than ``--threshold`` (fraction) and
+by more than ``--min-delta-ms`` (timer noise on very fast kernels).
+Kernels whose modules cannot be imported on this machine are reported
+as skipped.
+
+Author: BrainLink Companion Team
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Quiet, headless runs: no Qt windows, no per-window engine logging
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('BL_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('BL_LATENCY', '0')
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from bench_kernels import DEFAULT_CHANNELS, all_kernels  # noqa: E402
+
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+
+
+def machine_id() -> str:
+    """Stable file-name-safe id for this machine and interpreter."""
+    raw = f"{platform.node()}-{platform.system()}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', raw).strip('_').lower()
+
+
+def machine_info() -> Dict[str, Any]:
+    info = {
+        'id': machine_id(),
+        'node': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+    for module in ('numpy', 'scipy', 'pandas'):
+        try:
+            info[module] = __import__(module).__version__
+        except Exception:
+            info[module] = None
+    return info
+
+
+def time_kernel(setup, repeat: int) -> Dict[str, Any]:
+    """Warm up once, then time ``repeat`` fresh runs; returns ms statistics."""
+    samples = []
+    sink = io.StringIO()
+    for i in range(repeat + 1):
+        with contextlib.redirect_stdout(sink):
+            fn = setup()
+            t0 = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - t0) * 1000.0
+        sink.seek(0)
+        sink.truncate()
+        if i > 0:  # First run is the warm-up (imports, JIT-like caches in scipy/numpy)
+            samples.append(elapsed)
+    return {
+        'median_ms': round(statistics.median(samples), 4),
+        'min_ms': round(min(samples), 4),
+        'max_ms': round(max(samples), 4),
+        'repeat': repeat,
+    }
+
+
+def run(kernels, repeat: int) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    width = max((len(name) for name, _ in kernels), default=10)
+    for name, setup in kernels:
+        try:
+            stats = time_kernel(setup, repeat)
+            print(f"{name:<{width}}  median {stats['median_ms']:10.2f} ms  min {stats['min_ms']:10.2f} ms")
+        except Exception as e:
+            stats = {'skipped': f"{type(e).__name__}: {e}"}
+            print(f"{name:<{width}}  skipped ({stats['skipped']})")
+        results[name] = stats
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float, min_delta_ms: float) -> List[str]:
+    """Print a comparison table; returns the names of regressed kernels."""
+    base_results = baseline.get('results', {})
+    regressions = []
+    width = max((len(name) for name in results), default=10)
+    print()
+    print(f"Compared with baseline from {baseline.get('created', '?')} ({baseline.get('machine', {}).get('id', '?')})")
+    print(f"{'kernel':<{width}}  {'baseline':>10}  {'current':>10}  {'change':>8}")
+    for name, cur in results.items():
+        base = base_results.get(name)
+        if 'median_ms' not in cur or not base or 'median_ms' not in base:
+            status = 'skipped' if 'median_ms' not in cur else 'new'
+            print(f"{name:<{width}}  {'-':>10}  {cur.get('median_ms', '-'):>10}  {status:>8}")
+            continue
+        b, c = float(base['median_ms']), float(cur['median_ms'])
+        change = (c - b) / b if b > 0 else 0.0
+        flag = ''
+        if change > threshold and (c - b) > min_delta_ms:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        elif change < -threshold and (b - c) > min_delta_ms:
+            flag = '  faster'
+        print(f"{name:<{width}}  {b:>10.2f}  {c:>10.2f}  {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BrainLink hot-path benchmarks")
+    parser.add_argument('--save', action='store_true', help="Store results as this machine's baseline")
+    parser.add_argument('--compare', action='store_true', help="Compare with the stored baseline; exit 1 on regressions")
+    parser.add_argument('--baseline', default=None, help="Baseline file (default: baselines/<machine>.json)")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown as a fraction (default: %(default)s)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help="Ignore slowdowns smaller than this (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per kernel (default: %(default)s)")
+    parser.add_argument('--channels', default=",".join(str(c) for c in DEFAULT_CHANNELS),
+                        help="Channel counts for multi-channel kernels (default: %(default)s)")
+    parser.add_argument('--filter', default=None, help="Only run kernels whose name contains this text")
+    parser.add_argument('--json', default=None, help="Also write this run's results to a file")
+    parser.add_argument('--list', action='store_true', help="List kernel names and exit")
+    args = parser.parse_args(argv)
+
+    channels = [int(c) for c in args.channels.split(',') if c.strip()]
+    kernels = all_kernels(channels)
+    if args.filter:
+        kernels = [(n, s) for n, s in kernels if args.filter in n]
+    if args.list:
+        for name, _ in kernels:
+            print(name)
+        return 0
+    if not kernels:
+        print("No kernels match the filter")
+        return 2
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{machine_id()}.json")
+    baseline = None
+    if args.compare:
+        if not os.path.isfile(baseline_path):
+            print(f"No baseline at {baseline_path}; run with --save first")
+            return 2
+        with open(baseline_path, 'r', encoding='utf-8') as fh:
+            baseline = json.load(fh)
+
+    print(f"Running {len(kernels)} kernels on {machine_id()} (repeat={args.repeat})")
+    results = run(kernels, max(1, args.repeat))
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(payload, fh, indent=2)
+
+    exit_code = 0
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} kernel(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+    if args.save:
+        if baseline is None and os.path.isfile(baseline_path):
+            with open(baseline_path, 'r', encoding='utf-8') as fh:
+                baseline = json.load(fh)
+        if baseline is not None and args.filter:
+            # Partial run: keep the other kernels' baselines
+            merged = dict(baseline.get('results', {}))
+            merged.update(results)
+            payload['results'] = merged
+        os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as fh:
+            json.dump(payload, fh, indent=2)
+        print(f"Baseline written to {baseline_path}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+BrainLink headless analysis core
+================================
+
+Qt-free home of the single-channel analysis pipeline. Everything here
+imports with NumPy, SciPy and pandas only, so batch tools, tests and
+worker processes never load PySide6 or pyqtgraph.
+
+MODULES:
+    dsp       - Band/task constants, filters, PSD, band power, signal checks
+    engine    - FeatureAnalysisEngine (base single-channel engine)
+    enhanced  - EnhancedAnalyzerConfig, TaskAnalysisScheduler,
+                EnhancedFeatureAnalysisEngine (statistics and permutations)
+    recording - Loading recorded sessions and their phase markers
+    report    - Plain-text multi-task report (shared with the GUI)
+    analyze   - ``brainlink-analyze`` batch CLI
+
+The GUI modules (BrainLinkAnalyzer_GUI, BrainLinkAnalyzer_GUI_Enhanced)
+re-export these names, so existing ``BL.FeatureAnalysisEngine`` style
+references keep working.
+
+USAGE:
+    python -m brainlink_core.analyze recording.csv --output-dir reports/
+
+    from brainlink_core import EnhancedFeatureAnalysisEngine, EnhancedAnalyzerConfig
+
+Author: BrainLink Companion Team
+"""
+
+from .dsp import (
+    AVAILABLE_TASKS,
+    EEG_BANDS,
+    FEATURE_NAMES,
+    FS,
+    bandpass_filter,
+    bandpower,
+    check_signal_legitimacy,
+    compute_psd,
+    is_signal_noisy,
+    notch_filter,
+)
+from .engine import FeatureAnalysisEngine
+from .enhanced import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine, TaskAnalysisScheduler
+from .recording import Recording, find_markers_file, load_recording
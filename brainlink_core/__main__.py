@@ -0,0 +1,7 @@
+"""``python -m brainlink_core`` runs the brainlink-analyze batch CLI."""
+
+import sys
+
+from .analyze import main
+
+sys.exit(main())
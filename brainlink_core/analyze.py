@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+brainlink-analyze: run the enhanced analysis pipeline on recorded sessions.
+
+Headless batch counterpart of the GUI's "Analyze All Tasks" + "Generate
+Report". Nothing here imports Qt, so it runs on servers and in CI.
+
+    python -m brainlink_core.analyze session_X.csv
+    python -m brainlink_core.analyze signal.npy --markers markers_X.json --output-dir reports/
+    python -m brainlink_core.analyze rec1.csv rec2.csv --full --perm-preset strict
+
+Single-channel (MindLink) recordings are fed to EnhancedFeatureAnalysisEngine
+phase by phase in the live batch size, so windows and block timing match a
+live session; feature timestamps are taken from the recording, not the wall
+clock. Multi-channel recordings go through the 64-channel offline engine.
+Each recording gets ``<stem>_report.txt`` and ``<stem>_results.json``.
+
+Any EnhancedAnalyzerConfig option (``--n-perm``, ``--alpha``,
+``--perm-preset``, ...; see ``--config-help``) and the matching ``BL_*``
+environment variables apply, exactly as for the GUI.
+
+Author: BrainLink Companion Team
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .dsp import AVAILABLE_TASKS
+from .enhanced import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+from .recording import Recording, load_recording
+from .report import multi_task_report_lines
+
+CALIBRATION_PHASES = ('eyes_closed', 'eyes_open', 'task')
+# Samples per add_data call, as the live parser batches them (BL_RAW_BATCH); the
+# engine's windows follow its own hop, so this only changes speed, not results
+LIVE_CHUNK = 16
+
+
+def recording_phases(recording: Recording) -> List[Dict[str, Any]]:
+    """Recorded calibration/task phases, in order; cue and rest phases are dropped."""
+    phases = []
+    for marker in recording.phase_markers:
+        if marker.get('phase') not in CALIBRATION_PHASES or marker.get('record') is False:
+            continue
+        task = marker.get('task')
+        if marker.get('phase') == 'task' and task not in AVAILABLE_TASKS:
+            print(f"Skipping phase for unknown task '{task}'")
+            continue
+        phases.append(marker)
+    return phases
+
+
+def analyze_mindlink(recording: Recording, config: EnhancedAnalyzerConfig, channel: int = 0,
+                     chunk: int = LIVE_CHUNK) -> Dict[str, Any]:
+    """Feed one channel through the enhanced engine by phase and run the multi-task analysis."""
+    engine = EnhancedFeatureAnalysisEngine(config=config)
+    if recording.sample_rate != engine.fs:
+        print(f"Warning: recording is {recording.sample_rate} Hz, the single-channel engine expects {engine.fs} Hz")
+    signal = recording.data[:, channel]
+    phases = recording_phases(recording)
+    if not any(m.get('phase') == 'eyes_closed' for m in phases):
+        raise ValueError("No eyes-closed phase in the markers; the enhanced engine needs an eyes-closed baseline")
+
+    t0 = time.perf_counter()
+    for marker in phases:
+        phase, task = marker['phase'], marker.get('task')
+        start = recording.sample_at(float(marker.get('start', 0.0)))
+        end = recording.sample_at(float(marker.get('end', recording.duration_s)))
+        if phase == 'task':
+            engine.start_calibration_phase(phase, task_type=task)
+        else:
+            engine.start_calibration_phase(phase)
+        # Window timestamps in recording time: engine sample count -> recording sample
+        offset = start - engine.samples_seen
+        engine.sample_clock = lambda n, offset=offset: (offset + n) / float(recording.sample_rate)
+        for i in range(start, end, chunk):
+            engine.add_data(signal[i:min(end, i + chunk)])
+        engine.stop_calibration_phase()
+    extract_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    engine.compute_baseline_statistics()
+    multi_task = engine.analyze_all_tasks_data()
+    analysis_s = time.perf_counter() - t0
+
+    return {
+        'engine': engine,
+        'multi_task_results': multi_task,
+        'report_lines': multi_task_report_lines(engine, multi_task),
+        'timing': {'extract_s': round(extract_s, 3), 'analysis_s': round(analysis_s, 3)},
+    }
+
+
+def analyze_multichannel(recording: Recording, config: EnhancedAnalyzerConfig,
+                         workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run the 64-channel offline engine (feature extraction + multi-task statistics)."""
+    from antNeuro.offline_multichannel_analysis import OfflineMultichannelEngine
+    from utils.enhanced_report_generator import Enhanced64ChannelReportGenerator
+
+    engine = OfflineMultichannelEngine(sample_rate=recording.sample_rate, channel_count=recording.n_channels,
+                                       channel_names=recording.channel_names,
+                                       save_dir=tempfile.mkdtemp(prefix="bl_analyze_"))
+    engine.config = config
+    t_rel = (recording.timestamps - recording.timestamps[0]) if recording.timestamps is not None \
+        else np.arange(recording.n_samples) / float(recording.sample_rate)
+    engine.raw_data = list(zip(t_rel.tolist(), recording.data))
+    engine.recording_start_time = 0
+    engine.phase_markers = [m for m in recording.phase_markers if m.get('record', True)]
+
+    t0 = time.perf_counter()
+    analysis_results = engine.analyze_offline(workers=workers)
+    if analysis_results is None:
+        raise RuntimeError("Offline analysis returned no results")
+    multi_task = engine.analyze_all_tasks_data()
+    elapsed = time.perf_counter() - t0
+
+    ec = engine.calibration_data.get('eyes_closed', {}).get('features', [])
+    eo = engine.calibration_data.get('eyes_open', {}).get('features', [])
+    results = {
+        'session_info': {
+            'n_channels': recording.n_channels,
+            'sample_rate': recording.sample_rate,
+            'n_samples': recording.n_samples,
+            'duration': recording.duration_s,
+            'baseline_ec_windows': len(ec),
+            'baseline_eo_windows': len(eo),
+            'tasks_executed': len(multi_task.get('per_task', {})),
+        },
+        'analysis_results': analysis_results,
+        'multi_task_results': multi_task,
+        'baseline_stats': getattr(engine, 'baseline_stats', {}),
+        'artifact_summary': getattr(engine, 'artifact_summary', {}),
+    }
+    lines = Enhanced64ChannelReportGenerator.generate_text_report(
+        results, fast_mode=bool(getattr(config, 'fast_mode', False)), n_permutations=engine._effective_n_perm())
+    return {
+        'engine': engine,
+        'multi_task_results': multi_task,
+        'report_lines': lines,
+        'timing': {'analysis_s': round(elapsed, 3)},
+    }
+
+
+def _channel_index(recording: Recording, channel: Optional[str]) -> int:
+    if channel is None:
+        return 0
+    if channel in recording.channel_names:
+        return recording.channel_names.index(channel)
+    return int(channel)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='brainlink-analyze',
+        description="Run the enhanced analysis pipeline on recorded sessions (no GUI)",
+        epilog="Analyzer options (--n-perm, --alpha, --perm-preset, ...) are listed by --config-help.")
+    parser.add_argument('recordings', nargs='+', help="session_*.csv, single-column .csv or .npy")
+    parser.add_argument('--markers', default=None, help="Phase markers JSON (default: markers_*.json next to the CSV)")
+    parser.add_argument('--pipeline', choices=('auto', 'mindlink', 'multichannel'), default='auto',
+                        help="Single-channel enhanced engine or 64-channel offline engine (default: by channel count)")
+    parser.add_argument('--channel', default=None, help="Channel (name or index) analyzed by the single-channel pipeline")
+    parser.add_argument('--sample-rate', type=int, default=None, help="Override the recording's sample rate")
+    parser.add_argument('--chunk', type=int, default=LIVE_CHUNK, help="Samples per engine update (default: %(default)s, as live)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for the multi-channel pipeline")
+    parser.add_argument('--full', action='store_true',
+                        help="Permutation statistics (default is the GUI's fast mode: parametric tests only)")
+    parser.add_argument('--output-dir', default=None, help="Where reports are written (default: next to each recording)")
+    if '--config-help' in (sys.argv[1:] if argv is None else argv):
+        EnhancedAnalyzerConfig.from_sources(['--config-help'])  # prints the analyzer options and exits
+    args, config_argv = parser.parse_known_args(argv)
+
+    if args.markers and len(args.recordings) > 1:
+        parser.error("--markers applies to a single recording")
+    config = EnhancedAnalyzerConfig.from_sources(config_argv)
+    if args.full:
+        config.fast_mode = False
+
+    failures = 0
+    for path in args.recordings:
+        print(f"=== {path}")
+        try:
+            recording = load_recording(path, markers_path=args.markers, sample_rate=args.sample_rate)
+            pipeline = args.pipeline
+            if pipeline == 'auto':
+                pipeline = 'mindlink' if recording.n_channels == 1 else 'multichannel'
+            print(f"{recording.n_channels} ch @ {recording.sample_rate} Hz, {recording.duration_s:.1f}s, "
+                  f"{len(recording.phase_markers)} markers -> {pipeline} pipeline")
+            if pipeline == 'mindlink':
+                outcome = analyze_mindlink(recording, config, channel=_channel_index(recording, args.channel),
+                                           chunk=max(1, args.chunk))
+            else:
+                outcome = analyze_multichannel(recording, config, workers=args.workers)
+        except Exception as e:
+            print(f"FAILED: {type(e).__name__}: {e}")
+            failures += 1
+            continue
+
+        out_dir = args.output_dir or os.path.dirname(os.path.abspath(path))
+        os.makedirs(out_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        report_path = os.path.join(out_dir, f"{stem}_report.txt")
+        json_path = os.path.join(out_dir, f"{stem}_results.json")
+        with open(report_path, 'w', encoding='utf-8') as fh:
+            fh.write("\n".join(outcome['report_lines']))
+        with open(json_path, 'w', encoding='utf-8') as fh:
+            json.dump({
+                'recording': os.path.abspath(path),
+                'pipeline': pipeline,
+                'sample_rate': recording.sample_rate,
+                'n_channels': recording.n_channels,
+                'config': asdict(config),
+                'timing': outcome['timing'],
+                'multi_task_results': outcome['multi_task_results'],
+            }, fh, indent=2, default=str)
+        print(f"Report:  {report_path}")
+        print(f"Results: {json_path}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,446 @@
+"""
+Signal-processing constants and helpers for the single-channel pipeline.
+
+Band definitions, task protocols, filters, PSD/band power and the quick
+signal-legitimacy heuristics. Only NumPy and SciPy are used here, so
+offline tools and worker processes can use them without Qt. The SciPy
+functions are bound lazily (``utils.lazy_import``): scipy.signal pulls in
+scipy.stats and dominates GUI startup, but is first needed for the first
+analysis window.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from utils.lazy_import import lazy_attr
+
+simps = lazy_attr('scipy.integrate', 'simpson')
+butter = lazy_attr('scipy.signal', 'butter')
+filtfilt = lazy_attr('scipy.signal', 'filtfilt')
+iirnotch = lazy_attr('scipy.signal', 'iirnotch')
+welch = lazy_attr('scipy.signal', 'welch')
+
+# Optional extra tasks plugin - import dynamically to avoid static resolution errors
+try:
+    import importlib
+    import importlib.util
+    if importlib.util.find_spec("extra_tasks") is not None:
+        mod = importlib.import_module("extra_tasks")
+        EXTRA_TASKS = getattr(mod, "EXTRA_TASKS", {})
+    else:
+        EXTRA_TASKS = {}
+except Exception as e:
+    # Non-fatal: continue with empty extra tasks and log a warning
+    print(f"Warning: optional module 'extra_tasks' not imported: {e}")
+    EXTRA_TASKS = {}
+
+# Signal processing constants from mother code (corrected to match BrainCompanion_updated.py)
+FS = 512
+WINDOW_SIZE = 512 
+OVERLAP_SIZE = 128
+EEG_BANDS = {
+    'delta': (0.5, 4),
+    'theta': (4, 8),
+    'alpha': (8, 12),
+    'beta': (12, 30),
+    'gamma': (30, 45)
+}
+
+# Feature analysis constants
+FEATURE_NAMES = [
+    'delta_power', 'theta_power', 'alpha_power', 'beta_power', 'gamma_power',
+    'delta_relative', 'theta_relative', 'alpha_relative', 'beta_relative', 'gamma_relative',
+    'delta_peak_freq', 'theta_peak_freq', 'alpha_peak_freq', 'beta_peak_freq', 'gamma_peak_freq',
+    'delta_peak_amp', 'theta_peak_amp', 'alpha_peak_amp', 'beta_peak_amp', 'gamma_peak_amp',
+    'alpha_theta_ratio', 'beta_alpha_ratio', 'total_power'
+]
+
+# Available cognitive tasks
+AVAILABLE_TASKS = {
+    'visual_imagery': {
+        'name': 'Visual Imagery',
+        'description': 'Visualize a familiar place or object in detail',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Visualize walking through your home in rich sensory detail.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start visualizing\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Visualize walking through your home in rich sensory detail continuously. (Start on beep sound).'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'IMAGERY: Visualize walking through your home in rich sensory detail continuously.'}
+        ]
+    },
+    'attention_focus': {
+        'name': 'Focused Attention',
+        'description': 'Focus intensely on breathing or a single point',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Focus all attention on your breathing. Count breaths 1–10 and repeat.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start focusing\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'}
+        ]
+    },
+    'mental_math': {
+        'name': 'Mental Math',
+        'description': 'Perform mental arithmetic (e.g., count backwards from 200 by 7s)',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Count backwards from 200 by 7s: 200, 193, 186, 179...\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start counting\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to count backwards from 200 by 7s with your EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'COUNT: 200, 193, 186, 179... Keep counting backwards by 7s.'}
+        ]
+    },
+    'working_memory': {
+        'name': 'Working Memory',
+        'description': 'Remember and manipulate a sequence of numbers or letters',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Remember this sequence: 3-8-2-9-5-1. Now add 2 to each number mentally.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start calculating\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to remember and manipulate this sequence: 3-8-2-9-5-1. Add 2 to each number with EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'REMEMBER: 3-8-2-9-5-1. Add 2 to each number: 5-10-4-11-7-3. Keep manipulating the sequence.'}
+        ]
+    },
+    'attention_focus': {
+        'name': 'Focused Attention',
+        'description': 'Focus intensely on breathing or a single point',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Focus all attention on your breathing. Count breaths 1–10 and repeat.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start focusing\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'FOCUS: Attend only to breathing. Count breaths 1–10 and restart; gently return if distracted with EYES CLOSED.'}
+        ]
+    },
+    'language_processing': {
+        'name': 'Language Processing',
+        'description': 'Generate words or sentences following specific rules',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Think of as many words as possible that start with the letter "S".\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start generating words\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare – Silently list distinct "S" words, avoid repeats, keep steady pace with EYES CLOSED.).'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'GENERATE: Silently list distinct "S" words, avoid repeats, keep steady pace.'}
+        ]
+    },
+    'motor_imagery': {
+        'name': 'Motor Imagery',
+        'description': 'Imagine performing physical movements without moving',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Imagine throwing a ball with your right hand, then left hand, alternating.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start imagining\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to imagine throwing a ball with your right hand, then left hand, alternating with EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'IMAGINE: Throw a ball with your right hand, then left hand, alternating. Feel the motion vividly.'}
+        ]
+    },
+    'cognitive_load': {
+        'name': 'Cognitive Load',
+        'description': 'Perform multiple cognitive tasks simultaneously',
+        'duration': 60,
+        'instructions': '🔊 EYES CLOSED TASK - Count backwards from 50 by 3s while visualizing the numbers in blue.\n\nAudio cues:\n• 1st beep = Read instructions on screen\n• 2nd beep = Close eyes & start task\n• 2 beeps = Task complete, you can stop',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'CUE: Prepare to count backwards from 50 by 3s while visualizing each number in blue with EYES CLOSED.'},
+            {'type': 'task', 'duration': 52, 'record': True, 'instruction': 'COUNT & VISUALIZE: 50, 47, 44, 41... Count backwards by 3s while seeing each number in blue.'}
+        ]
+    },
+    # --- Added protocol tasks with phase-based timing ---
+    'emotion_face': {
+    'name': 'Emotion Recognition',
+        'description': 'View static emotional face images with timed phases.',
+        'duration': 114,  # 6 images × 19s each (8s cue + 11s look+resonate)
+        'instructions': '👁️ EYES OPEN TASK - For each face: LOOK & RESONATE with the emotion shown.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start task | 2 beeps = End task',
+        'phases': ['analyze', 'rest'],
+        'continuous_recording': True,  # Record throughout entire task
+        'phase_structure': [
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to LOOK & RESONATE with the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 0, 'instruction': 'LOOK & RESONATE'},
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to LOOK & RESONATE with the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 1, 'instruction': 'LOOK & RESONATE'},
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 2, 'instruction': 'LOOK & RESONATE'},
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 3, 'instruction': 'LOOK & RESONATE'},
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 4, 'instruction': 'LOOK & RESONATE'},
+            {'type': 'cue', 'duration': 8, 'record': True, 'instruction': 'CUE: Prepare to observe the upcoming face.'},
+            {'type': 'viewing', 'duration': 11, 'record': True, 'media_index': 5, 'instruction': 'LOOK & RESONATE'}
+        ],
+        'media': {
+            'images': [
+                'emo_face_01.png', 'emo_face_02.png', 'emo_face_03.png',
+                'emo_face_04.png', 'emo_face_05.png', 'emo_face_06.png'
+            ],
+            'videos': []
+        }
+    },
+    'diverse_thinking': {
+    'name': 'Creative Fluency',
+        'description': 'Divergent thinking task with timed phases.',
+        'duration': 96,  # 2 prompts × 48s each (8s get ready + 10s cue + 30s thinking)
+        'instructions': '👁️ EYES OPEN TASK - Read the prompt, then think of creative and unusual uses.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start thinking | 2 beeps = End task',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for creative thinking...'},
+            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 0},
+            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 0},
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for next prompt...'},
+            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 1},
+            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 1}
+        ],
+        'media': {
+            'type': 'text_prompts',
+            'prompts': [
+                {
+                    'title': 'CREATIVE USES - PAPERCLIP',
+                    'text': 'Think of as many creative and unusual uses for a PAPERCLIP as you can.\n\nGo beyond the obvious uses - be creative and imaginative!',
+                    'duration': 30
+                },
+                {
+                    'title': 'CREATIVE USES - ARTIFICIAL INTELLIGENCE',
+                    'text': 'Think of as many creative and innovative uses for ARTIFICIAL INTELLIGENCE as you can.\n\nConsider both current and future possibilities!',
+                    'duration': 30
+                }
+            ]
+        }
+    },
+    'reappraisal': {
+    'name': 'Perspective Shift',
+        'description': 'Cognitive reappraisal task with timed phases.',
+        'duration': 96,  # 2 scenarios × 48s each (8s get ready + 10s cue + 30s thinking)
+        'instructions': '👁️ EYES OPEN TASK - Read the scenario and follow the specific thinking instructions.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & start task | 2 beeps = End task',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for thinking task...'},
+            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 0},
+            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 0},
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for next scenario...'},
+            {'type': 'cue', 'duration': 10, 'record': False, 'prompt_index': 1},
+            {'type': 'thinking', 'duration': 30, 'record': True, 'prompt_index': 1}
+        ],
+        'media': {
+            'type': 'text_prompts',
+            'prompts': [
+                {
+                    'title': 'THINK POSITIVE',
+                    'scenario': 'Feedback from a close friend',
+                    'instruction': 'Try to see this situation in a positive light. What good could come from this? What are the silver linings?',
+                    'duration': 30
+                },
+                {
+                    'title': 'FOCUS ON NEGATIVES',
+                    'scenario': 'Going to miss a flight',
+                    'instruction': 'Think about what went wrong with this situation. Focus on the problems and negative consequences.',
+                    'duration': 30
+                }
+            ]
+        }
+    },
+    'curiosity': {
+    'name': 'Curiosity Reveal',
+        'description': 'Curiosity task with reveal timing.',
+        'duration': 45,  # 8s get ready + 2s cue + 2s wait + 33s video
+        'instructions': '👁️ EYES OPEN TASK - Watch the video reveal with full attention.\n\nAudio cues: 1st beep = Read instructions on screen | 2nd beep = Keep eyes open & video starts | 2 beeps = End task',
+        'phases': ['analyze', 'rest'],
+        'phase_structure': [
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready for video reveal...'},
+            {'type': 'cue', 'duration': 2, 'record': False, 'instruction': 'Video starting soon...'},
+            {'type': 'wait', 'duration': 2, 'record': True, 'instruction': 'Video starting...'},
+            {'type': 'video', 'duration': 33, 'record': True, 'media_file': 'curiosity_clip_01.mp4'}
+        ],
+        'media': {
+            # Placeholders; ensure files exist in assets/ or replace with available ones
+            'images': ['curiosity_card_back.png'],
+            'videos': ['curiosity_clip_01.mp4']
+        }
+    },
+    # --- Lifestyle pathway tasks ---
+    'num_form': {
+        'name': 'Numerical Preference',
+        'description': 'Evaluate aesthetic preference for numbers vs forms with balanced look phases.',
+        'duration': 60,
+        'instructions': (
+            '👁️ EYES OPEN TASK\n\n'
+            'NUMBERS: Wait for the countdown, then LOOK for the numbers. Keep your gaze steady and minimize movement.\n'
+            'FORMS: Wait for the countdown, then LOOK for the shapes. Keep your gaze steady and minimize movement.\n\n'
+            'Audio cues: 1 beep = Start task | 1 smooth beep = Phase change | 2 beeps = End task'
+        ),
+        'phases': ['analyze', 'rest'],
+        'continuous_recording': True,
+        'phase_structure': [
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready...'},
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'NUMBERS'},
+            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'NUM_FORM.png'},
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'FORMS'},
+            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'NUM_FORM.png'},
+            {'type': 'rest', 'duration': 2, 'record': False, 'instruction': 'Rest.'}
+        ],
+        'media': {
+            'images': ['NUM_FORM.png'],
+            'videos': []
+        }
+    },
+    'order_surprise': {
+        'name': 'Order & Surprise',
+        'description': 'Evaluate aesthetic response to ORDER vs SURPRISE with balanced look phases.',
+        'duration': 60,
+        'instructions': (
+            '👁️ EYES OPEN TASK\n\n'
+            'ORDER: Wait for the countdown, then COUNT symmetrical/normal shapes. Keep your gaze steady and minimize movement.\n'
+            'SURPRISE: Wait for the countdown, then COUNT non-symmetrical/abnormal shapes. Keep your gaze steady and minimize movement.\n\n'
+            'Audio cues: 1 beep = Start task | 1 smooth beep = Phase change | 2 beeps = End task'
+        ),
+        'phases': ['analyze', 'rest'],
+        'continuous_recording': True,
+        'phase_structure': [
+            {'type': 'get_ready', 'duration': 8, 'record': False, 'instruction': 'Get ready...'},
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'ORDER'},
+            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'ORDER_SURPRISE.png'},
+            {'type': 'cue', 'duration': 8, 'record': False, 'instruction': 'SURPRISE'},
+            {'type': 'viewing', 'duration': 20, 'record': True, 'media_file': 'ORDER_SURPRISE.png'},
+            {'type': 'rest', 'duration': 2, 'record': False, 'instruction': 'Rest.'}
+        ],
+        'media': {
+            'images': ['ORDER_SURPRISE.png'],
+            'videos': []
+        }
+    }
+}
+
+# Merge in any extra protocol tasks
+if EXTRA_TASKS:
+    try:
+        AVAILABLE_TASKS.update(EXTRA_TASKS)
+    except Exception:
+        pass
+
+# Filter designs are cached per (order/Q, edges, fs): the live pipeline filters
+# every window with the same few filters (and the warm-up fills the cache)
+@lru_cache(maxsize=32)
+def butter_coefficients(order, cutoff, fs, btype='band'):
+    """Butterworth ``(b, a)``; ``cutoff`` in Hz, a float or a ``(low, high)`` tuple."""
+    nyq = 0.5 * fs
+    if isinstance(cutoff, tuple):
+        wn = [c / nyq for c in cutoff]
+    else:
+        wn = cutoff / nyq
+    b, a = butter(order, wn, btype=btype, analog=False)
+    b.flags.writeable = False
+    a.flags.writeable = False
+    return b, a
+
+@lru_cache(maxsize=32)
+def notch_coefficients(fs, notch_freq=60.0, quality_factor=30.0):
+    """IIR notch ``(b, a)`` at ``notch_freq`` Hz."""
+    b, a = iirnotch(notch_freq/(fs/2), quality_factor)
+    b.flags.writeable = False
+    a.flags.writeable = False
+    return b, a
+
+# Signal processing functions from mother code
+def butter_lowpass_filter(data, cutoff, fs, order=2):
+    b, a = butter_coefficients(order, float(cutoff), fs, btype='low')
+    return filtfilt(b, a, data)
+
+def bandpass_filter(data, lowcut=1.0, highcut=45.0, fs=512, order=2):
+    b, a = butter_coefficients(order, (float(lowcut), float(highcut)), fs, btype='band')
+    return filtfilt(b, a, data)
+
+def notch_filter(data, fs, notch_freq=60.0, quality_factor=30.0):
+    b, a = notch_coefficients(fs, notch_freq, quality_factor)
+    return filtfilt(b, a, data)
+
+def compute_psd(data, fs):
+    freqs, psd = welch(data, fs=fs, nperseg=WINDOW_SIZE, noverlap=OVERLAP_SIZE)
+    return freqs, psd
+
+def bandpower(psd, freqs, band):
+    low, high = EEG_BANDS[band]
+    idx = (freqs >= low) & (freqs <= high)
+    return simps(psd[idx], dx=freqs[1] - freqs[0]) if np.any(idx) else 0
+
+def remove_eye_blink_artifacts(data, window=10):
+    """Remove eye blink artifacts from EEG data"""
+    clean = data.copy()
+    adaptive_threshold = np.mean(data) + 3 * np.std(data)
+    idx = np.where(np.abs(data) > adaptive_threshold)[0]
+    for i in idx:
+        start = max(0, i - window)
+        end = min(len(data), i + window)
+        local_window = np.delete(data[start:end], np.where(np.abs(data[start:end]) > adaptive_threshold))
+        if len(local_window) > 0:
+            clean[i] = np.median(local_window)
+        else:
+            clean[i] = np.median(data)
+    return clean
+
+
+def check_signal_legitimacy(data_window, min_variance=0.05, max_diff_std=0.1, max_identical_fraction=0.02):
+    """Perform quick heuristic checks to determine if the incoming EEG window looks legitimate.
+
+    Returns a dict with flags and short messages. Heuristics used:
+      - low_variance: variance below min_variance (flatline / disconnected)
+      - regular_steps: very low std of successive differences (possible synthetic/demo)
+      - too_many_identical: many repeated identical values (clipping or synthetic)
+    """
+    metrics = {}
+    arr = np.array(data_window)
+    metrics['variance'] = float(np.var(arr)) if arr.size > 0 else 0.0
+    metrics['std_of_diffs'] = float(np.std(np.diff(arr))) if arr.size > 1 else 0.0
+    # Fraction of identical samples (exact equality)
+    if arr.size > 0:
+        unique_count = len(np.unique(arr))
+        metrics['identical_fraction'] = 1.0 - (unique_count / float(arr.size))
+    else:
+        metrics['identical_fraction'] = 1.0
+
+    flags = {
+        'low_variance': metrics['variance'] < min_variance,
+        'regular_steps': metrics['std_of_diffs'] < max_diff_std,
+        'too_many_identical': metrics['identical_fraction'] > max_identical_fraction
+    }
+
+    messages = []
+    if flags['low_variance']:
+        messages.append('Low variance - possible disconnected/flatline signal')
+    if flags['regular_steps']:
+        messages.append('Highly regular sample-to-sample steps - possible synthetic/demo data')
+    if flags['too_many_identical']:
+        messages.append('Many identical values - possible clipping or artificial data')
+
+    return {'flags': flags, 'metrics': metrics, 'messages': messages}
+
+
+def is_signal_noisy(data_window, fs=512, high_freq_threshold=30.0, high_freq_ratio_thresh=0.7, spectrum=None):
+    """Estimate whether the window is dominated by high-frequency noise.
+
+    Simple heuristic: compute PSD and compare power above `high_freq_threshold` to total power.
+    Pass ``spectrum=(freqs, psd)`` to reuse a PSD already computed for this window.
+    Returns (is_noisy: bool, details: dict)
+    
+    Note: Threshold increased to 0.7 (70%) to reduce false positives from normal EEG artifacts.
+    """
+    arr = np.array(data_window)
+    details = {}
+    if arr.size < 4:
+        details['reason'] = 'too_short'
+        details['high_freq_ratio'] = 0.0
+        return False, details
+
+    try:
+        freqs, psd = spectrum if spectrum is not None else compute_psd(arr, fs)
+        total = np.trapz(psd, freqs) if psd.size > 0 else 0.0
+        mask = freqs >= high_freq_threshold
+        high_power = np.trapz(psd[mask], freqs[mask]) if np.any(mask) else 0.0
+        ratio = float(high_power / (total + 1e-12))
+        details['total_power'] = float(total)
+        details['high_power'] = float(high_power)
+        details['high_freq_ratio'] = ratio
+        details['freq_max'] = float(freqs[np.argmax(psd)]) if psd.size > 0 else 0.0
+        is_noisy = ratio > high_freq_ratio_thresh
+        return is_noisy, details
+    except Exception as e:
+        details['error'] = str(e)
+        return False, details
@@ -0,0 +1,291 @@
+"""
+Single-channel feature analysis engine (MindLink, 512 Hz).
+
+Windowed band-power feature extraction, calibration buffers and the
+baseline-vs-task comparison used by the GUI and by headless tools.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.lazy_import import lazy_module
+from utils.pipeline_latency import PIPELINE_LATENCY
+
+from .dsp import AVAILABLE_TASKS, EEG_BANDS, FEATURE_NAMES, bandpower, compute_psd, notch_filter
+
+pd = lazy_module('pandas')
+
+
+def window_ends(start, stop, window_samples, step_samples):
+    """Sample counts in (start, stop] at which a window ends (window_samples, then every step_samples)."""
+    k = max(0, (start - window_samples) // step_samples + 1)
+    return range(window_samples + k * step_samples, stop + 1, step_samples)
+
+
+class FeatureAnalysisEngine:
+    def __init__(self):
+        self.fs = 512  # Corrected sampling rate
+        self.window_size = 1.0
+        self.overlap = 0.5
+        self.window_samples = int(self.window_size * self.fs)
+        # Window hop: fixed in samples, so the windows don't depend on how add_data is batched
+        self.step_samples = max(1, int(self.window_samples * (1 - self.overlap)))
+        self.samples_seen = 0
+        # Optional samples_seen-at-window-end -> timestamp (offline replays); default wall clock
+        self.sample_clock = None
+        
+        # Data buffers
+        self.raw_buffer = deque(maxlen=self.fs * 10)
+        self.filtered_buffers = {band: deque(maxlen=self.fs * 10) for band in EEG_BANDS}
+        self.power_buffers = {band: deque(maxlen=self.fs * 10) for band in EEG_BANDS}
+        
+        # Calibration data storage
+        self.calibration_data = {
+            'eyes_closed': {'features': [], 'timestamps': []},
+            'eyes_open': {'features': [], 'timestamps': []},
+            'task': {'features': [], 'timestamps': []}
+        }
+        
+        # Current state
+        self.current_state = 'idle'
+        self.current_task = None
+        self.state_start_time = None
+        
+        # Analysis results
+        self.baseline_stats = {}
+        self.analysis_results = {}
+        
+        # Real-time features
+        self.latest_features = {}
+    
+    def reset_session(self):
+        """Clear all accumulated data for new session"""
+        # The previous session's latency histograms go to disk first
+        PIPELINE_LATENCY.end_session()
+        # Clear data buffers
+        self.raw_buffer.clear()
+        self.samples_seen = 0
+        for band in self.filtered_buffers:
+            self.filtered_buffers[band].clear()
+        for band in self.power_buffers:
+            self.power_buffers[band].clear()
+        
+        # Clear calibration data
+        self.calibration_data = {
+            'eyes_closed': {'features': [], 'timestamps': []},
+            'eyes_open': {'features': [], 'timestamps': []},
+            'task': {'features': [], 'timestamps': []}
+        }
+        
+        # Reset state
+        self.current_state = 'idle'
+        self.current_task = None
+        self.state_start_time = None
+        
+        # Clear analysis results
+        self.baseline_stats = {}
+        self.analysis_results = {}
+        self.latest_features = {}
+        
+        print("✓ Feature engine session reset complete")
+        
+    def add_data(self, new_data):
+        """Add new EEG data and process it.
+
+        A window is extracted every ``step_samples`` wherever the boundary
+        falls inside ``new_data``, so one sample per call and batches of any
+        size produce the same windows. Returns the last window's features.
+        """
+        t_stage = PIPELINE_LATENCY.stamp()
+        new_data = np.array(new_data).ravel()
+        
+        start = self.samples_seen
+        self.samples_seen += len(new_data)
+        self.raw_buffer.extend(new_data)
+        
+        ends = window_ends(start, self.samples_seen, self.window_samples, self.step_samples)
+        if not ends:
+            return None
+        buffer = np.array(self.raw_buffer)
+        now = time.time()
+        features = None
+        for end in ends:
+            lag = self.samples_seen - end  # Samples received after this window's last one
+            stop = len(buffer) - lag
+            if stop < self.window_samples:
+                continue
+            PIPELINE_LATENCY.record('buffer', t_stage)
+            if self.sample_clock is not None:
+                timestamp = self.sample_clock(end)
+            else:
+                timestamp = now - lag / float(self.fs)
+            features = self._process_window(buffer[stop - self.window_samples:stop], timestamp)
+            t_stage = PIPELINE_LATENCY.stamp()
+        return features
+    
+    def _process_window(self, window_data, timestamp):
+        """Extract one window and store it under the current state"""
+        features = self.extract_features(window_data)
+        
+        t_stage = PIPELINE_LATENCY.stamp()
+        # Store latest features
+        self.latest_features = features
+        
+        # Store based on current state
+        if self.current_state in ['eyes_closed', 'eyes_open', 'task']:
+            self.calibration_data[self.current_state]['features'].append(features)
+            self.calibration_data[self.current_state]['timestamps'].append(timestamp)
+        PIPELINE_LATENCY.record('store', t_stage)
+        
+        return features
+    
+    def extract_features(self, window_data):
+        """Extract comprehensive features from EEG data"""
+        features = {}
+        t_stage = PIPELINE_LATENCY.stamp()
+        
+        # Remove DC component
+        window_data = window_data - np.mean(window_data)
+        
+        # Apply notch filter for line noise
+        try:
+            window_data = notch_filter(window_data, self.fs, notch_freq=50.0)
+        except:
+            pass
+        t_stage = PIPELINE_LATENCY.lap('filter', t_stage)
+        
+        # Compute PSD
+        freqs, psd = compute_psd(window_data, self.fs)
+        t_stage = PIPELINE_LATENCY.lap('psd', t_stage)
+        
+        # Total EEG power via variance of the signal (matching BrainCompanion_updated.py)
+        total_power = np.var(window_data)
+        
+        # Calculate band powers
+        band_powers = {}
+        for band_name in EEG_BANDS:
+            power = bandpower(psd, freqs, band_name)
+            band_powers[band_name] = power
+            features[f'{band_name}_power'] = power
+            
+            # Relative power
+            rel_power = power / total_power if total_power > 0 else 0
+            features[f'{band_name}_relative'] = rel_power
+            
+            # Peak frequency and amplitude
+            low, high = EEG_BANDS[band_name]
+            band_mask = (freqs >= low) & (freqs <= high)
+            if np.any(band_mask):
+                band_freqs = freqs[band_mask]
+                band_psd = psd[band_mask]
+                
+                if len(band_psd) > 0:
+                    peak_idx = np.argmax(band_psd)
+                    features[f'{band_name}_peak_freq'] = band_freqs[peak_idx]
+                    features[f'{band_name}_peak_amp'] = band_psd[peak_idx]
+                else:
+                    features[f'{band_name}_peak_freq'] = (low + high) / 2
+                    features[f'{band_name}_peak_amp'] = 0
+            else:
+                features[f'{band_name}_peak_freq'] = (low + high) / 2
+                features[f'{band_name}_peak_amp'] = 0
+        
+        # Compute ratios
+        features['alpha_theta_ratio'] = band_powers.get('alpha', 0) / (band_powers.get('theta', 0) + 1e-10)
+        features['beta_alpha_ratio'] = band_powers.get('beta', 0) / (band_powers.get('alpha', 0) + 1e-10)
+        features['total_power'] = total_power
+        PIPELINE_LATENCY.record('features', t_stage)
+        
+        return features
+    
+    def start_calibration_phase(self, phase_name, task_type=None):
+        """Start calibration phase"""
+        self.current_state = phase_name
+        self.current_task = task_type
+        self.state_start_time = time.time()
+        
+        # Clear existing data
+        self.calibration_data[phase_name]['features'] = []
+        self.calibration_data[phase_name]['timestamps'] = []
+        
+        print(f"Started calibration phase: {phase_name}")
+        if task_type:
+            print(f"Task: {AVAILABLE_TASKS[task_type]['name']}")
+            print(f"Instructions: {AVAILABLE_TASKS[task_type]['instructions']}")
+    
+    def stop_calibration_phase(self):
+        """Stop calibration phase"""
+        if self.current_state != 'idle':
+            duration = time.time() - self.state_start_time
+            num_features = len(self.calibration_data[self.current_state]['features'])
+            
+            print(f"Stopped calibration phase: {self.current_state}")
+            print(f"Duration: {duration:.1f}s, Features collected: {num_features}")
+            
+            self.current_state = 'idle'
+            self.current_task = None
+            self.state_start_time = None
+    
+    def compute_baseline_statistics(self):
+        """Compute baseline statistics"""
+        baseline_features = []
+        baseline_features.extend(self.calibration_data['eyes_closed']['features'])
+        baseline_features.extend(self.calibration_data['eyes_open']['features'])
+        
+        if len(baseline_features) == 0:
+            return
+        
+        df = pd.DataFrame(baseline_features)
+        self.baseline_stats = {}
+        
+        for feature in FEATURE_NAMES:
+            if feature in df.columns:
+                values = df[feature].values
+                self.baseline_stats[feature] = {
+                    'mean': np.mean(values),
+                    'std': np.std(values),
+                    'min': np.min(values),
+                    'max': np.max(values),
+                    'median': np.median(values),
+                    'q25': np.percentile(values, 25),
+                    'q75': np.percentile(values, 75)
+                }
+        
+        print(f"Baseline statistics computed for {len(self.baseline_stats)} features")
+    
+    def analyze_task_data(self):
+        """Analyze task data against baseline"""
+        if not self.baseline_stats:
+            return
+        
+        task_features = self.calibration_data['task']['features']
+        if len(task_features) == 0:
+            return
+        
+        task_df = pd.DataFrame(task_features)
+        self.analysis_results = {}
+        
+        for feature in FEATURE_NAMES:
+            if feature in task_df.columns and feature in self.baseline_stats:
+                task_values = task_df[feature].values
+                baseline_mean = self.baseline_stats[feature]['mean']
+                baseline_std = self.baseline_stats[feature]['std']
+                
+                z_scores = (task_values - baseline_mean) / (baseline_std + 1e-10)
+                outliers = np.abs(z_scores) > 2
+                
+                self.analysis_results[feature] = {
+                    'task_mean': np.mean(task_values),
+                    'task_std': np.std(task_values),
+                    'baseline_mean': baseline_mean,
+                    'baseline_std': baseline_std,
+                    'z_scores': z_scores,
+                    'outliers': outliers,
+                    'outlier_percentage': np.sum(outliers) / len(outliers) * 100,
+                    'significant_change': abs(np.mean(task_values) - baseline_mean) > 2 * baseline_std
+                }
+        
+        print(f"Task analysis completed for {len(self.analysis_results)} features")
+        return self.analysis_results
@@ -0,0 +1,3328 @@
+"""
+Enhanced single-channel analysis: configuration, statistics and engine.
+
+EnhancedAnalyzerConfig, the background TaskAnalysisScheduler and
+EnhancedFeatureAnalysisEngine (eyes-closed baseline, blink-aware window
+rejection, Welch/permutation statistics, across-task omnibus). Nothing
+here imports Qt; BrainLinkAnalyzer_GUI_Enhanced re-exports these names.
+"""
+import argparse
+import copy
+import math
+import os
+import platform
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.bl_log import get_logger
+from utils.cache_manager import CacheManager, fingerprint
+from utils.lazy_import import lazy_attr, lazy_module, module_available
+from utils.pipeline_latency import PIPELINE_LATENCY
+from utils.result_cache import AnalysisResultCache, result_cache_key
+
+from .dsp import EEG_BANDS, compute_psd
+from .engine import FeatureAnalysisEngine
+
+pd = lazy_module('pandas')
+
+# scipy.stats is analysis-only and slow to import, so the tests resolve on first use
+if module_available('scipy'):
+    _scipy_ttest_ind = lazy_attr('scipy.stats', 'ttest_ind')
+    _scipy_chi2 = lazy_attr('scipy.stats', 'chi2')
+    _scipy_friedman = lazy_attr('scipy.stats', 'friedmanchisquare')
+    _scipy_f_oneway = lazy_attr('scipy.stats', 'f_oneway')
+    _scipy_wilcoxon = lazy_attr('scipy.stats', 'wilcoxon')
+    # SciPy >= 1.7; on older versions the call fails and the exact binomial sum is used
+    _scipy_binomtest = lazy_attr('scipy.stats', 'binomtest')
+else:
+    _scipy_ttest_ind = None
+    _scipy_chi2 = None
+    _scipy_friedman = None
+    _scipy_f_oneway = None
+    _scipy_wilcoxon = None
+    _scipy_binomtest = None
+
+
+engine_log = get_logger("engine")
+perm_log = get_logger("perm")
+
+
+@lru_cache(maxsize=8)
+def dpss_tapers(n_samples: int, nw: float, k: int) -> np.ndarray:
+    """DPSS tapers ``(k, n_samples)`` for the multitaper PSD, computed once per window length."""
+    from scipy.signal.windows import dpss  # type: ignore
+    tapers = dpss(n_samples, NW=nw, Kmax=k, sym=False)
+    tapers.flags.writeable = False
+    return tapers
+
+
+BOOL_TRUE = {"1", "true", "yes", "on", "y", "t"}
+MODE_CHOICES = ("aggregate_only", "feature_selection")
+DEPENDENCE_CORRECTION_CHOICES = ("Kost-McDermott", "none")
+EXPORT_PROFILE_CHOICES = ("full", "integer_only")
+EFFECT_MEASURE_CHOICES = ("delta", "z")
+OMNIBUS_CHOICES = ("Friedman", "RM-ANOVA")
+POSTHOC_CHOICES = ("Wilcoxon",)
+PERM_PRESETS = {
+    "ultrafast": 50,   # Very quick, still detects p<0.02
+    "fast": 100,       # Quick mode, detects p<0.01  
+    "default": 200,    # Balanced speed/precision
+    "strict": 500,     # Higher precision
+    "research": 1000,  # Research-grade precision
+}
+# "auto" is not a fixed size: n_perm is planned from a kernel benchmark and analysis_budget_s
+AUTO_PERM_PRESET = "auto"
+AUTO_PERM_BOUNDS = (20, 5000)
+PERM_MODE_CHOICES = ("fixed", "sequential")
+# Sequential (Besag-Clifford) permutation stopping: minimum permutations before the
+# confidence-bound rule may stop, and the two-sided z for that bound (99%).
+SEQ_PERM_MIN = 20
+SEQ_PERM_Z = 2.576
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None:
+        return default
+    return str(val).strip().lower() in BOOL_TRUE
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    val = os.environ.get(name)
+    if val is None or val == "":
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    val = os.environ.get(name)
+    if val is None or val == "":
+        return default
+    try:
+        return float(val)
+    except ValueError:
+        return default
+
+
+def _parse_duration_seconds(value: Any) -> Optional[float]:
+    """Parse "60", "60s", "1.5m" or "1h" into seconds (None if unparseable)."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    scale = 1.0
+    if text.endswith("ms"):
+        text, scale = text[:-2], 0.001
+    elif text[-1] in "smh":
+        scale = {"s": 1.0, "m": 60.0, "h": 3600.0}[text[-1]]
+        text = text[:-1]
+    try:
+        seconds = float(text) * scale
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def _env_choice(name: str, default: str, choices: Tuple[str, ...]) -> str:
+    val = os.environ.get(name)
+    if not val:
+        return default
+    val_clean = val.strip()
+    if val_clean in choices:
+        return val_clean
+    val_lower = val_clean.lower()
+    for opt in choices:
+        if opt.lower() == val_lower:
+            return opt
+    return default
+
+
+@dataclass
+class EnhancedAnalyzerConfig:
+    alpha: float = 0.05
+    mode: str = "aggregate_only"
+    dependence_correction: str = "Kost-McDermott"
+    use_permutation_for_sumP: bool = True
+    n_perm: int = 100  # Reduced from 1000 for faster analysis (still valid for p<0.01)
+    discretization_bins: int = 5
+    export_profile: str = "full"
+    effect_measure: str = "delta"
+    omnibus: str = "Friedman"
+    posthoc: str = "Wilcoxon"
+    fdr_alpha: float = 0.05
+    seed: Optional[int] = None
+    runtime_preset: Optional[str] = None
+    min_effect_size: float = 0.5
+    min_percent_change: float = 10.0
+    correlation_guard: bool = True
+    # Newly configurable analysis parameters
+    block_seconds: float = 8.0
+    mt_tapers: int = 3
+    # Fast analysis mode: skip permutation testing entirely, use only parametric tests
+    fast_mode: bool = True  # If True, uses only Welch's t-test + FDR (no permutation)
+    nmin_sessions: int = 2  # Minimum 2 sessions needed for statistical comparison
+    # Permutation stopping: "fixed" always runs n_perm; "sequential" stops after perm_h
+    # null exceedances or once the p-value confidence bound clears alpha (n_perm is the cap)
+    perm_mode: str = "fixed"
+    perm_h: int = 10
+    # Wall-clock budget for the final multi-task analysis, used by the "auto" preset
+    analysis_budget_s: float = 60.0
+    # Shared memory cap for the engine's permutation/correlation/block caches
+    cache_memory_mb: float = 256.0
+    # Reuse analyze_all_tasks_data() results stored on disk when data and config are unchanged
+    result_cache: bool = True
+    result_cache_dir: Optional[str] = None
+    
+    # Performance note: Permutation testing is optimized with:
+    # 1. Vectorized Welch t-test (5-10x faster than looping)
+    # 2. Throttled progress callbacks (reduces overhead)
+    # 3. Pre-allocated arrays (minimizes memory allocation)
+    # Typical performance: ~1000 permutations/second for 50 features
+
+    def __post_init__(self) -> None:
+        self.mode = self.mode if self.mode in MODE_CHOICES else MODE_CHOICES[0]
+        if self.dependence_correction not in DEPENDENCE_CORRECTION_CHOICES:
+            self.dependence_correction = DEPENDENCE_CORRECTION_CHOICES[0]
+        if self.export_profile not in EXPORT_PROFILE_CHOICES:
+            self.export_profile = EXPORT_PROFILE_CHOICES[0]
+        if self.effect_measure not in EFFECT_MEASURE_CHOICES:
+            self.effect_measure = EFFECT_MEASURE_CHOICES[0]
+        if self.omnibus not in OMNIBUS_CHOICES:
+            self.omnibus = OMNIBUS_CHOICES[0]
+        if self.posthoc not in POSTHOC_CHOICES:
+            self.posthoc = POSTHOC_CHOICES[0]
+        if self.perm_mode not in PERM_MODE_CHOICES:
+            self.perm_mode = PERM_MODE_CHOICES[0]
+        try:
+            self.perm_h = max(1, int(self.perm_h))
+        except Exception:
+            self.perm_h = 10
+        if self.runtime_preset and self.runtime_preset not in PERM_PRESETS and self.runtime_preset != AUTO_PERM_PRESET:
+            self.runtime_preset = None
+        if self.runtime_preset in PERM_PRESETS:
+            self.n_perm = PERM_PRESETS[self.runtime_preset]
+        try:
+            self.cache_memory_mb = max(1.0, float(self.cache_memory_mb))
+        except Exception:
+            self.cache_memory_mb = 256.0
+        budget = _parse_duration_seconds(self.analysis_budget_s)
+        self.analysis_budget_s = budget if budget is not None else 60.0
+        self.alpha = float(self.alpha)
+        self.fdr_alpha = float(self.fdr_alpha)
+        self.discretization_bins = max(2, int(self.discretization_bins))
+        self.n_perm = max(1, int(self.n_perm))
+        self.min_effect_size = max(0.0, float(self.min_effect_size))
+        self.min_percent_change = max(0.0, float(self.min_percent_change))
+        self.correlation_guard = bool(self.correlation_guard)
+        # Coerce and validate newly added parameters
+        try:
+            self.block_seconds = float(self.block_seconds)
+            if self.block_seconds <= 0:
+                self.block_seconds = 8.0
+        except Exception:
+            self.block_seconds = 8.0
+        try:
+            self.mt_tapers = int(self.mt_tapers)
+            if self.mt_tapers < 1:
+                self.mt_tapers = 1
+        except Exception:
+            self.mt_tapers = 3
+        try:
+            self.nmin_sessions = int(self.nmin_sessions)
+            if self.nmin_sessions < 2:
+                self.nmin_sessions = 2
+        except Exception:
+            self.nmin_sessions = 2  # Minimum needed for statistical comparison
+
+    @property
+    def is_feature_selection(self) -> bool:
+        return self.mode == "feature_selection"
+
+    @property
+    def is_auto_preset(self) -> bool:
+        return self.runtime_preset == AUTO_PERM_PRESET
+
+    @classmethod
+    def from_sources(cls, argv: Optional[List[str]] = None) -> "EnhancedAnalyzerConfig":
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--alpha", type=float, default=None)
+        parser.add_argument("--mode", choices=MODE_CHOICES, default=None)
+        parser.add_argument("--dependence-correction", choices=DEPENDENCE_CORRECTION_CHOICES, default=None)
+        parser.add_argument("--sumP-permutations", dest="use_perm", action="store_true")
+        parser.add_argument("--no-sumP-permutations", dest="use_perm", action="store_false")
+        parser.set_defaults(use_perm=None)
+        parser.add_argument("--n-perm", type=int, default=None)
+        parser.add_argument("--discretization-bins", type=int, default=None)
+        parser.add_argument("--export-profile", choices=EXPORT_PROFILE_CHOICES, default=None)
+        parser.add_argument("--effect-measure", choices=EFFECT_MEASURE_CHOICES, default=None)
+        parser.add_argument("--omnibus", choices=OMNIBUS_CHOICES, default=None)
+        parser.add_argument("--posthoc", choices=POSTHOC_CHOICES, default=None)
+        parser.add_argument("--fdr-alpha", type=float, default=None)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--perm-preset", choices=tuple(PERM_PRESETS.keys()) + (AUTO_PERM_PRESET,), default=None)
+        parser.add_argument("--analysis-budget", default=None, help="Wall-clock budget for multi-task analysis, e.g. 60s or 2m (implies --perm-preset auto)")
+        parser.add_argument("--perm-mode", choices=PERM_MODE_CHOICES, default=None, help="fixed: always n_perm permutations; sequential: stop early (Besag-Clifford)")
+        parser.add_argument("--perm-h", type=int, default=None, help="Null exceedances that end a sequential permutation run")
+        parser.add_argument("--cache-memory-mb", type=float, default=None, help="Memory cap shared by the analysis caches")
+        parser.add_argument("--result-cache", dest="result_cache", action="store_true")
+        parser.add_argument("--no-result-cache", dest="result_cache", action="store_false", help="Always recompute multi-task results")
+        parser.set_defaults(result_cache=None)
+        parser.add_argument("--result-cache-dir", default=None, help="Directory for cached multi-task results")
+        parser.add_argument("--min-effect-size", type=float, default=None)
+        parser.add_argument("--min-percent-change", type=float, default=None)
+        parser.add_argument("--correlation-guard", dest="corr_guard", action="store_true")
+        parser.add_argument("--no-correlation-guard", dest="corr_guard", action="store_false")
+        parser.set_defaults(corr_guard=None)
+        # Newly added CLI options
+        parser.add_argument("--block-seconds", type=float, default=None, help="Seconds per analysis block for block-based stats")
+        parser.add_argument("--mt-tapers", type=int, default=None, help="Number of DPSS tapers for multitaper PSD")
+        parser.add_argument("--nmin-sessions", type=int, default=None, help="Minimum sessions required to enable across-task significance tests")
+        parser.add_argument("--config-help", action="help", help="Show configuration options and exit")
+
+        parsed, _ = parser.parse_known_args(argv or [])
+
+        env_alpha = _env_float("BL_ALPHA", 0.05)
+        env_mode = _env_choice("BL_MODE", MODE_CHOICES[0], MODE_CHOICES)
+        env_dep = _env_choice("BL_DEPENDENCE_CORRECTION", DEPENDENCE_CORRECTION_CHOICES[0], DEPENDENCE_CORRECTION_CHOICES)
+        env_use_perm = os.environ.get("BL_USE_PERMUTATION_FOR_SUMP")
+        env_perm_flag = None
+        if env_use_perm is not None:
+            env_perm_flag = _env_bool("BL_USE_PERMUTATION_FOR_SUMP", True)
+        env_n_perm = _env_int("BL_N_PERM", None)
+        env_bins = _env_int("BL_DISCRETIZATION_BINS", None)
+        env_export = _env_choice("BL_EXPORT_PROFILE", EXPORT_PROFILE_CHOICES[0], EXPORT_PROFILE_CHOICES)
+        env_effect = _env_choice("BL_EFFECT_MEASURE", EFFECT_MEASURE_CHOICES[0], EFFECT_MEASURE_CHOICES)
+        env_omnibus = _env_choice("BL_OMNIBUS", OMNIBUS_CHOICES[0], OMNIBUS_CHOICES)
+        env_posthoc = _env_choice("BL_POSTHOC", POSTHOC_CHOICES[0], POSTHOC_CHOICES)
+        env_fdr_alpha = _env_float("BL_FDR_ALPHA", 0.05)
+        env_seed = _env_int("BL_RANDOM_SEED", None)
+        env_preset = os.environ.get("BL_PERM_PRESET")
+        if env_preset and env_preset not in PERM_PRESETS and env_preset != AUTO_PERM_PRESET:
+            env_preset = None
+        env_budget = _parse_duration_seconds(os.environ.get("BL_ANALYSIS_BUDGET"))
+        budget_value = _parse_duration_seconds(parsed.analysis_budget) or env_budget
+        env_min_effect = _env_float("BL_MIN_EFFECT_SIZE", 0.5)
+        env_min_pct = _env_float("BL_MIN_PERCENT_CHANGE", 10.0)
+        env_corr_guard = _env_bool("BL_CORRELATION_GUARD", True)
+        # Newly added environment overrides
+        env_block_seconds = _env_float("BL_BLOCK_SECONDS", None)
+        env_mt_tapers = _env_int("BL_MT_TAPERS", None)
+        env_nmin_sessions = _env_int("BL_NMIN_SESSIONS", None)
+        env_perm_mode = _env_choice("BL_PERM_MODE", PERM_MODE_CHOICES[0], PERM_MODE_CHOICES)
+        env_perm_h = _env_int("BL_PERM_H", None)
+        env_cache_mb = _env_float("BL_CACHE_MEMORY_MB", None)
+        env_result_cache = _env_bool("BL_RESULT_CACHE", True)
+
+        n_perm_value = None
+        if parsed.n_perm is not None:
+            n_perm_value = parsed.n_perm
+        elif env_n_perm is not None:
+            n_perm_value = env_n_perm
+        else:
+            n_perm_value = PERM_PRESETS.get(parsed.perm_preset or env_preset or "", 1000)
+        preset_value = parsed.perm_preset or env_preset
+        if preset_value is None and budget_value is not None:
+            preset_value = AUTO_PERM_PRESET
+
+        use_perm_value = parsed.use_perm if parsed.use_perm is not None else (env_perm_flag if env_perm_flag is not None else True)
+
+        cfg = cls(
+            alpha=parsed.alpha if parsed.alpha is not None else env_alpha,
+            mode=parsed.mode or env_mode,
+            dependence_correction=parsed.dependence_correction or env_dep,
+            use_permutation_for_sumP=use_perm_value,
+            n_perm=n_perm_value,
+            discretization_bins=parsed.discretization_bins or env_bins or 5,
+            export_profile=parsed.export_profile or env_export,
+            effect_measure=parsed.effect_measure or env_effect,
+            omnibus=parsed.omnibus or env_omnibus,
+            posthoc=parsed.posthoc or env_posthoc,
+            fdr_alpha=parsed.fdr_alpha if parsed.fdr_alpha is not None else env_fdr_alpha,
+            seed=parsed.seed if parsed.seed is not None else env_seed,
+            runtime_preset=preset_value,
+            min_effect_size=parsed.min_effect_size if parsed.min_effect_size is not None else env_min_effect,
+            min_percent_change=parsed.min_percent_change if parsed.min_percent_change is not None else env_min_pct,
+            correlation_guard=parsed.corr_guard if parsed.corr_guard is not None else env_corr_guard,
+            block_seconds=(parsed.block_seconds if parsed.block_seconds is not None else (env_block_seconds if env_block_seconds is not None else 8.0)),
+            mt_tapers=(parsed.mt_tapers if parsed.mt_tapers is not None else (env_mt_tapers if env_mt_tapers is not None else 3)),
+            nmin_sessions=(parsed.nmin_sessions if parsed.nmin_sessions is not None else (env_nmin_sessions if env_nmin_sessions is not None else 2)),
+            perm_mode=parsed.perm_mode or env_perm_mode,
+            perm_h=(parsed.perm_h if parsed.perm_h is not None else (env_perm_h if env_perm_h is not None else 10)),
+            analysis_budget_s=budget_value if budget_value is not None else 60.0,
+            cache_memory_mb=(parsed.cache_memory_mb if parsed.cache_memory_mb is not None else (env_cache_mb if env_cache_mb is not None else 256.0)),
+            result_cache=parsed.result_cache if parsed.result_cache is not None else env_result_cache,
+            result_cache_dir=parsed.result_cache_dir or os.environ.get("BL_RESULT_CACHE_DIR") or None,
+        )
+        return cfg
+
+
+
+
+class TaskAnalysisScheduler:
+    """Background queue that analyzes each task as soon as its phase closes.
+
+    Every submitted task is analyzed on a detached snapshot of the engine
+    (see ``EnhancedFeatureAnalysisEngine.analyze_task_snapshot``) so the live
+    engine can keep recording the next task. Results are cached keyed by the
+    task's data version; ``analyze_all_tasks_data`` reuses them and only runs
+    the combined and across-task steps itself.
+    """
+
+    STATE_QUEUED = "queued"
+    STATE_RUNNING = "running"
+    STATE_DONE = "done"
+    STATE_FAILED = "failed"
+
+    def __init__(self, engine: "EnhancedFeatureAnalysisEngine"):
+        self._engine_ref = weakref.ref(engine)
+        self._lock = threading.Condition()
+        self._pending: deque = deque()
+        # task_name -> {'state', 'version', 'result', 'error', 'seconds'}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="TaskAnalysisScheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, task_name: str) -> None:
+        """Queue a background analysis of ``task_name`` at its current data version."""
+        engine = self._engine_ref()
+        if engine is None or not task_name:
+            return
+        snapshot = engine.snapshot_task_data(task_name)
+        if snapshot is None:
+            return
+        # Plan on the engine (not the worker copy) so later runs reuse the same n_perm
+        engine._plan_for_tasks({task_name: snapshot})
+        version = snapshot['version']
+        with self._lock:
+            entry = self._entries.get(task_name)
+            if entry is not None and entry.get('version') == version and entry['state'] != self.STATE_FAILED:
+                return
+            self._entries[task_name] = {
+                'state': self.STATE_QUEUED,
+                'version': version,
+                'result': None,
+                'error': None,
+                'seconds': None,
+            }
+            if task_name not in self._order:
+                self._order.append(task_name)
+            self._pending.append((task_name, snapshot))
+            self._lock.notify_all()
+        print(f"[SCHEDULER] Queued background analysis for '{task_name}' ({len(snapshot['features'])} windows)")
+
+    def result_for(self, task_name: str, version: Tuple[Any, ...], wait: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the cached per-task result for ``version``.
+
+        If the matching analysis is still queued or running and ``wait`` is
+        True, block until it finishes instead of starting a duplicate run.
+        """
+        with self._lock:
+            while True:
+                entry = self._entries.get(task_name)
+                if entry is None or entry.get('version') != version:
+                    return None
+                if entry['state'] == self.STATE_DONE:
+                    return copy.deepcopy(entry['result'])
+                if entry['state'] == self.STATE_FAILED or not wait or self._stopped:
+                    return None
+                self._lock.wait(timeout=0.5)
+
+    def status(self) -> List[Tuple[str, str, Optional[float]]]:
+        """Return ``(task_name, state, seconds)`` for every task in submission order."""
+        with self._lock:
+            return [
+                (name, self._entries[name]['state'], self._entries[name]['seconds'])
+                for name in self._order
+                if name in self._entries
+            ]
+
+    def is_busy(self) -> bool:
+        with self._lock:
+            return any(e['state'] in (self.STATE_QUEUED, self.STATE_RUNNING) for e in self._entries.values())
+
+    def clear(self) -> None:
+        """Drop all cached results and pending work (e.g. on session reset)."""
+        with self._lock:
+            self._pending.clear()
+            self._entries.clear()
+            self._order.clear()
+            self._lock.notify_all()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._pending.clear()
+            self._lock.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopped:
+                    self._lock.wait()
+                if self._stopped:
+                    return
+                task_name, snapshot = self._pending.popleft()
+                entry = self._entries.get(task_name)
+                # Skip work superseded by a newer submission or a clear()
+                if entry is None or entry.get('version') != snapshot['version']:
+                    continue
+                entry['state'] = self.STATE_RUNNING
+            engine = self._engine_ref()
+            if engine is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                result = engine.analyze_task_snapshot(snapshot)
+                error = None
+            except Exception as e:
+                result = None
+                error = str(e)
+                print(f"[SCHEDULER] Background analysis of '{task_name}' failed: {e}")
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                entry = self._entries.get(task_name)
+                if entry is not None and entry.get('version') == snapshot['version']:
+                    entry['state'] = self.STATE_DONE if error is None else self.STATE_FAILED
+                    entry['result'] = result
+                    entry['error'] = error
+                    entry['seconds'] = elapsed
+                self._lock.notify_all()
+            if error is None:
+                print(f"[SCHEDULER] '{task_name}' analyzed in background in {elapsed:.1f}s")
+
+
+class EnhancedFeatureAnalysisEngine(FeatureAnalysisEngine):
+    def __init__(
+        self,
+        normalization_method: str = 'snr_based',
+        blink_sigma: float = 3.0,
+        config: Optional[EnhancedAnalyzerConfig] = None,
+    ):
+        super().__init__()
+        self.config = config or EnhancedAnalyzerConfig()
+        # Configuration
+        self.normalization_method = normalization_method
+        self.blink_sigma = blink_sigma
+        # Block-based analysis defaults
+        self.block_seconds = getattr(self.config, 'block_seconds', 8.0)
+        self.nmin_sessions = getattr(self.config, 'nmin_sessions', 2)
+        self.mt_tapers = getattr(self.config, 'mt_tapers', 3)
+        # Mains frequency heuristic (Windows: 60Hz, others default 50Hz)
+        try:
+            self.mains_hz = 60.0 if platform.system() == 'Windows' else 50.0
+        except Exception:
+            self.mains_hz = 50.0
+        # Prefer 2-second windows for processing
+        try:
+            if hasattr(self, 'window_seconds'):
+                self.window_seconds = 2.0
+            if hasattr(self, 'fs') and hasattr(self, 'window_samples'):
+                self.window_samples = int(self.fs * getattr(self, 'window_seconds', 2.0))
+            # Recompute step size for the new window length
+            if hasattr(self, 'window_samples') and hasattr(self, 'step_samples'):
+                overlap = getattr(self, 'window_overlap', getattr(self, 'overlap', 0.5))
+                self.step_samples = max(1, int(self.window_samples * (1.0 - float(overlap))))
+        except Exception:
+            pass
+        # Buffers for blink detection statistics over recent raw samples
+        self.recent_window_envelopes = deque(maxlen=60)
+        # Per-task storage in addition to aggregate 'task'
+        if 'tasks' not in self.calibration_data:
+            self.calibration_data['tasks'] = {}
+        # Diagnostics counters for EC windows
+        self.baseline_kept = 0
+        self.baseline_rejected = 0
+        # Gamma EMG guard statistics
+        self.gamma_windows_total = 0
+        self.gamma_windows_kept = 0
+        # Permutation and correlation caches: LRU, content-keyed, sharing one memory cap
+        self.cache_manager = CacheManager(int(self.config.cache_memory_mb * 1024 * 1024))
+        self._perm_index_cache = self.cache_manager.cache('perm_index')
+        self._cached_corr_matrices = self.cache_manager.cache('corr')
+        self._cached_block_summaries = self.cache_manager.cache('block_summaries')
+        self._cached_block_corr = self.cache_manager.cache('block_corr')
+        self.last_export_full: Dict[str, Any] = {}
+        self.last_export_integer: Dict[str, Any] = {}
+        # Cancellation / progress hooks for long-running permutation tasks
+        self._perm_cancelled = False
+        self._perm_progress_callback = None  # Callable[[int, int], None]
+        # "auto" preset: measured seconds per block permutation keyed by (features, blocks)
+        self._perm_benchmark_cache: Dict[Tuple[int, int], float] = {}
+        self.permutation_plan: Dict[str, Any] = {}
+        # Tasks this session is expected to record (sizes the "auto" plan; None: those recorded so far)
+        self.expected_tasks: Optional[int] = None
+        # Permutation seed of this session when config.seed is None (drawn on first use)
+        self.session_seed: Optional[int] = None
+        # General (non-permutation) multi-task analysis progress callback
+        self._general_progress_callback = None  # Callable[[int, int], None]
+        # Feature-level progress callback for fine-grained task analysis updates
+        self._feature_progress_callback = None  # Callable[[str, int, int], None] -> (task_name, processed_features, total_features)
+        # Overall single-task analysis cancellation flag
+        self._analysis_cancelled = False
+        # Optional background per-task analysis (see enable_pipelined_analysis)
+        self.task_scheduler: Optional[TaskAnalysisScheduler] = None
+
+    # --- Pipelined per-task analysis ---
+    def enable_pipelined_analysis(self) -> TaskAnalysisScheduler:
+        """Analyze each task in the background as soon as its phase is stopped."""
+        if self.task_scheduler is None:
+            self.task_scheduler = TaskAnalysisScheduler(self)
+        return self.task_scheduler
+
+    def stop_calibration_phase(self):
+        closing_task = self.current_task if self.current_state == 'task' else None
+        super().stop_calibration_phase()
+        if closing_task:
+            self._on_task_phase_closed(closing_task)
+
+    def _on_task_phase_closed(self, task_name: str) -> None:
+        if self.task_scheduler is not None:
+            try:
+                self.task_scheduler.submit(task_name)
+            except Exception as e:
+                print(f"[SCHEDULER] Could not queue '{task_name}': {e}")
+
+    def reset_session(self):
+        super().reset_session()
+        self.calibration_data.setdefault('tasks', {})
+        if self.task_scheduler is not None:
+            self.task_scheduler.clear()
+        self.cache_manager.clear()
+        self.session_seed = None
+        self.permutation_plan = {}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Per-cache entries, bytes and hit/miss/eviction counters plus the shared cap."""
+        return self.cache_manager.stats()
+
+    @staticmethod
+    def _clean_task_bucket(raw_data: Any) -> Tuple[Optional[Dict[str, List[Any]]], Optional[str]]:
+        """Return ``({'features', 'timestamps'}, None)`` for a usable task bucket, else ``(None, reason)``."""
+        if not isinstance(raw_data, dict):
+            return None, "invalid task container"
+        raw_features = raw_data.get('features') or []
+        if not isinstance(raw_features, list):
+            return None, "feature bucket is not a list"
+        timestamps_container = raw_data.get('timestamps')
+        if isinstance(timestamps_container, (list, tuple)):
+            raw_timestamps = list(timestamps_container)
+        else:
+            raw_timestamps = []
+        cleaned_features: List[Dict[str, Any]] = []
+        cleaned_timestamps: List[Any] = []
+        for idx, entry in enumerate(list(raw_features)):
+            if not isinstance(entry, dict):
+                continue
+            if not entry:
+                continue
+            cleaned_features.append(entry)
+            timestamp_value = raw_timestamps[idx] if idx < len(raw_timestamps) else None
+            cleaned_timestamps.append(timestamp_value)
+        if not cleaned_features:
+            return None, "no valid feature windows recorded"
+        return {'features': cleaned_features, 'timestamps': cleaned_timestamps}, None
+
+    def _task_data_version(self, task_data: Dict[str, List[Any]]) -> Tuple[Any, ...]:
+        """Cheap fingerprint of a task bucket plus the baseline and statistics config it is tested against."""
+        features = task_data.get('features', [])
+        timestamps = task_data.get('timestamps', [])
+        ec = self.calibration_data.get('eyes_closed', {})
+        eo = self.calibration_data.get('eyes_open', {})
+        ec_ts = ec.get('timestamps') or [None]
+        cfg = self.config
+        return (
+            len(features),
+            timestamps[-1] if timestamps else None,
+            len(ec.get('features', [])),
+            ec_ts[-1],
+            len(eo.get('features', [])),
+            cfg.alpha, cfg.fdr_alpha,
+            (AUTO_PERM_PRESET, cfg.analysis_budget_s) if cfg.is_auto_preset else cfg.n_perm,
+            cfg.perm_mode, cfg.perm_h, cfg.fast_mode, cfg.seed,
+            cfg.effect_measure, float(self.block_seconds),
+        )
+
+    def snapshot_task_data(self, task_name: str) -> Optional[Dict[str, Any]]:
+        """Copy everything needed to analyze ``task_name`` away from the live buffers."""
+        cleaned, _reason = self._clean_task_bucket(self.calibration_data.get('tasks', {}).get(task_name))
+        if cleaned is None:
+            return None
+        baseline = {}
+        for label in ('eyes_closed', 'eyes_open'):
+            bucket = self.calibration_data.get(label, {})
+            baseline[label] = {
+                'features': list(bucket.get('features', [])),
+                'timestamps': list(bucket.get('timestamps', [])),
+            }
+        return {
+            'task_name': task_name,
+            'features': cleaned['features'],
+            'timestamps': cleaned['timestamps'],
+            'baseline': baseline,
+            'version': self._task_data_version(cleaned),
+        }
+
+    def analyze_task_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Run ``analyze_task_data`` for one task on a detached copy of this engine.
+
+        The copy owns its calibration buffers, caches and result attributes, so
+        this is safe to call from a worker thread while recording continues.
+        Returns the same structure as one ``multi_task_results['per_task']`` entry.
+        """
+        worker = copy.copy(self)
+        worker.calibration_data = {
+            'eyes_closed': snapshot['baseline']['eyes_closed'],
+            'eyes_open': snapshot['baseline']['eyes_open'],
+            'task': {'features': list(snapshot['features']), 'timestamps': list(snapshot['timestamps'])},
+            'tasks': {},
+        }
+        worker.baseline_stats = dict(self.baseline_stats or {})
+        worker.analysis_results = {}
+        worker.task_summary = {}
+        worker.last_export_full = {}
+        worker.last_export_integer = {}
+        worker._perm_progress_callback = None
+        worker._general_progress_callback = None
+        worker._feature_progress_callback = None
+        worker._perm_cancelled = False
+        worker._analysis_cancelled = False
+        worker.task_scheduler = None
+        worker.current_state = 'idle'
+        worker.current_task = snapshot['task_name']
+        if not worker.baseline_stats:
+            worker.compute_baseline_statistics()
+        analysis = worker.analyze_task_data() or {}
+        return {
+            'analysis': copy.deepcopy(analysis),
+            'summary': copy.deepcopy(getattr(worker, 'task_summary', {})),
+            'export_full': copy.deepcopy(getattr(worker, 'last_export_full', {})),
+            'export_integer': copy.deepcopy(getattr(worker, 'last_export_integer', {})),
+        }
+
+    def _pipelined_task_result(self, task_name: str, task_data: Dict[str, List[Any]]) -> Optional[Dict[str, Any]]:
+        if self.task_scheduler is None:
+            return None
+        return self.task_scheduler.result_for(task_name, self._task_data_version(task_data))
+
+    # Persistent multi-task result cache
+    _RESULT_CACHE_IGNORED_FIELDS = ("cache_memory_mb", "result_cache", "result_cache_dir")
+
+    def _result_cache(self) -> Optional[AnalysisResultCache]:
+        """On-disk cache under the session directory (None when disabled)."""
+        if not getattr(self.config, 'result_cache', False):
+            return None
+        directory = self.config.result_cache_dir
+        if not directory and getattr(self, 'save_dir', None):
+            directory = os.path.join(self.save_dir, "analysis_cache")
+        return AnalysisResultCache(directory)
+
+    def _result_cache_key(self, tasks: Dict[str, Dict[str, Any]]) -> str:
+        cfg_items = {k: v for k, v in asdict(self.config).items() if k not in self._RESULT_CACHE_IGNORED_FIELDS}
+        if self.config.is_auto_preset:
+            # The planned n_perm depends on machine speed; the budget is what was asked for
+            cfg_items.pop('n_perm', None)
+        else:
+            cfg_items.pop('analysis_budget_s', None)
+        cfg_items.update({
+            'engine_block_seconds': float(self.block_seconds),
+            'fs': getattr(self, 'fs', None),
+            'window_samples': getattr(self, 'window_samples', None),
+            'channel_count': getattr(self, 'channel_count', None),
+        })
+        baseline = {
+            phase: self.calibration_data.get(phase, {}) or {}
+            for phase in ('eyes_closed', 'eyes_open')
+        }
+        return result_cache_key(type(self).__name__, baseline, tasks, cfg_items)
+
+    def _restore_cached_results(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Reinstate engine state as if analyze_all_tasks_data() had just run."""
+        self.multi_task_results = payload['multi_task_results']
+        combined = self.multi_task_results.get('combined', {}) or {}
+        self.analysis_results = copy.deepcopy(combined.get('analysis', {}) or {})
+        self.task_summary = copy.deepcopy(combined.get('summary', {}) or {})
+        self.last_export_full = copy.deepcopy(combined.get('export_full', {}) or {})
+        self.last_export_integer = copy.deepcopy(combined.get('export_integer', {}) or {})
+        self.permutation_plan = dict(payload.get('permutation_plan') or {})
+        if self.config.seed is None and payload.get('seed') is not None:
+            # Later runs in this session continue from the stored draw's seed
+            self.session_seed = int(payload['seed'])
+        return self.multi_task_results
+
+    # Cancellation / progress API
+    def cancel_permutations(self) -> None:
+        """Signal cancellation for any in-flight permutation computations."""
+        self._perm_cancelled = True
+
+    def reset_permutation_cancel(self) -> None:
+        """Reset the cancellation flag before starting a new permutation run."""
+        self._perm_cancelled = False
+
+    def set_permutation_progress_callback(self, cb) -> None:
+        """Set a progress callback function accepting (completed_perms, total_perms)."""
+        self._perm_progress_callback = cb
+
+    def clear_permutation_progress_callback(self) -> None:
+        self._perm_progress_callback = None
+
+    def set_general_progress_callback(self, cb) -> None:
+        """Set a general progress callback for per-task analysis phase.
+
+        Callback receives (completed_steps, total_steps) where total_steps = number of per-task analyses + 1 (combined).
+        """
+        self._general_progress_callback = cb
+
+    def clear_general_progress_callback(self) -> None:
+        self._general_progress_callback = None
+
+    def set_feature_progress_callback(self, cb) -> None:
+        """Set fine-grained per-feature progress callback.
+
+        Callback signature: (task_name: str, processed_features: int, total_features: int).
+        Emitted from analyze_task_data for each active task (including combined).
+        """
+        self._feature_progress_callback = cb
+
+    def clear_feature_progress_callback(self) -> None:
+        self._feature_progress_callback = None
+
+    # --- Analysis-wide cancellation (features + permutations) ---
+    def cancel_analysis(self) -> None:
+        """Cancel the current analysis (features + permutations)."""
+        self._analysis_cancelled = True
+        self.cancel_permutations()
+
+    def reset_analysis_cancel(self) -> None:
+        self._analysis_cancelled = False
+
+    # --- Minimal statistical helpers (SciPy optional) ---
+    @staticmethod
+    def _welch_ttest(x: np.ndarray, y: np.ndarray):
+        """Return (t_stat, p_value) for Welch's t-test.
+        Uses SciPy if available; otherwise a conservative normal approximation.
+        Guard against zero-variance degenerate cases to avoid spurious tiny p-values.
+        """
+        # Prefer SciPy if present
+        if _scipy_ttest_ind is not None:
+            try:
+                res = _scipy_ttest_ind(x, y, equal_var=False)
+                # Ensure consistent (t_stat, p_val) tuple
+                return float(res.statistic), float(res.pvalue)
+            except Exception:
+                pass
+        # Fallback: compute t-stat and p-value using normal approximation (reasonable for df>30)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        nx = max(1, x.size)
+        ny = max(1, y.size)
+        mx = float(np.mean(x))
+        my = float(np.mean(y))
+        vx = float(np.var(x, ddof=1)) if nx > 1 else 0.0
+        vy = float(np.var(y, ddof=1)) if ny > 1 else 0.0
+        # If both groups have (near) zero variance, treat as non-testable (p=1.0)
+        if vx <= 1e-15 and vy <= 1e-15:
+            return 0.0, 1.0
+        denom = float(np.sqrt((vx / max(nx, 1)) + (vy / max(ny, 1))))
+        if denom <= 1e-15:
+            # Degenerate denominator; avoid artificially inflating t
+            return 0.0, 1.0
+        t_stat = (mx - my) / denom
+        # Welch–Satterthwaite df
+        with np.errstate(divide='ignore', invalid='ignore'):
+            num = (vx / nx + vy / ny) ** 2
+            den = ((vx**2) / (nx**2 * max(nx - 1, 1))) + ((vy**2) / (ny**2 * max(ny - 1, 1)))
+            df = float(num / den) if den > 0 else float(nx + ny - 2)
+        # Two-tailed normal approximation for p-value
+        try:
+            from math import erfc, sqrt
+            z = abs(t_stat)
+            p = float(erfc(z / sqrt(2.0)))  # 2*(1-Phi(|z|))
+        except Exception:
+            p = 1.0
+        return t_stat, p
+
+    @staticmethod
+    def _chi2_sf(stat: float, df: int) -> float:
+        """Survival function (1-CDF) for chi-square. Uses SciPy if available; else normal approx."""
+        if _scipy_chi2 is not None:
+            try:
+                return float(_scipy_chi2.sf(stat, df))
+            except Exception:
+                pass
+        # Normal approximation: chi2_k ~ N(k, 2k)
+        try:
+            from math import erfc, sqrt
+            if df <= 0:
+                return 1.0
+            mean = float(df)
+            std = float(np.sqrt(2.0 * df))
+            z = (stat - mean) / (std + 1e-18)
+            return float(0.5 * erfc(z / np.sqrt(2.0)))
+        except Exception:
+            return 1.0
+
+    # --- Multiple testing and p-value combination helpers ---
+    @staticmethod
+    def _bh_fdr(p_values, alpha=0.05):
+        """Benjamini–Hochberg FDR procedure.
+        Returns (rejected_mask, p_adjusted_list).
+        """
+        if not p_values:
+            return [], []
+        # Pair p-values with their original indices
+        m = len(p_values)
+        pairs = sorted([(max(min(float(p), 1.0), 1e-300), i) for i, p in enumerate(p_values)], key=lambda x: x[0])
+        p_sorted = [p for p, _ in pairs]
+        idx_sorted = [i for _, i in pairs]
+        # Compute adjusted p-values (BH step-up)
+        q = [0.0] * m
+        prev = 1.0
+        for k in range(m - 1, -1, -1):
+            val = (m / (k + 1.0)) * p_sorted[k]
+            prev = min(prev, val)
+            q[k] = prev
+        # Re-map to original order
+        p_adj = [0.0] * m
+        for pos, orig_idx in enumerate(idx_sorted):
+            p_adj[orig_idx] = min(q[pos], 1.0)
+        rejected = [pa <= alpha for pa in p_adj]
+        return rejected, p_adj
+
+    @staticmethod
+    def _fishers_method(p_values):
+        """Fisher's method for combining independent p-values."""
+        if not p_values:
+            return None, None
+        # Clip p-values to avoid log(0)
+        clipped = [max(min(float(p), 1.0), 1e-300) for p in p_values]
+        stat = -2.0 * float(np.sum(np.log(clipped)))
+        df = 2 * len(clipped)
+    # Use our chi-square survival function (SciPy if available)
+        p_comb = float(EnhancedFeatureAnalysisEngine._chi2_sf(stat, df))
+        return stat, p_comb
+
+    def _km_from_corr(self, fisher_stat: float, corr: Optional[np.ndarray]) -> Tuple[float, float, float, Optional[float]]:
+        """Kost–McDermott correction using a provided correlation matrix (Spearman).
+        Returns (adjusted_stat, p_value, df_km, mean_offdiag_r).
+        """
+        if corr is None or corr.size == 0:
+            k = 0
+        else:
+            k = corr.shape[0]
+        if k <= 1:
+            return fisher_stat, float(self._chi2_sf(fisher_stat, 2 * max(k, 1))), float(2 * max(k, 1)), None
+        mu = 2.0 * k
+        cov_sum = 0.0
+        r_sum = 0.0
+        r_count = 0
+        for i in range(k):
+            for j in range(i + 1, k):
+                r = float(corr[i, j])
+                r_sum += r
+                r_count += 1
+                cov = 3.263 * r + 0.710 * (r ** 2) + 0.027 * (r ** 3)
+                cov_sum += cov
+        mean_r = r_sum / r_count if r_count > 0 else 0.0
+        sigma_sq = 4.0 * k + 2.0 * cov_sum
+        if sigma_sq <= 0:
+            return fisher_stat, float(self._chi2_sf(fisher_stat, 2 * k)), float(2 * k), mean_r
+        c = sigma_sq / (2.0 * mu)
+        df = max(1.0, (2.0 * (mu ** 2)) / sigma_sq)
+        adjusted_stat = fisher_stat / c
+        if _scipy_chi2 is not None:
+            p_val = float(_scipy_chi2.sf(adjusted_stat, df))
+        else:
+            p_val = float(self._chi2_sf(adjusted_stat, int(round(df))))
+        return adjusted_stat, p_val, df, mean_r
+
+    # --- Expectation alignment ---
+    def _evaluate_expectation_alignment(self, task_name: Optional[str]) -> Dict[str, Any]:
+        """Production expectation-alignment with task-specific rules and thresholds.
+        
+        Returns dict with:
+        - grade: A/B/C/D based on key-feature passes
+        - passes: list of features that met directional expectation with p_dir/d/pct/rule
+        - top_drivers: top 2-3 features by |d|
+        - counter_directional: bool if ≥70% features go against expectation
+        - notes: any warnings (gamma guarded, insufficient metrics)
+        - insufficient_metrics: True if key features have no valid d/p_dir
+        """
+        results = getattr(self, 'analysis_results', {}) or {}
+        expected_map = {}
+        passed_features = []
+        key_dir_counts = {'with': 0, 'against': 0}
+        insufficient_metrics = False
+        
+        # Task-specific thresholds for d and %Δ (production values)
+        task_thresholds = {
+            'mental_math': {'alpha': 0.25, 'beta': 0.35, 'gamma': 0.30, 'pct_relative': 5.0},
+            'attention_focus': {'alpha': 0.25, 'beta': 0.35, 'gamma': 0.30, 'pct_relative': 5.0},
+            'visual_imagery': {'alpha': 0.30, 'gamma': 0.30, 'pct_relative': 8.0},
+            'working_memory': {'theta': 0.30, 'beta': 0.35, 'alpha': 0.25, 'pct_relative': 5.0},
+            'cognitive_load': {'theta': 0.30, 'alpha': 0.25, 'pct_relative': 5.0},
+            'motor_imagery': {'alpha': 0.25, 'beta': 0.30, 'pct_relative': 5.0},
+            'language_processing': {'alpha': 0.25, 'beta': 0.35, 'pct_relative': 5.0},
+        }
+        
+        t = (task_name or '').lower()
+        thr = task_thresholds.get(t, {'alpha': 0.25, 'beta': 0.30, 'gamma': 0.30, 'pct_relative': 5.0})
+        
+        # Collect features with expectations
+        for feat, entry in results.items():
+            exp = self._expected_direction(task_name, feat)
+            if exp is None:
+                continue
+            expected_map[feat] = exp
+            
+            # Check observed direction vs expectation
+            delta = float(entry.get('delta', 0.0))
+            dir_ok = (delta > 0 and exp == 'up') or (delta < 0 and exp == 'down')
+            key_dir_counts['with' if dir_ok else 'against'] += 1
+            
+            # Check if feature passed significance with directional criteria
+            if entry.get('significant_change'):
+                flags = entry.get('decision_flags', {})
+                p_dir = flags.get('p_one_sided')
+                d_val = entry.get('effect_size_d')
+                pct = entry.get('percent_change')
+                rule = flags.get('pass_rule', 'unknown')
+                
+                # Determine which band/feature threshold applies
+                feat_thr_d = 0.25  # default
+                if 'alpha' in feat:
+                    feat_thr_d = thr.get('alpha', 0.25)
+                elif 'beta' in feat:
+                    feat_thr_d = thr.get('beta', 0.30)
+                elif 'gamma' in feat:
+                    feat_thr_d = thr.get('gamma', 0.30)
+                elif 'theta' in feat:
+                    feat_thr_d = thr.get('theta', 0.30)
+                
+                # Check if metrics meet threshold
+                d_meets = (d_val is not None and not np.isnan(d_val) and abs(d_val) >= feat_thr_d)
+                pct_meets = (pct is not None and not np.isnan(pct) and abs(pct) >= thr['pct_relative'])
+                
+                passed_features.append({
+                    'feature': feat,
+                    'direction': exp,
+                    'p_dir': p_dir,
+                    'd': d_val,
+                    'pct': pct,
+                    'rule': rule,
+                    'd_meets_thr': d_meets,
+                    'pct_meets_thr': pct_meets,
+                })
+        
+        # Task-specific grading rules (production)
+        t_lower = t.lower()
+        main_pass = False
+        grade_notes = []
+        
+        try:
+            if t_lower == 'mental_math':
+                # Expect: alpha↓, beta↑, beta_alpha_ratio↑, gamma↑
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                beta_up = any(f['feature'] == 'beta_relative' and f['direction'] == 'up' 
+                             and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'beta_alpha_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                gamma_up = any(f['feature'] == 'gamma_relative' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                
+                # Grade A: alpha↓ + (beta↑ or ratio↑) + gamma↑
+                if alpha_down and (beta_up or ratio_up) and gamma_up:
+                    main_pass = True
+                    grade_notes.append('All key features (α↓, β/ratio↑, γ↑) passed')
+                elif alpha_down and (beta_up or ratio_up):
+                    main_pass = True
+                    grade_notes.append('Core features (α↓, β/ratio↑) passed')
+                else:
+                    grade_notes.append('Missing core mental_math features')
+                    
+            elif t_lower == 'attention_focus':
+                # Expect: alpha↓, beta↑, beta_alpha_ratio↑
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                beta_up = any(f['feature'] == 'beta_relative' and f['direction'] == 'up' 
+                             and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'beta_alpha_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                
+                # Grade A: alpha↓ + (beta↑ or ratio↑)
+                if alpha_down and (beta_up or ratio_up):
+                    main_pass = True
+                    grade_notes.append('Core features (α↓, β/ratio↑) passed')
+                else:
+                    grade_notes.append('Missing core attention_focus features')
+                    
+            elif t_lower == 'visual_imagery':
+                alpha_up = any(f['feature'] == 'alpha_relative' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'alpha_theta_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                main_pass = alpha_up or ratio_up
+                grade_notes.append('Visual imagery: alpha/ratio signature')
+                
+            elif t_lower == 'working_memory':
+                theta_up = any(f['feature'].startswith('theta_') and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'beta_alpha_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                main_pass = theta_up and (alpha_down or ratio_up)
+                grade_notes.append('Working memory: theta + alpha/ratio')
+                
+            elif t_lower == 'cognitive_load':
+                theta_up = any(f['feature'].startswith('theta_') and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                main_pass = theta_up and alpha_down
+                grade_notes.append('Cognitive load: theta↑ + alpha↓')
+                
+            elif t_lower == 'motor_imagery':
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                beta_up = any(f['feature'] == 'beta_relative' and f['direction'] == 'up' 
+                             and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'beta_alpha_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                main_pass = alpha_down or beta_up or ratio_up
+                grade_notes.append('Motor imagery: alpha↓ or beta↑')
+                
+            elif t_lower == 'language_processing':
+                alpha_down = any(f['feature'] == 'alpha_relative' and f['direction'] == 'down' 
+                                and f.get('d_meets_thr', False) for f in passed_features)
+                ratio_up = any(f['feature'] == 'beta_alpha_ratio' and f['direction'] == 'up' 
+                              and f.get('d_meets_thr', False) for f in passed_features)
+                main_pass = alpha_down and ratio_up
+                grade_notes.append('Language: alpha↓ + ratio↑')
+                
+        except Exception as e:
+            main_pass = False
+            grade_notes.append(f'Grading error: {str(e)}')
+        
+        # Check for insufficient metrics on key features
+        key_features_map = {
+            'mental_math': ['alpha_relative', 'beta_relative', 'beta_alpha_ratio', 'gamma_relative'],
+            'attention_focus': ['alpha_relative', 'beta_relative', 'beta_alpha_ratio'],
+            'visual_imagery': ['alpha_relative', 'alpha_theta_ratio'],
+            'working_memory': ['theta_relative', 'alpha_relative', 'beta_alpha_ratio'],
+            'cognitive_load': ['theta_relative', 'alpha_relative'],
+            'motor_imagery': ['alpha_relative', 'beta_relative', 'beta_alpha_ratio'],
+            'language_processing': ['alpha_relative', 'beta_alpha_ratio'],
+        }
+        key_feats = key_features_map.get(t_lower, [])
+        missing_metrics = []
+        for kf in key_feats:
+            entry = results.get(kf, {})
+            d_val = entry.get('effect_size_d')
+            p_dir = entry.get('decision_flags', {}).get('p_one_sided')
+            reason = entry.get('reason', '')
+            if d_val is None or np.isnan(d_val) or p_dir is None:
+                missing_metrics.append(f"{kf}({reason if reason else 'no_d_or_p'})")
+        
+        if missing_metrics:
+            insufficient_metrics = True
+            grade_notes.append(f"Insufficient metrics: {', '.join(missing_metrics)}")
+        
+        # Assign grade A/B/C/D
+        grade = 'D'
+        n_pass = len(passed_features)
+        if main_pass and n_pass >= 3:
+            grade = 'A'
+        elif main_pass:
+            grade = 'B'
+        elif n_pass >= 2:
+            grade = 'C'
+        
+        # Counter-directional flag (≥70% features against expectation)
+        total_dir = key_dir_counts['with'] + key_dir_counts['against']
+        counter = False
+        if total_dir >= 3:
+            frac_against = key_dir_counts['against'] / float(total_dir)
+            counter = frac_against >= 0.70
+        
+        # Top 2-3 drivers by |d|
+        drivers = sorted(
+            [{'feature': f['feature'], 'd': abs(f.get('d', 0.0) or 0.0)} for f in passed_features],
+            key=lambda x: x['d'], reverse=True
+        )[:3]
+        
+        # Notes: gamma EMG status
+        notes = []
+        try:
+            task_features = self.calibration_data.get('task', {}).get('features', [])
+            emg_flags = [int(e.get('_emg_guard', 0)) for e in task_features]
+            if any(v == 1 for v in emg_flags):
+                notes.append('Gamma evaluation guarded by EMG flag in some windows')
+        except Exception:
+            pass
+        
+        notes.extend(grade_notes)
+        
+        return {
+            'grade': grade,
+            'passes': passed_features,
+            'top_drivers': drivers,
+            'counter_directional': counter,
+            'notes': notes,
+            'insufficient_metrics': insufficient_metrics,
+        }
+
+    # --- Utility: simple blink detection on a window ---
+    def _is_blinky_window(self, x: np.ndarray) -> bool:
+        """Conservative blink heuristic using robust dispersion (MAD) and proportion.
+        Flags as blink only if both a very large deviation exists AND a small
+        fraction of samples exceed a lower threshold, to avoid rejecting normal EC.
+        """
+        x = np.asarray(x, dtype=float)
+        med = float(np.median(x))
+        dev = np.abs(x - med)
+        mad = float(np.median(dev)) + 1e-12
+        scale = 1.4826 * mad  # approx std for normally distributed data
+        # Very high spike threshold and a lower threshold for proportion check
+        hi_thr = 8.0 * scale
+        lo_thr = 5.0 * scale
+        if scale <= 1e-9:
+            return False
+        has_spike = bool(np.max(dev) > hi_thr)
+        frac_hi = float(np.mean(dev > lo_thr))
+        return has_spike and (frac_hi > 0.01)
+
+    # --- Optional PSD normalization hook ---
+    def _normalize_psd(self, psd: np.ndarray, method: str):
+        if method == 'total_power':
+            denom = np.sum(psd) + 1e-12
+            return psd / denom
+        elif method == 'snr_based':
+            noise_floor = np.percentile(psd, 10)
+            nf = max(noise_floor, 1e-12)
+            return (psd - nf) / nf
+        elif method == 'z_transform':
+            mu, sd = np.mean(psd), np.std(psd) + 1e-12
+            return (psd - mu) / sd
+        elif method == 'robust_scaling':
+            med = np.median(psd)
+            mad = np.median(np.abs(psd - med))
+            scale = 1.4826 * (mad + 1e-12)
+            return (psd - med) / scale
+        return psd
+
+    def extract_features(self, window_data):
+        # Override to add PSD normalization and robust peak descriptors
+        t_stage = PIPELINE_LATENCY.stamp()
+        x = np.asarray(window_data, dtype=float)
+        x = x - np.mean(x)
+        t_stage = PIPELINE_LATENCY.lap('filter', t_stage)
+        try:
+            # Ensure sample rate present
+            self.fs = float(getattr(self, 'fs', 256.0))
+        except Exception:
+            self.fs = 256.0
+        # PSD via multitaper if available
+        psd = None
+        freqs = None
+        use_multitaper = True
+        if use_multitaper:
+            try:
+                from numpy.fft import rfft, rfftfreq
+                K = max(1, int(self.mt_tapers))
+                NW = 2.5  # time-bandwidth product (typical)
+                tapers = dpss_tapers(x.size, NW, K)
+                psd_accum = None
+                for k in range(K):
+                    xk = x * tapers[k]
+                    Xk = rfft(xk)
+                    Pk = (np.abs(Xk) ** 2) / (self.fs * x.size)
+                    if psd_accum is None:
+                        psd_accum = Pk
+                    else:
+                        psd_accum += Pk
+                psd = psd_accum / float(K)
+                freqs = rfftfreq(x.size, d=1.0 / self.fs)
+            except Exception:
+                pass
+        if psd is None or freqs is None:
+            freqs, psd = compute_psd(x, self.fs)
+        t_stage = PIPELINE_LATENCY.lap('psd', t_stage)
+
+        # Global noise floor for SNR-adapted band powers
+        try:
+            noise_floor = np.percentile(psd, 10)
+        except Exception:
+            noise_floor = float(np.min(psd)) if psd.size else 0.0
+        snr_psd = np.maximum(psd - noise_floor, 0.0)
+
+        # Keep a normalized PSD only for peak descriptors
+        psd_norm = self._normalize_psd(psd, self.normalization_method)
+
+        total_power = np.var(x)
+        features = {}
+        band_powers = {}
+
+        # Use extended bands: include theta1/theta2 and beta1/beta2
+        extended_bands = dict(EEG_BANDS)
+        # Fill in common defaults if base is missing
+        if not extended_bands:
+            extended_bands = {
+                'delta': (0.5, 4),
+                'theta': (4, 8),
+                'alpha': (8, 13),
+                'beta': (13, 30),
+                'gamma': (30, 45),
+            }
+        # Add splits
+        extended_bands.update({
+            'theta1': (4, 6),
+            'theta2': (6, 8),
+            'beta1': (13, 20),
+            'beta2': (20, 30),
+        })
+
+        # Precompute total SNR power across spectrum for relative metrics
+        try:
+            total_snr_power_spectrum = float(np.trapz(snr_psd, freqs)) if psd.size else 0.0
+        except Exception:
+            total_snr_power_spectrum = float(np.sum(snr_psd))
+
+        for band_name, (low, high) in extended_bands.items():
+            mask = (freqs >= low) & (freqs <= high)
+            if np.any(mask):
+                band_freqs = freqs[mask]
+                band_psd = psd[mask]
+                band_snr_psd = snr_psd[mask]
+                band_psd_norm = psd_norm[mask]
+
+                # Absolute and relative power
+                try:
+                    # Raw power (for reference)
+                    raw_power = float(np.trapz(band_psd, band_freqs))
+                except Exception:
+                    raw_power = float(np.sum(band_psd))
+                try:
+                    # SNR-adapted power (preferred)
+                    snr_power = float(np.trapz(band_snr_psd, band_freqs))
+                except Exception:
+                    snr_power = float(np.sum(band_snr_psd))
+
+                band_powers[band_name] = snr_power
+                features[f'{band_name}_power'] = snr_power
+                features[f'{band_name}_power_raw'] = raw_power
+
+                # Prefer relative metrics based on SNR-adapted totals
+                denom = total_snr_power_spectrum if total_snr_power_spectrum > 0 else (total_power + 1e-12)
+                rel_power = snr_power / (denom + 1e-12)
+                features[f'{band_name}_relative'] = rel_power
+
+                # Robust peak descriptors from normalized PSD
+                if len(band_psd_norm) > 0:
+                    peak_idx = int(np.argmax(band_psd_norm))
+                    peak_amp = float(band_psd_norm[peak_idx])
+                    peak_freq = float(band_freqs[peak_idx])
+                    features[f'{band_name}_peak_freq'] = peak_freq
+                    features[f'{band_name}_peak_amp'] = float(band_psd[peak_idx])
+                    # Relative prominence within band
+                    mean_band = np.mean(band_psd_norm) + 1e-12
+                    features[f'{band_name}_peak_rel_amp'] = peak_amp / mean_band
+                    # Spectral entropy within band (stable)
+                    p = band_psd_norm / (np.sum(band_psd_norm) + 1e-12)
+                    # Numerical guard: clip & renormalize to avoid log2 warnings and negative rounding
+                    p = np.clip(p, 1e-12, 1.0)
+                    p = p / (np.sum(p) + 1e-12)
+                    features[f'{band_name}_entropy'] = float(-np.sum(p * np.log2(p)))
+                else:
+                    mid = (low + high) / 2
+                    features[f'{band_name}_peak_freq'] = mid
+                    features[f'{band_name}_peak_amp'] = 0.0
+                    features[f'{band_name}_peak_rel_amp'] = 0.0
+                    features[f'{band_name}_entropy'] = 0.0
+            else:
+                mid = (low + high) / 2
+                for suf, val in [('peak_freq', mid), ('peak_amp', 0.0), ('peak_rel_amp', 0.0), ('entropy', 0.0)]:
+                    features[f'{band_name}_{suf}'] = val
+                features[f'{band_name}_power'] = 0.0
+                features[f'{band_name}_power_raw'] = 0.0
+                features[f'{band_name}_relative'] = 0.0
+
+        # High-frequency EMG guard for gamma metrics
+        gamma_windows_total = 1  # This window
+        gamma_windows_kept = 0
+        try:
+            hf_mask = (freqs >= 35) & (freqs <= 45)
+            mid_mask = (freqs >= 20) & (freqs <= 30)
+            hf_power_sum = float(np.trapz(psd[hf_mask], freqs[hf_mask]) if np.any(hf_mask) else 0.0)
+            mid_power_sum = float(np.trapz(psd[mid_mask], freqs[mid_mask]) if np.any(mid_mask) else 0.0)
+            ratio_hf_mid = hf_power_sum / (mid_power_sum + 1e-12)
+            # Spectral slope on 20–45 Hz
+            use_mask = (freqs >= 20) & (freqs <= 45)
+            f_sel = freqs[use_mask]
+            p_sel = psd[use_mask]
+            if f_sel.size >= 3:
+                logf = np.log(f_sel + 1e-12)
+                logp = np.log(p_sel + 1e-18)
+                A = np.vstack([logf, np.ones_like(logf)]).T
+                slope, _ = np.linalg.lstsq(A, logp, rcond=None)[0]
+                emg_flag = bool(ratio_hf_mid > 1.2 or slope > -0.6)
+            else:
+                emg_flag = True  # Not enough freq resolution
+        except Exception:
+            emg_flag = False
+        
+        # Store EMG guard status
+        features['_emg_guard'] = 1 if emg_flag else 0
+        features['_gamma_evaluated'] = 0 if emg_flag else 1
+        
+        if emg_flag:
+            # Remove gamma features and mark as guarded-out
+            for k in list(features.keys()):
+                if k.startswith('gamma_'):
+                    features.pop(k, None)
+            gamma_windows_kept = 0
+        else:
+            gamma_windows_kept = 1
+        
+        # Update session-level gamma statistics (for later reporting)
+        if not hasattr(self, 'gamma_windows_total'):
+            self.gamma_windows_total = 0
+        if not hasattr(self, 'gamma_windows_kept'):
+            self.gamma_windows_kept = 0
+        self.gamma_windows_total += gamma_windows_total
+        self.gamma_windows_kept += gamma_windows_kept
+
+        # Cross-band ratios
+        alpha = band_powers.get('alpha', 0.0)
+        theta = band_powers.get('theta', 0.0)
+        beta = band_powers.get('beta', 0.0)
+        theta1 = band_powers.get('theta1', 0.0)
+        theta2 = band_powers.get('theta2', 0.0)
+        beta1 = band_powers.get('beta1', 0.0)
+        beta2 = band_powers.get('beta2', 0.0)
+        features['alpha_theta_ratio'] = alpha / (theta + 1e-10)
+        features['beta_alpha_ratio'] = beta / (alpha + 1e-10)
+        # New split-band ratios
+        features['beta2_beta1_ratio'] = beta2 / (beta1 + 1e-10)
+        features['theta2_theta1_ratio'] = theta2 / (theta1 + 1e-10)
+        features['total_power'] = total_power
+        PIPELINE_LATENCY.record('features', t_stage)
+
+        return features
+
+    def _process_window(self, window_data, timestamp):
+        # Same windowing as base, but reject only extreme blink artifacts for baseline accumulation
+        features = super()._process_window(window_data, timestamp)
+        if features is None:
+            return None
+        # If currently collecting eyes_closed baseline, check for extreme artifacts only
+        if self.current_state == 'eyes_closed':
+            x = np.asarray(window_data)
+            # Initialize counters if missing
+            if not hasattr(self, 'baseline_rejected'):
+                self.baseline_rejected = 0
+            if not hasattr(self, 'baseline_kept'):
+                self.baseline_kept = 0
+            
+            # Use a much more lenient blink detection for eyes-closed baseline
+            # Only reject windows with extreme artifacts (>10 sigma from median)
+            med = float(np.median(x))
+            mad = float(np.median(np.abs(x - med))) + 1e-12
+            scale = 1.4826 * mad
+            extreme_threshold = 10.0 * scale  # Very lenient threshold
+            
+            # Only reject if there are extreme outliers (>20 sigma) AND many of them
+            extreme_outliers = np.abs(x - med) > (20.0 * scale)
+            is_extreme_artifact = np.sum(extreme_outliers) > (len(x) * 0.05)  # >5% extreme outliers
+            
+            if is_extreme_artifact and scale > 10.0:  # Also require significant variance
+                # Remove last appended feature if it was added to calibration store
+                if len(self.calibration_data['eyes_closed']['features']) > 0:
+                    self.calibration_data['eyes_closed']['features'].pop()
+                    self.calibration_data['eyes_closed']['timestamps'].pop()
+                self.baseline_rejected += 1
+                engine_log.info("❌ Rejected EC window: extreme artifacts detected (scale=%.1f, outliers=%d)", scale, int(np.sum(extreme_outliers)))
+            else:
+                self.baseline_kept += 1
+                # More frequent logging to show progress
+                if self.baseline_kept % 5 == 0:  # Log every 5 kept windows instead of 10
+                    engine_log.info("✅ EC Progress: %d windows kept, %d rejected (median=%.1f, scale=%.1f)", self.baseline_kept, self.baseline_rejected, med, scale)
+                elif self.baseline_kept == 1:  # Always show first window
+                    engine_log.info("✅ First EC window accepted (median=%.1f, scale=%.1f)", med, scale)
+        
+        # While in a task, also store into a per-task bucket
+        if self.current_state == 'task' and self.current_task and features is not None:
+            tasks = self.calibration_data.setdefault('tasks', {})
+            bucket = tasks.setdefault(self.current_task, {'features': [], 'timestamps': []})
+            bucket['features'].append(features)
+            bucket['timestamps'].append(timestamp)
+        return features
+
+    def compute_baseline_statistics(self):
+        """Use eyes-closed-only baseline as requested."""
+        ec_features = self.calibration_data['eyes_closed']['features']
+        eo_features = self.calibration_data['eyes_open']['features']
+        
+        print(f"\n=== COMPUTING BASELINE STATISTICS ===")
+        print(f"Available EC features: {len(ec_features)}")
+        print(f"Available EO features: {len(eo_features)}")
+        
+        if len(ec_features) == 0:
+            print("⚠️  WARNING: No eyes-closed features available, falling back to base behavior")
+            # Fallback to base behavior if EC absent
+            result = super().compute_baseline_statistics()
+            if result:
+                print(f"✅ Fallback baseline computed with {len(self.baseline_stats)} features")
+            return result
+            
+        df = pd.DataFrame(ec_features)
+        self.baseline_stats = {}
+        
+        print(f"Eyes-closed DataFrame shape: {df.shape}")
+        print(f"Available feature columns: {list(df.columns)}")
+        try:
+            bands = dict(EEG_BANDS)
+            print(f"Band edges (Hz): {bands}")
+        except Exception:
+            pass
+        try:
+            print(f"Notch mains: {getattr(self, 'mains_hz', 'unknown')} Hz | PSD: multitaper tapers={getattr(self, 'mt_tapers', 3)}")
+        except Exception:
+            pass
+        
+        for feature in df.columns:
+            values = df[feature].values
+            self.baseline_stats[feature] = {
+                'mean': float(np.mean(values)),
+                'std': float(np.std(values) + 1e-12),
+                'min': float(np.min(values)),
+                'max': float(np.max(values)),
+                'median': float(np.median(values)),
+                'q25': float(np.percentile(values, 25)),
+                'q75': float(np.percentile(values, 75)),
+            }
+        
+        print(f"✅ Eyes-closed-only baseline computed successfully!")
+        print(f"✅ {len(self.baseline_stats)} feature statistics computed from {len(ec_features)} windows")
+        
+        # Show sample statistics for key features
+        key_features = ['alpha_relative', 'theta_relative', 'beta_relative', 'alpha_theta_ratio']
+        for feat in key_features:
+            if feat in self.baseline_stats:
+                stats = self.baseline_stats[feat]
+                print(f"   {feat}: mean={stats['mean']:.3f} ± {stats['std']:.3f}")
+        
+        return self.baseline_stats
+
+    # --- Helper utilities for advanced analysis ---
+    def _baseline_dataframe(self, feature_list: List[str]) -> Optional['pd.DataFrame']:
+        pool = self.calibration_data.get('eyes_closed', {}).get('features', [])
+        if not pool:
+            return None
+        df = pd.DataFrame(pool)
+        if feature_list:
+            cols = [f for f in feature_list if f in df.columns]
+            if cols:
+                return df[cols].copy()
+        return df
+
+    def _task_dataframe(self, feature_list: List[str]) -> Optional['pd.DataFrame']:
+        pool = self.calibration_data.get('task', {}).get('features', [])
+        if not pool:
+            return None
+        df = pd.DataFrame(pool)
+        if feature_list:
+            cols = [f for f in feature_list if f in df.columns]
+            if cols:
+                return df[cols].copy()
+        return df
+
+    def _permutation_seed(self) -> int:
+        """config.seed, else one clock-drawn seed kept for the whole session."""
+        if self.config.seed is not None:
+            return int(self.config.seed)
+        if self.session_seed is None:
+            self.session_seed = int(time.time() * 1000) % (2**32)
+        return self.session_seed
+
+    def _get_rng(self) -> np.random.Generator:
+        return np.random.default_rng(self._permutation_seed())
+
+    # --- Block utilities (non-overlapping, time-based) ---
+    def _window_duration_sec(self) -> float:
+        try:
+            return float(self.window_samples) / float(self.fs)
+        except Exception:
+            return 2.0
+
+    def _build_blocks(self, features_list: List[Dict[str, Any]], timestamps: List[float]) -> List[Dict[str, Any]]:
+        if not features_list:
+            return []
+        block_sec = float(self.block_seconds)
+        # Key by content: the same windows give the same blocks whichever list holds them
+        cache_key = ("blocks", len(features_list), fingerprint(features_list, timestamps or []), block_sec)
+        cached = self._cached_block_summaries.get(cache_key)
+        if cached is not None:
+            return cached
+        # Compute block index per window by elapsed time
+        if timestamps and len(timestamps) == len(features_list):
+            t0 = float(timestamps[0])
+            rel = [max(0.0, float(t) - t0) for t in timestamps]
+            block_idx = [int(r // block_sec) for r in rel]
+        else:
+            # Fallback: derive block size by window duration
+            wsec = max(1e-6, self._window_duration_sec())
+            per_block = max(1, int(round(block_sec / wsec)))
+            block_idx = [i // per_block for i in range(len(features_list))]
+        # Aggregate by block index: mean of features present in all entries
+        df = pd.DataFrame(features_list)
+        df['_block'] = block_idx
+        grouped = df.groupby('_block', sort=True)
+        block_df = grouped.mean(numeric_only=True).drop(columns=[c for c in ['_block'] if c in grouped.obj.columns], errors='ignore')
+        # Convert to list of dicts
+        blocks = [row._asdict() if hasattr(row, '_asdict') else row.to_dict() for _, row in block_df.iterrows()]
+        self._cached_block_summaries.put(cache_key, blocks)
+        return blocks
+
+    def _equalize_blocks(self, base_blocks: List[Dict[str, Any]], task_blocks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        n_base = len(base_blocks)
+        n_task = len(task_blocks)
+        if n_base == 0 or n_task == 0:
+            return [], []
+        n = min(n_base, n_task)
+        if n_base > n:
+            idx = self._get_rng().choice(n_base, size=n, replace=False)
+            base_blocks = [base_blocks[i] for i in sorted(idx)]
+        else:
+            base_blocks = base_blocks[:n]
+        if n_task > n:
+            idx = self._get_rng().choice(n_task, size=n, replace=False)
+            task_blocks = [task_blocks[i] for i in sorted(idx)]
+        else:
+            task_blocks = task_blocks[:n]
+        return base_blocks, task_blocks
+
+    def _block_spearman_corr(self, base_blocks: List[Dict[str, Any]], task_blocks: List[Dict[str, Any]], features: List[str]) -> np.ndarray:
+        if not features:
+            return np.empty((0, 0))
+        key = ("block_corr", tuple(features), fingerprint(base_blocks or [], task_blocks or []), self.block_seconds)
+        cached = self._cached_block_corr.get(key)
+        if cached is not None:
+            return cached
+        if not base_blocks and not task_blocks:
+            corr = np.eye(len(features))
+        else:
+            all_blocks = (base_blocks or []) + (task_blocks or [])
+            df = pd.DataFrame(all_blocks)
+            try:
+                corr = df[features].corr(method='spearman').to_numpy()
+                corr = np.nan_to_num(corr, nan=0.0, posinf=0.0, neginf=0.0)
+            except Exception:
+                corr = np.eye(len(features))
+        self._cached_block_corr.put(key, corr)
+        return corr
+
+    def _compute_effect_value(self, feature: str, task_mean: float, baseline_stats: Dict[str, Any]) -> float:
+        b_mean = float(baseline_stats[feature]['mean'])
+        b_std = float(baseline_stats[feature]['std'])
+        if self.config.effect_measure == 'z':
+            return (task_mean - b_mean) / (b_std + 1e-12)
+        return task_mean - b_mean
+
+    def _baseline_effect_samples(self, feature: str, baseline_df: Optional['pd.DataFrame']) -> Optional[np.ndarray]:
+        if baseline_df is None or feature not in baseline_df.columns:
+            return None
+        values = np.asarray(baseline_df[feature].values, dtype=float)
+        stats = self.baseline_stats.get(feature)
+        if stats is None:
+            return None
+        mean = float(stats['mean'])
+        std = float(stats['std'])
+        if self.config.effect_measure == 'z':
+            return (values - mean) / (std + 1e-12)
+        return values - mean
+
+    @staticmethod
+    def _digitize_effect(value: float, bins: np.ndarray) -> int:
+        if bins.size <= 1:
+            return 0
+        idx = int(np.digitize([value], bins[1:-1], right=True)[0])
+        return max(0, min(idx, bins.size - 2))
+
+    def _discretize(self, feature: str, effect_value: float, baseline_df: Optional['pd.DataFrame']) -> Dict[str, Any]:
+        bins = self.config.discretization_bins
+        baseline_samples = self._baseline_effect_samples(feature, baseline_df)
+        if baseline_samples is None or baseline_samples.size == 0:
+            edges = np.linspace(-1, 1, bins + 1)
+        else:
+            quantiles = np.linspace(0, 1, bins + 1)
+            try:
+                edges = np.quantile(baseline_samples, quantiles)
+            except Exception:
+                edges = np.linspace(np.min(baseline_samples), np.max(baseline_samples), bins + 1)
+        edges = np.asarray(edges, dtype=float)
+        # Ensure strictly increasing
+        edges = np.unique(edges)
+        if edges.size <= 1:
+            edges = np.linspace(effect_value - 1.0, effect_value + 1.0, bins + 1)
+        # Guarantee number of edges = bins+1
+        if edges.size != bins + 1:
+            edges = np.linspace(edges.min(), edges.max() if edges.max() > edges.min() else edges.min() + 1.0, bins + 1)
+        discrete_idx = self._digitize_effect(effect_value, edges)
+        return {
+            'bins': edges.tolist(),
+            'discrete_index': int(discrete_idx),
+        }
+
+    def _spearman_corr(self, baseline_df: Optional['pd.DataFrame'], features: List[str]) -> np.ndarray:
+        if not features:
+            return np.empty((0, 0))
+        baseline_len = len(baseline_df) if baseline_df is not None else 0
+        key = ("spearman", baseline_len, tuple(features),
+               fingerprint(baseline_df.reindex(columns=features)) if baseline_len else None)
+        cached = self._cached_corr_matrices.get(key)
+        if cached is not None:
+            return cached
+        if baseline_df is None or baseline_df.empty:
+            corr = np.eye(len(features))
+        else:
+            try:
+                corr_df = baseline_df[features].copy()
+                corr = corr_df.corr(method='spearman').to_numpy()
+                corr = np.nan_to_num(corr, nan=0.0, posinf=0.0, neginf=0.0)
+            except Exception:
+                corr = np.eye(len(features))
+        self._cached_corr_matrices.put(key, corr)
+        return corr
+
+    def _effective_feature_count(self, baseline_df: Optional['pd.DataFrame'], features: List[str]) -> float:
+        if not features:
+            return 0.0
+        try:
+            corr = self._spearman_corr(baseline_df, features)
+            if corr.size == 0:
+                return float(len(features))
+            eigvals = np.linalg.eigvalsh(corr)
+            eff = float(np.sum(np.clip(eigvals, 0.0, 1.0)))
+            return max(1.0, eff)
+        except Exception:
+            return float(len(features))
+
+    def _correlation_guard_factor(self, baseline_df: Optional['pd.DataFrame'], features: List[str]) -> float:
+        if not self.config.correlation_guard or not features:
+            return 1.0
+        nominal = max(1.0, float(len(features)))
+        eff = self._effective_feature_count(baseline_df, features)
+        factor = eff / nominal
+        return float(np.clip(factor, 0.05, 1.0))
+
+    # --- Directional priors and thresholds ---
+    def _feature_classification(self, feature: str) -> Tuple[str, bool, bool]:
+        name = feature.lower()
+        band = 'other'
+        if name.startswith('alpha_') or ('alpha' in name and 'ratio' not in name):
+            band = 'alpha'
+        if name.startswith('beta_') or ('beta' in name and 'ratio' not in name):
+            band = 'beta'
+        if name.startswith('theta_') or ('theta' in name and 'ratio' not in name):
+            band = 'theta'
+        if name.startswith('gamma_') or ('gamma' in name and 'ratio' not in name):
+            band = 'gamma'
+        is_ratio = ('ratio' in name)
+        is_relative = name.endswith('_relative') or is_ratio
+        if is_ratio and band == 'other':
+            band = 'ratio'
+        return band, is_relative, is_ratio
+
+    def _thresholds_for_feature(self, feature: str) -> Tuple[float, float]:
+        band, is_relative, is_ratio = self._feature_classification(feature)
+        d_map = {
+            'gamma': 0.30,
+            'ratio': 0.30,
+            'beta': 0.35,
+            'theta': 0.30,
+            'alpha': 0.25,
+        }
+        d_thr = d_map.get(band, 0.30)
+        pct_thr = 0.05 if (is_relative or is_ratio) else 0.10
+        return d_thr, pct_thr * 100.0
+
+    def _expected_direction(self, task_name: Optional[str], feature: str) -> Optional[str]:
+        t = (task_name or '').lower()
+        f = feature.lower()
+        if t == 'mental_math':
+            if f.startswith('alpha_'): return 'down'
+            if f.startswith('beta_') or 'beta_alpha_ratio' in f: return 'up'
+            if f.startswith('gamma_'): return 'up'
+            if f == 'alpha_theta_ratio': return 'down'
+        elif t == 'visual_imagery':
+            if f.startswith('alpha_'): return 'up'
+            if f == 'alpha_theta_ratio': return 'up'
+            if 'beta_alpha_ratio' in f: return 'down'
+        elif t == 'working_memory':
+            if f.startswith('theta_'): return 'up'
+            if f.startswith('alpha_'): return 'down'
+            if 'beta_alpha_ratio' in f or f.startswith('beta_'): return 'up'
+            if f.startswith('gamma_'): return 'up'
+        elif t == 'attention_focus':
+            if f.startswith('alpha_'): return 'down'
+            if f.startswith('beta_') or 'beta_alpha_ratio' in f: return 'up'
+            if f.startswith('theta_'): return 'down'
+        elif t == 'language_processing':
+            if f.startswith('beta_') or 'beta_alpha_ratio' in f: return 'up'
+            if f.startswith('alpha_'): return 'down'
+            if f.startswith('gamma_'): return 'up'
+        elif t == 'motor_imagery':
+            if f.startswith('alpha_'): return 'down'
+            if 'beta_alpha_ratio' in f or f.startswith('beta_'): return 'up'
+        elif t == 'cognitive_load':
+            if f.startswith('theta_'): return 'up'
+            if f.startswith('alpha_'): return 'down'
+            if f.startswith('beta_') or 'beta_alpha_ratio' in f: return 'up'
+        return None
+
+    def _kost_mcdermott_pvalue(self, fisher_stat: float, features: List[str], baseline_df: Optional['pd.DataFrame']) -> Tuple[float, float, float]:
+        k = len(features)
+        if k == 0:
+            return fisher_stat, 1.0, 0.0
+        if self.config.dependence_correction.lower() != 'kost-mcdermott' or k == 1:
+            return fisher_stat, float(self._chi2_sf(fisher_stat, 2 * k)), float(2 * k)
+        corr = self._spearman_corr(baseline_df, features)
+        mu = 2.0 * k
+        cov_sum = 0.0
+        for i in range(k):
+            for j in range(i + 1, k):
+                r = float(corr[i, j])
+                cov = 3.263 * r + 0.710 * (r ** 2) + 0.027 * (r ** 3)
+                cov_sum += cov
+        sigma_sq = 4.0 * k + 2.0 * cov_sum
+        if sigma_sq <= 0:
+            return fisher_stat, float(self._chi2_sf(fisher_stat, 2 * k)), float(2 * k)
+        c = sigma_sq / (2.0 * mu)
+        df = max(1.0, (2.0 * (mu ** 2)) / sigma_sq)
+        adjusted_stat = fisher_stat / c
+        if _scipy_chi2 is not None:
+            p_val = float(_scipy_chi2.sf(adjusted_stat, df))
+        else:
+            p_val = float(self._chi2_sf(adjusted_stat, int(round(df))))
+        return adjusted_stat, p_val, df
+
+    def _get_permutation_indices(self, feature_key: str, total_len: int, n_perm: int, rng: np.random.Generator) -> np.ndarray:
+        cache_key = (feature_key, total_len, n_perm)
+        cached = self._perm_index_cache.get(cache_key)
+        if cached is not None and cached.shape[0] >= n_perm:
+            return cached[:n_perm]
+        perms = np.vstack([rng.permutation(total_len) for _ in range(n_perm)])
+        self._perm_index_cache.put(cache_key, perms)
+        return perms
+
+    def _effective_n_perm(self) -> int:
+        """Permutation count for the current run: the planned value under the "auto" preset."""
+        if self.config.is_auto_preset and self.permutation_plan.get('n_perm'):
+            return int(self.permutation_plan['n_perm'])
+        return int(self.config.n_perm)
+
+    def _benchmark_block_permutation(self, n_features: int, n_blocks: int, trials: int = 8) -> float:
+        """Measure seconds per block permutation for this machine and problem size."""
+        key = (int(n_features), int(n_blocks))
+        cached = self._perm_benchmark_cache.get(key)
+        if cached is not None:
+            return cached
+        rng = np.random.default_rng(0)
+        blocks = {
+            f"bench_{i}": (rng.normal(size=n_blocks), rng.normal(size=n_blocks))
+            for i in range(max(1, n_features))
+        }
+        saved_cb = self._perm_progress_callback
+        self._perm_progress_callback = None
+        try:
+            t0 = time.perf_counter()
+            meta = self._permutation_sum_p_blocks(blocks, n_perm=trials)[4] or {}
+            # "sequential" mode may stop before ``trials``: time only what ran
+            done = max(1, int(meta.get('n_perm_used') or trials))
+            per_perm = (time.perf_counter() - t0) / float(done)
+        finally:
+            self._perm_progress_callback = saved_cb
+        self._perm_benchmark_cache[key] = per_perm
+        return per_perm
+
+    def plan_permutations(self, n_features: int, n_blocks: int, runs: int) -> Dict[str, Any]:
+        """Choose n_perm so ``runs`` block-permutation tests fit the analysis budget.
+
+        Only active under the "auto" preset. 80% of ``config.analysis_budget_s``
+        is given to permutations; the remainder covers the parametric steps.
+        The permutation kernels are single-threaded, so the plan always uses
+        one worker and one permutation per iteration.
+        """
+        if not self.config.is_auto_preset:
+            return {}
+        n_features = max(1, int(n_features))
+        n_blocks = max(2, int(n_blocks))
+        runs = max(1, int(runs))
+        per_perm = max(1e-6, self._benchmark_block_permutation(n_features, n_blocks))
+        budget = float(self.config.analysis_budget_s)
+        lo, hi = AUTO_PERM_BOUNDS
+        n_perm = int(np.clip(int((0.8 * budget) / (runs * per_perm)), lo, hi))
+        self.permutation_plan = {
+            'preset': AUTO_PERM_PRESET,
+            'budget_s': budget,
+            'runs': runs,
+            'n_features': n_features,
+            'n_blocks': n_blocks,
+            'sec_per_perm': per_perm,
+            'n_perm': n_perm,
+            'workers': 1,
+            'estimated_s': runs * n_perm * per_perm,
+            'p_resolution': 1.0 / (n_perm + 1.0),
+        }
+        print(
+            f"[PLANNER] budget={budget:.0f}s runs={runs} features={n_features} blocks={n_blocks} "
+            f"-> {per_perm * 1000:.2f} ms/perm, n_perm={n_perm}, p resolution={1.0 / (n_perm + 1.0):.4f}"
+        )
+        return self.permutation_plan
+
+    def _estimate_block_count(self, data: Dict[str, Any]) -> int:
+        """Number of blocks ``_build_blocks`` would produce for a phase bucket."""
+        features = data.get('features', []) or []
+        timestamps = data.get('timestamps', []) or []
+        block_sec = max(1e-6, float(self.block_seconds))
+        if timestamps and len(timestamps) == len(features):
+            return int(max(0.0, float(timestamps[-1]) - float(timestamps[0])) // block_sec) + 1
+        per_block = max(1, int(round(block_sec / max(1e-6, self._window_duration_sec()))))
+        return -(-len(features) // per_block)
+
+    def _plan_for_tasks(self, tasks: Dict[str, Dict[str, Any]]) -> None:
+        """Plan n_perm once per session from the recorded phases.
+
+        The plan covers every expected task (``expected_tasks``, else the tasks
+        known now) plus the combined step, and is reused by background and
+        final runs so all tasks in a report share one p-value resolution.
+        """
+        if not self.config.is_auto_preset or not tasks:
+            return
+        if self.permutation_plan.get('budget_s') == float(self.config.analysis_budget_s):
+            return
+        baseline = self.calibration_data.get('eyes_closed', {})
+        if not baseline.get('features'):
+            baseline = self.calibration_data.get('eyes_open', {})
+        n_blocks = min(self._estimate_block_count(baseline), max(self._estimate_block_count(d) for d in tasks.values()))
+        n_features = len(self.baseline_stats) if self.baseline_stats else 0
+        if not n_features:
+            sample = next(iter(tasks.values())).get('features', [{}])
+            n_features = len(sample[0]) if sample else 1
+        n_tasks = max(int(self.expected_tasks or 0), len(tasks), len(self.calibration_data.get('tasks', {}) or {}))
+        self.plan_permutations(n_features, n_blocks, runs=n_tasks + 1)
+
+    def permutation_plan_summary(self) -> Optional[str]:
+        """One-line description of the auto permutation plan for report headers."""
+        plan = self.permutation_plan
+        if not plan:
+            return None
+        return (
+            f"Permutation plan: auto, budget={plan['budget_s']:.0f}s, n_perm={plan['n_perm']} "
+            f"({plan['sec_per_perm'] * 1000:.2f} ms/perm x {plan['runs']} run(s), workers={plan['workers']}), "
+            f"p-value resolution={plan['p_resolution']:.4f}"
+        )
+
+    def _sequential_perm_stop(self, extreme: int, done: int) -> Optional[str]:
+        """Return why a sequential permutation run may stop now, or None to continue.
+
+        ``extreme`` counts null sums at least as extreme as the observed one
+        after ``done`` permutations. Only active when ``config.perm_mode`` is
+        "sequential".
+        """
+        if self.config.perm_mode != 'sequential' or done <= 0:
+            return None
+        if extreme >= self.config.perm_h:
+            return 'h_exceedances'
+        if done >= SEQ_PERM_MIN:
+            p_hat = (extreme + 1.0) / (done + 1.0)
+            half_width = SEQ_PERM_Z * math.sqrt(p_hat * (1.0 - p_hat) / done)
+            if p_hat - half_width > self.config.alpha or p_hat + half_width < self.config.alpha:
+                return 'confidence_bound'
+        return None
+
+    @staticmethod
+    def _permutation_p_estimate(extreme: int, done: int, stop_reason: Optional[str]) -> Tuple[float, float]:
+        """Return (p_value, Monte Carlo standard error) for a permutation run."""
+        if stop_reason == 'h_exceedances':
+            # Besag-Clifford estimate for runs ended by the h-th exceedance
+            p_val = extreme / float(done)
+        else:
+            p_val = (extreme + 1.0) / (done + 1.0)
+        mc_se = math.sqrt(max(0.0, p_val * (1.0 - p_val)) / max(1, done))
+        return float(p_val), float(mc_se)
+
+    def _permutation_sum_p(
+        self,
+        per_feature_data: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        observed_sum: float,
+    ) -> Tuple[Optional[float], Optional[float], bool]:
+        # Fast mode: skip permutation testing entirely
+        if getattr(self.config, 'fast_mode', False):
+            # Use asymptotic approximation instead of permutation
+            # For large n, sum of -log(p) ~ chi-square(2k) under null
+            # Return observed_sum with chi-square based p-value
+            k = len(per_feature_data)
+            if k > 0:
+                from scipy import stats
+                # Fisher's method p-value (chi-square approximation)
+                chi2_p = 1.0 - stats.chi2.cdf(2 * observed_sum, 2 * k) if observed_sum > 0 else 1.0
+                return observed_sum, chi2_p, False
+            return observed_sum, None, False
+        
+        if not self.config.use_permutation_for_sumP:
+            return None, None, False
+        if not per_feature_data:
+            return None, None, False
+        n_perm = self._effective_n_perm()
+        rng = self._get_rng()
+        # Streaming permutation: avoid allocating (n_perm, total_len) index arrays which
+        # can be huge for large total_len (causes MemoryError). Instead, precompute the
+        # combined arrays for each feature and draw a single permutation per-feature per-iteration.
+        # Vectorized setup: stack combined arrays row-wise
+        feature_names = list(per_feature_data.keys())
+        if not feature_names:
+            return observed_sum, None, False
+        combined_rows = []
+        n_task = None
+        for f in feature_names:
+            task_vals, base_vals = per_feature_data[f]
+            if n_task is None:
+                n_task = int(task_vals.size)
+            combined_rows.append(np.concatenate([task_vals, base_vals]))
+        combined = np.vstack(combined_rows)  # shape (F, T+B)
+        total_len = combined.shape[1]
+        F = combined.shape[0]
+        perm_distribution = np.zeros(n_perm, dtype=float)
+        extreme = 0
+        done = 0
+        stop_reason = None
+        self.reset_permutation_cancel()
+        try:
+            self._last_permutation_partial = False
+        except Exception:
+            pass
+        
+        # OPTIMIZATION: Vectorized t-test computation (5-10x faster than loop)
+        # Pre-compute constants for vectorized Welch t-test
+        from math import erfc, sqrt as math_sqrt
+        
+        # Progress callback throttling: only emit every N iterations to reduce overhead
+        progress_interval = max(1, n_perm // 100)  # Update ~100 times max
+        
+        for idx in range(n_perm):
+            if self._perm_cancelled:
+                completed = idx
+                if completed <= 0:
+                    return observed_sum, None, False
+                less_equal_partial = float(np.sum(perm_distribution[:completed] <= observed_sum))
+                perm_p_partial = (less_equal_partial + 1.0) / (completed + 1.0)
+                try:
+                    self._last_permutation_partial = True
+                except Exception:
+                    pass
+                return observed_sum, float(perm_p_partial), True
+            
+            # Permute once for all features
+            perm_idx = rng.permutation(total_len)
+            permuted = combined[:, perm_idx]
+            task_block = permuted[:, :n_task]  # shape (F, n_task)
+            base_block = permuted[:, n_task:]  # shape (F, n_base)
+            
+            # VECTORIZED WELCH T-TEST (compute all features at once)
+            # Means: shape (F,)
+            mx = np.mean(task_block, axis=1)
+            my = np.mean(base_block, axis=1)
+            
+            # Variances: shape (F,)
+            vx = np.var(task_block, axis=1, ddof=1)
+            vy = np.var(base_block, axis=1, ddof=1)
+            
+            # Welch t-statistic: shape (F,)
+            nx = task_block.shape[1]
+            ny = base_block.shape[1]
+            denom = np.sqrt((vx / nx) + (vy / ny) + 1e-18)
+            t_stats = np.where(denom > 0, (mx - my) / denom, 0.0)
+            
+            # Two-tailed p-values using normal approximation (vectorized)
+            z = np.abs(t_stats)
+            # Use numpy's vectorized operations instead of loop
+            p_vals = np.array([erfc(zi / math_sqrt(2.0)) for zi in z])
+            
+            # Handle NaN/inf (replace with 1.0)
+            p_vals = np.nan_to_num(p_vals, nan=1.0, posinf=1.0, neginf=1.0)
+            
+            # Sum p-values across features
+            row_sum = float(np.sum(p_vals))
+            perm_distribution[idx] = row_sum
+            done = idx + 1
+            if row_sum <= observed_sum:
+                extreme += 1
+            
+            # Throttled progress callback (only every N iterations)
+            if self._perm_progress_callback is not None and (idx + 1) % progress_interval == 0:
+                try:
+                    self._perm_progress_callback(idx + 1, n_perm)
+                except Exception:
+                    pass
+            
+            stop_reason = self._sequential_perm_stop(extreme, done)
+            if stop_reason:
+                break
+        
+        # Final progress update
+        if self._perm_progress_callback is not None:
+            try:
+                self._perm_progress_callback(n_perm, n_perm)
+            except Exception:
+                pass
+        
+        perm_p, _mc_se = self._permutation_p_estimate(extreme, done, stop_reason)
+        return observed_sum, float(perm_p), True
+
+    @staticmethod
+    def _friedman_fallback(rows: np.ndarray) -> Tuple[float, float]:
+        # rows.shape = (observations, treatments)
+        n, k = rows.shape
+        if n < 2 or k < 2:
+            return 0.0, 1.0
+        ranks = np.argsort(np.argsort(rows, axis=1), axis=1).astype(float) + 1.0
+        sum_ranks = np.sum(ranks, axis=0)
+        chi2 = (12.0 / (n * k * (k + 1))) * np.sum((sum_ranks - (n * (k + 1) / 2.0)) ** 2)
+        p_val = float(EnhancedFeatureAnalysisEngine._chi2_sf(chi2, k - 1))
+        return float(chi2), p_val
+
+    def _friedman_test(self, rows: np.ndarray) -> Tuple[float, float]:
+        if _scipy_friedman is not None:
+            try:
+                stat, p_val = _scipy_friedman(*[rows[:, i] for i in range(rows.shape[1])])
+                return float(stat), float(p_val)
+            except Exception:
+                pass
+        return self._friedman_fallback(rows)
+
+    @staticmethod
+    def _sign_test_pvalue(diff: np.ndarray) -> float:
+        diff = diff[np.isfinite(diff)]
+        diff = diff[diff != 0]
+        n = diff.size
+        if n == 0:
+            return 1.0
+        pos = int(np.sum(diff > 0))
+        tail = min(pos, n - pos)
+
+        # Prefer SciPy's exact binomial implementation when available
+        if _scipy_binomtest is not None:
+            try:
+                return float(_scipy_binomtest(pos, n, 0.5).pvalue)
+            except Exception:
+                pass
+
+        if n <= 60:
+            # Exact probability via cumulative binomial; manageable for small n
+            cumulative = math.fsum(math.comb(n, k) for k in range(tail + 1))
+            base_prob = cumulative / (2 ** n)
+            if n % 2 == 0 and pos == n - pos:
+                center_prob = math.comb(n, tail) / (2 ** n)
+                p_val = 2.0 * base_prob - center_prob
+            else:
+                p_val = 2.0 * base_prob
+            return float(min(1.0, max(0.0, p_val)))
+
+        # Normal approximation with continuity correction for large n
+        mean = n / 2.0
+        std = math.sqrt(n / 4.0) + 1e-12
+        z = (abs(pos - mean) - 0.5) / std
+        z = max(0.0, z)
+        p_val = math.erfc(z / math.sqrt(2.0))
+        return float(min(1.0, max(0.0, p_val)))
+
+    def _permutation_sum_p_blocks(
+        self,
+        per_feature_blocks: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        n_perm: Optional[int] = None,
+    ) -> Tuple[Optional[float], Optional[float], bool, Optional[float], Dict[str, Any]]:
+        """Block-level permutation for SumP.
+        Returns (observed_sum, perm_p, used_permutation_flag, ess_blocks, metadata).
+        """
+        # Always run block permutations if n_perm > 0 (independent of mode)
+        n_perm = int(n_perm if n_perm is not None else self._effective_n_perm())
+        if n_perm <= 0:
+            return None, None, False, None, {}
+        if not per_feature_blocks:
+            return None, None, False, None, {}
+        
+        rng = self._get_rng()
+        seed_val = self._permutation_seed()
+        
+        # Determine equalized block count (ESS per condition) by downsampling larger side
+        any_item = next(iter(per_feature_blocks.values()))
+        n_task = len(any_item[0])
+        n_base = len(any_item[1])
+        n = min(n_task, n_base)
+        if n == 0:
+            return None, None, False, 0.0, {}
+        ess = float(n)
+        
+        # Log metadata
+        metadata = {
+            'perm_unit': 'block',
+            'block_len_sec': float(self.block_seconds),
+            'n_blocks_used': int(n),
+            'ess_baseline': int(n),
+            'ess_task': int(n),
+            'n_baseline_total': int(n_base),
+            'n_task_total': int(n_task),
+            'n_perm': int(n_perm),
+            'perm_mode': self.config.perm_mode,
+            'seed': seed_val,
+        }
+        # Observed sum of p-values using block means per feature
+        obs_sum = 0.0
+        for f, (task_arr, base_arr) in per_feature_blocks.items():
+            # Equalize arrays to n
+            t = np.asarray(task_arr, dtype=float)
+            b = np.asarray(base_arr, dtype=float)
+            if t.size > n:
+                idx = rng.choice(t.size, size=n, replace=False)
+                t = t[idx]
+            else:
+                t = t[:n]
+            if b.size > n:
+                idx = rng.choice(b.size, size=n, replace=False)
+                b = b[idx]
+            else:
+                b = b[:n]
+            _, p = self._welch_ttest(t, b)
+            p = float(np.nan_to_num(p, nan=1.0))
+            obs_sum += p
+        
+        # Log start of permutation
+        perm_log.info("[SumP Block Perm] Starting %d permutations on %d features, %d blocks per condition...", n_perm, len(per_feature_blocks), n)
+        
+        # Permutation distribution
+        perm_vals = np.zeros(n_perm, dtype=float)
+        extreme = 0
+        done = 0
+        stop_reason = None
+        for i in range(n_perm):
+            s = 0.0
+            for f, (task_arr, base_arr) in per_feature_blocks.items():
+                t = np.asarray(task_arr, dtype=float)
+                b = np.asarray(base_arr, dtype=float)
+                # Downsample to n if either side is larger
+                if t.size > n:
+                    idx = rng.choice(t.size, size=n, replace=False)
+                    t = t[idx]
+                else:
+                    t = t[:n]
+                if b.size > n:
+                    idx = rng.choice(b.size, size=n, replace=False)
+                    b = b[idx]
+                else:
+                    b = b[:n]
+                # Concatenate and permute
+                comb = np.concatenate([t, b])
+                comb_len = len(comb)  # Actual combined length (may be < 2*n if original arrays were shorter)
+                perm_idx = rng.permutation(comb_len)
+                # Split permuted indices to create task and baseline permutations
+                split_point = len(t)  # Use actual task array length, not n
+                t_perm = comb[perm_idx[:split_point]]
+                b_perm = comb[perm_idx[split_point:]]
+                _, p = self._welch_ttest(t_perm, b_perm)
+                s += float(np.nan_to_num(p, nan=1.0))
+            perm_vals[i] = s
+            done = i + 1
+            if s <= obs_sum:
+                extreme += 1
+            # Progress callback: update every 1% (or every iteration for small n_perm)
+            progress_interval = max(1, n_perm // 100)
+            if self._perm_progress_callback is not None and ((i + 1) % progress_interval == 0 or (i + 1) == n_perm):
+                try:
+                    self._perm_progress_callback(i + 1, n_perm)
+                except Exception:
+                    pass
+            # Console logging for visibility (every 10%)
+            if (i + 1) % max(1, n_perm // 10) == 0 or (i + 1) == n_perm:
+                perm_log.info("[SumP Block Perm] Progress: %d/%d (%d%%)", i + 1, n_perm, 100 * (i + 1) // n_perm)
+            stop_reason = self._sequential_perm_stop(extreme, done)
+            if stop_reason:
+                if self._perm_progress_callback is not None:
+                    try:
+                        self._perm_progress_callback(n_perm, n_perm)
+                    except Exception:
+                        pass
+                break
+        perm_p, mc_se = self._permutation_p_estimate(extreme, done, stop_reason)
+        metadata['n_perm_used'] = int(done)
+        metadata['exceedances'] = int(extreme)
+        metadata['stop_reason'] = stop_reason or 'max_permutations'
+        metadata['mc_se'] = mc_se
+        
+        # Log summary
+        perm_log.info("[SumP Block Perm] unit=block, block_len=%ss, n_blocks=%s, n_perm=%s, used=%d (%s), mc_se=%.4f, seed=%s",
+                      metadata['block_len_sec'], metadata['n_blocks_used'], metadata['n_perm'], done, metadata['stop_reason'], mc_se, metadata['seed'])
+        
+        return obs_sum, float(perm_p), True, ess, metadata
+
+    def analyze_task_data(self):
+        """Analyze the current task synchronously and return per-feature analysis results."""
+        # Ensure baseline stats exist
+        if not getattr(self, 'baseline_stats', None):
+            try:
+                self.compute_baseline_statistics()
+            except Exception:
+                pass
+
+        ec_features = self.calibration_data.get('eyes_closed', {}).get('features', [])
+        eo_features = self.calibration_data.get('eyes_open', {}).get('features', [])
+        task_features = self.calibration_data.get('task', {}).get('features', [])
+
+        if not task_features:
+            # Nothing to analyze
+            return None
+
+        # =====================================================================
+        # CRITICAL DATA QUALITY VALIDATION
+        # Check if data looks like real EEG before running statistical tests
+        # =====================================================================
+        data_quality_issues = []
+        data_quality_valid = True
+        
+        # Check 1: Minimum window counts
+        min_baseline = 4  # Need at least 4 baseline windows
+        min_task = 4      # Need at least 4 task windows
+        
+        baseline_count = max(len(ec_features), len(eo_features))
+        task_count = len(task_features)
+        
+        if baseline_count < min_baseline:
+            data_quality_issues.append(f"Insufficient baseline data ({baseline_count} < {min_baseline} windows)")
+            data_quality_valid = False
+        
+        if task_count < min_task:
+            data_quality_issues.append(f"Insufficient task data ({task_count} < {min_task} windows)")
+            data_quality_valid = False
+        
+        # Check 2: Verify signal looks like EEG (not flat/noise) using spectral analysis
+        try:
+            # Sample a few windows and check spectral properties
+            sample_windows = task_features[:min(5, len(task_features))]
+            flat_signal_count = 0
+            noise_signal_count = 0
+            
+            for window_data in sample_windows:
+                if not isinstance(window_data, dict):
+                    continue
+                
+                # Check if all power values are near-zero (flat signal)
+                total_power = window_data.get('total_power', window_data.get('global_total_power', 0))
+                if isinstance(total_power, (int, float)) and total_power < 1e-6:
+                    flat_signal_count += 1
+                    continue
+                
+                # Check spectral distribution (real EEG has strong delta/theta)
+                delta_rel = window_data.get('delta_relative', window_data.get('global_delta_relative', 0))
+                theta_rel = window_data.get('theta_relative', window_data.get('global_theta_relative', 0))
+                gamma_rel = window_data.get('gamma_relative', window_data.get('global_gamma_relative', 0))
+                
+                if isinstance(delta_rel, (int, float)) and isinstance(theta_rel, (int, float)):
+                    low_freq_power = delta_rel + theta_rel
+                    # Real EEG typically has >30% power in delta+theta
+                    if low_freq_power < 0.15:  # Very low delta+theta suggests noise
+                        noise_signal_count += 1
+                    # High gamma dominance often indicates muscle artifact or noise
+                    if isinstance(gamma_rel, (int, float)) and gamma_rel > 0.4:
+                        noise_signal_count += 1
+            
+            # If most samples look problematic, flag the data
+            n_samples = len(sample_windows)
+            if n_samples > 0:
+                if flat_signal_count / n_samples > 0.5:
+                    data_quality_issues.append("Flat signal detected - headset may not be worn")
+                    data_quality_valid = False
+                if noise_signal_count / n_samples > 0.5:
+                    data_quality_issues.append("Noise-like spectrum detected - data may be artifacts, not EEG")
+                    # Don't invalidate, but warn
+        except Exception as e:
+            print(f"[DATA QUALITY] Error checking spectral properties: {e}")
+        
+        # Store quality assessment
+        self._data_quality_valid = data_quality_valid
+        self._data_quality_issues = data_quality_issues
+        
+        if data_quality_issues:
+            print("\n" + "="*70)
+            print("⚠️  DATA QUALITY WARNINGS:")
+            for issue in data_quality_issues:
+                print(f"    • {issue}")
+            print("="*70 + "\n")
+        
+        # Default to eyes-closed baseline if available
+        chosen_baseline_label = 'eyes_closed' if len(ec_features) > 0 else 'eyes_open'
+        baseline_source_features = ec_features if chosen_baseline_label == 'eyes_closed' else eo_features
+        
+        # Initialize block-equalized variables (may be set later by KM computation)
+        eb_eq = None
+        et_eq = None
+        
+        baseline_df = pd.DataFrame(baseline_source_features) if baseline_source_features else None
+        task_df = pd.DataFrame(task_features)
+
+        print("\n=== BASELINE DATA ANALYSIS ===")
+        print(f"Eyes-Closed (EC) windows: {len(ec_features)}")
+        print(f"Eyes-Open (EO) windows: {len(eo_features)}")
+        print(f"Task windows: {len(task_features)}")
+        print(f"Total baseline features computed: {len(self.baseline_stats)}")
+        print(f"Chosen baseline: {chosen_baseline_label} ({len(baseline_source_features)} windows)")
+
+        if hasattr(self, 'baseline_kept') and hasattr(self, 'baseline_rejected'):
+            total_ec = self.baseline_kept + self.baseline_rejected
+            if total_ec > 0:
+                keep_rate = (self.baseline_kept / total_ec) * 100.0
+                print(f"EC Quality Control: {self.baseline_kept} kept, {self.baseline_rejected} rejected ({keep_rate:.1f}% keep rate)")
+
+        available_features = [f for f in task_df.columns if f in self.baseline_stats]
+        preferred_features = [f for f in available_features if f.endswith('_relative') or ('ratio' in f)] or available_features
+
+        self.analysis_results = {}
+        p_for_combo: List[float] = []
+        combo_features: List[str] = []
+        effect_sizes: List[float] = []
+        composite_contrib: List[float] = []
+        per_feature_perm: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        total_features = len(available_features)
+        processed_features = 0
+        # Emit initial feature progress so UI moves immediately
+        engine_log.debug("[ENGINE] About to emit initial feature progress: task=%s, total=%d", self.current_task or 'task', total_features)
+        engine_log.debug("[ENGINE] Feature callback registered: %s", self._feature_progress_callback is not None)
+        try:
+            if self._feature_progress_callback is not None:
+                engine_log.debug("[ENGINE] Calling feature callback with: task=%s, done=0, total=%d", self.current_task or 'task', total_features)
+                self._feature_progress_callback(self.current_task or 'task', 0, total_features)
+                engine_log.debug("[ENGINE] Initial feature callback emitted successfully")
+        except Exception as e:
+            engine_log.error("[ENGINE] Feature callback error: %s", e, exc_info=True)
+        for feature in available_features:
+            if baseline_df is None or feature not in baseline_df.columns:
+                # Mark as NA if no baseline available
+                self.analysis_results[feature] = {
+                    'delta': np.nan,
+                    'percent_change': np.nan,
+                    'effect_size_d': np.nan,
+                    'p_value': 1.0,
+                    'significant_change': False,
+                    'reason': 'NA (no baseline)'
+                }
+                continue
+            if getattr(self, '_analysis_cancelled', False):
+                print("⚠️ Analysis cancelled during feature loop; returning partial results.")
+                break
+            
+            # Check if this is a gamma feature that was guarded out
+            is_gamma = feature.startswith('gamma_')
+            gamma_guarded = False
+            if is_gamma:
+                # Check if gamma was evaluated in task windows
+                gamma_eval_flags = [int(f.get('_gamma_evaluated', 1)) for f in task_features if isinstance(f, dict)]
+                gamma_guarded = all(f == 0 for f in gamma_eval_flags) if gamma_eval_flags else False
+                if gamma_guarded:
+                    self.analysis_results[feature] = {
+                        'delta': np.nan,
+                        'percent_change': np.nan,
+                        'effect_size_d': np.nan,
+                        'p_value': 1.0,
+                        'significant_change': False,
+                        'reason': 'Guarded-out (EMG)',
+                        'gamma_evaluated': False,
+                    }
+                    continue
+            
+            # Use BLOCK SUMMARIES for consistent unit with SumP and ESS
+            # Extract block-level values for this feature
+            if eb_eq and et_eq:  # Use equalized blocks from KM computation
+                task_block_vals = np.asarray([blk.get(feature) for blk in et_eq if feature in blk and np.isfinite(blk.get(feature))], dtype=float)
+                base_block_vals = np.asarray([blk.get(feature) for blk in eb_eq if feature in blk and np.isfinite(blk.get(feature))], dtype=float)
+            else:
+                # Fallback: use all windows if blocks aren't available
+                task_block_vals = np.asarray(task_df[feature].dropna().values, dtype=float)
+                base_block_vals = np.asarray(baseline_df[feature].dropna().values, dtype=float)
+            
+            # Require minimal sample sizes per group to ensure stable inference
+            if task_block_vals.size < 3 or base_block_vals.size < 3:
+                self.analysis_results[feature] = {
+                    'delta': np.nan,
+                    'percent_change': np.nan,
+                    'effect_size_d': np.nan,
+                    'p_value': 1.0,
+                    'significant_change': False,
+                    'reason': f'Insufficient samples (task={task_block_vals.size}, base={base_block_vals.size})'
+                }
+                continue
+
+            b_mean = float(np.mean(base_block_vals))
+            b_std = float(np.std(base_block_vals) + 1e-12)
+            t_mean = float(np.mean(task_block_vals))
+            t_std = float(np.std(task_block_vals) + 1e-12)
+
+            var_task = float(np.var(task_block_vals, ddof=1)) if task_block_vals.size > 1 else 0.0
+            var_base = float(np.var(base_block_vals, ddof=1)) if base_block_vals.size > 1 else 0.0
+            pooled = float(np.sqrt(max(0.0, (var_task + var_base) / 2.0)))
+            degenerate_var = pooled <= 1e-12
+            d = 0.0 if degenerate_var else (t_mean - b_mean) / (pooled + 1e-12)
+            effect_sizes.append(abs(d))
+
+            try:
+                if degenerate_var:
+                    t_stat, p_val = 0.0, 1.0
+                else:
+                    t_stat, p_val = self._welch_ttest(task_block_vals, base_block_vals)
+            except Exception:
+                t_stat, p_val = 0.0, 1.0
+
+            z = (t_mean - b_mean) / (b_std + 1e-12)
+            ratio = (t_mean / (abs(b_mean) + 1e-12)) if b_mean != 0 else np.inf
+            pct = ((t_mean - b_mean) / (abs(b_mean) + 1e-12)) * 100.0
+
+            effect_value = self._compute_effect_value(feature, t_mean, self.baseline_stats)
+            discretized = self._discretize(feature, effect_value, baseline_df)
+
+            result_entry = {
+                'task_mean': t_mean,
+                'task_std': t_std,
+                'baseline_mean': b_mean,
+                'baseline_std': b_std,
+                'delta': t_mean - b_mean,
+                'z_score': z,
+                'effect_size_d': d,
+                'effect_measure': effect_value,
+                'percent_change': pct,
+                'baseline_task_ratio': ratio,
+                'p_value': p_val,
+                'p_value_welch': p_val,
+                't_stat': float(t_stat),
+                'discrete_index': discretized['discrete_index'],
+                'discretization_bins': discretized['bins'],
+                'log2_ratio': float(np.log2(abs(ratio) + 1e-12)) if np.isfinite(ratio) else np.inf,
+                'significant_change': False,  # updated post-FDR or heuristics
+                'bin_sig': 0,
+                'reason': None,  # Will be set if degenerate or guarded
+                'gamma_evaluated': True,  # Default true; overridden for guarded gamma
+                'n_blocks_task': int(task_block_vals.size),  # Log actual unit count
+                'n_blocks_baseline': int(base_block_vals.size),
+            }
+            
+            # Add reason if degenerate variance
+            if degenerate_var:
+                result_entry['reason'] = 'Degenerate variance (pooled ≈ 0)'
+
+            self.analysis_results[feature] = result_entry
+            combo_features.append(feature)
+            p_for_combo.append(float(np.nan_to_num(p_val, nan=1.0)))
+            composite_contrib.append(float(np.nan_to_num(p_val, nan=1.0)))
+            per_feature_perm[feature] = (task_block_vals, base_block_vals)  # Use blocks for permutation too
+            processed_features += 1
+            # Feature-level progress strategy:
+            #  - Always emit for the first 10 features to guarantee early visible motion even for huge datasets
+            #  - After that, if large dataset (> 100 features), throttle to every 5; else every feature
+            #  - Always emit on completion
+            if self._feature_progress_callback is not None:
+                emit = False
+                if processed_features <= 10:
+                    emit = True
+                elif total_features <= 100:
+                    emit = True
+                elif (processed_features % 5) == 0:
+                    emit = True
+                if processed_features == total_features:
+                    emit = True
+                if emit:
+                    try:
+                        self._feature_progress_callback(self.current_task or 'task', processed_features, total_features)
+                    except Exception:
+                        pass
+
+        if not self.analysis_results:
+            print("❌ ERROR: No overlapping features between baseline and task for analysis")
+            return None
+
+        corr_guard_factor = self._correlation_guard_factor(baseline_df, combo_features)
+        eff_feature_count = self._effective_feature_count(baseline_df, combo_features) if combo_features else 0.0
+        local_alpha = max(1e-9, self.config.alpha * corr_guard_factor)
+        fdr_alpha = max(1e-9, self.config.fdr_alpha * corr_guard_factor)
+        if combo_features:
+            rejected, q_vals = self._bh_fdr(p_for_combo, alpha=fdr_alpha)
+        else:
+            rejected, q_vals = [], []
+
+        significant_flags: List[bool] = []
+        for idx, feature in enumerate(combo_features):
+            entry = self.analysis_results[feature]
+            q_val = q_vals[idx] if idx < len(q_vals) else None
+            entry['q_value'] = q_val
+            p_two = entry.get('p_value')
+            t_stat = float(entry.get('t_stat', 0.0))
+            expected = self._expected_direction(self.current_task, feature)
+            p_dir = p_two
+            delta = float(entry.get('delta', 0.0))
+            dir_ok = True
+            if expected == 'up':
+                p_dir = (p_two / 2.0) if p_two is not None and t_stat > 0 else (1.0 - (p_two or 1.0) / 2.0)
+                dir_ok = delta > 0
+            elif expected == 'down':
+                p_dir = (p_two / 2.0) if p_two is not None and t_stat < 0 else (1.0 - (p_two or 1.0) / 2.0)
+                dir_ok = delta < 0
+            
+            # Store one-sided p when directional prior exists
+            entry['p_one_sided'] = p_dir if expected else p_two
+            entry['expected_direction'] = expected
+            
+            d_thr, pct_thr = self._thresholds_for_feature(feature)
+            effect_ok = (abs(entry.get('effect_size_d', 0.0)) >= d_thr) and dir_ok
+            pct_ok = (abs(entry.get('percent_change', 0.0)) >= pct_thr) and dir_ok
+            p_ok = (p_dir is not None) and (p_dir <= local_alpha) and dir_ok
+            q_ok = (q_val is not None) and (q_val <= fdr_alpha)
+            pass_rule = None
+            decision = False
+            if p_ok:
+                decision = True
+                pass_rule = 'p'
+            if not decision and effect_ok:
+                decision = True
+                pass_rule = 'd'
+            if not decision and pct_ok:
+                decision = True
+                pass_rule = 'pct'
+            entry['significant_change'] = decision
+            entry['bin_sig'] = 1 if decision else 0
+            entry['decision_flags'] = {
+                'p_pass': p_ok,
+                'p_one_sided': p_dir,
+                'q_pass': q_ok,
+                'effect_pass': effect_ok,
+                'percent_pass': pct_ok,
+                'bh_rejected': rejected[idx] if idx < len(rejected) else False,
+                'expected_direction': expected,
+                'direction_ok': dir_ok,
+                'pass_rule': pass_rule,
+            }
+            entry['thresholds'] = {
+                'alpha': local_alpha,
+                'fdr_alpha': fdr_alpha,
+                'min_effect_size': d_thr,
+                'min_percent_change': pct_thr,
+                'correlation_guard_factor': corr_guard_factor,
+            }
+            significant_flags.append(decision)
+
+        sig_feature_count = int(np.sum(significant_flags))
+        sig_prop = sig_feature_count / max(1, len(combo_features)) if combo_features else 0.0
+
+        fisher_stat, fisher_p_naive = self._fishers_method(p_for_combo)
+        # Build non-overlapping blocks for KM correlation and block permutation
+        try:
+            base_timestamps = self.calibration_data.get(chosen_baseline_label, {}).get('timestamps', [])
+            base_blocks = self._build_blocks(baseline_source_features, base_timestamps)
+            task_timestamps = self.calibration_data.get('task', {}).get('timestamps', [])
+            task_blocks = self._build_blocks(task_features, task_timestamps)
+            # Equalize for correlation estimation
+            eb, et = self._equalize_blocks(base_blocks, task_blocks)
+            km_corr = self._block_spearman_corr(eb, et, combo_features)
+        except Exception:
+            km_corr = None
+            eb, et = [], []
+        km_stat, fisher_p_km, fisher_df, km_mean_r = self._km_from_corr(fisher_stat, km_corr)
+        
+        # Log KM correlation details (Task F)
+        k = len(combo_features) if combo_features else 0
+        km_df_ratio = float(fisher_df / max(1.0, 2.0 * k)) if k > 0 and fisher_df else None
+        if km_mean_r is not None and k > 1:
+            try:
+                log_fn = getattr(self, 'log_message', None)
+                msg = (
+                    f"KM correlation: k={k}, mean_offdiag_r={km_mean_r:.4f}, "
+                    f"df_KM={fisher_df:.2f}, df_KM/(2k)={km_df_ratio:.3f}"
+                )
+                if callable(log_fn):
+                    log_fn(msg)
+                else:
+                    engine_log.info("[ENGINE] %s", msg)
+            except Exception:
+                pass
+        
+        fisher_sig = fisher_p_km < self.config.alpha if fisher_p_km is not None else False
+
+        # Block-based SumP permutation (ALWAYS RUN if n_perm > 0, regardless of mode)
+        observed_sum = None
+        sum_p_perm_p = None
+        perm_used = False
+        ess_blocks = None
+        perm_meta = {}
+        try:
+            # Build per-feature block means for permutation
+            per_feature_blocks: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+            # Equalize to ensure matched exposure for permutation
+            eb_eq, et_eq = self._equalize_blocks(base_blocks, task_blocks)
+            ess_blocks = float(min(len(eb_eq), len(et_eq))) if eb_eq and et_eq else 0.0
+            if ess_blocks and combo_features:
+                for f in combo_features:
+                    tb = np.asarray([blk.get(f) for blk in et_eq if f in blk and np.isfinite(blk.get(f))], dtype=float)
+                    bb = np.asarray([blk.get(f) for blk in eb_eq if f in blk and np.isfinite(blk.get(f))], dtype=float)
+                    if tb.size > 0 and bb.size > 0:
+                        per_feature_blocks[f] = (tb, bb)
+            # Run permutations if we have any valid features with blocks
+            if per_feature_blocks and self._effective_n_perm() > 0:
+                observed_sum, sum_p_perm_p, perm_used, _ess, perm_meta = self._permutation_sum_p_blocks(per_feature_blocks)
+                if ess_blocks == 0.0:
+                    ess_blocks = _ess
+            elif self.config.n_perm > 0 and combo_features:
+                # Log why permutations didn't run
+                perm_log.info("[SumP Skip] No valid blocks for permutation (ess_blocks=%s, combo_features=%d, per_feature_blocks=%d)", ess_blocks, len(combo_features), len(per_feature_blocks))
+        except Exception as e:
+            perm_log.error("[SumP Block Error] %s", e)
+            import traceback
+            traceback.print_exc()
+        sum_p_sig = (sum_p_perm_p is not None) and (sum_p_perm_p < self.config.alpha)
+        sum_p_approx_flag = False
+        if observed_sum is not None and sum_p_perm_p is None:
+            k = len(p_for_combo)
+            if k > 0:
+                mean = k / 2.0
+                var = k / 12.0
+                if var > 0:
+                    from math import erfc, sqrt
+                    z = (observed_sum - mean) / np.sqrt(var)
+                    sum_p_perm_p = 0.5 * erfc(z / np.sqrt(2.0))
+                    sum_p_sig = sum_p_perm_p < self.config.alpha
+                    sum_p_approx_flag = True
+
+        composite_score = None
+        if combo_features:
+            adjusted_values = []
+            for feature in combo_features:
+                entry = self.analysis_results[feature]
+                val = entry['q_value'] if entry.get('q_value') is not None else entry['p_value']
+                adjusted_values.append(max(val, 1e-12))
+            composite_score = float(np.sum(-np.log10(adjusted_values)))
+
+        mean_effect_size = float(np.mean(effect_sizes)) if effect_sizes else None
+
+        cosine_sim = cosine_dist = cosine_p = None
+        try:
+            base_vec = np.array([self.baseline_stats[f]['mean'] for f in combo_features], dtype=float)
+            task_vec = np.array([self.analysis_results[f]['task_mean'] for f in combo_features], dtype=float)
+            base_norm = base_vec / (np.linalg.norm(base_vec) + 1e-12)
+            task_norm = task_vec / (np.linalg.norm(task_vec) + 1e-12)
+            cosine_sim = float(np.dot(base_norm, task_norm))
+            cosine_dist = float(1.0 - cosine_sim)
+            perms = int(max(1, min(self._effective_n_perm(), 5000)))
+            rng = self._get_rng()
+            exceed = 0
+            for _ in range(perms):
+                shuf = rng.permutation(base_vec)
+                shuf_norm = shuf / (np.linalg.norm(shuf) + 1e-12)
+                sim = float(np.dot(task_norm, shuf_norm))
+                if (1.0 - sim) >= cosine_dist:
+                    exceed += 1
+            cosine_p = (exceed + 1.0) / (perms + 1.0) if perms > 0 else 1.0
+        except Exception:
+            pass
+
+        decision_block = {
+            'enabled': True,
+            'sig_feature_count': sig_feature_count,
+            'sig_prop': sig_prop,
+            'alpha': local_alpha,
+            'fdr_alpha': fdr_alpha,
+            'correlation_guard_factor': corr_guard_factor,
+            'correlation_guard_active': self.config.correlation_guard,
+            'effective_feature_count': eff_feature_count,
+            'nominal_feature_count': len(combo_features),
+            'bh_rejections': int(np.sum(rejected)) if rejected else 0,
+            'min_effect_size': self.config.min_effect_size,
+            'min_percent_change': self.config.min_percent_change,
+        }
+
+        self.task_summary = {
+            'fisher': {
+                'stat': fisher_stat,
+                'p_naive': fisher_p_naive,
+                'km_stat': km_stat,
+                'km_p': fisher_p_km,
+                'km_df': fisher_df,
+                'km_df_ratio': km_df_ratio,
+                'km_mean_r': km_mean_r,
+                'k_features': k,
+                'significant': fisher_sig,
+                'alpha': self.config.alpha,
+            },
+            'sum_p': {
+                'value': observed_sum,
+                'perm_p': sum_p_perm_p,
+                'significant': sum_p_sig,
+                'permutation_used': perm_used,
+                'approximate': sum_p_approx_flag,
+                'metadata': perm_meta,
+            },
+            'permutation': {
+                'preset': getattr(self.config, 'runtime_preset', None),
+                'mode': getattr(self.config, 'perm_mode', 'fixed'),
+                'n_perm': self._effective_n_perm(),
+                'n_perm_used': perm_meta.get('n_perm_used') if perm_meta else None,
+                'plan': dict(self.permutation_plan) if self.config.is_auto_preset else None,
+                'mc_se': perm_meta.get('mc_se') if perm_meta else None,
+                'seed': self._permutation_seed(),
+            },
+            'ess': {
+                'block_seconds': float(self.block_seconds),
+                'baseline_blocks': int(ess_blocks) if ess_blocks is not None else None,
+                'task_blocks': int(ess_blocks) if ess_blocks is not None else None,
+            },
+            'feature_selection': decision_block,
+            'composite': {
+                'score': composite_score,
+                'ranking_only': True,
+            },
+            'cosine': {
+                'similarity': cosine_sim,
+                'distance': cosine_dist,
+                'p_value': cosine_p,
+            },
+            'effect_size_mean': mean_effect_size,
+            'expectation': self._evaluate_expectation_alignment(self.current_task),
+        }
+
+        # =====================================================================
+        # SANITY CHECK: Flag suspicious results that indicate data quality issues
+        # =====================================================================
+        # If >70% of features are "significant", the data is likely noise/garbage
+        # Real cognitive tasks typically affect 5-30% of features
+        SUSPICIOUS_SIG_THRESHOLD = 0.70  # 70% significant = likely garbage data
+        WARNING_SIG_THRESHOLD = 0.50     # 50% significant = suspicious
+        
+        data_quality_warnings = []
+        results_reliable = True
+        
+        if sig_prop > SUSPICIOUS_SIG_THRESHOLD:
+            data_quality_warnings.append(
+                f"CRITICAL: {sig_prop*100:.1f}% of features marked significant - "
+                f"this exceeds the {SUSPICIOUS_SIG_THRESHOLD*100:.0f}% threshold and strongly suggests "
+                "the data is noise/garbage, not real EEG. The headset may not have been worn."
+            )
+            results_reliable = False
+        elif sig_prop > WARNING_SIG_THRESHOLD:
+            data_quality_warnings.append(
+                f"WARNING: {sig_prop*100:.1f}% of features marked significant - "
+                f"this is unusually high (>{WARNING_SIG_THRESHOLD*100:.0f}%) and may indicate data quality issues."
+            )
+        
+        # Check if data quality validation failed earlier
+        if hasattr(self, '_data_quality_valid') and not self._data_quality_valid:
+            data_quality_warnings.extend(getattr(self, '_data_quality_issues', []))
+            results_reliable = False
+        
+        # Store in task_summary
+        self.task_summary['data_quality'] = {
+            'reliable': results_reliable,
+            'warnings': data_quality_warnings,
+            'sig_prop': sig_prop,
+            'sig_count': sig_feature_count,
+            'total_features': len(combo_features),
+        }
+        
+        if data_quality_warnings:
+            print("\n" + "="*70)
+            print("⚠️  RESULTS RELIABILITY WARNING:")
+            for warning in data_quality_warnings:
+                print(f"    {warning}")
+            if not results_reliable:
+                print("\n    ❌ RESULTS MARKED AS UNRELIABLE")
+                print("    These results should NOT be interpreted as valid EEG analysis.")
+            print("="*70 + "\n")
+
+        self.composite_summary = self.task_summary
+        if getattr(self, '_analysis_cancelled', False):
+            try:
+                self.task_summary['partial'] = True
+            except Exception:
+                pass
+        self._prepare_exports()
+        return self.analysis_results
+
+    def _prepare_exports(self) -> None:
+        full_features = {}
+        masked_features = {}
+        integer_features = {}
+        for feature, data in self.analysis_results.items():
+            feature_entry = {
+                'task_mean': data.get('task_mean'),
+                'baseline_mean': data.get('baseline_mean'),
+                'delta': data.get('delta'),
+                'effect_measure': data.get('effect_measure'),
+                'discrete_index': data.get('discrete_index'),
+                'discretization_bins': data.get('discretization_bins'),
+                'p_value': data.get('p_value'),
+                'q_value': data.get('q_value'),
+                'bin_sig': data.get('bin_sig'),
+            }
+            full_features[feature] = feature_entry
+            if self.config.is_feature_selection and not data.get('bin_sig'):
+                masked_features[feature] = {
+                    'effect_measure': 0.0,
+                    'discrete_index': 0,
+                    'bin_sig': 0,
+                }
+            else:
+                masked_features[feature] = {
+                    'effect_measure': data.get('effect_measure'),
+                    'discrete_index': data.get('discrete_index'),
+                    'bin_sig': data.get('bin_sig'),
+                }
+            integer_features[feature] = {
+                'discrete_index': data.get('discrete_index'),
+                'bin_sig': data.get('bin_sig'),
+            }
+        summary_core = {
+            'Fisher_KM_sig': self.task_summary['fisher']['significant'] if 'fisher' in self.task_summary else False,
+            'SumP_sig': self.task_summary['sum_p']['significant'] if 'sum_p' in self.task_summary else False,
+            'sig_feature_count': self.task_summary.get('feature_selection', {}).get('sig_feature_count') if self.task_summary.get('feature_selection') else None,
+        }
+        self.last_export_full = {
+            'features': full_features,
+            'masked_features': masked_features,
+            'summary': self.task_summary,
+            'summary_core': summary_core,
+        }
+        self.last_export_integer = {
+            'features': integer_features,
+            'summary_core': summary_core,
+        }
+
+    def analyze_all_tasks_data(self):
+        """Analyze each recorded task separately and also combined across all tasks."""
+        if not getattr(self, 'baseline_stats', None) or not self.baseline_stats:
+            try:
+                self.compute_baseline_statistics()
+            except Exception:
+                pass
+
+        raw_tasks = self.calibration_data.get('tasks', {}) or {}
+        log_fn = getattr(self, 'log_message', None)
+        normalized_tasks: Dict[str, Dict[str, Any]] = {}
+        skipped_tasks: List[Tuple[str, str]] = []
+        for task_name, raw_data in raw_tasks.items():
+            cleaned, reason = self._clean_task_bucket(raw_data)
+            if cleaned is None:
+                skipped_tasks.append((task_name, reason))
+                continue
+            normalized_tasks[task_name] = cleaned
+        if skipped_tasks:
+            for task_name, reason in skipped_tasks:
+                msg = f"Skipping task '{task_name}' in multi-task analysis: {reason}."
+                try:
+                    if callable(log_fn):
+                        log_fn(msg)
+                    else:
+                        engine_log.info("[ENGINE] %s", msg)
+                except Exception:
+                    engine_log.info("[ENGINE] %s", msg)
+        tasks = normalized_tasks
+        if not tasks:
+            msg = "Multi-task analysis skipped: no tasks with valid feature data were recorded."
+            try:
+                if callable(log_fn):
+                    log_fn(msg)
+                else:
+                    engine_log.info("[ENGINE] %s", msg)
+            except Exception:
+                engine_log.info("[ENGINE] %s", msg)
+            self.multi_task_results = {
+                'per_task': {},
+                'combined': {
+                    'analysis': {},
+                    'summary': {},
+                    'export_full': {},
+                    'export_integer': {},
+                },
+                'across_task': {},
+            }
+            return self.multi_task_results
+
+        task_bucket = self.calibration_data.setdefault('task', {'features': [], 'timestamps': []})
+        original_task_features_src = task_bucket.get('features')
+        if isinstance(original_task_features_src, (list, tuple)):
+            original_task_features = list(original_task_features_src)
+        else:
+            original_task_features = []
+
+        original_task_timestamps_src = task_bucket.get('timestamps')
+        if isinstance(original_task_timestamps_src, (list, tuple)):
+            original_task_timestamps = list(original_task_timestamps_src)
+        else:
+            original_task_timestamps = []
+        result_cache = self._result_cache()
+        result_key = None
+        if result_cache is not None:
+            try:
+                result_key = self._result_cache_key(tasks)
+                payload = result_cache.load(result_key)
+            except Exception as e:
+                print(f"[RESULT CACHE] Lookup failed: {e}")
+                payload = None
+            if payload is not None:
+                print(f"[RESULT CACHE] Reusing stored multi-task results ({result_key[:12]}) from {result_cache.directory}")
+                try:
+                    if self._general_progress_callback is not None:
+                        self._general_progress_callback(len(tasks) + 1, len(tasks) + 1)
+                except Exception:
+                    pass
+                return self._restore_cached_results(payload)
+
+        per_task_results: Dict[str, Any] = {}
+        # No-op when a background run already planned this session
+        self._plan_for_tasks(tasks)
+        # Total steps for general progress: each individual task + 1 combined step
+        total_general_steps = len(tasks) + 1
+        # Emit initial progress (0 completed) so UI can move off 0% immediately
+        try:
+            if self._general_progress_callback is not None:
+                self._general_progress_callback(0, total_general_steps)
+        except Exception:
+            pass
+        current_step = 0
+        try:
+            for task_name, data in tasks.items():
+                # Reuse the background result when the task data has not changed since it closed
+                pipelined = self._pipelined_task_result(task_name, data)
+                if pipelined is not None:
+                    engine_log.info("[ENGINE] Using background analysis result for '%s'", task_name)
+                    per_task_results[task_name] = pipelined
+                else:
+                    task_bucket['features'] = list(data.get('features', []))
+                    task_bucket['timestamps'] = list(data.get('timestamps', []))
+                    self.current_task = task_name
+                    analysis = self.analyze_task_data() or {}
+                    summary = copy.deepcopy(getattr(self, 'task_summary', {}))
+                    exports_full = copy.deepcopy(getattr(self, 'last_export_full', {}))
+                    exports_int = copy.deepcopy(getattr(self, 'last_export_integer', {}))
+                    per_task_results[task_name] = {
+                        'analysis': copy.deepcopy(analysis),
+                        'summary': summary,
+                        'export_full': exports_full,
+                        'export_integer': exports_int,
+                    }
+                current_step += 1
+                # Emit general progress after each task
+                try:
+                    if self._general_progress_callback is not None:
+                        self._general_progress_callback(current_step, total_general_steps)
+                except Exception:
+                    pass
+        finally:
+            task_bucket['features'] = original_task_features
+            task_bucket['timestamps'] = original_task_timestamps
+            self.current_task = None
+
+        combined_features = []
+        combined_timestamps = []
+        for data in tasks.values():
+            combined_features.extend(list(data.get('features', [])))
+            combined_timestamps.extend(list(data.get('timestamps', [])))
+        task_bucket['features'] = combined_features
+        task_bucket['timestamps'] = combined_timestamps
+        self.current_task = 'combined'
+        combined_analysis = self.analyze_task_data() or {}
+        combined_summary = copy.deepcopy(getattr(self, 'task_summary', {}))
+        combined_exports_full = copy.deepcopy(getattr(self, 'last_export_full', {}))
+        combined_exports_int = copy.deepcopy(getattr(self, 'last_export_integer', {}))
+
+        # Emit final general progress step (combined)
+        try:
+            current_step = total_general_steps
+            if self._general_progress_callback is not None:
+                self._general_progress_callback(current_step, total_general_steps)
+        except Exception:
+            pass
+
+        # Restore current task bucket after combined
+        task_bucket['features'] = original_task_features
+        task_bucket['timestamps'] = original_task_timestamps
+        self.current_task = None
+
+        across_task = self._analyze_across_tasks(tasks)
+
+        self.multi_task_results = {
+            'per_task': per_task_results,
+            'combined': {
+                'analysis': copy.deepcopy(combined_analysis),
+                'summary': combined_summary,
+                'export_full': combined_exports_full,
+                'export_integer': combined_exports_int,
+            },
+            'across_task': across_task,
+        }
+        print(f"[CACHE] {self.cache_manager.summary_line()}")
+        if result_cache is not None and result_key is not None and not self._perm_cancelled and not self._analysis_cancelled:
+            stored = result_cache.store(result_key, {
+                'multi_task_results': self.multi_task_results,
+                'permutation_plan': dict(self.permutation_plan),
+                'seed': self._permutation_seed(),
+                'created': time.time(),
+            })
+            if stored:
+                print(f"[RESULT CACHE] Stored multi-task results in {stored}")
+        return self.multi_task_results
+
+    def _analyze_across_tasks(self, tasks: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        if not tasks or len(tasks) < 2:
+            return {}
+        if not self.baseline_stats:
+            return {}
+
+        log_fn = getattr(self, 'log_message', None)
+        valid_tasks: Dict[str, Dict[str, Any]] = {}
+        valid_task_names: List[str] = []
+        skipped: List[str] = []
+        for name in sorted(tasks.keys()):
+            data = tasks.get(name)
+            if not isinstance(data, dict):
+                skipped.append(name)
+                continue
+            feature_entries = data.get('features') or []
+            if not isinstance(feature_entries, list):
+                skipped.append(name)
+                continue
+            cleaned_entries = [entry for entry in feature_entries if isinstance(entry, dict) and entry]
+            if not cleaned_entries:
+                skipped.append(name)
+                continue
+            valid_task_names.append(name)
+            valid_tasks[name] = {'features': cleaned_entries, 'timestamps': data.get('timestamps', [])}
+
+        if len(valid_task_names) < 2:
+            if valid_task_names:
+                msg = "Cross-task analysis requires at least two tasks with valid feature data."
+            else:
+                msg = "Cross-task analysis skipped: no tasks contained valid feature data."
+            try:
+                if callable(log_fn):
+                    log_fn(msg)
+                else:
+                    engine_log.info("[ENGINE] %s", msg)
+            except Exception:
+                engine_log.info("[ENGINE] %s", msg)
+            return {}
+
+        if skipped:
+            skipped_msg = ", ".join(skipped)
+            msg = f"Omitting task(s) without valid feature data from cross-task comparison: {skipped_msg}."
+            try:
+                if callable(log_fn):
+                    log_fn(msg)
+                else:
+                    engine_log.info("[ENGINE] %s", msg)
+            except Exception:
+                engine_log.info("[ENGINE] %s", msg)
+
+        task_names = valid_task_names
+        feature_sets = []
+        for data in valid_tasks.values():
+            feat_names = set()
+            for entry in data.get('features', []):
+                feat_names.update(entry.keys())
+            feature_sets.append(feat_names)
+        if not feature_sets:
+            return {}
+        common_features = set.intersection(*feature_sets)
+        common_features = [f for f in common_features if f in self.baseline_stats]
+        if not common_features:
+            return {}
+
+        feature_results: Dict[str, Any] = {}
+        feature_sequence: List[str] = []
+        omnibus_pvalues: List[float] = []
+
+        # Build per-task block effect arrays per feature
+        # Determine min sessions across tasks (equalized block counts)
+        # NOTE: Currently uses blocks (8s aggregates) not true session counts.
+        # This means 1 task execution with 20 windows → ~2-3 blocks, bypassing Nmin guard.
+        # TODO: Track session boundaries for true session-level omnibus.
+        per_task_blocks: Dict[str, List[Dict[str, Any]]] = {}
+        for task in task_names:
+            flist = valid_tasks[task]['features']
+            tlist = valid_tasks[task].get('timestamps', [])
+            per_task_blocks[task] = self._build_blocks(flist, tlist)
+        # Equalize sessions count by trimming to min length across tasks
+        min_sessions = min(len(v) for v in per_task_blocks.values()) if per_task_blocks else 0
+        
+        # Log block counts per task for diagnosis
+        perm_log.info("[Across-Task] Tasks: %d, Block counts: {%s}, min=%d", len(task_names), ', '.join(f'{t}:{len(per_task_blocks[t])}' for t in task_names), min_sessions)
+        
+        if min_sessions < self.nmin_sessions:
+            # Ranking-only mode: insufficient sessions for significance testing
+            msg = (
+                f"⚠ Across-task significance testing disabled: "
+                f"N={min_sessions} sessions < Nmin={self.nmin_sessions}. "
+                f"Showing descriptive rankings only (median effect per task)."
+            )
+            try:
+                if callable(log_fn):
+                    log_fn(msg)
+                else:
+                    engine_log.info("[ENGINE] %s", msg)
+            except Exception:
+                engine_log.info("[ENGINE] %s", msg)
+            
+            ranking_only: Dict[str, Any] = {}
+            for feature in sorted(common_features):
+                arrays = []
+                for task in task_names:
+                    vals = [blk.get(feature) for blk in per_task_blocks[task] if feature in blk]
+                    arr = np.asarray([v for v in vals if v is not None and np.isfinite(v)], dtype=float)
+                    stats = self.baseline_stats[feature]
+                    mean = float(stats['mean'])
+                    std = float(stats['std'])
+                    eff = (arr - mean) / (std + 1e-12) if self.config.effect_measure == 'z' else (arr - mean)
+                    arrays.append(eff[:min_sessions] if min_sessions > 0 else eff)
+                if not arrays:
+                    continue
+                medians = [float(np.median(a)) if a.size > 0 else 0.0 for a in arrays]
+                order = sorted(range(len(task_names)), key=lambda i: medians[i], reverse=True)
+                ranking = [{ 'task': task_names[idx], 'median_effect': medians[idx], 'rank': r+1 } for r, idx in enumerate(order)]
+                ranking_only[feature] = {
+                    'ranking': ranking,
+                    'sessions': min_sessions,
+                    'significance': 'disabled',
+                }
+            return {
+                'task_order': task_names,
+                'features': ranking_only,
+                'fdr_alpha': self.config.fdr_alpha,
+                'ranking_only': True,
+                'nmin_sessions': self.nmin_sessions,
+                'sessions_used': min_sessions,
+                'message': msg,
+            }
+
+        for feature in sorted(common_features):
+            # Build per-task effect arrays for this feature; some tasks may have fewer
+            # usable block values (e.g., EMG-guarded gamma removed). Equalize lengths
+            # per-feature to avoid column_stack dimension mismatches.
+            raw_arrays = []
+            for task in task_names:
+                vals = [blk.get(feature) for blk in per_task_blocks[task] if feature in blk]
+                arr = np.asarray([v for v in vals if v is not None and np.isfinite(v)], dtype=float)
+                stats = self.baseline_stats[feature]
+                mean = float(stats['mean'])
+                std = float(stats['std'])
+                eff = (arr - mean) / (std + 1e-12) if self.config.effect_measure == 'z' else (arr - mean)
+                raw_arrays.append(eff)
+            if not raw_arrays:
+                continue
+            # Determine equalized row count for this feature across tasks
+            per_feature_rows = min((a.size for a in raw_arrays), default=0)
+            # Also respect the global min_sessions cap
+            n_rows = min(per_feature_rows, min_sessions)
+            if n_rows < 2:
+                # Not enough paired observations for omnibus
+                continue
+            per_task_arrays = [a[:n_rows] for a in raw_arrays]
+            data_matrix = np.column_stack(per_task_arrays)
+
+            method_used = self.config.omnibus
+            if self.config.omnibus == 'RM-ANOVA' and _scipy_f_oneway is not None:
+                try:
+                    stat, p_val = _scipy_f_oneway(*[data_matrix[:, i] for i in range(data_matrix.shape[1])])
+                    method_used = 'RM-ANOVA (approx)'
+                except Exception:
+                    stat, p_val = self._friedman_test(data_matrix)
+                    method_used = 'Friedman (fallback)'
+            else:
+                stat, p_val = self._friedman_test(data_matrix)
+                method_used = 'Friedman'
+
+            omnibus_pvalues.append(p_val)
+
+            pairwise_indices: List[Tuple[int, int]] = []
+            pairwise_pvals: List[float] = []
+            num_tasks = len(task_names)
+            for i in range(num_tasks):
+                for j in range(i + 1, num_tasks):
+                    diff = data_matrix[:, i] - data_matrix[:, j]
+                    if self.config.posthoc == 'Wilcoxon' and _scipy_wilcoxon is not None:
+                        try:
+                            _, p_pair = _scipy_wilcoxon(diff)
+                        except Exception:
+                            p_pair = self._sign_test_pvalue(diff)
+                    else:
+                        p_pair = self._sign_test_pvalue(diff)
+                    pairwise_indices.append((i, j))
+                    pairwise_pvals.append(p_pair)
+
+            ranking = []
+            medians = [float(np.median(data_matrix[:, idx])) for idx in range(num_tasks)]
+            order = sorted(range(num_tasks), key=lambda i: medians[i], reverse=True)
+            for rank, idx in enumerate(order, start=1):
+                ranking.append({
+                    'task': task_names[idx],
+                    'median_effect': medians[idx],
+                    'rank': rank,
+                })
+
+            feature_results[feature] = {
+                'omnibus_stat': float(stat),
+                'omnibus_p': float(p_val),
+                'method': method_used,
+                'task_order': task_names,
+                'pairwise_indices': pairwise_indices,
+                'pairwise_pvals': pairwise_pvals,
+                'ranking': ranking,
+                'matrix': data_matrix.tolist(),
+            }
+            feature_sequence.append(feature)
+
+        if not feature_results:
+            return {}
+
+        _, omnibus_qvals = self._bh_fdr(omnibus_pvalues, alpha=self.config.fdr_alpha)
+        for feature, q_val in zip(feature_sequence, omnibus_qvals):
+            feature_results[feature]['omnibus_q'] = q_val
+            feature_results[feature]['omnibus_sig'] = q_val <= self.config.fdr_alpha
+
+            pairwise_pvals = feature_results[feature]['pairwise_pvals']
+            if pairwise_pvals:
+                _, pairwise_q = self._bh_fdr(pairwise_pvals, alpha=self.config.fdr_alpha)
+            else:
+                pairwise_q = []
+            num_tasks = len(task_names)
+            q_matrix = [[None for _ in range(num_tasks)] for _ in range(num_tasks)]
+            sig_matrix = [[False for _ in range(num_tasks)] for _ in range(num_tasks)]
+            for idx, (i, j) in enumerate(feature_results[feature]['pairwise_indices']):
+                qv = pairwise_q[idx] if idx < len(pairwise_q) else None
+                q_matrix[i][j] = q_matrix[j][i] = qv
+                sig = bool(qv is not None and qv <= self.config.fdr_alpha)
+                sig_matrix[i][j] = sig_matrix[j][i] = sig
+            feature_results[feature]['posthoc_q'] = q_matrix
+            feature_results[feature]['posthoc_sig'] = sig_matrix
+
+        return {
+            'task_order': task_names,
+            'features': feature_results,
+            'fdr_alpha': self.config.fdr_alpha,
+        }
+
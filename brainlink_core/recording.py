@@ -0,0 +1,109 @@
+"""
+Recorded sessions and their phase markers.
+
+Reads the offline engine's ``session_*.csv`` (timestamp, sample_index,
+channels...) with the ``markers_*.json`` written next to it, a
+single-column CSV, or a ``.npy`` array (1-D MindLink signal or
+(samples, channels)). Used by the batch CLI and the session replay harness.
+"""
+
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MINDLINK_FS = 512
+ANTNEURO_FS = 500
+
+
+@dataclass
+class Recording:
+    """Samples (n_samples, n_channels) in µV plus phase markers in seconds."""
+    data: np.ndarray
+    sample_rate: int
+    channel_names: List[str]
+    phase_markers: List[Dict[str, Any]] = field(default_factory=list)
+    timestamps: Optional[np.ndarray] = None
+    source: str = ""
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.data.shape[0])
+
+    @property
+    def n_channels(self) -> int:
+        return int(self.data.shape[1])
+
+    @property
+    def duration_s(self) -> float:
+        return self.n_samples / float(self.sample_rate)
+
+    def sample_at(self, t: float) -> int:
+        """Index of the first sample at or after ``t`` seconds from the recording start."""
+        if self.timestamps is not None and len(self.timestamps):
+            idx = int(np.searchsorted(self.timestamps, t + self.timestamps[0], side='left'))
+        else:
+            idx = int(round(t * self.sample_rate))
+        return max(0, min(self.n_samples, idx))
+
+
+def find_markers_file(recording_path: str) -> Optional[str]:
+    """``markers_<id>.json`` written by the offline engine next to ``session_<id>.csv``."""
+    base = os.path.basename(recording_path)
+    m = re.match(r'session_(.+)\.csv$', base)
+    if m:
+        candidate = os.path.join(os.path.dirname(recording_path), f"markers_{m.group(1)}.json")
+        if os.path.isfile(candidate):
+            return candidate
+    stem = os.path.splitext(recording_path)[0]
+    for candidate in (stem + '.markers.json', stem + '_markers.json'):
+        if os.path.isfile(candidate):
+            return candidate
+    matches = sorted(glob.glob(os.path.join(os.path.dirname(recording_path) or '.', 'markers_*.json')))
+    return matches[0] if len(matches) == 1 else None
+
+
+def load_recording(path: str, markers_path: Optional[str] = None, sample_rate: Optional[int] = None) -> Recording:
+    """Load a session CSV / .npy recording and its phase markers."""
+    meta: Dict[str, Any] = {}
+    markers_path = markers_path or find_markers_file(path)
+    if markers_path:
+        with open(markers_path, 'r', encoding='utf-8') as fh:
+            meta = json.load(fh)
+        if isinstance(meta, list):
+            meta = {'phase_markers': meta}
+
+    timestamps = None
+    names: List[str] = []
+    if path.lower().endswith('.npy'):
+        data = np.load(path)
+        data = np.asarray(data, dtype=float)
+        if data.ndim == 1:
+            data = data[:, None]
+        elif data.shape[0] < data.shape[1]:
+            data = data.T  # (channels, samples) -> (samples, channels)
+    else:
+        import pandas as pd
+        df = pd.read_csv(path)
+        if 'timestamp' in df.columns:
+            timestamps = pd.to_numeric(df['timestamp'], errors='coerce').to_numpy(dtype=float)
+            names = [c for c in df.columns if c not in ('timestamp', 'sample_index')]
+        else:
+            # Single-signal CSV: first numeric column (same rule as the GUI's signal loader)
+            names = [c for c in df.columns if pd.to_numeric(df[c], errors='coerce').notna().any()][:1]
+        if not names:
+            raise ValueError(f"No numeric channel columns in {path}")
+        data = df[names].apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+    n_channels = data.shape[1]
+    names = list(meta.get('channel_names') or names)[:n_channels]
+    if len(names) < n_channels:
+        names = [f"ch{i}" for i in range(n_channels)]
+    fs = int(sample_rate or meta.get('sample_rate') or (MINDLINK_FS if n_channels == 1 else ANTNEURO_FS))
+    markers = sorted(meta.get('phase_markers') or [], key=lambda mk: float(mk.get('start', 0.0)))
+    return Recording(data=data, sample_rate=fs, channel_names=names, phase_markers=markers,
+                     timestamps=timestamps, source=path)
@@ -0,0 +1,340 @@
+"""
+Plain-text multi-task report for the single-channel enhanced engine.
+
+Builds the same report the GUI shows after "Analyze All Tasks" from an
+engine's ``multi_task_results``, so batch runs and the GUI produce
+identical text.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.pipeline_latency import PIPELINE_LATENCY
+
+
+def multi_task_report_lines(engine, res: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Report lines for ``res`` (defaults to ``engine.multi_task_results``)."""
+    if res is None:
+        res = getattr(engine, 'multi_task_results', None) or {}
+    lines = []
+
+    # Helper function for safe formatting with improved placeholders
+    def _fmt(v, none="NA"):
+        if v is None:
+            return none
+        if isinstance(v, float):
+            if math.isnan(v):
+                return none
+            return f"{v:.6g}"
+        return str(v)
+    # Header
+    lines.append("MindLink Enhanced Multi-Task Analysis Report")
+    lines.append("=" * 72)
+    try:
+        from datetime import datetime, UTC
+        lines.append(f"UTC Timestamp: {datetime.now(UTC).isoformat()}")
+    except Exception:
+        lines.append(f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Baseline info
+    try:
+        ec_features = engine.calibration_data.get('eyes_closed', {}).get('features', [])
+        eo_features = engine.calibration_data.get('eyes_open', {}).get('features', [])
+        tasks = engine.calibration_data.get('tasks', {})
+        lines.append(f"Baseline EC windows: {len(ec_features)} | EO windows: {len(eo_features)}")
+        lines.append(f"Tasks executed: {len(tasks)}")
+    except Exception:
+        pass
+    plan_line = engine.permutation_plan_summary() if hasattr(engine, 'permutation_plan_summary') else None
+    if plan_line:
+        lines.append(plan_line)
+
+    lines.append("")
+    lines.append("Per-Task Statistical Summaries")
+    lines.append("-" * 40)
+
+    # Per-task results
+    per_task = res.get('per_task', {})
+    for tname in sorted(per_task.keys()):
+        tinfo = per_task[tname] or {}
+        summary = tinfo.get("summary", {}) if isinstance(tinfo, dict) else {}
+        fisher = summary.get("fisher", {})
+        sum_p = summary.get("sum_p", {})
+        comp = summary.get("composite", {}) or {}
+        effect_mean = summary.get("effect_size_mean")
+        decision_info = summary.get("feature_selection") or {}
+
+        lines.append(f"[{tname}]")
+
+        # KM correlation details (Task F)
+        km_mean_r = fisher.get('km_mean_r')
+        k_features = fisher.get('k_features')
+        km_df_ratio = fisher.get('km_df_ratio')
+        if km_mean_r is not None and k_features:
+            lines.append(f"  KM correlation: k={k_features}, mean_offdiag_r={_fmt(km_mean_r)}, df_KM/(2k)={_fmt(km_df_ratio)}")
+
+        lines.append(f"  Fisher_KM_p={_fmt(fisher.get('km_p'))} sig={fisher.get('significant')} df={_fmt(fisher.get('km_df'))}")
+
+        # ESS display (Task G)
+        perm_meta = sum_p.get('metadata', {})
+        ess_baseline = perm_meta.get('ess_baseline')
+        ess_task = perm_meta.get('ess_task')
+        n_blocks_used = perm_meta.get('n_blocks_used')
+        if ess_baseline is not None or ess_task is not None or n_blocks_used is not None:
+            lines.append(f"  ESS: baseline={_fmt(ess_baseline)}, task={_fmt(ess_task)}, n_blocks={_fmt(n_blocks_used)}")
+
+        lines.append(f"  SumP={_fmt(sum_p.get('value'))} p={_fmt(sum_p.get('perm_p'))} sig={sum_p.get('significant')} perm={sum_p.get('permutation_used')}")
+        if perm_meta.get('n_perm_used') is not None:
+            lines.append(
+                f"  Permutations used={perm_meta.get('n_perm_used')}/{perm_meta.get('n_perm')} "
+                f"({perm_meta.get('stop_reason')}) MC_SE={_fmt(perm_meta.get('mc_se'))}"
+            )
+
+        # Consistency banner (Task G): if Fisher_KM~0 but SumP missing
+        fisher_p = fisher.get('km_p')
+        sump_p = sum_p.get('perm_p')
+        if fisher_p is not None and fisher_p > 0.10 and (sump_p is None or sump_p == 0.0):
+            lines.append("  ⚠ Consistency note: Fisher_KM~null but SumP not computed or zero")
+
+        lines.append(f"  CompositeScore={_fmt(comp.get('score'))} Mean|d|={_fmt(effect_mean)}")
+        if decision_info:
+            lines.append(
+                "  Decision thresholds (band-specific): "
+                f"p≤{_fmt(decision_info.get('alpha'))}, "
+                f"q≤{_fmt(decision_info.get('fdr_alpha'))}"
+            )
+            lines.append(
+                "    Effect sizes: α≥0.25, β≥0.35, γ≥0.30, θ≥0.30, ratios≥0.30"
+            )
+            lines.append(
+                "    Percent change: relative features≥5%, absolute≥10%"
+            )
+            if decision_info.get('correlation_guard_active'):
+                lines.append(
+                    f"  Correlation guard factor={_fmt(decision_info.get('correlation_guard_factor'))} "
+                    f"(m_eff={_fmt(decision_info.get('effective_feature_count'))}/{decision_info.get('nominal_feature_count')})"
+                )
+
+        # Per-feature detail
+        analysis = tinfo.get("analysis", {}) or {}
+        if analysis:
+            # Build list with significance flag, filtering out gamma features not evaluated
+            feat_rows = []
+            for fname, data in analysis.items():
+                # Skip gamma features that were guarded out (gamma_evaluated=False)
+                if fname.startswith('gamma_') and not data.get('gamma_evaluated', True):
+                    continue
+
+                p = data.get("p_value")
+                q = data.get("q_value")
+                delta = data.get("delta")
+                eff_d = data.get("effect_size_d")
+                task_mean = data.get("task_mean")
+                base_mean = data.get("baseline_mean")
+                disc = data.get("discrete_index")
+                sig = bool(data.get("significant_change"))
+                feat_rows.append((p if p is not None else 1.0, fname, {
+                    "p": p, "q": q, "delta": delta, "d": eff_d,
+                    "task_mean": task_mean, "baseline_mean": base_mean,
+                    "disc": disc, "sig": sig
+                }))
+            feat_rows.sort(key=lambda r: r[0])
+            sig_rows = [r for r in feat_rows if r[2]["sig"]]
+
+            lines.append("  Significant Features (adjusted thresholds, top 5 shown):")
+            if not sig_rows:
+                lines.append("    (none)")
+            else:
+                for p, fname, d in sig_rows[:5]:
+                    lines.append(
+                        f"    {fname}: p={_fmt(d['p'])} q={_fmt(d.get('q'))} Δ={_fmt(d['delta'])} d={_fmt(d['d'])} "
+                        f"task_mean={_fmt(d['task_mean'])} base_mean={_fmt(d['baseline_mean'])} bin={d['disc']}"
+                    )
+
+            # Always include top-5 table (by p-value)
+            lines.append("  Top 5 Features (by p-value):")
+            for p, fname, d in feat_rows[:5]:
+                ratio = (d['task_mean']/(abs(d['baseline_mean'])+1e-12)) if (d['task_mean'] is not None and d['baseline_mean']) else None
+                lines.append(
+                    f"    {fname}: p={_fmt(d['p'])} q={_fmt(d.get('q'))} sig={d['sig']} Δ={_fmt(d['delta'])} d={_fmt(d['d'])} "
+                    f"ratio={_fmt(ratio)}"
+                )
+
+        # Expectation-alignment analysis (production display)
+        exp_result = summary.get('expectation')
+        if exp_result:
+            lines.append("  ⎯⎯⎯ Expectation-Alignment Analysis ⎯⎯⎯")
+            grade = exp_result.get('grade', 'N/A')
+            passes = exp_result.get('passes', [])
+            drivers = exp_result.get('top_drivers', [])
+            counter = exp_result.get('counter_directional', False)
+            notes = exp_result.get('notes', [])
+            insufficient = exp_result.get('insufficient_metrics', False)
+
+            lines.append(f"  Grade: {grade}")
+            if insufficient:
+                lines.append("  ⚠ Insufficient metrics for full evaluation (missing d or p_dir on key features)")
+            if counter:
+                lines.append("  ⚠ Counter-directional: ≥70% of features moved opposite to task expectations")
+
+            lines.append(f"  Passed Features (n={len(passes)}):")
+            if not passes:
+                lines.append("    (none)")
+            else:
+                for pf in passes:
+                    feat_name = pf.get('feature', 'unknown')
+                    direction = pf.get('direction', '?')
+                    p_dir = pf.get('p_dir')
+                    d_val = pf.get('d')
+                    pct_val = pf.get('pct')
+                    rule = pf.get('rule', 'unknown')
+                    d_meets = pf.get('d_meets_thr', False)
+                    pct_meets = pf.get('pct_meets_thr', False)
+
+                    criteria_str = []
+                    if d_meets:
+                        criteria_str.append(f"d={_fmt(d_val)}")
+                    if pct_meets:
+                        criteria_str.append(f"Δ%={_fmt(pct_val)}")
+                    criteria_str.append(f"p_dir={_fmt(p_dir)}")
+
+                    lines.append(f"    {feat_name} ({direction}): {', '.join(criteria_str)} | rule={rule}")
+
+            lines.append("  Top Drivers (by |d|):")
+            if not drivers:
+                lines.append("    (none)")
+            else:
+                for drv in drivers:
+                    lines.append(f"    {drv.get('feature', 'unknown')}: |d|={_fmt(drv.get('d'))}")
+
+            if notes:
+                lines.append("  Notes:")
+                for note in notes:
+                    lines.append(f"    • {note}")
+
+        lines.append("")
+
+    # Combined aggregate
+    lines.append("Combined Task Aggregate")
+    lines.append("-" * 30)
+    combined = res.get('combined', {})
+    comb_summary = combined.get("summary", {})
+    combined_analysis = combined.get("analysis", {}) or {}
+    fisher_c = comb_summary.get("fisher", {})
+    sum_p_c = comb_summary.get("sum_p", {})
+    comp_c = comb_summary.get("composite", {}) or {}
+    effect_c = comb_summary.get("effect_size_mean")
+    decision_c = comb_summary.get("feature_selection") or {}
+    lines.append(f"Fisher_KM_p={_fmt(fisher_c.get('km_p'))} sig={fisher_c.get('significant')} df={_fmt(fisher_c.get('km_df'))}")
+    lines.append(f"SumP={_fmt(sum_p_c.get('value'))} p={_fmt(sum_p_c.get('perm_p'))} sig={sum_p_c.get('significant')} perm={sum_p_c.get('permutation_used')}")
+    lines.append(f"CompositeScore={_fmt(comp_c.get('score'))} Mean|d|={_fmt(effect_c)}")
+    if decision_c:
+        lines.append(
+            "Decision thresholds (band-specific): "
+            f"p≤{_fmt(decision_c.get('alpha'))}, "
+            f"q≤{_fmt(decision_c.get('fdr_alpha'))}"
+        )
+        lines.append(
+            "  Effect sizes: α≥0.25, β≥0.35, γ≥0.30, θ≥0.30, ratios≥0.30"
+        )
+        lines.append(
+            "  Percent change: relative features≥5%, absolute≥10%"
+        )
+        if decision_c.get('correlation_guard_active'):
+            lines.append(
+                f"Correlation guard factor={_fmt(decision_c.get('correlation_guard_factor'))} "
+                f"(m_eff={_fmt(decision_c.get('effective_feature_count'))}/{decision_c.get('nominal_feature_count')})"
+            )
+    lines.append("")
+
+    # Across-task omnibus
+    lines.append("Across-Task Omnibus (Feature Stability)")
+    lines.append("-" * 40)
+    across = res.get('across_task') or {}
+    if across:
+        # Check for ranking-only mode (Nmin guard)
+        ranking_only = across.get('ranking_only', False)
+        nmin = across.get('nmin_sessions')
+        sessions_used = across.get('sessions_used')
+        msg = across.get('message')
+
+        if ranking_only:
+            lines.append(f"⚠ Significance testing disabled: N={sessions_used} sessions < Nmin={nmin}")
+            lines.append("Showing descriptive rankings only (median effect per task).")
+            if msg:
+                lines.append(f"Note: {msg}")
+            # Show ranking-only features
+            feat_info = across.get("features", {}) or {}
+            lines.append(f"Features ranked: {len(feat_info)}")
+            # Show a few examples
+            lines.append("Sample feature rankings (up to 5):")
+            for i, (fname, data) in enumerate(sorted(feat_info.items())[:5]):
+                ranking = data.get('ranking', [])
+                ranking_str = " > ".join([f"{r['task']}({_fmt(r['median_effect'])})" for r in ranking])
+                lines.append(f"  {fname}: {ranking_str}")
+        else:
+            feat_info = across.get("features", {}) or {}
+            sig_feats = [f for f, d in feat_info.items() if d.get("omnibus_sig")]
+            lines.append(f"Features tested: {len(feat_info)} | Significant (FDR {engine.config.fdr_alpha}): {len(sig_feats)}")
+            if sig_feats:
+                lines.append("Significant features: " + ", ".join(sorted(sig_feats)))
+            # Show top 5 by omnibus statistic
+            scored = []
+            for fname, data in feat_info.items():
+                stat = data.get("omnibus_stat")
+                pval = data.get("omnibus_p")
+                qval = data.get("omnibus_q")
+                scored.append((stat if stat is not None else -float('inf'), fname, pval, qval))
+            scored.sort(reverse=True)
+            lines.append("Top Feature Omnibus Stats (up to 5):")
+            for stat, fname, pval, qval in scored[:5]:
+                lines.append(f"  {fname}: stat={_fmt(stat)} p={_fmt(pval)} q={_fmt(qval)}")
+    else:
+        lines.append("Across-task analysis unavailable (insufficient task diversity).")
+    lines.append("")
+
+    # Configuration provenance
+    lines.append("Configuration & Provenance")
+    lines.append("-" * 40)
+    config = engine.config
+    lines.append(f"Mode={config.mode} | alpha={config.alpha} | dependence={config.dependence_correction}")
+    lines.append(f"Permutation preset={config.runtime_preset} (n_perm={engine._effective_n_perm()}, mode={config.perm_mode}, h={config.perm_h}) | effect_measure={config.effect_measure}")
+    lines.append(f"Discretization bins={config.discretization_bins} | FDR alpha={config.fdr_alpha}")
+    lines.append("Baseline: eyes-closed only (eyes-open retained for reference, not pooled).")
+    lines.append("")
+    lines.append("Glossary of Metrics")
+    lines.append("-" * 40)
+    glossary_entries = [
+        ("Fisher_KM", "Fisher combined p-value adjusted with Kost–McDermott correlation correction"),
+        ("SumP", "Sum of per-feature p-values; permutation p-value gauges deviation from baseline"),
+        ("CompositeScore", "Sum of -log10 adjusted p-values as an aggregate strength indicator"),
+        ("Mean|d|", "Mean absolute Cohen's d effect size across significant features"),
+        ("perm_p", "Permutation-derived significance comparing observed statistic to shuffled baseline"),
+        ("perm_used", "Indicates whether permutations (vs analytic approximation) were applied"),
+        ("km_df", "Effective degrees of freedom used in Kost–McDermott chi-square approximation"),
+        ("sig_feature_count", "Number of features passing the FDR threshold when feature selection enabled"),
+        ("sig_prop", "Proportion of tested features that remained significant after FDR control"),
+        ("omnibus_stat", "Across-task Friedman/Wilcoxon statistic measuring feature variation between tasks"),
+        ("omnibus_p", "P-value for omnibus_stat before FDR adjustment"),
+        ("omnibus_q", "FDR-adjusted p-value for the across-task omnibus test"),
+        ("omnibus_sig", "True when omnibus_q is below the configured FDR alpha"),
+        ("posthoc_q", "Pairwise task comparison FDR-adjusted q-values (matrix form in exports)"),
+        ("Δ", "Absolute difference between task and baseline means for the feature"),
+        ("d", "Cohen's d effect size comparing task vs baseline distributions"),
+        ("ratio", "Task mean divided by baseline mean (signed) for quick proportional change"),
+        ("bin", "Discretized effect bin index relative to baseline distribution quantiles"),
+    ]
+    seen_terms = set()
+    for key, description in glossary_entries:
+        if key in seen_terms:
+            continue
+        seen_terms.add(key)
+        lines.append(f"{key}: {description}")
+
+    latency_lines = PIPELINE_LATENCY.report_lines()
+    if latency_lines:
+        lines.append("")
+        lines.extend(latency_lines)
+
+    return lines
@@ -0,0 +1,271 @@
+"""
+Background warm-up of the analysis kernels during the setup wizard.
+
+The operator spends 30-90 s in the OS / device / environment / partner /
+login dialogs while the CPU is idle, and the first calibration window
+then pays every one-off cost at once: the deferred pandas and SciPy
+imports, filter design, DPSS tapers, the first FFT and LAPACK calls and
+the first pandas frame. WarmupService runs these once on a low-priority
+daemon thread, using synthetic EEG and a throwaway engine:
+
+    imports       pandas, scipy.signal, scipy.stats, scipy.integrate
+    filters       notch (50/60 Hz) and 1-45 Hz band-pass designs for the rate
+    tapers        DPSS tapers for the enhanced engine's window length
+    extract       one base and one enhanced extract_features pass
+    statistics    Welch t-test, BH-FDR, Spearman / Kost-McDermott, Friedman,
+                  sign test, Wilcoxon, one-way ANOVA, fast-mode sum-p
+    multichannel  vectorized notch / Welch and quality metrics (ANT Neuro)
+
+Filter designs and tapers are cached (``dsp.notch_coefficients``,
+``dsp.butter_coefficients``, ``enhanced.dpss_tapers``), so the live
+pipeline reuses what the warm-up computed. The session's engine is never
+touched, and stage latencies are muted on the warm-up thread. Steps added
+with ``add_step`` (GUI-level kernels such as the signal-quality checks)
+run after the built-in ones for their device. ``BL_WARMUP=0`` disables it.
+
+    service = WarmupService(config)
+    service.start('mindlink')        # right after the window opens
+    service.request('antneuro')      # once the device type is known
+"""
+
+import copy
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.bl_log import get_logger
+from utils.pipeline_latency import PIPELINE_LATENCY
+
+from .dsp import FS, bandpass_filter, butter_coefficients, notch_coefficients, notch_filter
+from .recording import ANTNEURO_FS
+
+warmup_log = get_logger("startup")
+
+WARMUP_ENABLED = os.environ.get('BL_WARMUP', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+# Sample rate and channel count the live pipeline runs at, per device type
+DEVICE_PROFILES: Dict[str, Dict[str, int]] = {
+    'mindlink': {'sample_rate': FS, 'channels': 1},
+    'antneuro': {'sample_rate': ANTNEURO_FS, 'channels': 64},
+}
+MAINS_HZ = (50.0, 60.0)
+WARMUP_WINDOWS = 8  # Synthetic windows per condition for the statistics pass
+
+Step = Tuple[str, Callable[[Dict[str, Any]], Any], Optional[str]]
+
+
+def synthetic_eeg(n_samples: int, n_channels: int, fs: float, alpha: float = 20.0, seed: int = 0) -> np.ndarray:
+    """Alpha rhythm plus white noise, shape ``(n_samples, n_channels)``."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / float(fs)
+    rhythm = alpha * np.sin(2 * np.pi * 10.0 * t) + 0.3 * alpha * np.sin(2 * np.pi * 20.0 * t)
+    return rhythm[:, None] + 5.0 * rng.standard_normal((n_samples, n_channels))
+
+
+def _lower_thread_priority() -> None:
+    """Best effort: run the calling thread below the GUI thread."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), -2)  # THREAD_PRIORITY_LOWEST
+        elif hasattr(os, 'setpriority') and hasattr(threading, 'get_native_id'):
+            # Linux applies nice values per thread; elsewhere this fails and is ignored
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except Exception:
+        pass
+
+
+# ----------------------------------------------------------------------------
+# Built-in steps
+# ----------------------------------------------------------------------------
+
+def warm_imports(profile: Dict[str, Any]) -> None:
+    import importlib
+    for name in ('pandas', 'scipy.signal', 'scipy.signal.windows', 'scipy.stats', 'scipy.integrate'):
+        importlib.import_module(name)
+
+
+def warm_filters(profile: Dict[str, Any]) -> None:
+    fs = profile['sample_rate']
+    for mains in MAINS_HZ:
+        notch_coefficients(fs, mains)
+    butter_coefficients(2, (1.0, 45.0), fs, btype='band')
+    x = synthetic_eeg(int(2 * fs), 1, fs)[:, 0]
+    notch_filter(x, fs, notch_freq=MAINS_HZ[0])
+    bandpass_filter(x, fs=fs)
+
+
+def warm_tapers(profile: Dict[str, Any]) -> None:
+    from .enhanced import dpss_tapers
+    engine = profile['engine']
+    dpss_tapers(int(engine.window_samples), 2.5, max(1, int(engine.mt_tapers)))
+
+
+def warm_extract(profile: Dict[str, Any]) -> None:
+    from .engine import FeatureAnalysisEngine
+    engine = profile['engine']
+    x = synthetic_eeg(int(engine.window_samples), 1, engine.fs)[:, 0]
+    base = FeatureAnalysisEngine()
+    base.extract_features(x[:base.window_samples])
+    engine.extract_features(x)
+
+
+def warm_statistics(profile: Dict[str, Any]) -> None:
+    from . import enhanced
+    engine = profile['engine']
+    n = int(engine.window_samples)
+    baseline = [engine.extract_features(synthetic_eeg(n, 1, engine.fs, alpha=20.0, seed=i)[:, 0])
+                for i in range(WARMUP_WINDOWS)]
+    task = [engine.extract_features(synthetic_eeg(n, 1, engine.fs, alpha=12.0, seed=100 + i)[:, 0])
+            for i in range(WARMUP_WINDOWS)]
+    engine.calibration_data['eyes_closed']['features'] = baseline
+    features = []
+    for name in sorted(k for k, v in baseline[0].items() if np.isscalar(v)):
+        values = np.array([w[name] for w in baseline + task], dtype=float)
+        # Skip near-constant features so SciPy has nothing to warn about
+        if np.all(np.isfinite(values)) and np.std(values) > 1e-6 * (abs(np.mean(values)) + 1e-12):
+            features.append(name)
+
+    baseline_df = engine._baseline_dataframe(features)
+    p_values = []
+    for feature in features[:8]:
+        x = np.array([w[feature] for w in task], dtype=float)
+        y = np.array([w[feature] for w in baseline], dtype=float)
+        p_values.append(engine._welch_ttest(x, y)[1])
+    engine._bh_fdr(p_values, alpha=0.05)
+    fisher_stat, _ = engine._fishers_method(p_values)
+    engine._kost_mcdermott_pvalue(float(fisher_stat or 0.0), features[:8], baseline_df)
+    engine._effective_feature_count(baseline_df, features[:8])
+
+    rows = np.random.default_rng(1).standard_normal((WARMUP_WINDOWS, 3))
+    engine._friedman_test(rows)
+    engine._sign_test_pvalue(rows[:, 0] - rows[:, 1])
+    if enhanced._scipy_wilcoxon is not None:
+        enhanced._scipy_wilcoxon(rows[:, 0] - rows[:, 1])
+    if enhanced._scipy_f_oneway is not None:
+        enhanced._scipy_f_oneway(rows[:, 0], rows[:, 1], rows[:, 2])
+    fast = copy.copy(engine.config)
+    fast.fast_mode = True
+    engine.config = fast
+    engine._permutation_sum_p({'warmup': (rows[:, 0], rows[:, 1])}, observed_sum=1.0)
+
+
+def warm_multichannel(profile: Dict[str, Any]) -> None:
+    from scipy import signal
+    from utils.multichannel_quality import multichannel_quality_metrics
+    fs = profile['sample_rate']
+    data = synthetic_eeg(int(4 * fs), profile['channels'], fs)
+    b, a = signal.iirnotch(MAINS_HZ[1], 30.0, fs)
+    window = signal.filtfilt(b, a, data[:int(2 * fs)], axis=0)
+    signal.welch(window, fs, nperseg=min(window.shape[0], 256), axis=0)
+    multichannel_quality_metrics(data, fs=fs)
+
+
+# (name, function, device or None for all devices); engine steps need the throwaway engine
+BUILTIN_STEPS: List[Step] = [
+    ('imports', warm_imports, None),
+    ('filters', warm_filters, None),
+    ('tapers', warm_tapers, 'mindlink'),
+    ('extract', warm_extract, 'mindlink'),
+    ('statistics', warm_statistics, None),
+    ('multichannel', warm_multichannel, 'antneuro'),
+]
+ENGINE_STEPS = ('tapers', 'extract', 'statistics')
+
+
+class WarmupService:
+    """Runs the warm-up steps for each requested device once, on a background thread."""
+
+    def __init__(self, config=None):
+        self.config = config
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._extra_steps: List[Step] = []
+        self._done_steps: set = set()
+        self._requested: set = set()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_step(self, name: str, fn: Callable[[Dict[str, Any]], Any], device: Optional[str] = None) -> None:
+        """Extra kernel to warm; ``fn(profile)`` gets sample_rate, channels, device and config."""
+        self._extra_steps.append((name, fn, device))
+
+    def start(self, device: str = 'mindlink') -> bool:
+        """Start the thread and queue ``device``; False when disabled (BL_WARMUP=0)."""
+        if not WARMUP_ENABLED:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bl-warmup", daemon=True)
+            self._thread.start()
+        self.request(device)
+        return True
+
+    def request(self, device: str) -> None:
+        """Queue the warm-up for another device type (no-op if already queued or not started)."""
+        if self._thread is None or device in self._requested or device not in DEVICE_PROFILES:
+            return
+        self._requested.add(device)
+        self._idle.clear()
+        self._queue.put(device)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued device is warm; True if it finished in time."""
+        return self._idle.wait(timeout)
+
+    def stop(self) -> None:
+        """Skip the remaining steps; the current step finishes on its own."""
+        self._stop.set()
+        self._queue.put(None)
+
+    def summary_line(self) -> str:
+        parts = [f"{name} {ms:.0f}" for name, ms in self.timings.items()]
+        return f"Warm-up: {sum(self.timings.values()):.0f} ms ({', '.join(parts) or 'nothing run'})"
+
+    def _run(self) -> None:
+        _lower_thread_priority()
+        while not self._stop.is_set():
+            device = self._queue.get()
+            if device is None:
+                break
+            with PIPELINE_LATENCY.muted():
+                self._warm_device(device)
+            if self._queue.empty():
+                self._idle.set()
+        self._idle.set()
+
+    def _warm_device(self, device: str) -> None:
+        profile: Dict[str, Any] = dict(DEVICE_PROFILES[device], device=device, config=self.config)
+        t_device = time.perf_counter()
+        for name, fn, step_device in BUILTIN_STEPS + self._extra_steps:
+            if self._stop.is_set():
+                return
+            if step_device not in (None, device):
+                continue
+            key = f"{name}[{profile['sample_rate']}]" if name == 'filters' else name
+            if key in self._done_steps:
+                continue
+            self._done_steps.add(key)
+            t0 = time.perf_counter()
+            try:
+                if name in ENGINE_STEPS and 'engine' not in profile:
+                    profile['engine'] = self._throwaway_engine()
+                fn(profile)
+            except Exception as e:
+                self.errors[key] = f"{type(e).__name__}: {e}"
+                warmup_log.debug("Warm-up step %s failed: %s", key, self.errors[key])
+            self.timings[key] = (time.perf_counter() - t0) * 1000.0
+        warmup_log.info("Warm-up for %s finished in %.0f ms", device, (time.perf_counter() - t_device) * 1000.0)
+
+    def _throwaway_engine(self):
+        from .enhanced import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+        config = copy.copy(self.config) if self.config is not None else EnhancedAnalyzerConfig()
+        config.result_cache = False
+        return EnhancedFeatureAnalysisEngine(config=config)
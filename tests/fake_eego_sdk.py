@@ -0,0 +1,119 @@
+"""
+Fake eego_sdk module for running the ANT Neuro acquisition code without hardware.
+
+Mimics the parts of the SDK used by antNeuro/antneuro_data_acquisition.py:
+factory -> amplifier -> stream -> buffer. Buffers hold deterministic
+sample-major data (value = sample_index * 1000 + channel) so tests can
+check ordering exactly.
+
+Usage:
+    import sys, fake_eego_sdk
+    sys.modules['eego_sdk'] = fake_eego_sdk
+    from antNeuro.antneuro_data_acquisition import AntNeuroDevice
+
+Set ``fake_eego_sdk.BUFFER_MODE`` to pick which buffer API is exposed:
+    'buffer'  - Python buffer protocol (memoryview)
+    'flat'    - getData() returning a flat list
+    'legacy'  - only size() / getSample(channel) per channel
+"""
+
+import numpy as np
+
+BUFFER_MODE = 'flat'
+CHANNEL_COUNT = 88
+SAMPLES_PER_READ = 60
+
+
+class FakeBuffer:
+    def __init__(self, data):
+        self._data = np.ascontiguousarray(data, dtype=np.float64)  # (samples, channels)
+
+    def getChannelCount(self):
+        return self._data.shape[1]
+
+    def getSampleCount(self):
+        return self._data.shape[0]
+
+    def size(self):
+        return self._data.size
+
+    def getSample(self, channel):
+        return list(self._data[:, channel])
+
+
+class FlatBuffer(FakeBuffer):
+    def getData(self):
+        return self._data.ravel().tolist()
+
+
+class ProtocolBuffer(np.ndarray):
+    """Flat sample-major array exposing the Python buffer protocol"""
+
+    def getChannelCount(self):
+        return self.channel_count
+
+
+def _make_buffer(data):
+    if BUFFER_MODE == 'buffer':
+        buffer = np.ascontiguousarray(data, dtype=np.float64).ravel().view(ProtocolBuffer)
+        buffer.channel_count = data.shape[1]
+        return buffer
+    if BUFFER_MODE == 'flat':
+        return FlatBuffer(data)
+    return FakeBuffer(data)
+
+
+class FakeStream:
+    def __init__(self, channel_count, samples_per_read):
+        self.channel_count = channel_count
+        self.samples_per_read = samples_per_read
+        self.next_index = 0
+
+    def getChannelList(self):
+        return list(range(self.channel_count))
+
+    def getData(self):
+        idx = np.arange(self.next_index, self.next_index + self.samples_per_read)
+        self.next_index += self.samples_per_read
+        data = idx[:, None] * 1000.0 + np.arange(self.channel_count)[None, :]
+        return _make_buffer(data)
+
+
+class FakeAmplifier:
+    def __init__(self, serial="FAKE-0001"):
+        self.serial = serial
+
+    def getSerialNumber(self):
+        return self.serial
+
+    def getType(self):
+        return "EE-225 (fake)"
+
+    def getFirmwareVersion(self):
+        return "0.0"
+
+    def getChannelList(self):
+        return list(range(CHANNEL_COUNT))
+
+    def getPowerState(self):
+        return True
+
+    def getSamplingRatesAvailable(self):
+        return [500, 1000, 2000]
+
+    def getReferenceRangesAvailable(self):
+        return [1.0]
+
+    def getBipolarRangesAvailable(self):
+        return [4.0]
+
+    def OpenEegStream(self, sample_rate, ref_range, bipolar_range):
+        return FakeStream(CHANNEL_COUNT, SAMPLES_PER_READ)
+
+
+class factory:
+    def getVersion(self):
+        return "fake"
+
+    def getAmplifiers(self):
+        return [FakeAmplifier()]
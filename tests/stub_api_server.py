@@ -0,0 +1,185 @@
+"""
+Local stub of the Mindspeller API for tests (no network, no credentials)
+
+Serves the login, device-authorization, live-metrics (``brainlink_data``)
+and report-seeding (``eeg-reports/seed``) endpoints over HTTP/1.1 keep-alive on 127.0.0.1 with
+a configurable per-request delay, so tests can measure login-to-ready
+latency and count TCP connections. gzip request bodies are decoded, and
+``metrics`` collects every metrics tick received (batched or single) and
+``reports`` every seeded report body with its ``Idempotency-Key``:
+
+    with StubApiServer(delay_s=0.05) as server:
+        client = MindspellerClient(server.login_url)
+        ...
+        server.connections          # distinct client connections
+        server.hits['/api/cas/users/hwids']
+
+``fail[path] = [503, 503]`` makes the next requests to ``path`` return
+those statuses (one per request) before the normal response. Extra
+routes are added with ``server.routes[(method, path)] = handler``, where
+``handler(request_json, headers)`` returns ``(status, body_dict)``.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+API_PREFIX = "/api/cas"
+STUB_TOKEN = "stub-jwt-token"
+STUB_USER = {'email': 'stub@example.com', 'initial_protocol': ''}
+STUB_PARTNERS = [{'id': 1, 'name': 'Stub Partner'}, {'id': 2, 'name': 'Other Partner'}]
+STUB_HWIDS = ['5C361634682F', '5C361634682E']
+
+Handler = Callable[[Optional[Dict[str, Any]], Dict[str, str]], Tuple[int, Dict[str, Any]]]
+
+
+def _login(body, headers):
+    if not body or not body.get('username') or not body.get('password'):
+        return 401, {'error': 'invalid credentials'}
+    return 200, {'x-jwt-access-token': STUB_TOKEN, 'hwid': STUB_HWIDS[0]}
+
+
+def _authorized(handler: Handler) -> Handler:
+    def wrapped(body, headers):
+        if headers.get('X-Authorization') != f"Bearer {STUB_TOKEN}":
+            return 401, {'error': 'missing token'}
+        return handler(body, headers)
+    return wrapped
+
+
+class StubApiServer:
+    """Threaded keep-alive HTTP server on an ephemeral port; use as a context manager."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.hits: Counter = Counter()
+        self.fail: Dict[str, List[int]] = {}
+        self.requests: List[Tuple[str, str, Any]] = []
+        self.metrics: List[Dict[str, Any]] = []
+        self.reports: List[Tuple[Optional[str], Dict[str, Any]]] = []
+        self.bytes_received = 0
+        self._peers = set()
+        self._lock = threading.Lock()
+        self.routes: Dict[Tuple[str, str], Handler] = {
+            ('POST', f"{API_PREFIX}/token/login"): _login,
+            ('GET', f"{API_PREFIX}/users/current_user"): _authorized(lambda b, h: (200, {'data': dict(STUB_USER)})),
+            ('GET', f"{API_PREFIX}/partners/list"): _authorized(lambda b, h: (200, {'partners': list(STUB_PARTNERS)})),
+            ('GET', f"{API_PREFIX}/users/hwids"): _authorized(lambda b, h: (200, {'brainlink_hwid': list(STUB_HWIDS)})),
+            ('POST', f"{API_PREFIX}/brainlink_data"): _authorized(self._brainlink_data),
+            ('POST', f"{API_PREFIX}/eeg-reports/seed"): _authorized(self._seed_report),
+        }
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _brainlink_data(self, body, headers):
+        ticks = body if isinstance(body, list) else [body]
+        with self._lock:
+            self.metrics.extend(ticks)
+        return 200, {'received': len(ticks)}
+
+    def _seed_report(self, body, headers):
+        if not body or not body.get('email') or not body.get('report_text'):
+            return 400, {'error': 'email and report_text are required'}
+        with self._lock:
+            self.reports.append((headers.get('Idempotency-Key'), body))
+            report_id = len(self.reports)
+        return 201, {'user_id': 7, 'session_id': body.get('session_id'), 'report_id': report_id}
+
+    @property
+    def seed_url(self) -> str:
+        return f"{self.base_url}{API_PREFIX}/eeg-reports/seed"
+
+    @property
+    def metrics_url(self) -> str:
+        return f"{self.base_url}{API_PREFIX}/brainlink_data"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def login_url(self) -> str:
+        return f"{self.base_url}{API_PREFIX}/token/login"
+
+    @property
+    def connections(self) -> int:
+        return len(self._peers)
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.hits.clear()
+            self.requests.clear()
+            self.metrics.clear()
+            self.reports.clear()
+            self._peers.clear()
+            self.bytes_received = 0
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path = urlsplit(handler.path).path
+        length = int(handler.headers.get('Content-Length') or 0)
+        raw = handler.rfile.read(length) if length else b""
+        with self._lock:
+            self.bytes_received += len(raw)
+        if raw and handler.headers.get('Content-Encoding') == 'gzip':
+            raw = gzip.decompress(raw)
+        body = json.loads(raw) if raw else None
+        with self._lock:
+            self._peers.add(handler.client_address)
+            self.hits[path] += 1
+            self.requests.append((method, path, body))
+            failures = self.fail.get(path)
+            forced = failures.pop(0) if failures else None
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        route = self.routes.get((method, path))
+        if forced is not None:
+            status, payload = forced, {'error': 'stub failure'}
+        elif route is None:
+            status, payload = 404, {'error': 'not found'}
+        else:
+            status, payload = route(body, dict(handler.headers))
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def start(self) -> 'StubApiServer':
+        stub = self
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                stub._handle(self, 'GET')
+
+            def do_POST(self):
+                stub._handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'StubApiServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
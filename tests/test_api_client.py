@@ -0,0 +1,127 @@
+"""
+Test the pooled login / device-authorization client against a local stub
+
+Measures login-to-ready latency (login, then user data, partners and
+HWIDs) for the old flow (four sequential calls, a new connection each)
+and for MindspellerClient (keep-alive pool, parallel fetches), and
+checks connection reuse, retries with backoff, partial failures and the
+login error kinds the LoginDialog shows.
+
+Usage:
+    cd tests
+    python test_api_client.py
+"""
+
+import os
+import sys
+import time
+
+import requests
+
+os.environ.setdefault('BL_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api_server import STUB_HWIDS, STUB_PARTNERS, STUB_TOKEN, StubApiServer
+from utils.api_client import ApiError, MindspellerClient, backoff_delay
+
+DELAY_S = 0.08  # Simulated server latency per request
+
+
+def sequential_login(login_url):
+    """The previous LoginDialog flow: one request after another, no shared session."""
+    t0 = time.perf_counter()
+    token = requests.post(login_url, json={"username": "u", "password": "p"}, timeout=10).json()["x-jwt-access-token"]
+    api_base = login_url.replace("/token/login", "")
+    headers = {"X-Authorization": f"Bearer {token}"}
+    for path in ("/users/current_user", "/partners/list?region=all", "/users/hwids"):
+        requests.get(f"{api_base}{path}", headers=headers, timeout=10).json()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def test_login_to_ready(server):
+    old_ms = sequential_login(server.login_url)
+    old_connections = server.connections
+    server.reset_counters()
+
+    client = MindspellerClient(server.login_url)
+    result = client.login_and_fetch("user@example.com", "secret")
+    assert result.jwt_token == STUB_TOKEN and result.hwid == STUB_HWIDS[0]
+    assert result.partners == STUB_PARTNERS and result.hwids == STUB_HWIDS
+    assert result.user_data.get('email') == 'stub@example.com' and not result.errors, result.errors
+    new_ms = result.timings['ready']
+    # Login plus one parallel round trip instead of four round trips
+    assert new_ms < old_ms * 0.75, (new_ms, old_ms)
+    assert new_ms < 3.5 * DELAY_S * 1000.0, new_ms
+    print(f"  ✓ login-to-ready {old_ms:.0f} ms sequential -> {new_ms:.0f} ms pooled/parallel "
+          f"({DELAY_S * 1000:.0f} ms per request)")
+
+    first_connections = server.connections
+    assert first_connections <= 3, first_connections  # login connection reused by one fetch
+    client.login_and_fetch("user@example.com", "secret")
+    assert server.connections == first_connections, "second login opened new connections"
+    print(f"  ✓ {old_connections} connections before, {first_connections} pooled connections reused across logins")
+    client.close()
+
+
+def test_retries(server):
+    delays = []
+    client = MindspellerClient(server.login_url, retries=2, sleep=delays.append)
+    server.reset_counters()
+    server.fail['/api/cas/users/hwids'] = [503, 502]
+    result = client.login_and_fetch("user@example.com", "secret")
+    assert result.hwids == STUB_HWIDS and not result.errors, result.errors
+    assert server.hits['/api/cas/users/hwids'] == 3
+    assert len(delays) == 2 and delays[0] <= 0.25 and delays[1] <= 0.5, delays
+
+    server.fail['/api/cas/partners/list'] = [500]
+    result = client.login_and_fetch("user@example.com", "secret")
+    assert 'partners' in result.errors and result.partners == [] and result.hwids == STUB_HWIDS
+
+    server.reset_counters()
+    server.fail['/api/cas/token/login'] = [503]
+    try:
+        client.login_and_fetch("user@example.com", "secret")
+        raise AssertionError("login 503 should fail")
+    except ApiError as e:
+        assert e.kind == 'status' and e.status_code == 503
+    assert server.hits['/api/cas/token/login'] == 1, "login POST must not be resent after a response"
+
+    try:
+        client.login_and_fetch("", "")
+        raise AssertionError("empty credentials should fail")
+    except ApiError as e:
+        assert e.status_code == 401
+    assert all(0.0 <= backoff_delay(n) <= min(4.0, 0.25 * 2 ** n) for n in range(8))
+    client.close()
+    print("  ✓ transient 5xx retried with jittered backoff, partial failures reported, login POST not resent")
+
+
+def test_connection_refused():
+    with StubApiServer() as server:
+        login_url = server.login_url
+    delays = []
+    client = MindspellerClient(login_url, retries=2, sleep=delays.append, timeout=2.0)
+    try:
+        client.login("user@example.com", "secret")
+        raise AssertionError("closed port should fail")
+    except requests.exceptions.ConnectionError:
+        pass
+    assert len(delays) == 2, delays  # Never reached the server, so the POST is retried
+    print("  ✓ refused connections retried, then raised")
+
+
+def main():
+    print("=" * 60)
+    print("API CLIENT TEST")
+    print("=" * 60)
+    with StubApiServer(delay_s=DELAY_S) as server:
+        test_login_to_ready(server)
+    with StubApiServer() as server:
+        test_retries(server)
+    test_connection_refused()
+    print("\n✓ All API client tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Test the pre-rendered audio cue bank
+
+Renders every cue pattern once for the mixer (SDL dummy driver, so no
+sound card is needed), compares a cue's play() call with the old
+per-beep NumPy synthesis + Sound() construction, checks pattern timing
+(tones and gaps in one buffer, in the mixer's channel count), the logged
+requested / played / marker_to_cue_ms timestamps and attach_cues()
+offsets on offline-engine style phase markers.
+
+Usage:
+    cd tests
+    python test_audio_cues.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.audio_cues import CUE_PATTERNS, CueBank, attach_cues, render_pattern, render_tone
+
+try:
+    import pygame.mixer
+    pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+    MIXER = pygame.mixer.get_init() is not None
+except Exception as e:
+    print(f"  (no mixer: {e}; render-only checks)")
+    MIXER = False
+
+
+def old_beep(frequency=900, duration=220, sample_rate=22050):
+    """The previous AudioFeedback._play_beep: synthesize and build a Sound per cue."""
+    duration_s = duration / 1000.0
+    num_samples = int(sample_rate * duration_s)
+    samples = np.sin(2 * np.pi * frequency * np.linspace(0, duration_s, num_samples))
+    samples = (samples * 32767).astype(np.int16)
+    stereo = np.column_stack((samples, samples))
+    sound = pygame.mixer.Sound(buffer=stereo)
+    sound.play()
+    return sound
+
+
+def test_render():
+    tone = render_tone(900, 220)
+    assert tone.dtype == np.int16 and len(tone) == int(22050 * 0.22)
+    tones, gap = CUE_PATTERNS['phase_complete']
+    mono = render_pattern(tones, gap, 22050, 1)
+    expected = 4 * int(22050 * 0.15) + 3 * int(22050 * 0.05)
+    assert mono.shape == (expected,), mono.shape
+    # Silence between the beeps, not a sleep in another thread
+    gap_start = int(22050 * 0.15)
+    assert not mono[gap_start:gap_start + int(22050 * 0.05)].any()
+    stereo = render_pattern(tones, gap, 44100, 2)
+    assert stereo.shape == (4 * int(44100 * 0.15) + 3 * int(44100 * 0.05), 2) and stereo.flags['C_CONTIGUOUS']
+    assert (stereo[:, 0] == stereo[:, 1]).all()
+    print(f"  ✓ phase_complete pattern: 4 beeps + 3 gaps in one {expected / 22.05:.0f} ms buffer (mono / stereo)")
+
+
+def test_load_and_play():
+    bank = CueBank()
+    if not MIXER:
+        event = bank.play('start_task', marker_time=time.time())
+        assert event['audio'] is False and 'marker_to_cue_ms' in event
+        assert bank.summary_line().endswith("audio off")
+        print("  ✓ without a mixer cues are logged with audio: False")
+        return
+    assert bank.load(buffer_samples=512) and bank.audio_available
+    sounds = dict(bank._sounds)
+    assert bank.load() and bank._sounds == sounds, "reloaded for the same mixer format"
+    for name, (tones, gap) in CUE_PATTERNS.items():
+        expected_s = (sum(d for _, d in tones) + gap * (len(tones) - 1)) / 1000.0
+        assert abs(sounds[name].get_length() - expected_s) < 0.005, (name, sounds[name].get_length())
+
+    old_ms, new_ms = [], []
+    for _ in range(30):
+        t0 = time.perf_counter()
+        old = old_beep()
+        old_ms.append((time.perf_counter() - t0) * 1000.0)
+        t0 = time.perf_counter()
+        bank.play('start_task')
+        new_ms.append((time.perf_counter() - t0) * 1000.0)
+    # Stereo samples into the mono mixer played twice as long (and an octave low)
+    assert abs(old.get_length() - 0.44) < 0.005 and abs(sounds['start_task'].get_length() - 0.22) < 0.005
+    assert np.median(new_ms) < np.median(old_ms), (new_ms, old_ms)
+    print(f"  ✓ {len(sounds)} cues rendered once in {bank.render_ms:.1f} ms; play() median "
+          f"{np.median(new_ms) * 1000:.0f} µs vs {np.median(old_ms) * 1000:.0f} µs synthesize-per-beep")
+
+    try:
+        bank.play('no_such_cue')
+        raise AssertionError("unknown cue accepted")
+    except KeyError:
+        pass
+    assert bank.play_tone(800, 200) and bank._tones[(800, 200)] is not None
+    tone = bank._tones[(800, 200)]
+    bank.play_tone(800, 200)
+    assert bank._tones[(800, 200)] is tone
+
+
+def test_timestamps():
+    ticks = iter([100.0, 100.002, 101.5, 101.5004, 103.0, 103.001])
+    bank = CueBank(clock=lambda: next(ticks))
+    bank.buffer_samples = 512
+    first = bank.play('phase_transition', marker_time=99.999, marker={'phase': 'task', 'task': 'mental_math'})
+    assert first['requested'] == 100.0 and first['played'] == 100.002
+    assert abs(first['marker_to_cue_ms'] - 3.0) < 1e-6 and first['marker']['task'] == 'mental_math'
+    bank.play('phase_transition', marker_time=101.5)
+    bank.play('end_task')  # no marker: logged, not in the offset stats
+    stats = bank.latency_stats()
+    assert stats['cues'] == 3 and stats['with_marker'] == 2, stats
+    assert abs(stats['max_ms'] - 3.0) < 1e-6 and abs(stats['play_call_max_ms'] - 2.0) < 1e-6
+    assert bank.summary_line().startswith("Cues: 3 | marker->cue p50")
+
+    # End cues and stale markers (phase not started yet / long over) carry no offset
+    ticks = iter([200.0, 200.001, 230.0, 230.001])
+    other = CueBank(clock=lambda: next(ticks))
+    end = other.play('phase_complete', marker_time=170.0)
+    stale = other.play('start_task', marker_time=212.0)
+    assert 'marker_to_cue_ms' not in end and 'marker_to_cue_ms' not in stale
+    assert other.latency_stats()['with_marker'] == 0
+    print(f"  ✓ requested / played logged per cue; {bank.summary_line()}")
+
+
+def test_attach_cues():
+    markers = [
+        {'phase': 'eyes_closed', 'task': None, 'start': 0.0, 'end': 60.0},
+        {'phase': 'task', 'task': 'mental_math', 'start': 65.0, 'end': 125.0},
+        {'phase': 'task', 'task': 'emotion_face', 'start': 200.0, 'end': None},
+    ]
+    cues = [
+        {'cue': 'start_calibration', 'time': 0.012},
+        {'cue': 'end_calibration', 'time': 60.004},
+        {'cue': 'start_task', 'time': 65.031},
+        {'cue': 'end_task', 'time': 125.002},
+        {'cue': 'start_task', 'time': 203.0},  # too far from any boundary
+    ]
+    assert attach_cues(markers, cues) == 4
+    assert markers[0]['start_cue'] == 'start_calibration' and markers[0]['start_cue_ms'] == 12.0
+    assert markers[1]['start_cue_ms'] == 31.0 and markers[1]['end_cue'] == 'end_task'
+    assert 'start_cue' not in markers[2] and 'end_cue' not in markers[2]
+    assert attach_cues(markers, []) == 0
+    short = [{'phase': 'eyes_open', 'task': None, 'start': 10.0, 'end': 10.4}]
+    assert attach_cues(short, [{'cue': 'start_calibration', 'time': 10.01}]) == 1 and 'end_cue' not in short[0]
+    print("  ✓ start_cue_ms / end_cue_ms written next to the phase markers (1 s window)")
+
+
+def main():
+    print("=" * 60)
+    print("AUDIO CUE BANK TEST")
+    print("=" * 60)
+    test_render()
+    test_load_and_play()
+    test_timestamps()
+    test_attach_cues()
+    print("\n✓ All audio cue tests passed")
+
+
+if __name__ == "__main__":
+    main()
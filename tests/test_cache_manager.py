@@ -0,0 +1,79 @@
+"""
+Test the shared, byte-bounded engine caches
+
+Content fingerprints for the key types the engines use (arrays, DataFrames,
+Series, nested feature lists), LRU eviction across caches sharing one cap,
+and the hit / miss / eviction counters.
+
+Usage:
+    cd tests
+    python test_cache_manager.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_manager import CacheManager, fingerprint
+
+
+def test_fingerprint():
+    frame = pd.DataFrame({'alpha': [1.0, 2.0, 3.0], 'theta': [0.5, 0.25, 0.125]})
+    series = pd.Series([1.0, 2.0, 3.0], name='alpha')
+    fp_frame = fingerprint(frame)
+    fp_series = fingerprint(series)
+    assert len(fp_frame) == 16 and len(fp_series) == 16
+    # Same content, new objects -> same key; changed values, columns or name -> new key
+    assert fingerprint(frame.copy()) == fp_frame
+    assert fingerprint(series.copy()) == fp_series
+    changed = frame.copy()
+    changed.loc[1, 'theta'] = 0.3
+    assert fingerprint(changed) != fp_frame
+    assert fingerprint(frame.rename(columns={'theta': 'beta'})) != fp_frame
+    assert fingerprint(series.rename('theta')) != fp_series
+    assert fp_series != fingerprint(frame[['alpha']])
+
+    arr = np.arange(12, dtype=float).reshape(3, 4)
+    assert fingerprint(arr) == fingerprint(arr.copy()) != fingerprint(arr.reshape(4, 3))
+    features = [{'alpha': 1.0, 'theta': 2.0}, {'theta': 2.0, 'alpha': 1.0}]
+    assert fingerprint(features[:1]) == fingerprint(features[1:])
+    assert fingerprint(frame, 'spearman') != fingerprint(frame, 'pearson')
+    print("  ✓ DataFrame / Series / array / feature-list fingerprints follow content, not identity")
+
+
+def test_shared_cap():
+    manager = CacheManager(max_bytes=3000)
+    blocks = manager.cache('blocks')
+    corr = manager.cache('corr')
+    blocks.put('a', np.zeros(100))  # 800 bytes each
+    blocks.put('b', np.zeros(100))
+    corr.put('c', np.zeros(100))
+    assert blocks.get('a') is not None  # 'a' is now the most recent
+    corr.put('d', np.zeros(100))  # over the cap: evicts 'b' (least recently used overall)
+    assert 'b' not in blocks and 'a' in blocks and 'c' in corr and 'd' in corr
+    assert manager.total_bytes <= manager.max_bytes
+    assert blocks.get('b') is None
+    stats = manager.stats()['caches']
+    assert stats['blocks']['hits'] == 1 and stats['blocks']['misses'] == 1 and stats['blocks']['evictions'] == 1
+    corr.put('huge', np.zeros(1000))  # larger than the whole cap: not stored
+    assert 'huge' not in corr and 'c' in corr
+    manager.clear()
+    assert manager.total_bytes == 0
+    print(f"  ✓ LRU across caches under one cap; {manager.summary_line()}")
+
+
+def main():
+    print("=" * 60)
+    print("CACHE MANAGER TEST")
+    print("=" * 60)
+    test_fingerprint()
+    test_shared_cap()
+    print("\n✓ All cache manager tests passed")
+
+
+if __name__ == "__main__":
+    main()
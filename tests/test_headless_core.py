@@ -0,0 +1,194 @@
+"""
+Test the Qt-free analysis core and the brainlink-analyze batch CLI
+
+Imports brainlink_core (engines, config, statistics, report) and the
+offline 64-channel engine and checks that neither PySide6 nor pyqtgraph
+was loaded, and that pandas and SciPy stay unloaded until first use
+(lazy imports). Then runs the CLI on a short synthetic MindLink recording
+with phase markers and checks the text report and JSON results. The
+engine's windows must not depend on how samples are batched, and the
+"auto" permutation plan is made once per session.
+
+Usage:
+    cd tests
+    python test_headless_core.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+os.environ.setdefault('BL_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('BL_LATENCY', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QT_MODULES = ('PySide6', 'pyqtgraph', 'BrainLinkAnalyzer_GUI')
+DEFERRED_MODULES = ('pandas', 'scipy.stats', 'scipy.signal')
+
+
+def test_no_qt_imports():
+    import brainlink_core
+    from brainlink_core import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+    from brainlink_core import report
+    from antNeuro.offline_multichannel_analysis import BASE_ENGINE_AVAILABLE
+    assert BASE_ENGINE_AVAILABLE, "offline engine could not import the core engine"
+    engine = EnhancedFeatureAnalysisEngine(config=EnhancedAnalyzerConfig())
+    assert engine.fs == brainlink_core.FS
+    assert callable(report.multi_task_report_lines)
+    loaded = sorted(m for m in sys.modules if m.split('.')[0] in QT_MODULES)
+    assert not loaded, f"GUI modules imported by the headless core: {loaded}"
+    print("  ✓ brainlink_core and the offline engine import without Qt")
+
+
+def test_lazy_imports():
+    # Fresh interpreter: this process has already loaded the engines
+    code = ("import sys, brainlink_core, utils.result_cache, utils.multichannel_quality; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ, BL_LAZY_IMPORTS='1')
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    loaded = out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ''
+    assert not loaded, f"analysis-only modules imported eagerly: {loaded}"
+
+    from brainlink_core import engine
+    from brainlink_core.dsp import welch
+    assert engine.pd.DataFrame([{'a': 1.0}]).shape == (1, 1)
+    freqs, _ = welch(np.zeros(256), fs=512, nperseg=256)
+    assert freqs.size == 129
+    print("  ✓ pandas and SciPy are imported on first use")
+
+
+def test_window_hop():
+    from brainlink_core import EnhancedFeatureAnalysisEngine
+    fs = 512
+    signal = 20.0 * np.sin(2 * np.pi * 10.0 * np.arange(fs * 10) / fs) + np.random.default_rng(3).standard_normal(fs * 10)
+    runs = {}
+    # Per-sample delivery, BL_RAW_BATCH-sized batches, and irregular batches (stale flushes)
+    for name, sizes in (('per-sample', [1]), ('batch 16', [16]), ('irregular', [16, 3, 16, 1, 9, 700])):
+        engine = EnhancedFeatureAnalysisEngine()
+        engine.sample_clock = lambda n: n / float(fs)
+        engine.start_calibration_phase('eyes_open')
+        i = k = 0
+        while i < signal.size:
+            step = sizes[k % len(sizes)]
+            engine.add_data(signal[i:i + step])
+            i += step
+            k += 1
+        runs[name] = engine.calibration_data['eyes_open']
+    expected = (signal.size - engine.window_samples) // engine.step_samples + 1
+    reference = runs['per-sample']
+    assert len(reference['features']) == expected, (len(reference['features']), expected)
+    for name, store in runs.items():
+        assert store['timestamps'] == reference['timestamps'], name
+        assert [f['alpha_power'] for f in store['features']] == [f['alpha_power'] for f in reference['features']], name
+    print(f"  ✓ {expected} windows, hop {engine.step_samples} samples, whatever the add_data batch size")
+
+
+def test_session_permutation_plan():
+    from brainlink_core import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+    fs = 512
+    rng = np.random.default_rng(5)
+    config = EnhancedAnalyzerConfig(runtime_preset='auto', analysis_budget_s=3.0, seed=3, result_cache=False,
+                                    perm_mode='sequential', perm_h=1)
+    engine = EnhancedFeatureAnalysisEngine(config=config)
+    engine.expected_tasks = 2
+    engine.enable_pipelined_analysis()
+    offset = 0
+    for phase, task, freq in (('eyes_closed', None, 10.0), ('eyes_open', None, 10.0),
+                              ('task', 'mental_math', 20.0), ('task', 'working_memory', 6.0)):
+        signal = 20.0 * np.sin(2 * np.pi * freq * np.arange(fs * 24) / fs) + 5.0 * rng.standard_normal(fs * 24)
+        engine.start_calibration_phase(phase, task_type=task)
+        engine.sample_clock = lambda n, offset=offset: (offset + n) / float(fs)
+        engine.add_data(signal)
+        engine.stop_calibration_phase()
+        offset += signal.size
+    plan = dict(engine.permutation_plan)
+    # Planned once, on the first background task, for both tasks plus the combined step
+    assert plan['runs'] == 3, plan
+    engine.compute_baseline_statistics()
+    results = engine.analyze_all_tasks_data()
+    assert engine.permutation_plan == plan
+    n_perms = {name: entry['summary']['permutation']['n_perm'] for name, entry in results['per_task'].items()}
+    assert set(n_perms.values()) == {plan['n_perm']}, (n_perms, plan['n_perm'])
+
+    # A sequential benchmark that stops after 2 of 8 trials is timed per permutation run
+    def stopped_early(blocks, n_perm):
+        time.sleep(0.02)
+        return None, None, True, None, {'n_perm_used': 2}
+    engine._perm_benchmark_cache.clear()
+    engine._permutation_sum_p_blocks = stopped_early
+    assert engine._benchmark_block_permutation(4, 4, trials=8) >= 0.009
+    print(f"  ✓ one permutation plan per session: n_perm={plan['n_perm']} for {sorted(n_perms)}")
+
+
+def test_result_cache_seed(directory):
+    from brainlink_core import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+    engine = EnhancedFeatureAnalysisEngine(config=EnhancedAnalyzerConfig(result_cache_dir=directory))
+    assert engine.config.seed is None and engine._result_cache().directory == directory
+    # One seed per session: every permutation run draws from the same stream
+    seed = engine._permutation_seed()
+    assert engine._permutation_seed() == seed
+    assert engine._get_rng().random() == engine._get_rng().random()
+    engine._restore_cached_results({'multi_task_results': {}, 'seed': seed + 1})
+    assert engine._permutation_seed() == seed + 1
+    engine.reset_session()
+    assert engine.session_seed is None
+    disabled = EnhancedFeatureAnalysisEngine(config=EnhancedAnalyzerConfig(result_cache=False))
+    assert disabled._result_cache() is None
+    print("  ✓ unseeded runs are cached with their session seed; only --no-result-cache bypasses")
+
+
+def test_cli(directory):
+    from brainlink_core.analyze import main
+    fs = 512
+    rng = np.random.default_rng(11)
+    t = np.arange(fs * 60) / fs
+    signal = 20.0 * np.sin(2 * np.pi * 10.0 * t) + 5.0 * rng.standard_normal(t.size)
+    task = slice(fs * 36, fs * 60)
+    signal[task] = 8.0 * np.sin(2 * np.pi * 20.0 * t[task]) + 5.0 * rng.standard_normal(task.stop - task.start)
+    path = os.path.join(directory, "mindlink.npy")
+    np.save(path, signal)
+    with open(os.path.join(directory, "mindlink_markers.json"), 'w') as fh:
+        json.dump([
+            {'phase': 'eyes_closed', 'task': None, 'start': 0.0, 'end': 24.0},
+            {'phase': 'eyes_open', 'task': None, 'start': 24.0, 'end': 32.0},
+            {'phase': 'task', 'task': 'mental_math', 'phase_type': 'cue', 'record': False, 'start': 32.0, 'end': 36.0},
+            {'phase': 'task', 'task': 'mental_math', 'start': 36.0, 'end': 60.0},
+        ], fh)
+
+    out_dir = os.path.join(directory, "reports")
+    code = main([path, '--output-dir', out_dir, '--perm-preset', 'ultrafast', '--seed', '7', '--no-result-cache'])
+    assert code == 0, code
+    with open(os.path.join(out_dir, "mindlink_report.txt"), encoding='utf-8') as fh:
+        report = fh.read()
+    assert report.startswith("MindLink Enhanced Multi-Task Analysis Report"), report[:80]
+    assert "[mental_math]" in report
+    with open(os.path.join(out_dir, "mindlink_results.json"), encoding='utf-8') as fh:
+        results = json.load(fh)
+    assert results['pipeline'] == 'mindlink' and results['sample_rate'] == fs
+    assert list(results['multi_task_results']['per_task']) == ['mental_math']
+    print("  ✓ brainlink-analyze wrote the multi-task report and results")
+
+
+def main():
+    print("=" * 60)
+    print("HEADLESS CORE TEST")
+    print("=" * 60)
+    test_no_qt_imports()
+    test_lazy_imports()
+    test_window_hop()
+    test_session_permutation_plan()
+    with tempfile.TemporaryDirectory() as directory:
+        test_result_cache_seed(directory)
+        test_cli(directory)
+    print("\n✓ All headless core tests passed")
+
+
+if __name__ == "__main__":
+    main()
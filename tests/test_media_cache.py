@@ -0,0 +1,131 @@
+"""
+Test the decoded, pre-scaled task media cache
+
+Uses the real task images in assets/: the names each task's
+phase_structure needs, phase-transition time with the old load path
+(QPixmap(path) + scaled on the GUI thread) vs a prefetched cache hit,
+waiting on an in-flight prefetch instead of decoding twice, cover/fit/width
+scaling sizes and the byte-bounded LRU.
+
+Usage:
+    cd tests
+    python test_media_cache.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('BL_LOG_LEVEL', 'ERROR')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QPixmap
+
+from brainlink_core.dsp import AVAILABLE_TASKS
+from utils.media_cache import MediaCache, default_resolver, task_media_names
+
+BOX = (1500, 640)  # Media label on a 1920x1080 screen
+FULLSCREEN = (1920, 1080)
+
+
+def old_phase_load(name):
+    """The previous _set_image path: decode and scale at the phase transition."""
+    pm = QPixmap(default_resolver(name))
+    return pm.scaled(BOX[0], BOX[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def test_task_media_names():
+    assert task_media_names(AVAILABLE_TASKS['emotion_face']) == [f"emo_face_0{i}.png" for i in range(1, 7)]
+    assert task_media_names(AVAILABLE_TASKS['num_form']) == ['NUM_FORM.png']
+    assert task_media_names(AVAILABLE_TASKS['curiosity']) == []  # video only
+    assert task_media_names(AVAILABLE_TASKS['visual_imagery']) == []
+    phases = AVAILABLE_TASKS['emotion_face']['phase_structure']
+    viewing = next(p for p in phases if p.get('type') == 'viewing')
+    assert task_media_names(AVAILABLE_TASKS['emotion_face'], [viewing]) == [
+        AVAILABLE_TASKS['emotion_face']['media']['images'][viewing['media_index']]]
+    print("  ✓ phase_structure -> image assets (emotion_face, num_form, video-only curiosity)")
+
+
+def test_phase_transitions():
+    names = task_media_names(AVAILABLE_TASKS['emotion_face']) + ['NUM_FORM.png']
+    old_ms = []
+    for name in names:
+        t0 = time.perf_counter()
+        assert not old_phase_load(name).isNull()
+        old_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    cache = MediaCache(max_bytes=256 * 1024 * 1024)
+    cache.prefetch(names, fit=BOX)
+    assert cache.wait(60)
+    new_ms = []
+    for name in names:
+        t0 = time.perf_counter()
+        pm = cache.pixmap(name, *BOX)
+        new_ms.append((time.perf_counter() - t0) * 1000.0)
+        expected = old_phase_load(name)
+        assert (pm.width(), pm.height()) == (expected.width(), expected.height()), name
+    stats = cache.stats()
+    assert stats['misses'] == 0 and stats['hits'] == len(names), stats
+    assert max(new_ms) < max(old_ms) / 4, (new_ms, old_ms)
+    print(f"  ✓ phase transition worst case {max(old_ms):.0f} ms decode+scale -> {max(new_ms):.1f} ms prefetched "
+          f"({len(names)} images, cache {stats['bytes'] / 2**20:.0f} MB)")
+
+    # Second lookup reuses the converted QPixmap
+    assert cache.pixmap(names[0], *BOX).cacheKey() == cache.pixmap(names[0], *BOX).cacheKey()
+    cache.shutdown()
+
+
+def test_inflight_and_modes():
+    cache = MediaCache()
+    cache.prefetch(['ORDER_SURPRISE.png'], cover=FULLSCREEN)
+    image = cache.image('ORDER_SURPRISE.png', *FULLSCREEN, mode='cover')
+    assert (image.width(), image.height()) == FULLSCREEN
+    stats = cache.stats()
+    assert stats['misses'] == 0 and stats['waits'] + stats['hits'] == 1, stats
+
+    odd = cache.image('emo_face_02.png', 1000, 300, mode='cover')  # portrait image into a wide box
+    assert (odd.width(), odd.height()) == (1000, 300)
+    fit = cache.image('emo_face_02.png', 1000, 300, mode='fit')
+    assert fit.height() == 300 and fit.width() == 200
+    narrow = cache.image('onoffinstructions.jpg', 167, mode='width')
+    assert narrow.width() == 167
+    assert cache.stats()['misses'] == 3
+    cache.shutdown()
+    print("  ✓ lookup waits for the in-flight prefetch; cover / fit / width sizes")
+
+
+def test_lru_bound():
+    names = task_media_names(AVAILABLE_TASKS['emotion_face'])
+    limit = 12 * 1024 * 1024
+    cache = MediaCache(max_bytes=limit)
+    for name in names:
+        cache.image(name, *BOX)
+    stats = cache.stats()
+    assert stats['bytes'] <= limit and stats['evictions'] > 0, stats
+    # Most recent image is still cached
+    hits = stats['hits']
+    cache.image(names[-1], *BOX)
+    assert cache.stats()['hits'] == hits + 1
+
+    off = MediaCache(enabled=False)
+    assert off.prefetch(names, fit=BOX) == 0
+    assert not off.image(names[0], *BOX).isNull() and off.stats()['entries'] == 0
+    print(f"  ✓ LRU stays under {limit / 2**20:.0f} MB ({stats['evictions']} evictions); BL_MEDIA_CACHE=0 caches nothing")
+
+
+def main():
+    print("=" * 60)
+    print("MEDIA CACHE TEST")
+    print("=" * 60)
+    QGuiApplication.instance() or QGuiApplication([])
+    test_task_media_names()
+    test_phase_transitions()
+    test_inflight_and_modes()
+    test_lru_bound()
+    print("\n✓ All media cache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Test the non-blocking batched metrics uploader against a local stub
+
+Checks that submit() never waits on the network, that the default is the
+legacy one-dict-per-request format, that opted-in ticks are sent in
+gzip-compressed batches over one keep-alive connection, that a slow or
+failing backend is coalesced to the latest tick with consistent
+sent/queued/dropped counters, and that a backend rejecting batches (even
+with a 500) gets the legacy format.
+
+Usage:
+    cd tests
+    python test_metrics_uploader.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault('BL_LOG_LEVEL', 'ERROR')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api_server import API_PREFIX, STUB_TOKEN, StubApiServer
+from utils.metrics_uploader import MetricsUploader
+
+HEADERS = {"X-Authorization": f"Bearer {STUB_TOKEN}"}
+METRICS_PATH = f"{API_PREFIX}/brainlink_data"
+
+
+def tick_payload(i):
+    rng = np.random.default_rng(i)
+    powers = rng.uniform(1.0, 100.0, 6)
+    return {
+        'Total variance (power)': float(powers[0]),
+        'Delta power': float(powers[1]),
+        'Theta power': float(powers[2]),
+        'Theta contribution': float(powers[2] / powers[0]),
+        'Theta relative': float(powers[2] / powers[0] / 100),
+        'Theta SNR broad': float('nan'),
+        'Theta SNR peak': float(rng.uniform(0, 3)),
+        'Alpha power': float(powers[3]),
+        'Beta power': float(powers[4]),
+        'Gamma power': float(powers[5]),
+        'tick': i,
+    }
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_default_format():
+    with StubApiServer() as server:
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS).start()
+        assert not uploader.batched and not uploader.compress
+        for i in range(3):
+            uploader.submit(tick_payload(i))
+        assert wait_for(lambda: uploader.sent == 3), uploader.stats()
+        assert server.hits[METRICS_PATH] == 3
+        assert [m['tick'] for m in server.metrics] == [0, 1, 2]
+        assert all('timestamp' not in m for m in server.metrics), "legacy payload changed"
+        assert server.bytes_received == uploader.bytes_raw, "default upload was compressed"
+        uploader.stop()
+    print("  ✓ default: one uncompressed tick object per request, as before")
+
+
+def test_batches():
+    with StubApiServer() as server:
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS, batch_size=5, flush_s=0.5,
+                                   compress=True).start()
+        for i in range(23):
+            uploader.submit(tick_payload(i))
+        assert wait_for(lambda: uploader.sent == 20), uploader.stats()
+        assert uploader.stats()['queued'] == 3
+        assert wait_for(lambda: uploader.sent == 23), "partial batch not flushed after flush_s"
+        stats = uploader.stats()
+        assert [m['tick'] for m in server.metrics] == list(range(23))
+        assert all('timestamp' in m for m in server.metrics)
+        assert server.hits[METRICS_PATH] == stats['batches'] == 5, (server.hits, stats)
+        assert server.connections == 1, server.connections
+        assert server.bytes_received < uploader.bytes_raw * 0.6, (server.bytes_received, uploader.bytes_raw)
+        uploader.stop()
+        print(f"  ✓ 23 ticks in {stats['batches']} requests over 1 connection, "
+              f"gzip {stats['compression']:.0%} of raw JSON")
+
+
+def test_submit_never_blocks():
+    delay_s = 0.5
+    with StubApiServer(delay_s=delay_s) as server:
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS, batch_size=1, flush_s=0.0, slow_s=0.2).start()
+        worst = 0.0
+        submitted = 40
+        for i in range(submitted):
+            t0 = time.perf_counter()
+            uploader.submit(tick_payload(i))
+            worst = max(worst, time.perf_counter() - t0)
+            time.sleep(0.02)
+        # A blocking submit would wait out the backend delay; allow for GIL/scheduler jitter
+        assert worst < delay_s / 10, f"submit blocked for {worst * 1000:.1f} ms"
+        uploader.stop(flush_timeout=3.0)
+        stats = uploader.stats()
+        assert stats['dropped'] > 0, stats  # slow backend: coalesced to latest
+        assert stats['sent'] + stats['dropped'] + stats['queued'] == submitted, stats
+        assert server.metrics[-1]['tick'] == submitted - 1, "latest tick was not kept"
+        print(f"  ✓ submit worst case {worst * 1000:.2f} ms with a 500 ms backend; "
+              f"sent {stats['sent']}, dropped {stats['dropped']} (coalesced to latest)")
+
+
+def test_failures_and_legacy_format():
+    with StubApiServer() as server:
+        server.fail[METRICS_PATH] = [503, 503]
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS, flush_s=0.05).start()
+        for i in range(3):
+            uploader.submit(tick_payload(i))
+        assert wait_for(lambda: uploader.sent >= 1), uploader.stats()
+        stats = uploader.stats()
+        assert stats['failed_requests'] == 2 and stats['sent'] + stats['dropped'] == 3, stats
+        assert server.metrics[-1]['tick'] == 2
+        uploader.stop()
+
+    with StubApiServer() as server:
+        def single_only(body, headers):
+            if isinstance(body, list):
+                return 400, {'error': 'expected an object'}
+            server.metrics.append(body)
+            return 200, {}
+
+        server.routes[('POST', METRICS_PATH)] = single_only
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS, batch_size=4, flush_s=0.05).start()
+        for i in range(4):
+            uploader.submit(tick_payload(i))
+        assert wait_for(lambda: uploader.sent == 4), uploader.stats()
+        assert not uploader.batched
+        assert [m['tick'] for m in server.metrics] == [0, 1, 2, 3]
+        assert all('timestamp' not in m for m in server.metrics), "legacy payload changed"
+        assert uploader.status_text().startswith("Upload: sent 4 | queued 0 | dropped 0")
+        uploader.stop()
+
+    with StubApiServer() as server:
+        def crashes_on_list(body, headers):
+            if isinstance(body, list):
+                return 500, {'error': "'list' object has no attribute 'get'"}
+            server.metrics.append(body)
+            return 200, {}
+
+        server.routes[('POST', METRICS_PATH)] = crashes_on_list
+        uploader = MetricsUploader(server.metrics_url, headers=HEADERS, batch_size=4, flush_s=0.05,
+                                   compress=True).start()
+        for i in range(4):
+            uploader.submit(tick_payload(i))
+        assert wait_for(lambda: uploader.sent == 4), uploader.stats()
+        assert not uploader.batched and uploader.stats()['dropped'] == 0
+        assert [m['tick'] for m in server.metrics] == [0, 1, 2, 3]
+        uploader.stop()
+    print("  ✓ 5xx retried with backoff; backend rejecting the first batch (4xx or 500) gets the legacy format")
+
+
+def main():
+    print("=" * 60)
+    print("METRICS UPLOADER TEST")
+    print("=" * 60)
+    test_default_format()
+    test_batches()
+    test_submit_never_blocks()
+    test_failures_and_legacy_format()
+    print("\n✓ All metrics uploader tests passed")
+
+
+if __name__ == "__main__":
+    main()
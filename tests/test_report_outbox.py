@@ -0,0 +1,213 @@
+"""
+Test the durable report-seeding outbox against a local stub
+
+Checks that enqueue() returns without waiting on the network, that the
+spool is gzip-compressed and keyed by a content hash (sent as the
+Idempotency-Key, so the same report is not seeded twice), that a report
+queued while the server is down is delivered by a new outbox after a
+"restart", how 5xx / 401 / 4xx responses are handled, that a spooled report
+is only sent for the login that queued it, and re-queueing a rejected one.
+
+Usage:
+    cd tests
+    python test_report_outbox.py
+"""
+
+import base64
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('BL_LOG_LEVEL', 'ERROR')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api_server import API_PREFIX, STUB_TOKEN, StubApiServer
+from utils.report_outbox import ReportOutbox, content_hash, owner_id
+
+SEED_PATH = f"{API_PREFIX}/eeg-reports/seed"
+
+
+def report_payload(email="stub@example.com", session="session_1", lines=400):
+    text = "\n".join(f"Task {i % 6}: theta {i * 0.37:.2f} alpha {i * 0.11:.2f} — within normal range"
+                     for i in range(lines))
+    return {
+        "email": email,
+        "report_text": base64.b64encode(text.encode('utf-8')).decode('utf-8'),
+        "is_base64": True,
+        "protocol_type": "initial",
+        "partner_id": 1,
+        "session_id": session,
+        "generation_meta": {"generated_at": time.time(), "task_count": 6},
+    }
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def spool_files(spool, sub):
+    return sorted(glob.glob(os.path.join(spool, sub, '*.json.gz')))
+
+
+def test_enqueue_and_idempotency(spool):
+    events = []
+    with StubApiServer(delay_s=0.5) as server:
+        outbox = ReportOutbox(spool, token_fn=lambda: STUB_TOKEN, on_event=events.append).start()
+        payload = report_payload()
+        t0 = time.perf_counter()
+        entry = outbox.enqueue(server.seed_url, payload)
+        enqueue_ms = (time.perf_counter() - t0) * 1000.0
+        assert enqueue_ms < 100.0, f"enqueue blocked for {enqueue_ms:.0f} ms"
+        assert not entry.duplicate and spool_files(spool, 'pending')
+        raw_kb = len(payload['report_text']) / 1024
+        spool_kb = os.path.getsize(spool_files(spool, 'pending')[0]) / 1024
+        assert spool_kb < raw_kb * 0.5, (spool_kb, raw_kb)
+
+        # Same report, new session id / timestamp: still one upload
+        again = outbox.enqueue(server.seed_url, report_payload(session="session_2"))
+        assert again.duplicate and again.id == entry.id
+        assert wait_for(lambda: outbox.sent_this_run == 1)
+        assert server.reports[0][0] == entry.id == content_hash(server.seed_url, payload)
+        assert server.reports[0][1] == payload, "payload changed on the wire"
+        assert [e['kind'] for e in events] == ['queued', 'sent'], events
+        assert events[-1]['response']['report_id'] == 1
+        assert spool_files(spool, 'sent') and not spool_files(spool, 'pending')
+        assert outbox.enqueue(server.seed_url, payload).status == 'sent'
+        assert outbox.status_text() == "Outbox: ✓ 1 sent"
+        time.sleep(0.1)
+        assert len(server.reports) == 1
+        outbox.stop()
+    print(f"  ✓ enqueue {enqueue_ms:.1f} ms with a 500 ms server; spool {spool_kb:.1f} KB gzip "
+          f"vs {raw_kb:.1f} KB base64; duplicate report sent once")
+
+
+def test_survives_restart(spool):
+    with StubApiServer() as server:
+        dead_url = server.seed_url
+    # Server down: the report stays in the spool with its attempt count
+    events = []
+    outbox = ReportOutbox(spool, token_fn=lambda: STUB_TOKEN, on_event=events.append).start()
+    entry = outbox.enqueue(dead_url, report_payload(email="down@example.com"))
+    assert wait_for(lambda: any(e['kind'] == 'retry' for e in events))
+    outbox.stop()
+    reloaded = ReportOutbox(spool).pending()
+    assert [(e.id, e.attempts) for e in reloaded] == [(entry.id, 1)], reloaded
+    for path in glob.glob(os.path.join(spool, 'pending', '*')):
+        os.remove(path)
+
+    with StubApiServer() as server:
+        # Queued, then the app quits before anything was sent (no login yet)
+        token = []
+        outbox = ReportOutbox(spool, token_fn=lambda: token[0] if token else None).start()
+        outbox.enqueue(server.seed_url, report_payload(email="restart@example.com"))
+        time.sleep(0.2)
+        assert outbox.status_text() == "Outbox: 1 pending (waiting for login)"
+        outbox.stop()
+        assert not server.reports, "sent without a token"
+
+        outbox = ReportOutbox(spool, token_fn=lambda: token[0] if token else None).start()
+        assert len(outbox.pending()) == 1
+        token.append(STUB_TOKEN)
+        outbox.wake()
+        assert wait_for(lambda: len(server.reports) == 1)
+        assert server.reports[0][1]['email'] == "restart@example.com"
+        assert not outbox.pending() and spool_files(spool, 'sent')
+        outbox.stop()
+    print("  ✓ failed upload kept in the spool; pending report sent after restart and login")
+
+
+def test_status_handling(spool):
+    with StubApiServer() as server:
+        events = []
+        outbox = ReportOutbox(spool, token_fn=lambda: STUB_TOKEN, on_event=events.append).start()
+        server.fail[SEED_PATH] = [503]
+        entry = outbox.enqueue(server.seed_url, report_payload(email="retry@example.com"))
+        assert wait_for(lambda: any(e['kind'] == 'retry' for e in events))
+        assert events[-1]['last_error'] == "status 503" and events[-1]['attempts'] == 1
+        outbox.wake()
+        assert wait_for(lambda: len(server.reports) == 1)
+        assert server.reports[0][0] == entry.id
+
+        server.fail[SEED_PATH] = [401]
+        events.clear()
+        outbox.enqueue(server.seed_url, report_payload(email="auth@example.com"))
+        assert wait_for(lambda: any(e['kind'] == 'retry' for e in events))
+        assert "login" in events[-1]['last_error'] and events[-1]['next_attempt'] > time.time() + 20
+        outbox.wake()
+        assert wait_for(lambda: len(server.reports) == 2)
+
+        events.clear()
+        rejected = outbox.enqueue(server.seed_url, report_payload(email=""))
+        assert wait_for(lambda: any(e['kind'] == 'failed' for e in events))
+        assert events[-1]['last_error'].startswith("status 400")
+        assert os.path.exists(os.path.join(spool, 'failed', rejected.id + '.json.gz'))
+        assert not outbox.pending() and len(server.reports) == 2
+        assert outbox.enqueue(server.seed_url, report_payload(email="")).status == 'failed'
+        outbox.stop()
+    print("  ✓ 5xx retried, 401 waits for a new login, 4xx moved to failed/")
+
+
+def test_owner_and_requeue(spool):
+    with StubApiServer() as server:
+        login = {'owner': owner_id("operator.a@clinic.example")}
+        outbox = ReportOutbox(spool, token_fn=lambda: STUB_TOKEN, owner_fn=lambda: login['owner'])
+        entry = outbox.enqueue(server.seed_url, report_payload(email="client.a@example.com"))
+        outbox.stop()
+        assert entry.owner == login['owner'] and entry.owner != owner_id("operator.b@clinic.example")
+
+        # Next start, another operator logs in: operator A's report is not seeded with B's token
+        login['owner'] = owner_id("Operator.B@clinic.example ")
+        outbox = ReportOutbox(spool, token_fn=lambda: STUB_TOKEN, owner_fn=lambda: login['owner']).start()
+        mine = outbox.enqueue(server.seed_url, report_payload(email="client.b@example.com"))
+        assert wait_for(lambda: len(server.reports) == 1)
+        time.sleep(0.2)
+        assert [r[0] for r in server.reports] == [mine.id], "sent a report queued by another login"
+        assert outbox.status_text() == "Outbox: 1 pending for another login"
+        login['owner'] = owner_id("operator.a@clinic.example")
+        outbox.wake()
+        assert wait_for(lambda: len(server.reports) == 2)
+        assert server.reports[1][0] == entry.id and not outbox.pending()
+
+        # Rejected report: seeding it again reports the stored error; requeue sends it again
+        events = []
+        outbox.on_event = events.append
+        server.fail[SEED_PATH] = [422]
+        rejected = outbox.enqueue(server.seed_url, report_payload(email="client.c@example.com"))
+        assert wait_for(lambda: any(e['kind'] == 'failed' for e in events))
+        again = outbox.enqueue(server.seed_url, report_payload(email="client.c@example.com", session="session_9"))
+        assert again.duplicate and again.status == 'failed' and again.last_error.startswith("status 422")
+        requeued = outbox.requeue(rejected.id)
+        assert requeued.status == 'pending' and requeued.attempts == 0
+        assert not os.path.exists(os.path.join(spool, 'failed', rejected.id + '.json.gz'))
+        assert wait_for(lambda: len(server.reports) == 3) and server.reports[2][0] == rejected.id
+        assert wait_for(lambda: not outbox.pending())
+        assert outbox.requeue(rejected.id) is None  # Delivered, nothing left in failed/
+        outbox.stop()
+    print("  ✓ reports only sent for the login that queued them; rejected report re-queued from failed/")
+
+
+def main():
+    print("=" * 60)
+    print("REPORT OUTBOX TEST")
+    print("=" * 60)
+    for test in (test_enqueue_and_idempotency, test_survives_restart, test_status_handling,
+                 test_owner_and_requeue):
+        spool = tempfile.mkdtemp(prefix="bl_outbox_")
+        try:
+            test(spool)
+        finally:
+            shutil.rmtree(spool, ignore_errors=True)
+    print("\n✓ All report outbox tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Test the session replay harness on a synthetic recording (no hardware needed)
+
+Writes a recording in the offline engine's format (session_*.csv plus
+markers_*.json), loads it back and replays it at max speed through the
+EDI2 callback into the 64-channel engine and, when the GUI module can be
+imported, through onRaw into the single-channel engine. Checks that phases
+are replayed in order and that every expected window is extracted.
+
+Usage:
+    cd tests
+    python test_session_replay.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('BL_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('BL_LATENCY', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.session_replay import SessionReplay, format_report, load_recording
+
+MARKERS = [
+    {'phase': 'eyes_closed', 'task': None, 'start': 1.0, 'end': 9.0},
+    {'phase': 'eyes_open', 'task': None, 'start': 10.0, 'end': 16.0},
+    {'phase': 'task', 'task': 'mental_math', 'phase_type': 'cue', 'record': False, 'start': 16.0, 'end': 17.0},
+    {'phase': 'task', 'task': 'mental_math', 'start': 17.0, 'end': 25.0},
+]
+
+
+def write_recording(directory, fs, n_channels, seconds=26):
+    rng = np.random.default_rng(7)
+    n = fs * seconds
+    t = np.arange(n) / fs
+    data = 10.0 * np.sin(2 * np.pi * 10.0 * t)[:, None] + 5.0 * rng.standard_normal((n, n_channels))
+    names = [f"E{i}" for i in range(n_channels)]
+    csv_path = os.path.join(directory, "session_20250101_120000_test_example_com.csv")
+    with open(csv_path, 'w', newline='') as fh:
+        fh.write(','.join(['timestamp', 'sample_index'] + names) + '\n')
+        for i in range(n):
+            fh.write(','.join([f"{t[i]:.6f}", str(i)] + [f"{v:.6f}" for v in data[i]]) + '\n')
+    with open(os.path.join(directory, "markers_20250101_120000_test_example_com.json"), 'w') as fh:
+        json.dump({'sample_rate': fs, 'channel_count': n_channels, 'channel_names': names,
+                   'phase_markers': MARKERS}, fh)
+    return csv_path, data
+
+
+def check_report(report, recording):
+    phases = [(p['phase'], p['task']) for p in report['phases']]
+    assert phases == [('eyes_closed', None), ('eyes_open', None), ('task', 'mental_math')], phases
+    assert report['samples'] == recording.n_samples
+    for p in report['phases']:
+        assert p['expected_windows'] > 0, p
+        assert p['windows'] == p['expected_windows'], p
+        assert p['missing_windows'] == 0, p
+    ec = report['phases'][0]
+    assert abs(ec['samples'] - 8 * recording.sample_rate) <= 1, ec
+
+
+def test_edi2_replay(directory):
+    from enhanced_multichannel_analysis import Enhanced64ChannelEngine
+    csv_path, data = write_recording(directory, fs=500, n_channels=8)
+    recording = load_recording(csv_path)
+    assert recording.n_channels == 8 and recording.sample_rate == 500
+    assert len(recording.phase_markers) == 4
+    assert np.allclose(recording.data, data, atol=1e-5)
+
+    engine = Enhanced64ChannelEngine(sample_rate=500, channel_count=8, channel_names=recording.channel_names)
+    report = SessionReplay(recording, engine, target='antneuro', speed=0).run()
+    print("\n".join(format_report(report)))
+    check_report(report, recording)
+    assert engine.feature_interval_s == 0.5, "live extraction interval not restored"
+    print("  ✓ EDI2 replay: phases and window counts match")
+
+
+def test_mindlink_replay(directory):
+    try:
+        import BrainLinkAnalyzer_GUI as BL
+    except ImportError as e:
+        print(f"  - MindLink replay skipped ({e})")
+        return
+    path = os.path.join(directory, "mindlink.npy")
+    fs = 512
+    t = np.arange(fs * 26) / fs
+    np.save(path, 20.0 * np.sin(2 * np.pi * 10.0 * t) + np.random.default_rng(3).standard_normal(t.size))
+    markers = os.path.join(directory, "mindlink_markers.json")
+    with open(markers, 'w') as fh:
+        json.dump(MARKERS, fh)
+    recording = load_recording(path)
+    assert recording.n_channels == 1 and recording.sample_rate == fs
+
+    engine = BL.FeatureAnalysisEngine()
+    report = SessionReplay(recording, engine, target='mindlink', speed=0).run()
+    print("\n".join(format_report(report)))
+    check_report(report, recording)
+    assert getattr(BL.onRaw, 'feature_engine', None) is not engine, "onRaw consumer not restored"
+    print("  ✓ MindLink replay: phases and window counts match")
+
+
+def main():
+    print("=" * 60)
+    print("SESSION REPLAY TEST")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as directory:
+        test_edi2_replay(directory)
+    with tempfile.TemporaryDirectory() as directory:
+        test_mindlink_replay(directory)
+    print("\n✓ All session replay tests passed")
+
+
+if __name__ == "__main__":
+    main()
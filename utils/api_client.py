@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client for the Mindspeller login and device-authorization API.
+
+One ``requests.Session`` per API base keeps TLS connections alive between
+calls: the login POST, and then user data, partners list and authorized
+HWIDs, which are fetched in parallel once the JWT arrives.
+
+    client = get_client("https://en.mindspeller.com/api/cas/token/login")
+    result = client.login_and_fetch(username, password)
+    result.jwt_token, result.user_data, result.partners, result.hwids
+
+Transient failures (connection errors, timeouts, 429/502/503/504) are
+retried up to ``BL_API_RETRIES`` times (default 2) with full-jitter
+exponential backoff. The login POST is only retried when the connection
+failed before the request was sent. A proxy error switches the client to
+a direct session (no environment proxies) for the rest of the run.
+
+Qt-free; the GUI runs ``login_and_fetch`` on a worker thread and receives
+the result through Qt signals. Requests are logged under the ``api``
+category; credentials and tokens are never logged.
+
+Author: BrainLink Companion Team
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from utils.bl_log import get_logger
+
+api_log = get_logger("api")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+API_RETRIES = _env_int('BL_API_RETRIES', 2)
+API_POOL_SIZE = _env_int('BL_API_POOL_SIZE', 8)
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+BACKOFF_BASE_S = 0.25
+BACKOFF_MAX_S = 4.0
+
+
+class ApiError(Exception):
+    """Request failed; ``status_code`` is None when no response arrived."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, kind: str = 'error'):
+        super().__init__(message)
+        self.status_code = status_code
+        self.kind = kind  # 'status', 'no_token' or 'error'
+
+
+@dataclass
+class LoginResult:
+    jwt_token: str
+    hwid: Optional[str] = None
+    user_data: Dict[str, Any] = field(default_factory=dict)
+    partners: List[Any] = field(default_factory=list)
+    hwids: Optional[List[str]] = None  # None when the HWID request failed
+    errors: Dict[str, str] = field(default_factory=dict)  # Per-fetch failures (login still succeeded)
+    timings: Dict[str, float] = field(default_factory=dict)  # ms: login, user_data, partners, hwids, ready
+
+
+def is_local_url(url: str) -> bool:
+    return "127.0.0.1" in url or "localhost" in url
+
+
+def api_base_from_login_url(login_url: str) -> str:
+    return login_url.replace("/token/login", "")
+
+
+def _connect_failed(exc: Exception) -> bool:
+    """True if the request never reached the server (safe to resend a POST)."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ReadTimeout):
+        return False
+    reason = exc.args[0] if exc.args else None
+    reason = getattr(reason, 'reason', reason)  # MaxRetryError wraps the cause
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def new_session(pool_size: int = API_POOL_SIZE, trust_env: bool = True) -> requests.Session:
+    """Keep-alive session with a ``pool_size`` connection pool; retries are left to the caller."""
+    session = requests.Session()
+    session.trust_env = trust_env  # False ignores environment proxies (direct connection)
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, int(pool_size)), max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_S, cap: float = BACKOFF_MAX_S) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+
+class MindspellerClient:
+    """Keep-alive session, retries and the parallel post-login fetches for one API base."""
+
+    def __init__(self, login_url: str, retries: int = API_RETRIES, pool_size: int = API_POOL_SIZE,
+                 timeout: float = 10.0, sleep: Callable[[float], None] = time.sleep):
+        self.login_url = login_url
+        self.api_base = api_base_from_login_url(login_url)
+        self.verify = not is_local_url(login_url)
+        self.retries = max(0, int(retries))
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._session = new_session(self.pool_size)
+        self._direct = False
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    def _use_direct_session(self) -> None:
+        with self._lock:
+            if self._direct:
+                return
+            api_log.warning("Proxy error talking to %s; using a direct connection", self.api_base)
+            old, self._session = self._session, new_session(self.pool_size, trust_env=False)
+            self._direct = True
+        old.close()
+
+    def request(self, method: str, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        """Send with pooled connections; retries transient failures (see module docstring)."""
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify)
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except requests.exceptions.ProxyError:
+                if self._direct:
+                    raise
+                self._use_direct_session()
+                continue
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.retries or not (idempotent or _connect_failed(e)):
+                    raise
+                api_log.info("%s %s failed (%s), retry %d/%d", method, url, type(e).__name__, attempt + 1, self.retries)
+            else:
+                api_log.debug("%s %s -> %d in %.0f ms", method, url, response.status_code,
+                              (time.perf_counter() - t0) * 1000.0)
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries or not idempotent:
+                    return response
+                api_log.info("%s %s returned %d, retry %d/%d", method, url, response.status_code, attempt + 1, self.retries)
+                response.close()
+            self._sleep(backoff_delay(attempt))
+            attempt += 1
+
+    def _auth_get(self, path: str, jwt_token: str, **kwargs) -> Dict[str, Any]:
+        response = self.request("GET", f"{self.api_base}{path}",
+                                headers={"X-Authorization": f"Bearer {jwt_token}"}, **kwargs)
+        if response.status_code != 200:
+            raise ApiError(f"{path} returned status {response.status_code}", response.status_code, kind='status')
+        return response.json()
+
+    def login(self, username: str, password: str) -> Dict[str, Any]:
+        """POST the credentials; returns the response JSON (raises ApiError without a token)."""
+        response = self.request("POST", self.login_url, idempotent=False,
+                                json={"username": username, "password": password},
+                                headers={"Content-Type": "application/json"})
+        if response.status_code != 200:
+            raise ApiError(f"Login failed with status code: {response.status_code}",
+                           response.status_code, kind='status')
+        data = response.json()
+        if not data.get("x-jwt-access-token"):
+            raise ApiError("The login response didn't contain an authentication token.", 200, kind='no_token')
+        return data
+
+    def fetch_user_data(self, jwt_token: str) -> Dict[str, Any]:
+        return self._auth_get("/users/current_user", jwt_token).get("data", {}) or {}
+
+    def fetch_partners(self, jwt_token: str) -> List[Any]:
+        # 'all' returns partner IDs regardless of region
+        return self._auth_get("/partners/list?region=all", jwt_token).get("partners", []) or []
+
+    def fetch_hwids(self, jwt_token: str) -> List[str]:
+        raw = self._auth_get("/users/hwids", jwt_token, timeout=min(self.timeout, 5.0)).get("brainlink_hwid", [])
+        if isinstance(raw, str):
+            return [raw]
+        return list(raw) if isinstance(raw, list) else []
+
+    def fetch_session_data(self, jwt_token: str, result: LoginResult, t_start: Optional[float] = None) -> LoginResult:
+        """User data, partners and HWIDs in parallel on the pooled session; failures go to ``result.errors``."""
+        t_start = time.perf_counter() if t_start is None else t_start
+        fetches = {
+            'user_data': self.fetch_user_data,
+            'partners': self.fetch_partners,
+            'hwids': self.fetch_hwids,
+        }
+
+        def timed(name):
+            t0 = time.perf_counter()
+            try:
+                return fetches[name](jwt_token)
+            finally:
+                result.timings[name] = (time.perf_counter() - t0) * 1000.0
+
+        with ThreadPoolExecutor(max_workers=len(fetches), thread_name_prefix="bl-api") as pool:
+            futures = {name: pool.submit(timed, name) for name in fetches}
+            for name, future in futures.items():
+                try:
+                    setattr(result, name, future.result())
+                except Exception as e:
+                    result.errors[name] = str(e)
+                    api_log.warning("Fetching %s failed: %s", name, e)
+        result.timings['ready'] = (time.perf_counter() - t_start) * 1000.0
+        return result
+
+    def login_and_fetch(self, username: str, password: str) -> LoginResult:
+        """Login, then the parallel fetches; ``timings['ready']`` is login-to-ready latency."""
+        t_start = time.perf_counter()
+        data = self.login(username, password)
+        result = LoginResult(jwt_token=data["x-jwt-access-token"], hwid=data.get("hwid"))
+        result.timings['login'] = (time.perf_counter() - t_start) * 1000.0
+        return self.fetch_session_data(result.jwt_token, result, t_start)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_clients: Dict[str, MindspellerClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(login_url: str) -> MindspellerClient:
+    """Shared client for ``login_url`` (one connection pool per API base)."""
+    with _clients_lock:
+        client = _clients.get(login_url)
+        if client is None:
+            client = _clients[login_url] = MindspellerClient(login_url)
+        return client
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered audio cues with playback timestamps.
+
+The calibration / task cues used to synthesize a sine with NumPy and build
+a new ``pygame.mixer.Sound`` for every beep, on the GUI thread at the phase
+boundary, and multi-beep patterns slept between beeps in a fresh thread.
+``CUE_BANK.load()`` renders every pattern in ``CUE_PATTERNS`` (beeps and
+the gaps between them) once, in the mixer's own format, so ``play`` is a
+single non-blocking ``Sound.play()`` on a preloaded buffer.
+
+Every ``play`` is logged with the time it was requested and the time
+playback was started (``time.time()``, the clock the engines use for phase
+markers), plus an audible-time estimate one mixer buffer later. Cues that
+announce a phase start (``PHASE_START_CUES``) can be given that phase's
+marker time; the event then carries ``marker_to_cue_ms`` and
+``latency_stats()`` summarizes it so the offset can be measured and
+corrected. End, countdown and completion cues, and marker times more than
+``MARKER_WINDOW_S`` away (a phase that has not started yet), are logged
+without an offset. ``attach_cues`` matches every cue to the offline
+engine's phase markers (start and end) when they are saved.
+
+    CUE_BANK.load()                                  # after pygame.mixer.init()
+    event = CUE_BANK.play('phase_transition', marker_time=engine.phase_start_time)
+    CUE_BANK.summary_line()                          # "Cues: 12 | marker->cue p50 3.1 ms ..."
+
+Qt-free; without a mixer (no pygame or no audio device) cues are still
+logged with ``audio: False``.
+
+Author: BrainLink Companion Team
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# name -> (tones as (frequency Hz, duration ms), silence between tones in ms)
+CUE_PATTERNS: Dict[str, Tuple[Sequence[Tuple[int, int]], int]] = {
+    'start_calibration': ([(900, 220)], 100),
+    'end_calibration': ([(900, 180), (900, 180)], 100),
+    'phase_transition': ([(950, 120)], 100),
+    'start_task': ([(900, 220)], 100),
+    'end_task': ([(900, 180), (900, 180)], 100),
+    'countdown': ([(800, 200)], 100),
+    'phase_complete': ([(1000, 150)] * 4, 50),
+}
+DEFAULT_BUFFER_SAMPLES = 512  # Matches pygame.mixer.init(..., buffer=512) in the GUIs
+PHASE_START_CUES = frozenset({'start_calibration', 'start_task', 'phase_transition'})
+MARKER_WINDOW_S = 1.0  # A marker further from the cue belongs to another phase
+
+
+def render_tone(frequency: float, duration_ms: float, sample_rate: int = 22050) -> np.ndarray:
+    """int16 sine samples, the same tone the per-cue synthesis produced."""
+    duration_s = duration_ms / 1000.0
+    num_samples = int(sample_rate * duration_s)
+    samples = np.sin(2 * np.pi * frequency * np.linspace(0, duration_s, num_samples))
+    return (samples * 32767).astype(np.int16)
+
+
+def render_pattern(tones: Sequence[Tuple[int, int]], gap_ms: int = 100, sample_rate: int = 22050,
+                   channels: int = 1) -> np.ndarray:
+    """One buffer for a whole pattern: tones separated by ``gap_ms`` of silence."""
+    gap = np.zeros(int(sample_rate * gap_ms / 1000.0), dtype=np.int16)
+    parts: List[np.ndarray] = []
+    for i, (freq, dur) in enumerate(tones):
+        if i:
+            parts.append(gap)
+        parts.append(render_tone(freq, dur, sample_rate))
+    mono = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+    if channels == 1:
+        return mono
+    return np.ascontiguousarray(np.repeat(mono[:, None], channels, axis=1))
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(np.asarray(values, dtype=float), q))
+
+
+def attach_cues(markers: List[Dict[str, Any]], cue_events: List[Dict[str, Any]], window_s: float = MARKER_WINDOW_S) -> int:
+    """Write ``start_cue_ms`` / ``end_cue_ms`` (cue time minus marker time) into phase markers.
+
+    ``cue_events`` use the markers' time base (seconds from recording start, key
+    ``time``). Each marker boundary gets the nearest cue within ``window_s``;
+    returns the number of offsets written.
+    """
+    written = 0
+    times = [(float(ev['time']), ev) for ev in cue_events if ev.get('time') is not None]
+    for marker in markers:
+        used = None  # one cue never marks both ends of a (short) phase
+        for boundary in ('start', 'end'):
+            candidates = [item for item in times if item[1] is not used]
+            if marker.get(boundary) is None or not candidates:
+                continue
+            t_marker = float(marker[boundary])
+            t_cue, event = min(candidates, key=lambda item: abs(item[0] - t_marker))
+            if abs(t_cue - t_marker) <= window_s:
+                used = event
+                marker[f'{boundary}_cue'] = event['cue']
+                marker[f'{boundary}_cue_ms'] = round((t_cue - t_marker) * 1000.0, 2)
+                written += 1
+    return written
+
+
+class CueBank:
+    """Preloaded cue sounds plus a timestamp log; see the module docstring."""
+
+    def __init__(self, patterns: Optional[Dict[str, Tuple[Sequence[Tuple[int, int]], int]]] = None,
+                 max_events: int = 1000, clock: Callable[[], float] = time.time):
+        self.patterns = dict(CUE_PATTERNS if patterns is None else patterns)
+        self.clock = clock
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._sounds: Dict[str, Any] = {}
+        self._tones: Dict[Tuple[int, int], Any] = {}
+        self._format: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self.buffer_samples = DEFAULT_BUFFER_SAMPLES
+        self.render_ms = 0.0
+
+    @property
+    def audio_available(self) -> bool:
+        return bool(self._sounds)
+
+    @property
+    def output_latency_s(self) -> float:
+        """One mixer buffer: roughly when a started sound becomes audible."""
+        return self.buffer_samples / float(self._format[0]) if self._format else 0.0
+
+    def load(self, buffer_samples: int = DEFAULT_BUFFER_SAMPLES) -> bool:
+        """Render all patterns for the initialized mixer (no-op if already loaded for its format)."""
+        self.buffer_samples = int(buffer_samples)
+        try:
+            import pygame.mixer
+            mixer_format = pygame.mixer.get_init()
+        except Exception:
+            mixer_format = None
+        if not mixer_format:
+            return False
+        with self._lock:
+            if mixer_format == self._format and self._sounds:
+                return True
+            sample_rate, _, channels = mixer_format
+            t0 = time.perf_counter()
+            sounds = {name: pygame.mixer.Sound(buffer=render_pattern(tones, gap, sample_rate, channels))
+                      for name, (tones, gap) in self.patterns.items()}
+            self.render_ms = (time.perf_counter() - t0) * 1000.0
+            self._sounds, self._tones, self._format = sounds, {}, mixer_format
+        return True
+
+    def play(self, name: str, marker_time: Optional[float] = None, marker: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Start cue ``name`` (non-blocking) and return its logged event.
+
+        ``marker_time`` is only kept for ``PHASE_START_CUES`` within
+        ``MARKER_WINDOW_S`` of playback; otherwise the offset would measure
+        the phase duration, not cue latency.
+        """
+        requested = self.clock()
+        sound = self._sounds.get(name)
+        played = False
+        if sound is not None:
+            try:
+                sound.play()
+                played = True
+            except Exception as e:
+                print(f"Warning: Could not play cue '{name}': {e}")
+        elif name not in self.patterns:
+            raise KeyError(f"unknown cue: {name}")
+        started = self.clock()
+        event: Dict[str, Any] = {
+            'cue': name,
+            'requested': requested,
+            'played': started,
+            'audible_est': started + self.output_latency_s if played else None,
+            'audio': played,
+        }
+        if marker is not None:
+            event['marker'] = dict(marker)
+        if marker_time is not None and (name not in PHASE_START_CUES or abs(started - marker_time) > MARKER_WINDOW_S):
+            marker_time = None
+        if marker_time is not None:
+            event['marker_time'] = marker_time
+            event['marker_to_cue_ms'] = (started - marker_time) * 1000.0
+        self.events.append(event)
+        return event
+
+    def play_tone(self, frequency: int = 800, duration_ms: int = 200) -> bool:
+        """Single ad-hoc beep, rendered on first use and reused afterwards."""
+        if not self._format:
+            return False
+        key = (int(frequency), int(duration_ms))
+        with self._lock:
+            sound = self._tones.get(key)
+            if sound is None:
+                import pygame.mixer
+                sample_rate, _, channels = self._format
+                sound = pygame.mixer.Sound(buffer=render_pattern([key], 0, sample_rate, channels))
+                self._tones[key] = sound
+        sound.play()
+        return True
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Marker-to-cue offsets (ms) over the logged cues that had a marker time."""
+        offsets = [ev['marker_to_cue_ms'] for ev in list(self.events) if 'marker_to_cue_ms' in ev]
+        calls = [(ev['played'] - ev['requested']) * 1000.0 for ev in list(self.events)]
+        stats: Dict[str, Any] = {'cues': len(calls), 'with_marker': len(offsets)}
+        if calls:
+            stats['play_call_max_ms'] = max(calls)
+        if offsets:
+            stats.update({
+                'mean_ms': float(np.mean(offsets)),
+                'p50_ms': _percentile(offsets, 50),
+                'p95_ms': _percentile(offsets, 95),
+                'max_ms': max(offsets, key=abs),
+            })
+        return stats
+
+    def summary_line(self) -> str:
+        stats = self.latency_stats()
+        text = f"Cues: {stats['cues']}"
+        if stats.get('with_marker'):
+            text += f" | marker->cue p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms"
+            if self.output_latency_s:
+                text += f" (+{self.output_latency_s * 1000.0:.0f} ms output buffer)"
+        if not self.audio_available:
+            text += " | audio off"
+        return text
+
+
+CUE_BANK = CueBank()
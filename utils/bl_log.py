@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Rate-limited, non-blocking logging for acquisition and analysis hot paths.
+
+Console writes are slow (especially on Windows), and a ``print`` inside the
+serial loop or a permutation loop blocks the caller while the console
+catches up. Loggers from ``get_logger(category)`` instead hand records to
+a ``QueueHandler``; a ``QueueListener`` thread does the actual writing.
+
+- Categories are child loggers of ``bl`` (``bl.serial``, ``bl.engine``, ...)
+  with their own levels.
+- Repeats of the same message template (below ERROR) are limited by a
+  token bucket per (category, template); the next message that gets
+  through reports how many were dropped.
+
+Configuration (environment, or the same switches on the command line):
+
+    BL_LOG_LEVEL=INFO                      --log-level DEBUG
+    BL_LOG_CATEGORIES=serial,engine=WARNING,plot=off
+                                           --log-categories "*=DEBUG,perm=off"
+
+A bare category name means DEBUG, ``off`` silences it and ``*`` sets the
+default for all categories. ``BL_LOG_RATE`` / ``BL_LOG_BURST`` tune the
+limiter (messages per second per template, and burst size; rate 0 disables).
+
+Author: BrainLink Companion Team
+"""
+
+import argparse
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+ROOT_NAME = "bl"
+_OFF = logging.CRITICAL + 10
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_configured = False
+
+
+def _parse_level(text: str, default: int = logging.INFO) -> int:
+    text = (text or "").strip()
+    if not text:
+        return default
+    if text.lower() in ("off", "none", "0"):
+        return _OFF
+    if text.isdigit():
+        return int(text)
+    level = logging.getLevelName(text.upper())
+    return level if isinstance(level, int) else default
+
+
+def parse_categories(spec: str) -> Dict[str, int]:
+    """Parse ``"name[=LEVEL|off],..."`` into {category: level}. ``*`` is the default level."""
+    levels: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.partition("=")
+        levels[name.strip()] = _parse_level(level, logging.DEBUG) if level else logging.DEBUG
+    return levels
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message template); drops repeats past the burst."""
+
+    def __init__(self, rate: float = 5.0, burst: int = 20):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._buckets: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [tokens, last refill time, suppressed since last pass]
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} suppressed)"
+        return True
+
+
+def _switches_from_argv(argv: Optional[List[str]]) -> Tuple[Optional[str], Optional[str]]:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--log-level")
+    parser.add_argument("--log-categories")
+    try:
+        args, _ = parser.parse_known_args(argv)
+    except SystemExit:
+        return None, None
+    return args.log_level, args.log_categories
+
+
+def configure(
+    level: Optional[str] = None,
+    categories: Optional[str] = None,
+    argv: Optional[List[str]] = None,
+    stream=None,
+) -> logging.Logger:
+    """(Re)configure the ``bl`` logger tree. Explicit args win over CLI, CLI over env."""
+    global _listener, _configured
+    cli_level, cli_categories = _switches_from_argv(sys.argv[1:] if argv is None else argv)
+    level = level or cli_level or os.environ.get("BL_LOG_LEVEL", "INFO")
+    categories = categories if categories is not None else (cli_categories or os.environ.get("BL_LOG_CATEGORIES", ""))
+
+    with _lock:
+        root = logging.getLogger(ROOT_NAME)
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        cat_levels = parse_categories(categories)
+        root.setLevel(cat_levels.pop("*", _parse_level(level)))
+        root.propagate = False
+        for name in list(logging.Logger.manager.loggerDict):
+            if name.startswith(ROOT_NAME + "."):
+                logging.getLogger(name).setLevel(logging.NOTSET)
+        for name, cat_level in cat_levels.items():
+            logging.getLogger(f"{ROOT_NAME}.{name}").setLevel(cat_level)
+
+        writer = logging.StreamHandler(stream or sys.stdout)
+        writer.setFormatter(logging.Formatter("%(message)s"))
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        try:
+            rate = float(os.environ.get("BL_LOG_RATE", "5"))
+            burst = int(os.environ.get("BL_LOG_BURST", "20"))
+        except ValueError:
+            rate, burst = 5.0, 20
+        queue_handler.addFilter(RateLimitFilter(rate, burst))
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(records, writer)
+        _listener.start()
+        _configured = True
+    return root
+
+
+def get_logger(category: str) -> logging.Logger:
+    """Logger for a category (``serial``, ``engine``, ``perm``, ``plot``, ...)."""
+    if not _configured:
+        configure()
+    return logging.getLogger(f"{ROOT_NAME}.{category}")
+
+
+def flush() -> None:
+    """Stop the writer thread after draining queued records."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(flush)
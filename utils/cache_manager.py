@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Bounded in-memory caches for the analysis engines.
+
+A ``CacheManager`` owns a set of named ``LRUByteCache`` instances that share
+one memory cap. Entries are sized in bytes when stored; once the combined
+size exceeds the cap the least recently used entry across *all* caches is
+evicted. Every cache keeps hit / miss / eviction counters so long sessions
+can be inspected with ``CacheManager.stats()``.
+
+Keys should describe content, not object identity: use ``fingerprint()``
+to build a short digest of arrays, frames or feature lists.
+
+Author: BrainLink Companion Team
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+def _pandas():
+    """pandas if it is already loaded; a DataFrame cannot exist otherwise, so never import it here."""
+    return sys.modules.get('pandas')
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    pd = _pandas()
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        try:
+            return int(value.memory_usage(deep=False).sum()) if isinstance(value, pd.DataFrame) else int(value.memory_usage(deep=False))
+        except Exception:
+            return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _feed(digest: "hashlib._Hash", part: Any) -> None:
+    pd = _pandas()
+    if isinstance(part, np.ndarray):
+        arr = np.ascontiguousarray(part)
+        digest.update(str((arr.dtype.str, arr.shape)).encode())
+        digest.update(arr.tobytes())
+    elif pd is not None and isinstance(part, (pd.DataFrame, pd.Series)):
+        columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+        digest.update(str(tuple(columns)).encode())
+        digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+    elif isinstance(part, dict):
+        for k in sorted(part, key=str):
+            digest.update(str(k).encode())
+            _feed(digest, part[k])
+    elif isinstance(part, (list, tuple)):
+        digest.update(f"[{len(part)}".encode())
+        for item in part:
+            _feed(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(part).encode())
+
+
+def fingerprint(*parts: Any) -> str:
+    """Content digest of arrays, frames, containers and scalars (16 hex chars)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+
+class LRUByteCache:
+    """A named cache whose entries are accounted against a shared ``CacheManager``."""
+
+    def __init__(self, name: str, manager: "CacheManager"):
+        self.name = name
+        self._manager = manager
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._manager._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._manager._touch(self.name, key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None) -> None:
+        size = int(nbytes if nbytes is not None else estimate_nbytes(value))
+        with self._manager._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self._manager.max_bytes:
+                # Would evict everything else and still not fit; don't cache it
+                self.evictions += 1
+                return
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            self._manager._touch(self.name, key)
+            self._manager._enforce_cap()
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.put(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._manager._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Hashable) -> None:
+        _, size = self._entries.pop(key)
+        self.nbytes -= size
+        self._manager._order.pop((self.name, key), None)
+
+    def clear(self) -> None:
+        with self._manager._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else None,
+        }
+
+
+class CacheManager:
+    """Owns named caches and evicts least-recently-used entries past ``max_bytes``."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self._caches: Dict[str, LRUByteCache] = {}
+        self._order: "OrderedDict[Tuple[str, Hashable], None]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def cache(self, name: str) -> LRUByteCache:
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = LRUByteCache(name, self)
+            return self._caches[name]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(c.nbytes for c in self._caches.values())
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self._enforce_cap()
+
+    def _touch(self, name: str, key: Hashable) -> None:
+        self._order[(name, key)] = None
+        self._order.move_to_end((name, key))
+
+    def _enforce_cap(self) -> None:
+        total = self.total_bytes
+        while total > self.max_bytes and self._order:
+            (name, key), _ = self._order.popitem(last=False)
+            cache = self._caches.get(name)
+            if cache is None or key not in cache._entries:
+                continue
+            size = cache._entries[key][1]
+            cache._drop(key)
+            cache.evictions += 1
+            total -= size
+
+    def clear(self, names: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            for name, cache in self._caches.items():
+                if names is None or name in names:
+                    cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_bytes': self.max_bytes,
+                'total_bytes': self.total_bytes,
+                'caches': {name: cache.stats() for name, cache in self._caches.items()},
+            }
+
+    def summary_line(self) -> str:
+        """Compact one-line description for console logs."""
+        stats = self.stats()
+        parts = []
+        for name, s in stats['caches'].items():
+            parts.append(f"{name}: {s['entries']} entries/{s['bytes'] / 1e6:.1f}MB h={s['hits']} m={s['misses']} ev={s['evictions']}")
+        return f"{stats['total_bytes'] / 1e6:.1f}/{stats['max_bytes'] / 1e6:.0f}MB | " + "; ".join(parts)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Import-time profile and startup timing for the GUI.
+
+``BL_IMPORT_PROFILE=1`` hooks the import system as soon as this module is
+imported (the Sequential GUI imports it first) and records every module
+load with its self and cumulative time, the same numbers ``python -X
+importtime`` reports. When the first dialog is shown the tree is printed
+to stderr, parents before children:
+
+    import time: self [ms] | cumulative [ms] | imported package
+    import time:       2.1 |        812.4 | BrainLinkAnalyzer_GUI_Enhanced
+    import time:       1.0 |        350.2 |   BrainLinkAnalyzer_GUI
+
+Modules under ``BL_IMPORT_PROFILE_MIN_MS`` (default 1.0) cumulative are
+folded into their parent. Imports made after the first dialog (lazy
+loads, see ``utils.lazy_import``) are printed at exit.
+
+Startup marks (``mark('window')``) are always recorded; they cost one
+``perf_counter`` call. ``BL_STARTUP_PROBE=1`` prints one
+``BL_STARTUP {json}`` line with the marks when the first dialog is shown
+and exits the process; ``benchmarks/run_benchmarks.py`` uses it to time
+startup.
+
+Author: BrainLink Companion Team
+"""
+
+import atexit
+import importlib._bootstrap as _bootstrap
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+_T0 = time.perf_counter()
+
+ENABLED = os.environ.get('BL_IMPORT_PROFILE', '').strip().lower() in ('1', 'true', 'yes', 'on')
+PROBE = os.environ.get('BL_STARTUP_PROBE', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+MIN_MS = _env_float('BL_IMPORT_PROFILE_MIN_MS', 1.0)
+
+
+class _Node:
+    __slots__ = ('name', 'start_ms', 'cum_ns', 'children')
+
+    def __init__(self, name: str, start_ms: float):
+        self.name = name
+        self.start_ms = start_ms
+        self.cum_ns = 0
+        self.children: List['_Node'] = []
+
+    @property
+    def self_ns(self) -> int:
+        return self.cum_ns - sum(child.cum_ns for child in self.children)
+
+
+_roots: List[_Node] = []
+_local = threading.local()
+_marks: Dict[str, float] = {}
+_first_dialog_ms: Optional[float] = None
+_original_find_and_load = None
+
+
+def _elapsed_ms() -> float:
+    return (time.perf_counter() - _T0) * 1000.0
+
+
+def _profiled_find_and_load(name, import_):
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    node = _Node(name, _elapsed_ms())
+    stack.append(node)
+    t0 = time.perf_counter_ns()
+    try:
+        return _original_find_and_load(name, import_)
+    finally:
+        node.cum_ns = time.perf_counter_ns() - t0
+        stack.pop()
+        (stack[-1].children if stack else _roots).append(node)
+
+
+def install() -> None:
+    """Start recording imports (no-op if already installed)."""
+    global _original_find_and_load
+    if _original_find_and_load is not None:
+        return
+    _original_find_and_load = _bootstrap._find_and_load
+    _bootstrap._find_and_load = _profiled_find_and_load
+    atexit.register(_report_deferred)
+
+
+def _tree_lines(nodes: List[_Node], depth: int = 0) -> List[str]:
+    lines = []
+    for node in nodes:
+        cum_ms = node.cum_ns / 1e6
+        if cum_ms < MIN_MS:
+            continue
+        lines.append(f"import time: {node.self_ns / 1e6:9.1f} | {cum_ms:12.1f} | {'  ' * depth}{node.name}")
+        lines.extend(_tree_lines(node.children, depth + 1))
+    return lines
+
+
+def format_tree(nodes: Optional[List[_Node]] = None) -> str:
+    """The recorded imports as an ``-X importtime``-style tree with a total line."""
+    nodes = list(_roots) if nodes is None else nodes
+    total_ms = sum(node.cum_ns for node in nodes) / 1e6
+    lines = ["import time: self [ms] | cumulative [ms] | imported package"]
+    lines.extend(_tree_lines(nodes))
+    lines.append(f"import time: {len(nodes)} top-level imports, {total_ms:.1f} ms total "
+                 f"(modules under {MIN_MS:g} ms folded into their parent)")
+    return "\n".join(lines)
+
+
+def mark(label: str) -> float:
+    """Record a startup milestone; returns ms since this module was imported."""
+    elapsed = _elapsed_ms()
+    _marks.setdefault(label, round(elapsed, 1))
+    return elapsed
+
+
+def marks() -> Dict[str, float]:
+    return dict(_marks)
+
+
+def first_dialog_shown() -> None:
+    """Mark the first dialog; prints the import tree (profile) or the probe line and exits (probe)."""
+    global _first_dialog_ms
+    if _first_dialog_ms is not None:
+        return
+    _first_dialog_ms = mark('first_dialog')
+    if ENABLED:
+        print(format_tree(), file=sys.stderr)
+        print(f"Startup: {json.dumps(marks())} (ms)", file=sys.stderr)
+        sys.stderr.flush()
+    if PROBE:
+        from utils.lazy_import import LAZY_IMPORTS
+        probe = {
+            'marks': marks(),
+            'lazy_imports': LAZY_IMPORTS,
+            'modules': len(sys.modules),
+            'deferred': [m for m in ('pandas', 'scipy.stats', 'scipy.signal', 'grpc',
+                                     'antNeuro.offline_multichannel_analysis') if m not in sys.modules],
+        }
+        print("BL_STARTUP " + json.dumps(probe), flush=True)
+        os._exit(0)
+
+
+def _report_deferred() -> None:
+    if _first_dialog_ms is None:
+        return
+    late = [node for node in _roots if node.start_ms > _first_dialog_ms]
+    if late:
+        print("\nImports after the first dialog:", file=sys.stderr)
+        print(format_tree(late), file=sys.stderr)
+
+
+if ENABLED:
+    install()
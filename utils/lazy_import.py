@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Lazy module and attribute proxies for analysis-only imports.
+
+The GUI needs pandas, SciPy's statistics and signal modules, the 64-channel
+engines and the EDI2 gRPC stubs only once a recording is analyzed, yet
+importing them eagerly costs most of the time before the first dialog.
+Modules bind them through proxies instead:
+
+    pd = lazy_module('pandas')                    # instead of: import pandas as pd
+    welch = lazy_attr('scipy.signal', 'welch')    # instead of: from scipy.signal import welch
+
+``lazy_module`` returns a module object that imports the real module on the
+first attribute access and then copies its namespace, so later lookups are
+plain attribute hits. ``lazy_attr`` returns a callable proxy that resolves
+the name on first use (calls and attribute access are forwarded).
+
+``BL_LAZY_IMPORTS=0`` turns both into ordinary eager imports, for
+comparison and for tools that want import errors up front.
+First-use loads are logged under the ``startup`` category at DEBUG level.
+
+Author: BrainLink Companion Team
+"""
+
+import importlib
+import importlib.util
+import os
+import time
+import types
+from typing import Any
+
+from utils.bl_log import get_logger
+
+startup_log = get_logger("startup")
+
+LAZY_IMPORTS = os.environ.get('BL_LAZY_IMPORTS', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def module_available(name: str) -> bool:
+    """True if ``name`` can be found without importing it (parent packages may be imported)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _import(name: str):
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    startup_log.debug("Lazy import of %s resolved in %.1f ms", name, (time.perf_counter() - t0) * 1000.0)
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        # No lock: importlib serializes concurrent imports, and a repeated update is harmless
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = _import(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+class LazyAttr:
+    """Callable stand-in for ``from module import name``, resolved on first use."""
+
+    __slots__ = ('_module', '_name', '_target')
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            target = getattr(_import(self._module), self._name)
+            self._target = target
+        return target
+
+    def __call__(self, *args, **kwargs):
+        target = self._target
+        if target is None:
+            target = self._resolve()
+        return target(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self) -> str:
+        if self._target is not None:
+            return repr(self._target)
+        return f"<lazy {self._module}.{self._name}>"
+
+
+def lazy_module(name: str):
+    """``import name`` now, or a ``LazyModule`` that imports it on first use."""
+    if not LAZY_IMPORTS:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+def lazy_attr(module: str, name: str):
+    """``from module import name`` now, or a ``LazyAttr`` that resolves it on first use."""
+    if not LAZY_IMPORTS:
+        return getattr(importlib.import_module(module), name)
+    return LazyAttr(module, name)
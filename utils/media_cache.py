@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Decoded, pre-scaled image cache for task phase media.
+
+Task dialogs used to build a ``QPixmap(path)`` when each phase started and
+scale it for the media area, so the 4K ``NUM_FORM`` / ``ORDER_SURPRISE``
+images and the ``emo_face_*`` PNGs were decoded again at every phase
+transition, on the GUI thread, while the stimulus was due on screen.
+
+``MEDIA_CACHE`` decodes images with ``QImage`` (safe off the GUI thread) on
+one background worker and keeps the originals plus scaled variants in an
+LRU bounded by bytes (``BL_MEDIA_CACHE_MB``, default 192). Variants are
+keyed by asset name, mode and target size:
+
+- ``fit``: ``Qt.KeepAspectRatio`` into the box (the inline media label)
+- ``cover``: fill the box and centre-crop (the fullscreen image window)
+- ``width``: ``scaledToWidth`` (instruction pictures)
+
+``prefetch`` queues work and returns; ``pixmap`` is called on the GUI
+thread and returns a ready ``QPixmap``, waiting for an in-flight prefetch
+of the same key instead of decoding twice. Only a miss decodes and scales
+inline (counted in ``stats()``).
+
+    MEDIA_CACHE.prefetch(task_media_names(task_cfg), fit=(w, h))
+    label.setPixmap(MEDIA_CACHE.pixmap('emo_face_01.png', w, h))
+
+``BL_MEDIA_CACHE=0`` disables caching (every call decodes, as before).
+
+Author: BrainLink Companion Team
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from utils.bl_log import get_logger
+
+media_log = get_logger("media")
+
+MEDIA_CACHE_ENABLED = os.environ.get('BL_MEDIA_CACHE', '1') not in ('0', 'false', 'False')
+try:
+    MEDIA_CACHE_MB = float(os.environ.get('BL_MEDIA_CACHE_MB', 192))
+except ValueError:
+    MEDIA_CACHE_MB = 192.0
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+Key = Tuple[str, str, int, int]
+
+
+def default_resolver(name: str) -> str:
+    """Asset name -> path, like ``BL.resource_path(os.path.join('assets', name))``."""
+    import sys
+    base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base, 'assets', name)
+
+
+def scale_image(image: QImage, mode: str, width: int, height: int) -> QImage:
+    """Scale like the task dialog does: fit, cover (centre crop) or to width."""
+    if image.isNull() or width <= 0 or (mode != 'width' and height <= 0):
+        return image
+    if mode == 'width':
+        return image.scaledToWidth(width, Qt.SmoothTransformation)
+    if mode == 'fit':
+        return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if mode == 'cover':
+        scale = max(width / image.width(), height / image.height())
+        scaled = image.scaled(int(image.width() * scale), int(image.height() * scale),
+                              Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        x_off = max(0, (scaled.width() - width) // 2)
+        y_off = max(0, (scaled.height() - height) // 2)
+        return scaled.copy(x_off, y_off, min(width, scaled.width() - x_off), min(height, scaled.height() - y_off))
+    raise ValueError(f"unknown scale mode: {mode}")
+
+
+def task_media_names(task_cfg: Dict[str, Any], phases: Optional[Iterable[Dict[str, Any]]] = None) -> List[str]:
+    """Image assets shown by ``phases`` (default: the task's whole ``phase_structure``), in order."""
+    images = (task_cfg.get('media') or {}).get('images', []) or []
+    names: List[str] = []
+    for phase in (task_cfg.get('phase_structure') or [] if phases is None else phases):
+        if not isinstance(phase, dict):
+            continue
+        name = phase.get('media_file')
+        if name is None and 'media_index' in phase and phase.get('type') in ('viewing', 'writing'):
+            idx = phase.get('media_index', 0)
+            name = images[idx] if 0 <= idx < len(images) else None
+        if name and name.lower().endswith(IMAGE_EXTENSIONS) and name not in names:
+            names.append(name)
+    return names
+
+
+class MediaCache:
+    """Byte-bounded LRU of decoded / scaled images; see the module docstring."""
+
+    def __init__(self, max_bytes: int = int(MEDIA_CACHE_MB * 1024 * 1024),
+                 resolver: Callable[[str], str] = default_resolver, enabled: bool = MEDIA_CACHE_ENABLED):
+        self.max_bytes = int(max_bytes)
+        self.resolver = resolver
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Key, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[Key, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self.miss_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _decode(self, name: str) -> QImage:
+        reader = QImageReader(self.resolver(name))
+        reader.setAutoTransform(True)
+        image = reader.read()
+        if image.isNull():
+            media_log.warning("Could not decode %s: %s", name, reader.errorString())
+        return image
+
+    def _store(self, key: Key, image: QImage) -> None:
+        if not self.enabled or image.isNull():
+            return
+        size = int(image.sizeInBytes())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old['bytes']
+            self._entries[key] = {'image': image, 'pixmap': None, 'bytes': size}
+            self.bytes += size
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted['bytes']
+                self.evictions += 1
+
+    def _lookup(self, key: Key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _original(self, name: str) -> QImage:
+        key = (name, 'original', 0, 0)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry['image']
+        image = self._decode(name)
+        self._store(key, image)
+        return image
+
+    def _build(self, key: Key) -> QImage:
+        """Decode (or reuse the original) and scale; runs on the worker or, on a miss, inline."""
+        name, mode, width, height = key
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry['image']
+        original = self._original(name)
+        if mode == 'original':
+            return original
+        image = scale_image(original, mode, width, height)
+        self._store(key, image)
+        return image
+
+    def _run_prefetch(self, key: Key) -> QImage:
+        try:
+            return self._build(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.prefetched += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def prefetch(self, names: Iterable[str], fit: Optional[Tuple[int, int]] = None,
+                 cover: Optional[Tuple[int, int]] = None, width: Optional[int] = None) -> int:
+        """Queue decoding of ``names`` and their variants in the background; returns jobs queued."""
+        if not self.enabled:
+            return 0
+        keys: List[Key] = []
+        for name in names:
+            if fit:
+                keys.append((name, 'fit', int(fit[0]), int(fit[1])))
+            if cover:
+                keys.append((name, 'cover', int(cover[0]), int(cover[1])))
+            if width:
+                keys.append((name, 'width', int(width), 0))
+            if not (fit or cover or width):
+                keys.append((name, 'original', 0, 0))
+        queued = 0
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bl-media")
+            for key in keys:
+                if key in self._entries or key in self._inflight:
+                    continue
+                self._inflight[key] = self._executor.submit(self._run_prefetch, key)
+                queued += 1
+        return queued
+
+    def image(self, name: str, width: int = 0, height: int = 0, mode: str = 'fit') -> QImage:
+        """Decoded (and scaled) ``QImage``; safe from any thread."""
+        key = (name, 'original' if mode == 'original' else mode, int(width), int(height))
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry['image']
+        with self._lock:
+            future = self._inflight.get(key)
+        if future is not None:
+            self.waits += 1
+            try:
+                return future.result()
+            except Exception as e:
+                media_log.warning("Prefetch of %s failed: %s", name, e)
+        self.misses += 1
+        t0 = time.perf_counter()
+        image = self._build(key)
+        self.miss_ms += (time.perf_counter() - t0) * 1000.0
+        return image
+
+    def pixmap(self, name: str, width: int = 0, height: int = 0, mode: str = 'fit') -> QPixmap:
+        """Ready-to-show ``QPixmap`` (GUI thread only); converted once per cached variant."""
+        image = self.image(name, width, height, mode)
+        key = (name, mode, int(width), int(height))
+        entry = self._lookup(key)
+        if entry is not None and entry['image'] is image:
+            if entry['pixmap'] is None:
+                entry['pixmap'] = QPixmap.fromImage(image)
+            return entry['pixmap']
+        return QPixmap.fromImage(image)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued prefetches finish (tests and benchmarks)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._inflight.values())
+            if not pending:
+                return True
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                pending[0].result(timeout=remaining)
+            except Exception:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+            inflight = len(self._inflight)
+        return {
+            'entries': entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'waits': self.waits,
+            'misses': self.misses,
+            'miss_ms': self.miss_ms,
+            'evictions': self.evictions,
+            'prefetched': self.prefetched,
+            'inflight': inflight,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+MEDIA_CACHE = MediaCache()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Non-blocking, batched uploader for live band-power metrics.
+
+BrainCompanion's live mode produces one metrics dict per plot tick (1 Hz).
+Posting it from the tick handler froze the plot for the whole request, and
+for a second one on proxy errors. ``MetricsUploader.submit`` only appends
+to a bounded queue; a background thread sends the ticks:
+
+- By default each tick is posted on its own, as the same uncompressed JSON
+  object as before, the only format the backend is known to accept.
+- Batching is opt-in until the backend confirms support: up to
+  ``batch_size`` ticks per request (``BL_UPLOAD_BATCH``, default 1), sent
+  once a batch is full or the oldest tick has waited ``flush_s``
+  (``BL_UPLOAD_FLUSH_S``, default 3 s). The body is a JSON list of the tick
+  payloads, each with the ``timestamp`` it was queued at, gzip-compressed
+  (``Content-Encoding: gzip``) with ``BL_UPLOAD_GZIP=1``.
+- One keep-alive connection (``utils.api_client.new_session``); a proxy
+  error switches to a direct connection once.
+- Backpressure: the queue holds at most ``max_pending`` ticks and drops the
+  oldest. After a failed or slow request (over ``slow_s``) the queue is
+  coalesced to the latest tick, and failures back off with jitter.
+- A backend that rejects the batch format (400/404/405/415/422, or any
+  non-2xx answer before a batch has ever been accepted) is sent one
+  uncompressed tick per request from then on, the format it always accepted.
+
+``stats()`` returns the sent / queued / dropped counters for the UI.
+Qt-free; uploads are logged under the ``api`` category.
+
+    uploader = MetricsUploader(BACKEND_URL, headers={"X-Authorization": f"Bearer {jwt}"})
+    uploader.start()
+    uploader.submit(payload)          # from the plot tick, never blocks
+    uploader.stop(flush_timeout=2.0)  # on close
+
+Author: BrainLink Companion Team
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+from utils.api_client import api_log, backoff_delay, is_local_url, new_session
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+UPLOAD_BATCH = max(1, int(_env_float('BL_UPLOAD_BATCH', 1)))
+UPLOAD_FLUSH_S = _env_float('BL_UPLOAD_FLUSH_S', 3.0)
+UPLOAD_GZIP = os.environ.get('BL_UPLOAD_GZIP', '0') in ('1', 'true', 'True')
+REJECTED_FORMAT_STATUS = frozenset({400, 404, 405, 415, 422})
+
+
+class MetricsUploader:
+    """Background sender for per-tick metrics dicts; see the module docstring."""
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, batch_size: int = UPLOAD_BATCH,
+                 flush_s: float = UPLOAD_FLUSH_S, max_pending: int = 120, timeout: float = 5.0,
+                 slow_s: float = 2.0, compress: bool = UPLOAD_GZIP):
+        self.url = url
+        self.headers = dict(headers or {})
+        self.batch_size = max(1, int(batch_size))
+        self.flush_s = max(0.0, float(flush_s))
+        self.timeout = timeout
+        self.slow_s = slow_s
+        self.compress = compress
+        self.verify = not is_local_url(url)
+        self.batched = self.batch_size > 1  # False: legacy one-dict-per-request format
+        self._batch_accepted = False  # Until a batch gets a 2xx, any error falls back to legacy
+        self._pending: Deque[Tuple[float, Dict[str, Any]]] = deque(maxlen=max(1, int(max_pending)))
+        self._cond = threading.Condition()
+        self._session = new_session(pool_size=1)
+        self._direct = False
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._coalesce = False
+        self.sent = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_requests = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> 'MetricsUploader':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bl-uploader", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, payload: Dict[str, Any]) -> None:
+        """Queue one tick (O(1), never blocks on the network)."""
+        tick = (time.time(), payload)
+        with self._cond:
+            if self._coalesce and self._pending:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+            elif len(self._pending) == self._pending.maxlen:
+                self.dropped += 1  # deque drops the oldest
+            self._pending.append(tick)
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = len(self._pending)
+        return {
+            'sent': self.sent,
+            'queued': queued,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'failed_requests': self.failed_requests,
+            'last_latency_ms': self.last_latency_ms,
+            'last_error': self.last_error,
+            'compression': (self.bytes_sent / self.bytes_raw) if self.bytes_raw else None,
+            'batched': self.batched,
+        }
+
+    def status_text(self) -> str:
+        """Compact counters for a status label."""
+        stats = self.stats()
+        text = f"Upload: sent {stats['sent']} | queued {stats['queued']} | dropped {stats['dropped']}"
+        if stats['last_latency_ms'] is not None:
+            text += f" | {stats['last_latency_ms']:.0f} ms"
+        if self._failures:
+            text += " | retrying"
+        return text
+
+    def stop(self, flush_timeout: float = 2.0) -> None:
+        """Send what is queued (up to ``flush_timeout`` s), then end the thread."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=max(0.0, flush_timeout))
+        self._session.close()
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _next_batch(self) -> Tuple[List[Tuple[float, Dict[str, Any]]], bool]:
+        """Wait for a full batch or the flush deadline; returns (ticks, stopping)."""
+        with self._cond:
+            while True:
+                limit = self.batch_size if self.batched else 1
+                if self._pending:
+                    waited = time.time() - self._pending[0][0]
+                    if self._stop or len(self._pending) >= limit or waited >= self.flush_s:
+                        return [self._pending.popleft() for _ in range(min(limit, len(self._pending)))], self._stop
+                    self._cond.wait(timeout=self.flush_s - waited)
+                elif self._stop:
+                    return [], True
+                else:
+                    self._cond.wait()
+
+    def _requeue(self, ticks: List[Tuple[float, Dict[str, Any]]]) -> None:
+        with self._cond:
+            if self._coalesce:
+                # Only the newest tick survives a slow or failing backend
+                newest = self._pending[-1] if self._pending else ticks[-1]
+                self.dropped += len(self._pending) + len(ticks) - 1
+                self._pending.clear()
+                self._pending.append(newest)
+                return
+            room = self._pending.maxlen - len(self._pending)
+            keep = ticks[-room:] if room > 0 else []
+            self.dropped += len(ticks) - len(keep)
+            self._pending.extendleft(reversed(keep))
+
+    def _encode(self, ticks: List[Tuple[float, Dict[str, Any]]]) -> Tuple[bytes, Dict[str, str]]:
+        headers = dict(self.headers, **{"Content-Type": "application/json"})
+        if not self.batched:
+            raw = json.dumps(ticks[0][1]).encode()
+            self.bytes_raw += len(raw)
+            self.bytes_sent += len(raw)
+            return raw, headers
+        raw = json.dumps([dict(payload, timestamp=t) for t, payload in ticks]).encode()
+        self.bytes_raw += len(raw)
+        if self.compress:
+            raw = gzip.compress(raw, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        self.bytes_sent += len(raw)
+        return raw, headers
+
+    def _post(self, body: bytes, headers: Dict[str, str]) -> requests.Response:
+        try:
+            return self._session.post(self.url, data=body, headers=headers, timeout=self.timeout, verify=self.verify)
+        except requests.exceptions.ProxyError:
+            if self._direct:
+                raise
+            api_log.warning("Proxy error uploading to %s; using a direct connection", self.url)
+            self._session.close()
+            self._session = new_session(pool_size=1, trust_env=False)
+            self._direct = True
+            return self._session.post(self.url, data=body, headers=headers, timeout=self.timeout, verify=self.verify)
+
+    def _send(self, ticks: List[Tuple[float, Dict[str, Any]]]) -> bool:
+        body, headers = self._encode(ticks)
+        t0 = time.perf_counter()
+        try:
+            response = self._post(body, headers)
+        except requests.exceptions.RequestException as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        finally:
+            self.last_latency_ms = (time.perf_counter() - t0) * 1000.0
+        if 200 <= response.status_code < 300:
+            self.sent += len(ticks)
+            self.batches += 1
+            self.last_error = None
+            self._batch_accepted = self._batch_accepted or self.batched
+            return True
+        if self.batched and (response.status_code in REJECTED_FORMAT_STATUS or not self._batch_accepted):
+            api_log.warning("Backend rejected batched upload (status %d); sending one tick per request",
+                            response.status_code)
+            self.batched = False
+            self._requeue(ticks)
+            return True  # Not a backend failure: resend in the legacy format right away
+        self.last_error = f"status {response.status_code}"
+        return False
+
+    def _run(self) -> None:
+        while True:
+            ticks, stopping = self._next_batch()
+            if not ticks:
+                return
+            ok = self._send(ticks)
+            slow = self.last_latency_ms is not None and self.last_latency_ms > self.slow_s * 1000.0
+            with self._cond:
+                self._coalesce = slow or not ok
+            if ok:
+                self._failures = 0
+                continue
+            self.failed_requests += 1
+            self._failures += 1
+            api_log.info("Upload of %d tick(s) failed (%s)", len(ticks), self.last_error)
+            if stopping:
+                # Closing with the backend down: give up on the rest
+                with self._cond:
+                    self.dropped += len(ticks) + len(self._pending)
+                    self._pending.clear()
+                return
+            self._requeue(ticks)
+            with self._cond:
+                # Back off, but wake up for stop()
+                self._cond.wait_for(lambda: self._stop, timeout=backoff_delay(self._failures - 1, base=0.5, cap=10.0))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency instrumentation for the acquisition -> feature pipeline.
+
+Each stage between a sample arriving and a feature window landing in
+``calibration_data`` records its duration into a fixed-bucket,
+HDR-style histogram:
+
+    acquire     device read / raw batching until data is handed on
+    buffer      append to the engine buffer and cut the analysis window
+    filter      DC removal and notch filtering
+    psd         power spectral density
+    features    building the feature dict from the PSD
+    store       appending the window to calibration_data
+    end_to_end  batch arrival until the engine returns
+    plot        live plot timer tick (buffer copy, setData, range/labels)
+
+Callers bracket a stage with ``t0 = PIPELINE_LATENCY.stamp()`` and
+``PIPELINE_LATENCY.record('psd', t0)``; ``t = lap('filter', t)`` chains
+consecutive stages. When disabled (``BL_LATENCY=0``)
+``stamp`` returns 0 and ``record`` returns immediately, so the cost is one
+attribute check per call. ``with PIPELINE_LATENCY.muted():`` does the same
+for the calling thread only.
+
+Histograms use log-linear buckets (16 per power of two, ~6% relative
+error) over 1 ns .. ~18 minutes; recording is a ``bit_length`` and a list
+increment. ``end_session`` writes a JSON dump and resets the counters.
+
+Author: BrainLink Companion Team
+"""
+
+import atexit
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+STAGES = ('acquire', 'buffer', 'filter', 'psd', 'features', 'store', 'end_to_end', 'plot')
+DEFAULT_DUMP_DIR = os.path.join(os.path.expanduser("~"), "BrainLink_Recordings", "latency")
+
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS          # Buckets per power of two
+_MAX_SHIFT = 36                      # Values above 2**41 ns are clamped
+_N_BUCKETS = (_MAX_SHIFT + 2) * _SUB_COUNT
+
+
+def _bucket_index(value_ns: int) -> int:
+    if value_ns < 2 * _SUB_COUNT:
+        return max(0, value_ns)
+    shift = value_ns.bit_length() - _SUB_BITS - 1
+    if shift > _MAX_SHIFT:
+        return _N_BUCKETS - 1
+    return shift * _SUB_COUNT + (value_ns >> shift)
+
+
+def _bucket_value(index: int) -> int:
+    """Upper edge (inclusive) of a bucket in ns."""
+    if index < 2 * _SUB_COUNT:
+        return index
+    shift = index // _SUB_COUNT - 1
+    mantissa = index - shift * _SUB_COUNT
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed log-linear histogram of durations in nanoseconds."""
+
+    __slots__ = ('counts', 'count', 'total_ns', 'min_ns', 'max_ns')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, value_ns: int) -> None:
+        self.counts[_bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Value (ns) at percentile ``q`` (0-100), or None when empty."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return min(_bucket_value(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        """Count plus p50/p95/p99/max/mean in milliseconds."""
+        def ms(v):
+            return None if v is None else round(v / 1e6, 4)
+        return {
+            'count': self.count,
+            'p50_ms': ms(self.percentile(50)),
+            'p95_ms': ms(self.percentile(95)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max_ns if self.count else None),
+            'mean_ms': ms(self.total_ns / self.count if self.count else None),
+        }
+
+
+class PipelineLatency:
+    """Named stage histograms shared by the acquisition, engine and plot code."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get("BL_LATENCY", "1").strip().lower() not in ("0", "false", "no", "off")
+        self.enabled = bool(enabled)
+        self._hists: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in STAGES}
+        self._lock = threading.Lock()
+        self.session_started = time.time()
+        self._dirty = False
+        self._muted = frozenset()  # Thread idents whose stages are not recorded
+
+    def stamp(self) -> int:
+        """Start time for a stage (0 when disabled or muted on this thread)."""
+        if not self.enabled or (self._muted and threading.get_ident() in self._muted):
+            return 0
+        return time.perf_counter_ns()
+
+    @contextlib.contextmanager
+    def muted(self):
+        """Skip stages timed on the calling thread (synthetic runs such as the kernel warm-up)."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._muted = self._muted | {ident}
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._muted = self._muted - {ident}
+
+    def record(self, stage: str, start_ns: int, end_ns: Optional[int] = None) -> None:
+        """Record ``end_ns - start_ns`` (end defaults to now) for ``stage``."""
+        if not start_ns or not self.enabled:
+            return
+        elapsed = (end_ns if end_ns is not None else time.perf_counter_ns()) - start_ns
+        hist = self._hists.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(stage, LatencyHistogram())
+        hist.record(max(0, elapsed))
+        self._dirty = True
+
+    def lap(self, stage: str, start_ns: int) -> int:
+        """Record ``stage`` since ``start_ns`` and return the start of the next stage."""
+        if not start_ns or not self.enabled:
+            return 0
+        now = time.perf_counter_ns()
+        self.record(stage, start_ns, now)
+        return now
+
+    def histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        return self._hists.get(stage)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Summary per stage that has samples, in pipeline order."""
+        return {name: hist.summary() for name, hist in list(self._hists.items()) if hist.count}
+
+    def reset(self) -> None:
+        with self._lock:
+            for hist in self._hists.values():
+                hist.reset()
+            self.session_started = time.time()
+            self._dirty = False
+
+    def panel_text(self) -> str:
+        """Compact one-line text for the status bar."""
+        snap = self.snapshot()
+        if not snap:
+            return "⏱ --"
+        parts = []
+        e2e = snap.get('end_to_end')
+        if e2e:
+            parts.append(f"e2e {e2e['p50_ms']:.1f}/{e2e['p95_ms']:.1f}ms")
+        stages = {k: v for k, v in snap.items() if k != 'end_to_end'}
+        if stages:
+            slowest = max(stages, key=lambda k: stages[k]['p95_ms'] or 0.0)
+            parts.append(f"{slowest} p95 {stages[slowest]['p95_ms']:.1f}ms")
+        return "⏱ " + " | ".join(parts)
+
+    def report_lines(self, title: str = "Pipeline Latency (ms)") -> List[str]:
+        """p50/p95/p99 per stage for text report footers (empty when nothing was recorded)."""
+        snap = self.snapshot()
+        if not snap:
+            return []
+
+        def fmt(v):
+            return "--" if v is None else f"{v:.2f}"
+
+        lines = [title, "-" * 40, f"{'stage':<11} {'n':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        for name, s in snap.items():
+            lines.append(f"{name:<11} {s['count']:>7} {fmt(s['p50_ms']):>8} {fmt(s['p95_ms']):>8} "
+                         f"{fmt(s['p99_ms']):>8} {fmt(s['max_ms']):>8}")
+        return lines
+
+    def dump_json(self, path: Optional[str] = None) -> Optional[str]:
+        """Write stage summaries and raw bucket counts to ``path`` (default: timestamped file)."""
+        if path is None:
+            directory = os.environ.get("BL_LATENCY_DIR") or DEFAULT_DUMP_DIR
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.session_started))
+            path = os.path.join(directory, f"latency_{stamp}.json")
+        payload = {
+            'session_started': self.session_started,
+            'session_ended': time.time(),
+            'bucket_sub_count': _SUB_COUNT,
+            'stages': {},
+        }
+        for name, hist in list(self._hists.items()):
+            if not hist.count:
+                continue
+            entry = hist.summary()
+            entry['buckets'] = {str(_bucket_value(i)): n for i, n in enumerate(hist.counts) if n}
+            payload['stages'][name] = entry
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as fh:
+                json.dump(payload, fh, indent=2)
+            return path
+        except Exception as e:
+            print(f"[LATENCY] Could not write {path}: {e}")
+            return None
+
+    def end_session(self) -> Optional[str]:
+        """Dump the session's histograms (if anything was recorded) and start a new session."""
+        if not self.enabled or not self._dirty:
+            return None
+        path = self.dump_json()
+        if path:
+            print(f"[LATENCY] Pipeline latency written to {path}")
+        self.reset()
+        return path
+
+
+PIPELINE_LATENCY = PipelineLatency()
+atexit.register(PIPELINE_LATENCY.end_session)
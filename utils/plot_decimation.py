@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Peak-preserving decimation for live EEG plots.
+
+Plotting every sample of a multi-second window costs far more than the
+screen can show, and stride decimation (``data[::k]``) aliases: blinks and
+spikes that fall between kept samples disappear. ``MinMaxDecimator``
+instead reduces each channel to one min/max pair per pixel column, so the
+curve keeps every excursion while drawing ~2 points per pixel.
+
+Columns are aligned to the absolute sample count of the stream, so on each
+timer tick only the columns completed since the previous tick are reduced;
+older columns come from the previous result.
+
+Author: BrainLink Companion Team
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def forward_fill_nonfinite(data: np.ndarray) -> np.ndarray:
+    """Replace NaN/inf in a 1-D array with the last finite value (leading gaps become 0)."""
+    data = np.asarray(data, dtype=float)
+    finite = np.isfinite(data)
+    if finite.all():
+        return data
+    if not finite.any():
+        return np.zeros_like(data)
+    idx = np.where(finite, np.arange(data.size), 0)
+    np.maximum.accumulate(idx, out=idx)
+    out = data[idx]
+    out[:int(np.argmax(finite))] = 0.0
+    return out
+
+
+def _column_envelope(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Min/max over axis 1 of a (n_columns, bin, n_channels) block, ignoring NaN."""
+    return np.fmin.reduce(block, axis=1), np.fmax.reduce(block, axis=1)
+
+
+class MinMaxDecimator:
+    """Incremental per-pixel-column min/max envelope of a sliding window.
+
+    Call ``update(window, end_index, n_columns)`` each frame with the latest
+    samples (shape (n,) or (n, n_channels)) and the absolute index one past
+    the last sample. Returns ``(x, y)``: absolute sample positions and the
+    interleaved min/max values (2 points per column). Windows that already
+    fit in ``2 * n_columns`` points are returned unchanged.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._bin = None
+        self._k0 = 0
+        self._mins = None
+        self._maxs = None
+        self._firsts = None
+        self.columns_computed = 0
+
+    def update(self, window: np.ndarray, end_index: int, n_columns: int) -> Tuple[np.ndarray, np.ndarray]:
+        data = np.asarray(window, dtype=float)
+        squeeze = data.ndim == 1
+        if squeeze:
+            data = data[:, None]
+        n = data.shape[0]
+        end_index = int(end_index)
+        start = end_index - n
+        n_columns = max(1, int(n_columns))
+
+        if n <= 2 * n_columns:
+            x = np.arange(start, end_index, dtype=float)
+            return x, (data[:, 0] if squeeze else data)
+
+        bin_size = -(-n // n_columns)
+        if bin_size != self._bin:
+            self.reset()
+            self._bin = bin_size
+
+        k_first = -(-start // bin_size)      # First column fully inside the window
+        k_end = end_index // bin_size        # Columns below this are complete
+        self._reuse(data, start, k_first, k_end)
+
+        k_cached = self._k0 + (len(self._mins) if self._mins is not None else 0)
+        if self._mins is None:
+            k_cached = self._k0 = k_first
+        if k_cached < k_end:
+            lo = k_cached * bin_size - start
+            block = data[lo:k_end * bin_size - start].reshape(k_end - k_cached, bin_size, -1)
+            mins, maxs = _column_envelope(block)
+            firsts = block[:, 0, :]
+            if self._mins is None:
+                self._mins, self._maxs, self._firsts = mins, maxs, firsts
+            else:
+                self._mins = np.concatenate([self._mins, mins])
+                self._maxs = np.concatenate([self._maxs, maxs])
+                self._firsts = np.concatenate([self._firsts, firsts])
+            self.columns_computed += k_end - k_cached
+
+        # Partial columns at either edge are cheap and recomputed every frame
+        centres = (np.arange(k_first, k_end) * bin_size + (bin_size - 1) / 2.0)
+        parts_x = [centres]
+        parts_min = [self._mins]
+        parts_max = [self._maxs]
+        head = k_first * bin_size - start
+        if head > 0:
+            h_min, h_max = _column_envelope(data[None, :head])
+            parts_x.insert(0, np.array([start + (head - 1) / 2.0]))
+            parts_min.insert(0, h_min)
+            parts_max.insert(0, h_max)
+        tail = end_index - k_end * bin_size
+        if tail > 0:
+            t_min, t_max = _column_envelope(data[None, n - tail:])
+            parts_x.append(np.array([k_end * bin_size + (tail - 1) / 2.0]))
+            parts_min.append(t_min)
+            parts_max.append(t_max)
+
+        col_x = np.concatenate(parts_x)
+        col_min = np.concatenate(parts_min)
+        col_max = np.concatenate(parts_max)
+        x = np.repeat(col_x, 2)
+        y = np.empty((2 * len(col_x), data.shape[1]))
+        y[0::2] = col_min
+        y[1::2] = col_max
+        return x, (y[:, 0] if squeeze else y)
+
+    def _reuse(self, data: np.ndarray, start: int, k_first: int, k_end: int) -> None:
+        """Keep cached columns still inside the window, or drop them if the data moved."""
+        if self._mins is None:
+            return
+        k_last = self._k0 + len(self._mins)
+        lo, hi = max(k_first, self._k0), min(k_end, k_last)
+        if lo >= hi or self._k0 > k_first or data.shape[1] != self._mins.shape[1]:
+            self.reset_columns()
+            return
+        # Cheap consistency check: the first sample of the newest reusable
+        # column must still sit where it was (guards against a buffer reset or
+        # an end_index that drifted from the snapshot)
+        check = hi - 1
+        row = data[check * self._bin - start]
+        if not np.array_equal(row, self._firsts[check - self._k0], equal_nan=True):
+            self.reset_columns()
+            return
+        keep = slice(lo - self._k0, hi - self._k0)
+        self._mins = self._mins[keep]
+        self._maxs = self._maxs[keep]
+        self._firsts = self._firsts[keep]
+        self._k0 = lo
+
+    def reset_columns(self) -> None:
+        """Forget cached columns but keep the current column width."""
+        self._mins = self._maxs = self._firsts = None
+
+
+def plot_columns(plot_widget, default: int = 600) -> int:
+    """Pixel width available to curves in a pyqtgraph PlotWidget/PlotItem."""
+    try:
+        item = plot_widget.getPlotItem() if hasattr(plot_widget, 'getPlotItem') else plot_widget
+        width = int(item.getViewBox().width())
+        if width > 0:
+            return width
+    except Exception:
+        pass
+    try:
+        width = int(plot_widget.width())
+        if width > 0:
+            return width
+    except Exception:
+        pass
+    return default
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Durable outbox for seeding reports to the Mindspeller API.
+
+``enqueue`` writes the request (URL and JSON payload) to a gzip-compressed
+spool file and returns immediately; a background thread posts it on a
+pooled keep-alive session. Entries survive restarts: anything left in the
+spool is sent once a JWT is available again (``token_fn``), so a network
+failure never loses a report.
+
+Each entry records its owner, ``owner_id(login)`` of the operator who queued
+it (``owner_fn``), and is only posted while that login is current: on a
+shared machine a report left over from one operator is never seeded with
+the next operator's token; it stays pending until its owner logs in again.
+
+    outbox = ReportOutbox(token_fn=lambda: window.jwt_token, owner_fn=lambda: window.login_owner,
+                          on_event=callback).start()
+    entry = outbox.enqueue(seed_url, payload)   # entry.id, entry.status
+    outbox.status_text()                        # "Outbox: 1 pending (retry in 30 s)"
+    outbox.requeue(entry.id)                    # failed/ -> pending/ after a rejection
+
+Spool layout (``BL_OUTBOX_DIR``, default ``~/BrainLink_Recordings/outbox``):
+
+    pending/<id>.json.gz     request, written atomically before enqueue returns
+    pending/<id>.state.json  attempts, next attempt time, last error
+    sent/<id>.json.gz        delivered (with the response); pruned after 30 days
+    failed/<id>.json.gz      rejected by the server (4xx other than 401/403/408/429)
+
+``<id>`` is a SHA-256 of the URL and the payload without its volatile fields
+(``session_id``, ``generation_meta``), so seeding the same report twice is a
+no-op, and it is sent as the ``Idempotency-Key`` header. The payload itself
+is posted unchanged. 401/403 wait for a new login; connection errors,
+408/429 and 5xx are retried with jittered exponential backoff (up to 10 min).
+
+``on_event(event)`` is called on the worker thread with ``kind`` one of
+queued / sent / retry / failed; the GUI forwards it through a Qt signal.
+
+Author: BrainLink Companion Team
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from utils.api_client import api_log, backoff_delay, is_local_url, new_session
+
+DEFAULT_OUTBOX_DIR = os.environ.get('BL_OUTBOX_DIR') or os.path.join(
+    os.path.expanduser("~"), "BrainLink_Recordings", "outbox")
+VOLATILE_FIELDS = ('session_id', 'generation_meta')
+AUTH_STATUS = frozenset({401, 403})
+RETRY_STATUS = frozenset({408, 429})
+AUTH_RETRY_S = 30.0
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 600.0
+SENT_MAX_AGE_DAYS = 30
+
+
+def owner_id(login: str) -> str:
+    """Spool owner for a login name (hashed; the spool does not store the login itself)."""
+    return hashlib.sha256(f"login:{login.strip().lower()}".encode('utf-8')).hexdigest()[:16]
+
+
+def content_hash(url: str, payload: Dict[str, Any], exclude=VOLATILE_FIELDS) -> str:
+    """Idempotency key: SHA-256 of the URL and the payload without volatile fields."""
+    stable = {k: v for k, v in payload.items() if k not in exclude}
+    canonical = json.dumps({'url': url, 'payload': stable}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class OutboxEntry:
+    id: str
+    url: str
+    created: float
+    status: str = 'pending'  # pending, sent or failed
+    attempts: int = 0
+    next_attempt: float = 0.0
+    last_error: Optional[str] = None
+    response: Optional[Dict[str, Any]] = None
+    owner: Optional[str] = None  # owner_id() of the login that queued it
+    duplicate: bool = False  # enqueue() found the same report already spooled
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class ReportOutbox:
+    """Spool plus sender thread; see the module docstring."""
+
+    def __init__(self, spool_dir: str = DEFAULT_OUTBOX_DIR, token_fn: Callable[[], Optional[str]] = lambda: None,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None, timeout: float = 60.0,
+                 owner_fn: Callable[[], Optional[str]] = lambda: None):
+        self.spool_dir = spool_dir
+        self.token_fn = token_fn
+        self.owner_fn = owner_fn
+        self.on_event = on_event
+        self.timeout = timeout  # Large reports on slow links
+        for sub in ('pending', 'sent', 'failed'):
+            os.makedirs(os.path.join(spool_dir, sub), exist_ok=True)
+        self._cond = threading.Condition()
+        self._entries: Dict[str, OutboxEntry] = {}
+        self._sending: Optional[str] = None
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._session = new_session(pool_size=2)
+        self.sent_this_run = 0
+        self._load_pending()
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _path(self, sub: str, entry_id: str, suffix: str = '.json.gz') -> str:
+        return os.path.join(self.spool_dir, sub, entry_id + suffix)
+
+    def _save_state(self, entry: OutboxEntry, sub: str = 'pending') -> None:
+        _write_atomic(self._path(sub, entry.id, '.state.json'), json.dumps(asdict(entry)).encode('utf-8'))
+
+    def _load_state(self, sub: str, entry_id: str) -> OutboxEntry:
+        with open(self._path(sub, entry_id, '.state.json'), encoding='utf-8') as fh:
+            state = json.load(fh)
+        state.pop('duplicate', None)
+        return OutboxEntry(**state)
+
+    def _load_pending(self) -> None:
+        for path in glob.glob(os.path.join(self.spool_dir, 'pending', '*.json.gz')):
+            entry_id = os.path.basename(path)[:-len('.json.gz')]
+            try:
+                entry = self._load_state('pending', entry_id)
+            except (OSError, ValueError, TypeError):
+                # Request written but no state yet (crash in enqueue): rebuild it
+                try:
+                    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+                        request = json.load(fh)
+                except (OSError, ValueError):
+                    api_log.warning("Outbox: unreadable spool file %s left in place", path)
+                    continue
+                entry = OutboxEntry(id=entry_id, url=request['url'], created=request.get('created', time.time()),
+                                    owner=request.get('owner'))
+            entry.next_attempt = min(entry.next_attempt, time.time())  # Try leftovers right away
+            self._entries[entry.id] = entry
+        if self._entries:
+            api_log.info("Outbox: %d report(s) pending from a previous run", len(self._entries))
+
+    def _read_request(self, entry_id: str) -> Dict[str, Any]:
+        with gzip.open(self._path('pending', entry_id), 'rt', encoding='utf-8') as fh:
+            return json.load(fh)
+
+    def _finish(self, entry: OutboxEntry, sub: str) -> None:
+        """Move a pending entry to sent/ or failed/."""
+        self._save_state(entry, sub)
+        os.replace(self._path('pending', entry.id), self._path(sub, entry.id))
+        try:
+            os.remove(self._path('pending', entry.id, '.state.json'))
+        except OSError:
+            pass
+
+    def prune_sent(self, max_age_days: float = SENT_MAX_AGE_DAYS) -> int:
+        """Delete delivered entries older than ``max_age_days``; returns how many were removed."""
+        cutoff = time.time() - max_age_days * 86400.0
+        removed = 0
+        for path in glob.glob(os.path.join(self.spool_dir, 'sent', '*')):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += path.endswith('.json.gz')
+            except OSError:
+                pass
+        return removed
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, url: str, payload: Dict[str, Any], owner: Optional[str] = None) -> OutboxEntry:
+        """Spool one request (durable when this returns) and wake the sender.
+
+        ``owner`` defaults to ``owner_fn()``. A report already spooled comes
+        back with ``duplicate=True`` and its status (pending, sent, or failed
+        with ``last_error``; see ``requeue``).
+        """
+        entry_id = content_hash(url, payload)
+        owner = owner if owner is not None else self.owner_fn()
+        with self._cond:
+            existing = self._entries.get(entry_id)
+            if existing is not None:
+                existing.duplicate = True
+                return existing
+            for sub in ('sent', 'failed'):
+                if os.path.exists(self._path(sub, entry_id)):
+                    try:
+                        entry = self._load_state(sub, entry_id)
+                    except (OSError, ValueError, TypeError):
+                        entry = OutboxEntry(id=entry_id, url=url, created=time.time())
+                    entry.status, entry.duplicate = sub, True
+                    return entry
+            entry = OutboxEntry(id=entry_id, url=url, created=time.time(), owner=owner)
+            request = {'id': entry_id, 'url': url, 'created': entry.created, 'owner': owner, 'payload': payload}
+            _write_atomic(self._path('pending', entry_id),
+                          gzip.compress(json.dumps(request).encode('utf-8'), compresslevel=6))
+            self._save_state(entry)
+            self._entries[entry_id] = entry
+            self._cond.notify()
+        self._emit('queued', entry)
+        return entry
+
+    def requeue(self, entry_id: str, owner: Optional[str] = None) -> Optional[OutboxEntry]:
+        """Move a rejected entry from failed/ back to pending/ and send it again (None if not in failed/)."""
+        owner = owner if owner is not None else self.owner_fn()
+        with self._cond:
+            if entry_id in self._entries:
+                return self._entries[entry_id]
+            if not os.path.exists(self._path('failed', entry_id)):
+                return None
+            try:
+                previous = self._load_state('failed', entry_id)
+                url, created = previous.url, previous.created
+            except (OSError, ValueError, TypeError):
+                with gzip.open(self._path('failed', entry_id), 'rt', encoding='utf-8') as fh:
+                    request = json.load(fh)
+                url, created = request['url'], request.get('created', time.time())
+            entry = OutboxEntry(id=entry_id, url=url, created=created, owner=owner)
+            os.replace(self._path('failed', entry_id), self._path('pending', entry_id))
+            try:
+                os.remove(self._path('failed', entry_id, '.state.json'))
+            except OSError:
+                pass
+            self._save_state(entry)
+            self._entries[entry_id] = entry
+            self._cond.notify()
+        api_log.info("Outbox: report %s re-queued", entry_id[:12])
+        self._emit('queued', entry)
+        return entry
+
+    def start(self) -> 'ReportOutbox':
+        if self._thread is None:
+            self.prune_sent()
+            self._thread = threading.Thread(target=self._run, name="bl-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def wake(self) -> None:
+        """Retry now (e.g. after a new login)."""
+        with self._cond:
+            for entry in self._entries.values():
+                entry.next_attempt = min(entry.next_attempt, time.time())
+            self._cond.notify()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._session.close()
+
+    def pending(self) -> List[OutboxEntry]:
+        with self._cond:
+            return sorted(self._entries.values(), key=lambda e: e.created)
+
+    def status_text(self) -> str:
+        """Short status for the status bar ('' when there is nothing to report)."""
+        entries = self.pending()
+        if not entries:
+            return f"Outbox: ✓ {self.sent_this_run} sent" if self.sent_this_run else ""
+        if not self.token_fn():
+            return f"Outbox: {len(entries)} pending (waiting for login)"
+        owner = self.owner_fn()
+        mine = [e for e in entries if e.owner == owner]
+        others = len(entries) - len(mine)
+        if not mine:
+            return f"Outbox: {others} pending for another login"
+        extra = f", {others} for another login" if others else ""
+        if self._sending is not None:
+            return f"Outbox: sending ({len(mine)} pending{extra})"
+        wait = max(0.0, min(e.next_attempt for e in mine) - time.time())
+        return f"Outbox: {len(mine)} pending" + (f" (retry in {wait:.0f} s)" if wait >= 1 else "") + extra
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _emit(self, kind: str, entry: OutboxEntry) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(dict(asdict(entry), kind=kind))
+        except Exception as e:
+            api_log.warning("Outbox event handler failed: %s", e)
+
+    def _next_due(self) -> Optional[OutboxEntry]:
+        """Wait until an entry of the current login is due and a token is available; None when stopping."""
+        with self._cond:
+            while not self._stop:
+                now = time.time()
+                owner = self.owner_fn()
+                due = sorted((e for e in self._entries.values() if e.next_attempt <= now), key=lambda e: e.created)
+                mine = [e for e in due if e.owner == owner]
+                if mine and self.token_fn():
+                    self._sending = mine[0].id
+                    return mine[0]
+                waits = [e.next_attempt - now for e in self._entries.values() if e.next_attempt > now]
+                # No token yet, or only other logins' reports: poll for a login every few seconds
+                timeout = 5.0 if due else (min(waits) if waits else None)
+                self._cond.wait(timeout=timeout)
+            return None
+
+    def _run(self) -> None:
+        while True:
+            entry = self._next_due()
+            if entry is None:
+                return
+            try:
+                self._send(entry)
+            finally:
+                with self._cond:
+                    self._sending = None
+
+    def _send(self, entry: OutboxEntry) -> None:
+        try:
+            request = self._read_request(entry.id)
+        except (OSError, ValueError) as e:
+            entry.status, entry.last_error = 'failed', f"unreadable spool file: {e}"
+            with self._cond:
+                self._entries.pop(entry.id, None)
+            self._emit('failed', entry)
+            return
+        token = self.token_fn()
+        if not token or entry.owner != self.owner_fn():
+            return  # Logged out or switched user since _next_due; stays pending
+        headers = {
+            "X-Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Idempotency-Key": entry.id,
+        }
+        entry.attempts += 1
+        t0 = time.perf_counter()
+        try:
+            response = self._session.post(entry.url, json=request['payload'], headers=headers,
+                                          timeout=self.timeout, verify=not is_local_url(entry.url))
+        except requests.exceptions.RequestException as e:
+            self._retry(entry, f"{type(e).__name__}: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        status = response.status_code
+        if status in (200, 201):
+            try:
+                entry.response = response.json()
+            except ValueError:
+                entry.response = {}
+            entry.status, entry.last_error = 'sent', None
+            with self._cond:
+                self._finish(entry, 'sent')
+                self._entries.pop(entry.id, None)
+                self.sent_this_run += 1
+            api_log.info("Outbox: report %s sent in %.0f ms (attempt %d)", entry.id[:12], elapsed_ms, entry.attempts)
+            self._emit('sent', entry)
+        elif status in AUTH_STATUS:
+            self._retry(entry, f"status {status} (waiting for a new login)", delay=AUTH_RETRY_S)
+        elif status in RETRY_STATUS or status >= 500:
+            self._retry(entry, f"status {status}")
+        else:
+            try:
+                error = response.json().get('error', response.text[:200])
+            except ValueError:
+                error = response.text[:200]
+            entry.status, entry.last_error = 'failed', f"status {status}: {error}"
+            with self._cond:
+                self._finish(entry, 'failed')
+                self._entries.pop(entry.id, None)
+            api_log.warning("Outbox: report %s rejected (%s)", entry.id[:12], entry.last_error)
+            self._emit('failed', entry)
+
+    def _retry(self, entry: OutboxEntry, error: str, delay: Optional[float] = None) -> None:
+        if delay is None:
+            delay = backoff_delay(entry.attempts - 1, base=BACKOFF_BASE_S, cap=BACKOFF_MAX_S)
+        entry.last_error = error
+        entry.next_attempt = time.time() + delay
+        with self._cond:
+            self._save_state(entry)
+        api_log.info("Outbox: report %s not sent (%s), retry in %.0f s", entry.id[:12], error, delay)
+        self._emit('retry', entry)
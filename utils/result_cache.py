@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for multi-task analysis results.
+
+``analyze_all_tasks_data`` output (per-task, combined and across-task
+results) is stored and reused when a report is regenerated or a session
+is reopened, so the regenerated report shows the p-values that were
+already reported instead of a fresh permutation draw. Without a fixed
+seed (``EnhancedAnalyzerConfig.seed is None``) the engine draws one seed
+per session; it is saved in the entry and reused after a cache hit.
+Only ``--no-result-cache`` / ``BL_RESULT_CACHE=0`` bypasses the cache.
+
+Entries are keyed by a digest of the baseline and task feature matrices
+plus the config fields that affect statistics. Any change to the data or
+config produces a different key, and bumping ``RESULT_CACHE_SCHEMA``
+invalidates every existing entry. Files are zlib-compressed pickles with
+a small header and are written atomically.
+
+Prune old entries from the command line:
+
+    python -m utils.result_cache prune --max-age-days 30 --max-size-mb 512
+    python -m utils.result_cache list
+
+Author: BrainLink Companion Team
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.lazy_import import lazy_module, module_available
+
+# Loaded on the first digest (analysis time), not when the GUI starts
+pd = lazy_module('pandas') if module_available('pandas') else None
+
+# Bump when the layout of analyze_all_tasks_data() results changes
+RESULT_CACHE_SCHEMA = 1
+_MAGIC = b"BLRC"
+_SUFFIX = ".blr"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), "BrainLink_Recordings", "analysis_cache")
+
+
+def feature_matrix_digest(features: List[Dict[str, Any]], timestamps: Optional[Iterable[Any]] = None) -> str:
+    """Digest of a list of per-window feature dicts (column order independent)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(features)).encode())
+    if features and pd is not None:
+        frame = pd.DataFrame(features)
+        frame = frame.reindex(columns=sorted(frame.columns, key=str))
+        digest.update(repr(tuple(frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    elif features:
+        for entry in features:
+            digest.update(repr(sorted(entry.items(), key=lambda kv: str(kv[0]))).encode())
+    if timestamps is not None:
+        digest.update(repr([float(t) for t in timestamps]).encode())
+    return digest.hexdigest()
+
+
+def result_cache_key(
+    engine_kind: str,
+    baseline: Dict[str, Dict[str, Any]],
+    tasks: Dict[str, Dict[str, Any]],
+    config_items: Dict[str, Any],
+) -> str:
+    """Combine data and config digests into a cache key (hex string)."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"schema={RESULT_CACHE_SCHEMA}|engine={engine_kind}".encode())
+    for phase in sorted(baseline):
+        data = baseline.get(phase) or {}
+        digest.update(f"|baseline:{phase}:".encode())
+        digest.update(feature_matrix_digest(data.get('features', []) or [], data.get('timestamps')).encode())
+    # Task order matters: it fixes the combined bucket and the across-task layout
+    for task_name, data in tasks.items():
+        digest.update(f"|task:{task_name}:".encode())
+        digest.update(feature_matrix_digest(data.get('features', []) or [], data.get('timestamps')).encode())
+    for name in sorted(config_items):
+        digest.update(f"|cfg:{name}={config_items[name]!r}".encode())
+    return digest.hexdigest()
+
+
+class AnalysisResultCache:
+    """Directory of compressed analysis results, one file per key."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or DEFAULT_CACHE_DIR
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{_SUFFIX}")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored payload, or None (unreadable/outdated entries are removed)."""
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as fh:
+                blob = fh.read()
+            if blob[:4] != _MAGIC or blob[4] != RESULT_CACHE_SCHEMA:
+                raise ValueError("outdated cache entry")
+            payload = pickle.loads(zlib.decompress(blob[5:]))
+        except Exception as e:
+            print(f"[RESULT CACHE] Discarding {os.path.basename(path)}: {e}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path, None)  # Recency for prune
+        except OSError:
+            pass
+        return payload
+
+    def store(self, key: str, payload: Dict[str, Any]) -> Optional[str]:
+        """Write ``payload`` atomically; returns the file path or None on failure."""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            blob = _MAGIC + bytes([RESULT_CACHE_SCHEMA]) + zlib.compress(
+                pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 6)
+            with open(tmp, 'wb') as fh:
+                fh.write(blob)
+            os.replace(tmp, path)
+            return path
+        except Exception as e:
+            print(f"[RESULT CACHE] Could not store result: {e}")
+            self._remove(tmp)
+            return None
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """(path, size_bytes, mtime) for each entry, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        out = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((path, int(st.st_size), float(st.st_mtime)))
+        out.sort(key=lambda e: e[2])
+        return out
+
+    def prune(self, max_age_days: Optional[float] = None, max_size_mb: Optional[float] = None) -> Tuple[int, int]:
+        """Delete entries older than ``max_age_days``, then oldest-first down to ``max_size_mb``.
+
+        Returns (files_removed, bytes_freed).
+        """
+        removed, freed = 0, 0
+        entries = self.entries()
+        keep = []
+        now = time.time()
+        for path, size, mtime in entries:
+            if max_age_days is not None and (now - mtime) > max_age_days * 86400.0:
+                if self._remove(path):
+                    removed += 1
+                    freed += size
+            else:
+                keep.append((path, size, mtime))
+        if max_size_mb is not None:
+            limit = max_size_mb * 1024 * 1024
+            total = sum(size for _, size, _ in keep)
+            for path, size, _ in keep:
+                if total <= limit:
+                    break
+                if self._remove(path):
+                    removed += 1
+                    freed += size
+                    total -= size
+        return removed, freed
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or prune the on-disk analysis result cache")
+    parser.add_argument("--dir", default=os.environ.get("BL_RESULT_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                        help="Cache directory (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List cached results, oldest first")
+    prune = sub.add_parser("prune", help="Delete old entries")
+    prune.add_argument("--max-age-days", type=float, default=None, help="Remove entries not used for this many days")
+    prune.add_argument("--max-size-mb", type=float, default=None, help="Then remove oldest entries until the cache fits")
+    prune.add_argument("--all", action="store_true", help="Remove every entry")
+    args = parser.parse_args(argv)
+
+    cache = AnalysisResultCache(args.dir)
+    if args.command == "list":
+        entries = cache.entries()
+        for path, size, mtime in entries:
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+            print(f"{stamp}  {size / 1024:8.1f} KB  {os.path.basename(path)}")
+        print(f"{len(entries)} entries, {sum(e[1] for e in entries) / 1e6:.1f} MB in {cache.directory}")
+        return 0
+
+    if args.all:
+        removed, freed = cache.prune(max_size_mb=0)
+    elif args.max_age_days is None and args.max_size_mb is None:
+        parser.error("prune needs --max-age-days, --max-size-mb or --all")
+        return 2
+    else:
+        removed, freed = cache.prune(args.max_age_days, args.max_size_mb)
+    print(f"Removed {removed} entries ({freed / 1e6:.1f} MB) from {cache.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
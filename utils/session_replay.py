@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded session through the live acquisition entry points.
+
+Reproduces live-session load without a headset: samples from a recording
+are injected where the device drivers would deliver them, and the phase
+markers are replayed with ``start_calibration_phase`` /
+``stop_calibration_phase`` on the engine.
+
+    MindLink   samples go through ``onRaw`` (parser callback) and the
+               shared ``raw_batcher``, exactly like the serial thread.
+    ANT Neuro  chunks go to an EDI2 ``on_data`` callback in Volts; the
+               default callback mirrors the GUI (µV, engine fed while a
+               phase is active).
+
+Inputs: the offline engine's ``session_*.csv`` with its
+``markers_*.json`` (found automatically next to the CSV), a single-column
+CSV, or a ``.npy`` array (1-D MindLink signal or (samples, channels)).
+
+Speed is ``1`` (real time), any factor (``10`` = 10x) or ``max``. The
+report gives sustained samples/sec, windows extracted versus expected per
+phase, windows missing (rejected or throttled) and windows completed
+behind the replay schedule ("late"), plus the pipeline stage latencies.
+
+    python utils/session_replay.py ~/BrainLink_Recordings/session_X.csv --speed max
+    python utils/session_replay.py signal.npy --markers markers_X.json --target mindlink --engine enhanced
+
+The 64-channel engine throttles extraction on wall-clock time
+(``feature_interval_s``). Replays scale that interval by the speed so a 10x
+run extracts the same windows per second of data as a live session, at ten
+times the rate; ``max`` removes the throttle (one window per delivery).
+``--keep-throttle`` leaves the live interval in place, so faster replays
+show the throttled windows as missing. The MindLink engines cut a window
+every ``step_samples`` of data whatever the batch size, so their expected
+count follows that hop.
+
+Author: BrainLink Companion Team
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (ROOT_DIR, os.path.join(ROOT_DIR, 'antNeuro')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from utils.pipeline_latency import PIPELINE_LATENCY  # noqa: E402
+from brainlink_core.engine import FeatureAnalysisEngine, window_ends  # noqa: E402
+from brainlink_core.recording import Recording, load_recording  # noqa: E402
+
+CALIBRATION_PHASES = ('eyes_closed', 'eyes_open', 'task')
+
+
+def parse_speed(text: str) -> float:
+    """``"1"``, ``"10"``, ``"10x"`` -> factor; ``"max"`` / ``"0"`` -> 0 (no pacing)."""
+    text = str(text).strip().lower().rstrip('x')
+    if text in ('max', 'inf', '0', ''):
+        return 0.0
+    return max(0.0, float(text))
+
+
+def make_edi2_callback(engine) -> Callable[[np.ndarray], None]:
+    """Same handling as the GUI's EDI2 ``on_data``: Volts -> µV, feed the engine during phases."""
+    def on_data(data):
+        data_uv = data * 1e6
+        state = getattr(engine, 'current_state', 'idle')
+        if state != 'idle':
+            engine.add_data(data_uv)
+    return on_data
+
+
+class SessionReplay:
+    """Drive an engine from a ``Recording`` through a live entry point."""
+
+    def __init__(self, recording: Recording, engine, target: str = 'antneuro', speed: float = 0.0,
+                 chunk_samples: Optional[int] = None, channel: int = 0,
+                 on_data: Optional[Callable[[np.ndarray], None]] = None, progress: bool = False,
+                 scale_throttle: bool = True):
+        self.recording = recording
+        self.engine = engine
+        self.target = target
+        self.speed = float(speed)
+        self.channel = int(channel)
+        self.on_data = on_data
+        self.progress = progress
+        self._bl = None
+        if chunk_samples is None:
+            if target == 'mindlink':
+                chunk_samples = 16
+            else:
+                chunk_samples = max(1, int(round(recording.sample_rate * 0.05)))  # ~50 ms EDI2 frames
+        self.chunk_samples = max(1, int(chunk_samples))
+        self.scale_throttle = scale_throttle
+        self._live_interval_s = getattr(engine, 'feature_interval_s', None)
+        # Data-time spacing between windows the engine should produce
+        self._interval_s = float(self._live_interval_s or 0.0)
+        if self._live_interval_s and scale_throttle and self.speed <= 0:
+            self._interval_s = 0.0
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+    def _attach(self):
+        if self.target == 'mindlink':
+            import BrainLinkAnalyzer_GUI as BL
+            self._bl = BL
+            self._saved = (getattr(BL.onRaw, 'feature_engine', None), getattr(BL.onRaw, '_suppress_console', False))
+            BL.onRaw.feature_engine = self.engine
+            BL.onRaw._suppress_console = True
+            BL.raw_batcher.flush()
+            BL.raw_batcher.subscribe(self._on_batch)
+            mono = self.recording.data[:, min(self.channel, self.recording.n_channels - 1)]
+            raw = BL.onRaw
+
+            def deliver(chunk_start, chunk_end):
+                for value in mono[chunk_start:chunk_end]:
+                    raw(float(value))
+        else:
+            callback = self.on_data or make_edi2_callback(self.engine)
+            data = self.recording.data
+
+            def deliver(chunk_start, chunk_end):
+                frame = data[chunk_start:chunk_end] * 1e-6  # EDI2 delivers Volts
+                callback(frame)
+                self._on_batch(frame)
+        return deliver
+
+    def _detach(self):
+        if self._bl is not None:
+            self._bl.raw_batcher.flush()
+            self._bl.raw_batcher.unsubscribe(self._on_batch)
+            self._bl.onRaw.feature_engine, self._bl.onRaw._suppress_console = self._saved
+            self._bl = None
+
+    def _buffer_full(self) -> bool:
+        buffer = getattr(self.engine, 'multichannel_buffer', None)
+        if buffer is None:
+            buffer = getattr(self.engine, 'raw_buffer', ())
+        return len(buffer) >= getattr(self.engine, 'window_samples', 0)
+
+    def _on_batch(self, batch):
+        """After each batch reaches the engine: count the windows it should have produced."""
+        self._delivered += len(batch)
+        if self._phase is None or getattr(self.engine, 'current_state', 'idle') == 'idle':
+            return
+        if getattr(type(self.engine), 'add_data', None) is FeatureAnalysisEngine.add_data:
+            # Fixed-hop MindLink engine: one window per hop boundary in this batch
+            stop = self.engine.samples_seen
+            ends = window_ends(stop - len(batch), stop, self.engine.window_samples, self.engine.step_samples)
+            self._phase['expected_windows'] += len(ends)
+            return
+        if not self._buffer_full():
+            return
+        data_time = self._delivered / float(self.recording.sample_rate)
+        if self._interval_s and self._last_expected is not None and data_time - self._last_expected < self._interval_s - 1e-9:
+            return
+        self._last_expected = data_time
+        self._phase['expected_windows'] += 1
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+    def _feature_count(self, phase: str) -> int:
+        store = getattr(self.engine, 'calibration_data', {}).get(phase) or {}
+        return len(store.get('features', []))
+
+    def _start_phase(self, marker):
+        phase, task = marker.get('phase'), marker.get('task')
+        if task:
+            self.engine.start_calibration_phase(phase, task_type=task)
+        else:
+            self.engine.start_calibration_phase(phase)
+        self._phase = {
+            'phase': phase,
+            'task': task,
+            'samples': 0,
+            'expected_windows': 0,
+            'windows': 0,
+            'late_windows': 0,
+            '_start_count': self._feature_count(phase),
+        }
+        self._last_expected = None
+
+    def _stop_phase(self):
+        if self._phase is None:
+            return
+        if self._bl is not None:
+            self._bl.raw_batcher.flush()  # Pending samples belong to this phase
+        self._phase['windows'] = self._feature_count(self._phase['phase']) - self._phase.pop('_start_count')
+        self._phase['missing_windows'] = max(0, self._phase['expected_windows'] - self._phase['windows'])
+        self.engine.stop_calibration_phase()
+        self.phases.append(self._phase)
+        self._phase = None
+
+    def _segments(self):
+        """(start_sample, end_sample, marker or None) covering the whole recording."""
+        rec = self.recording
+        cursor = 0
+        for marker in rec.phase_markers:
+            if marker.get('phase') not in CALIBRATION_PHASES or marker.get('record') is False:
+                continue
+            start = max(cursor, rec.sample_at(float(marker.get('start', 0.0))))
+            end = max(start, rec.sample_at(float(marker.get('end', 0.0))))
+            if start > cursor:
+                yield cursor, start, None
+            yield start, end, marker
+            cursor = end
+        if cursor < rec.n_samples:
+            yield cursor, rec.n_samples, None
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+    def run(self) -> Dict[str, Any]:
+        rec = self.recording
+        self.phases: List[Dict[str, Any]] = []
+        self._phase = None
+        self._delivered = 0
+        self._last_expected = None
+        late_chunks = 0
+        max_lag_s = 0.0
+        chunks = 0
+
+        PIPELINE_LATENCY.reset()
+        if self._live_interval_s and self.scale_throttle:
+            self.engine.feature_interval_s = self._live_interval_s / self.speed if self.speed > 0 else 0.0
+        deliver = self._attach()
+        t0 = time.perf_counter()
+        next_progress = t0 + 1.0
+        try:
+            for seg_start, seg_end, marker in self._segments():
+                if marker is not None:
+                    self._start_phase(marker)
+                pos = seg_start
+                while pos < seg_end:
+                    end = min(seg_end, pos + self.chunk_samples)
+                    if self.speed > 0:
+                        due = t0 + pos / (rec.sample_rate * self.speed)
+                        delay = due - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    before = self._feature_count(self._phase['phase']) if self._phase else 0
+                    deliver(pos, end)
+                    chunks += 1
+                    if self.speed > 0:
+                        # Done after the next chunk was due -> the pipeline is falling behind
+                        lag = time.perf_counter() - (t0 + end / (rec.sample_rate * self.speed))
+                        if lag > 0:
+                            late_chunks += 1
+                            max_lag_s = max(max_lag_s, lag)
+                            if self._phase and self._feature_count(self._phase['phase']) > before:
+                                self._phase['late_windows'] += 1
+                    if self._phase:
+                        self._phase['samples'] += end - pos
+                    pos = end
+                    if self.progress and time.perf_counter() >= next_progress:
+                        next_progress += 1.0
+                        print(f"[REPLAY] {end}/{rec.n_samples} samples ({100 * end // max(1, rec.n_samples)}%)")
+                if marker is not None:
+                    self._stop_phase()
+        finally:
+            if self._phase is not None:
+                self._stop_phase()
+            self._detach()
+            if self._live_interval_s is not None:
+                self.engine.feature_interval_s = self._live_interval_s
+        wall_s = time.perf_counter() - t0
+
+        totals = {k: sum(p[k] for p in self.phases) for k in ('expected_windows', 'windows', 'missing_windows', 'late_windows')}
+        return {
+            'source': rec.source,
+            'target': self.target,
+            'engine': type(self.engine).__name__,
+            'speed': self.speed or 'max',
+            'sample_rate': rec.sample_rate,
+            'channels': rec.n_channels,
+            'samples': rec.n_samples,
+            'data_duration_s': round(rec.duration_s, 3),
+            'wall_s': round(wall_s, 3),
+            'samples_per_sec': round(rec.n_samples / wall_s, 1) if wall_s > 0 else None,
+            'realtime_factor': round(rec.duration_s / wall_s, 2) if wall_s > 0 else None,
+            'chunk_samples': self.chunk_samples,
+            'chunks': chunks,
+            'late_chunks': late_chunks if self.speed > 0 else None,
+            'max_lag_ms': round(max_lag_s * 1000.0, 2) if self.speed > 0 else None,
+            'phases': self.phases,
+            'totals': totals,
+            'latency': PIPELINE_LATENCY.snapshot(),
+        }
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Plain-text lines for the console."""
+    speed = report['speed']
+    lines = [
+        "=" * 60,
+        "SESSION REPLAY",
+        "=" * 60,
+        f"Source:     {report['source']}",
+        f"Target:     {report['target']} -> {report['engine']} ({report['channels']} ch @ {report['sample_rate']} Hz)",
+        f"Speed:      {speed if speed == 'max' else f'{speed:g}x'}  (chunk {report['chunk_samples']} samples)",
+        f"Samples:    {report['samples']} ({report['data_duration_s']:.1f}s of data) in {report['wall_s']:.2f}s",
+        f"Sustained:  {report['samples_per_sec']:,.0f} samples/s ({report['realtime_factor']:.1f}x real time)",
+    ]
+    if report['late_chunks'] is not None:
+        lines.append(f"Behind:     {report['late_chunks']}/{report['chunks']} chunks late, max lag {report['max_lag_ms']:.1f} ms")
+    lines += ["", f"{'phase':<28} {'samples':>8} {'expected':>8} {'windows':>8} {'missing':>8} {'late':>6}"]
+    for p in report['phases']:
+        label = p['phase'] + (f":{p['task']}" if p.get('task') else '')
+        lines.append(f"{label:<28} {p['samples']:>8} {p['expected_windows']:>8} {p['windows']:>8} "
+                     f"{p['missing_windows']:>8} {p['late_windows']:>6}")
+    t = report['totals']
+    lines.append(f"{'total':<28} {'':>8} {t['expected_windows']:>8} {t['windows']:>8} "
+                 f"{t['missing_windows']:>8} {t['late_windows']:>6}")
+    latency = PIPELINE_LATENCY.report_lines()
+    if latency:
+        lines += [""] + latency
+    return lines
+
+
+def build_engine(target: str, recording: Recording, engine_name: str = 'enhanced'):
+    """Engine the GUI would use for this target."""
+    if target == 'mindlink':
+        if engine_name == 'base':
+            import BrainLinkAnalyzer_GUI as BL
+            return BL.FeatureAnalysisEngine()
+        from BrainLinkAnalyzer_GUI_Enhanced import EnhancedAnalyzerConfig, EnhancedFeatureAnalysisEngine
+        return EnhancedFeatureAnalysisEngine(config=EnhancedAnalyzerConfig.from_sources([]))
+    from enhanced_multichannel_analysis import Enhanced64ChannelEngine
+    return Enhanced64ChannelEngine(sample_rate=recording.sample_rate, channel_count=recording.n_channels,
+                                   channel_names=recording.channel_names)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded session through the live pipeline")
+    parser.add_argument('recording', help="session_*.csv, single-column .csv or .npy")
+    parser.add_argument('--markers', default=None, help="Phase markers JSON (default: markers_*.json next to the CSV)")
+    parser.add_argument('--target', choices=('auto', 'mindlink', 'antneuro'), default='auto',
+                        help="Entry point: MindLink onRaw or EDI2 on_data (default: by channel count)")
+    parser.add_argument('--engine', choices=('base', 'enhanced'), default='enhanced', help="MindLink engine (default: %(default)s)")
+    parser.add_argument('--speed', default='1', help="1 = real time, N = N x, max = unpaced (default: %(default)s)")
+    parser.add_argument('--sample-rate', type=int, default=None, help="Override the recording's sample rate")
+    parser.add_argument('--chunk', type=int, default=None, help="Samples per delivery (default: 16 MindLink, ~50 ms EDI2)")
+    parser.add_argument('--keep-throttle', action='store_true',
+                        help="Keep the 64-channel engine's wall-clock extraction interval at its live value")
+    parser.add_argument('--channel', default=None, help="Channel (name or index) fed to MindLink from a multi-channel recording")
+    parser.add_argument('--json', default=None, help="Write the report to this file")
+    parser.add_argument('--min-windows', type=float, default=None,
+                        help="Exit 1 if windows/expected falls below this fraction (CI gate)")
+    args = parser.parse_args(argv)
+
+    recording = load_recording(args.recording, args.markers, args.sample_rate)
+    target = args.target
+    if target == 'auto':
+        target = 'mindlink' if recording.n_channels == 1 else 'antneuro'
+    channel = 0
+    if args.channel is not None:
+        channel = int(args.channel) if args.channel.isdigit() else recording.channel_names.index(args.channel)
+    elif recording.n_channels > 1 and 'Fz' in recording.channel_names:
+        channel = recording.channel_names.index('Fz')
+    if not recording.phase_markers:
+        print("[REPLAY] No phase markers: replaying without calibration phases (no windows are stored)")
+
+    engine = build_engine(target, recording, args.engine)
+    replay = SessionReplay(recording, engine, target=target, speed=parse_speed(args.speed),
+                           chunk_samples=args.chunk, channel=channel, progress=True,
+                           scale_throttle=not args.keep_throttle)
+    report = replay.run()
+    print("\n".join(format_report(report)))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2, default=str)
+        print(f"\nReport written to {args.json}")
+
+    if args.min_windows is not None:
+        expected = report['totals']['expected_windows']
+        ratio = report['totals']['windows'] / expected if expected else 1.0
+        if ratio < args.min_windows:
+            print(f"\nFAIL: {ratio:.1%} of expected windows extracted (minimum {args.min_windows:.0%})")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())